@@ -17,6 +17,10 @@ $ pip3 install pexpect-serial
 ./cisco_wifi_ctl.py --scheme ssh -d 192.168.100.112 -u admin -p Cisco123 --action summary --prompt "\(Cisco Controller\) >"
 ./cisco_wifi_ctl.py --scheme ssh -d 192.168.100.112 -u admin -p Cisco123 --action cmd --value "show ap config general APA453.0E7B.CF9C"
 
+# Stay logged in and send commands through a session daemon (one login for many commands)
+./cisco_wifi_ctl.py --scheme ssh -d 192.168.100.112 -u admin -p Cisco123 --series 9800 --daemon /tmp/wlc.sock &
+./cisco_wifi_ctl.py --socket /tmp/wlc.sock --action show --value "ap summary"
+
 telnet 172.19.36.168(Pwd:), go to the privileged mode and execute the command “clear line 43”.
 
 Cisco uses 9130 AP
@@ -38,7 +42,14 @@ if sys.version_info[0] != 3:
     print("This script requires Python 3")
     exit()
 
+import json
 import logging
+import os
+import re
+import socket
+import socketserver
+import stat
+import threading
 import time
 from time import sleep
 import argparse
@@ -88,6 +99,876 @@ class FileAdapter(object):
         pass  # leave it to logging to flush properly
 
 
+# prompts seen while logging in to a 9800
+LOGIN_ESCAPE = "Escape character is '^]'."
+LOGIN_BAD_SECRETS = "Bad secrets"
+LOGIN_PRESS_RETURN = "Press RETURN to get started."
+LOGIN_CONFIG_I = "%SYS-5-CONFIG_I: Configured from console by console"
+LEGACY_PROMPT = "(cisco) >"
+MORE = "--More--"
+AREYOUSURE = "Are you sure you want to continue? (y/n)"
+SAVE_NOW = "Would you like to save them now? (y/N)"
+
+
+class CiscoSession(object):
+   """
+   One logged in ssh, telnet or serial console session to a controller, kept open for any number of commands.
+   Each command returns as soon as the controller shows its prompt again; the prompt seen
+   last is kept in self.prompt and self.mode ("exec", "enable", "config", "config-wlan", ...).
+
+      session = CiscoSession("192.168.100.112", user="admin", passwd="Cisco123", scheme="ssh", series="9800")
+      print(session.send("show ap summary"))
+      session.config(["ap dot11 5ghz shutdown"])
+      session.close()
+   """
+   def __init__(self, host, user=None, passwd=None, scheme="ssh", port=None, series="3504",
+                prompt="(Cisco Controller) >", hostname="WLC", logg=None, timeout=10, tty="/dev/ttyUSB0"):
+      """
+      :param prompt: exec prompt of 3504 series controllers
+      :param hostname: hostname in the prompt of 9800 series controllers
+      :param timeout: seconds to wait for the prompt after a command
+      :param tty: serial device of the serial scheme
+      """
+      if scheme not in ("ssh", "telnet", "serial"):
+         raise ValueError("CiscoSession supports ssh, telnet and serial, given %s"%(scheme))
+      self.host = host
+      self.tty = tty
+      self.user = user
+      self.passwd = passwd
+      self.scheme = scheme
+      self.port = port if port is not None else default_ports[scheme]
+      self.series = series
+      self.hostname = hostname
+      self.timeout = timeout
+      self.logg = logg if logg is not None else logging.getLogger(__name__)
+      self.egg = None
+      self.prompt = None
+      self.mode = None
+      if series == "9800":
+         self.prompts = [r"[\r\n]%s(?:\(([-\w]+)\))?([#>])"%(re.escape(hostname))]
+      else:
+         self.prompts = [re.escape(prompt), re.escape(LEGACY_PROMPT)]
+      self.login()
+
+   def _spawn(self):
+      if self.scheme == "serial":
+         import serial
+         from pexpect_serial import SerialSpawn
+         self.logg.info("Open serial console: "+self.tty+NL)
+         egg = SerialSpawn(serial.Serial(self.tty, 115200, timeout=5), encoding="utf-8", codec_errors="ignore")
+         egg.logfile = FileAdapter(self.logg)
+         return egg
+      if self.scheme == "ssh":
+         cmd = "ssh -p%d %s@%s"%(self.port, self.user, self.host)
+      else:
+         cmd = "telnet %s %d"%(self.host, self.port)
+      self.logg.info("Spawn: "+cmd+NL)
+      egg = pexpect.spawn(cmd, encoding="utf-8", codec_errors="ignore")
+      egg.logfile = FileAdapter(self.logg)
+      return egg
+
+   def _reconnect(self):
+      if self.egg is not None:
+         self.egg.close(force = True)
+         sleep(1)
+      self.egg = self._spawn()
+      time.sleep(2 if self.scheme == "telnet" else 0.1)
+
+   def login(self):
+      self._reconnect()
+      if self.series == "9800":
+         self._login_9800()
+      elif self.scheme == "ssh":
+         i = self.egg.expect(["ssword:", "continue connecting (yes/no)?"], timeout=3)
+         sleep(0.1)
+         if i == 1:
+            self.egg.sendline('yes')
+            sleep(0.1)
+            self.egg.expect('ssword:')
+         sleep(0.1)
+         self.egg.sendline(self.passwd)
+         self._expect_prompt(3)
+      elif self.scheme == "serial":
+         self.egg.sendline(NL)
+         sleep(0.1)
+         self.egg.expect(['login:', r'User\:'], timeout=3)
+         self.egg.sendline(self.user)
+         self.egg.expect('ssword:', timeout=3)
+         self.egg.sendline(self.passwd)
+         self._expect_prompt(3)
+      else:
+         self.egg.sendline(' ')
+         self.egg.expect(r'User\:', timeout=3)
+         self.egg.sendline(self.user)
+         self.egg.expect(r'Password\:', timeout=3)
+         self.egg.sendline(self.passwd)
+         self._expect_prompt(3)
+      # prompts answering the login's extra line feeds would otherwise end the next command early
+      self._drain(0.5)
+      if self.series != "9800":
+         self.send("config paging disable")
+      else:
+         self.send("terminal length 0")
+
+   def _drain(self, settle=0):
+      """
+      Discard anything the controller printed since the last prompt, e.g. log messages.
+      """
+      try:
+         while True:
+            self.egg.read_nonblocking(size=4096, timeout=settle)
+      except pexpect.TIMEOUT:
+         pass
+      self.egg.buffer = ""
+
+   def _login_9800(self):
+      """
+      Answer whatever the controller shows until we are at the enable prompt.
+      """
+      host = self.hostname
+      expected = [LOGIN_ESCAPE, host+">", host+"#", "User:", "Password:", host+"(config)#", LOGIN_BAD_SECRETS,
+                  LOGIN_PRESS_RETURN, LOGIN_CONFIG_I, pexpect.TIMEOUT]
+      for loop_count in range(8):
+         self.egg.sendline(CR)
+         sleep(0.4)
+         i = self.egg.expect_exact(expected, timeout=2)
+         if i == 0:
+            i = self.egg.expect_exact(expected[1:5] + [pexpect.TIMEOUT], timeout=3) + 1
+            if i == 5:
+               self._reconnect()
+               continue
+         if i == 1:
+            self.egg.sendline("en")
+            sleep(0.1)
+            if self.egg.expect_exact(["Password:", pexpect.TIMEOUT], timeout=2) == 0:
+               i = 4
+         if i == 3:
+            self.egg.sendline(self.user)
+            sleep(0.1)
+            if self.egg.expect_exact(["Password:", pexpect.TIMEOUT], timeout=2) == 0:
+               i = 4
+         if i == 4:
+            self.egg.sendline(self.passwd)
+            sleep(0.1)
+            if self.egg.expect_exact([host+"#", pexpect.TIMEOUT], timeout=2) == 0:
+               i = 2
+         if i == 2:
+            self.prompt = host+"#"
+            self.mode = "enable"
+            self.logg.info("9800 logged in loop_count {}".format(loop_count))
+            return
+         if i == 5:
+            self.egg.sendline("exit")
+            sleep(0.2)
+         if i in (6, 7, 8):
+            self.egg.sendline(CR)
+            sleep(0.2)
+         if i == 9:
+            self.logg.info("9800 timed out waiting for the initial prompt, re-establishing the connection")
+            self._reconnect()
+      self.egg.close(force = True)
+      raise Exception("9800 could not log in to %s"%(self.host))
+
+   def _expect_prompt(self, timeout):
+      """
+      Wait for the next prompt, answering paging and confirmation questions.
+      :return: text shown before the prompt
+      """
+      output = []
+      patterns = self.prompts + [re.escape(MORE), re.escape(AREYOUSURE) + r"(\[y\]:)?", re.escape(SAVE_NOW)]
+      answer = None
+      while True:
+         i = self.egg.expect(patterns, timeout=timeout)
+         before = self.egg.before
+         if answer is not None:
+            # drop the echo of our answer
+            before = before.lstrip(" \r\n")
+            if before.startswith(answer):
+               before = before[len(answer):]
+         output.append(before)
+         if i < len(self.prompts):
+            break
+         if i == len(self.prompts):
+            answer = None
+            self.egg.send(" ")
+         else:
+            answer = "y" if i == len(self.prompts) + 1 else "N"
+            self.egg.sendline(answer)
+      self.prompt = self.egg.after.strip()
+      if self.series == "9800":
+         self.mode = self.egg.match.group(1) or ("enable" if self.egg.match.group(2) == "#" else "exec")
+      else:
+         self.mode = "exec"
+      return "".join(output)
+
+   def send(self, command, timeout=None):
+      """
+      Send one command and wait for the prompt.
+      :return: the command's output without the echoed command line
+      """
+      if (self.egg is None) or (not self.egg.isalive()):
+         self.logg.info("session to {} closed, logging in again".format(self.host))
+         self.login()
+      self._drain()
+      self.logg.info("Command[%s]"%command)
+      self.egg.sendline(command)
+      output = self._expect_prompt(self.timeout if timeout is None else timeout)
+      lines = output.replace("\r", "").split("\n")
+      if (len(lines) > 0) and (command in lines[0]):
+         lines = lines[1:]
+      return "\n".join(lines).strip("\n")
+
+   def config(self, commands, timeout=None):
+      """
+      Run commands in config mode and return to the enable prompt.
+      :return: list of outputs, one per command
+      """
+      if self.series != "9800":
+         return [self.send(command, timeout) for command in commands]
+      self.send("config t", timeout)
+      try:
+         return [self.send(command, timeout) for command in commands]
+      finally:
+         while self.mode not in ("enable", "exec"):
+            self.send("end" if self.mode.startswith("config") else "exit", timeout)
+
+   def close(self):
+      if self.egg is None:
+         return
+      try:
+         if self.series == "9800" and self.mode not in ("enable", "exec"):
+            self.send("end")
+         self.egg.sendline("logout")
+         if self.scheme == "telnet":
+            self.egg.sendline("\x1b\r")
+         sleep(0.1)
+      except (pexpect.EOF, pexpect.TIMEOUT, OSError):
+         pass
+      self.egg.close(force = True)
+      self.egg = None
+
+
+# A session daemon keeps one CiscoSession logged in and runs commands for any local
+# process that connects to its Unix socket. Requests and responses are one json object per line:
+#    {"op": "send", "command": "show ap summary"}    -> {"ok": true, "output": "...", "prompt": "WLC#", "mode": "enable"}
+#    {"op": "config", "commands": ["..."]}           -> {"ok": true, "output": ["..."], ...}
+#    {"op": "shutdown"}                              -> logs out and stops the daemon
+
+class _SessionRequestHandler(socketserver.StreamRequestHandler):
+   def handle(self):
+      server = self.server
+      for line in self.rfile:
+         op = None
+         response = {"ok": True}
+         try:
+            request = json.loads(line.decode("utf-8"))
+            op = request.get("op")
+            with server.lock:
+               if op == "send":
+                  response["output"] = server.session.send(request["command"], request.get("timeout"))
+               elif op == "config":
+                  response["output"] = server.session.config(request["commands"], request.get("timeout"))
+               elif op == "shutdown":
+                  server.session.close()
+                  threading.Thread(target=server.shutdown).start()
+               elif op != "ping":
+                  raise ValueError("unknown op %s"%(op))
+               response["prompt"] = server.session.prompt
+               response["mode"] = server.session.mode
+         except Exception as e:
+            response = {"ok": False, "error": "%s: %s"%(type(e).__name__, e)}
+         self.wfile.write((json.dumps(response) + "\n").encode("utf-8"))
+         if op == "shutdown":
+            return
+
+
+def serve_session(session, socket_path):
+   """
+   Run the session daemon on socket_path until a shutdown request; commands from all
+   clients go through the one session in turn.
+   """
+   if os.path.lexists(socket_path):
+      # a stale socket from an earlier daemon; never remove anything else
+      if not stat.S_ISSOCK(os.lstat(socket_path).st_mode):
+         raise Exception("%s exists and is not a socket"%(socket_path))
+      os.unlink(socket_path)
+   # the socket is created owner-only, no other user can connect before it is locked down
+   old_umask = os.umask(0o177)
+   try:
+      server = socketserver.ThreadingUnixStreamServer(socket_path, _SessionRequestHandler)
+   finally:
+      os.umask(old_umask)
+   server.daemon_threads = True
+   server.session = session
+   server.lock = threading.Lock()
+   try:
+      server.serve_forever()
+   finally:
+      server.server_close()
+      os.unlink(socket_path)
+
+
+class CiscoSessionClient(object):
+   """
+   Same send()/config() as CiscoSession, run by a session daemon (see serve_session, --daemon).
+   """
+   def __init__(self, socket_path):
+      self.socket_path = socket_path
+      self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+      self.sock.connect(socket_path)
+      self.rfile = self.sock.makefile("rb")
+      self.prompt = None
+      self.mode = None
+
+   def request(self, **request):
+      self.sock.sendall((json.dumps(request) + "\n").encode("utf-8"))
+      response = json.loads(self.rfile.readline().decode("utf-8"))
+      if not response["ok"]:
+         raise Exception("session daemon %s: %s"%(self.socket_path, response["error"]))
+      self.prompt = response.get("prompt")
+      self.mode = response.get("mode")
+      return response.get("output")
+
+   def send(self, command, timeout=None):
+      return self.request(op="send", command=command, timeout=timeout)
+
+   def config(self, commands, timeout=None):
+      return self.request(op="config", commands=list(commands), timeout=timeout)
+
+   def shutdown(self):
+      self.request(op="shutdown")
+      self.close()
+
+   def close(self):
+      self.rfile.close()
+      self.sock.close()
+
+
+# controller messages that mean a command was refused
+ERROR_MARKERS = ("% Invalid", "% Incomplete", "% Ambiguous", "% Error", "Incorrect usage", "Incorrect input",
+                 "Request failed")
+
+
+class CommandResult(object):
+   """
+   Outcome of one controller action: the commands sent, their output, and the error
+   message when the controller refused one of them.
+   """
+   __slots__ = ("action", "commands", "output", "error")
+
+   def __init__(self, action, commands, output):
+      self.action = action
+      self.commands = commands
+      self.output = output
+      self.error = None
+      for line in output.splitlines():
+         if any(marker in line for marker in ERROR_MARKERS):
+            self.error = line.strip()
+            break
+
+   @property
+   def ok(self):
+      return self.error is None
+
+   def __repr__(self):
+      return "CommandResult(%s ok=%s)"%(self.action, self.ok)
+
+
+# actions that only read from the controller; any other action drops the cached ControllerState
+READ_ACTIONS = ("config", "summary", "advanced", "show", "ap_channel", "show_wlan_summary")
+
+
+class ApSummary(object):
+   """
+   One AP of "show ap summary".  clients is reported by 3504 series controllers, state by 9800.
+   """
+   __slots__ = ("ap", "slots", "model", "mac", "location", "country", "ip", "clients", "state")
+
+   def __init__(self, ap, slots, model, mac, location, country, ip, clients=None, state=None):
+      self.ap = ap
+      self.slots = slots
+      self.model = model
+      self.mac = mac
+      self.location = location
+      self.country = country
+      self.ip = ip
+      self.clients = clients
+      self.state = state
+
+   def __repr__(self):
+      return "ApSummary(%s country=%s ip=%s)"%(self.ap, self.country, self.ip)
+
+
+class ApRadio(object):
+   """
+   One AP radio of "show ap dot11 5ghz summary" (9800) or "show advanced 802.11a summary" (3504).
+   txpower is the power level as "1/8", tx_dbm what that level is in dBm; width is in MHz.
+   """
+   __slots__ = ("ap", "mac", "slot", "admin_state", "oper_state", "width", "txpower", "tx_dbm", "channels", "mode")
+
+   def __init__(self, ap, mac, slot, admin_state, oper_state, width, txpower, tx_dbm, channels, mode=None):
+      self.ap = ap
+      self.mac = mac
+      self.slot = slot
+      self.admin_state = admin_state
+      self.oper_state = oper_state
+      self.width = width
+      self.txpower = txpower
+      self.tx_dbm = tx_dbm
+      self.channels = channels
+      self.mode = mode
+
+   @property
+   def channel(self):
+      """
+      :return: primary channel
+      """
+      return self.channels[0] if self.channels else None
+
+   @property
+   def enabled(self):
+      return self.admin_state.lower() == "enabled"
+
+   @property
+   def up(self):
+      return self.oper_state.lower() == "up"
+
+   def __repr__(self):
+      return "ApRadio(%s slot=%s channels=%s width=%s txpower=%s (%s dBm) %s/%s)"%(
+         self.ap, self.slot, self.channels, self.width, self.txpower, self.tx_dbm, self.admin_state, self.oper_state)
+
+
+def _table_rows(output):
+   """
+   :return: lines of the table below the first ----- line of output, up to the next blank line
+   """
+   rows = []
+   in_table = False
+   for line in output.splitlines():
+      if line.startswith("---------"):
+         in_table = True
+         continue
+      if in_table:
+         if line.strip() == "":
+            if rows:
+               break
+            continue
+         rows.append(line.strip())
+   return rows
+
+
+def parse_ap_summary(output, series="3504"):
+   """
+   :return: an ApSummary per AP line of "show ap summary"
+   """
+   aps = []
+   for row in _table_rows(output):
+      if series == "9800":
+         # AP name, slots, model, ethernet MAC, radio MAC, location..., country, IP, state
+         fields = row.split()
+         if len(fields) < 9:
+            continue
+         aps.append(ApSummary(fields[0], fields[1], fields[2], fields[3], " ".join(fields[5:-3]),
+                              fields[-3], fields[-2], state=fields[-1]))
+      else:
+         # AP name, slots, model, ethernet MAC, location..., country, IP, clients [DSE location]
+         fields = row.split("[")[0].split()
+         if len(fields) < 8:
+            continue
+         aps.append(ApSummary(fields[0], fields[1], fields[2], fields[3], " ".join(fields[4:-3]),
+                              fields[-3], fields[-2], clients=int(fields[-1]) if fields[-1].isdigit() else None))
+   return aps
+
+
+RADIO_9800 = re.compile(r"^(\S+)\s+(\S+)\s+(\d+)\s+(\S+)\s+(\S+)\s+(\S+)\s+\*?(\S+)\s+\(\s*(-?\d+)\s+dBm\)\s+(\S+)(?:\s+(\S+))?")
+RADIO_3504 = re.compile(r"^(\S+)\s+(\S+)\s+(\d+)\s+(\S+)\s+(\S+)\s+(\S+)\s+\*?(\S+)\s+\(\s*(-?\d+)\s+dBm")
+
+
+def parse_ap_radios(output, series="3504"):
+   """
+   :return: an ApRadio per AP line of the radio summary, see CiscoController.commands("advanced")
+   """
+   radios = []
+   for row in _table_rows(output):
+      if series == "9800":
+         m = RADIO_9800.search(row)
+         if m is None:
+            continue
+         channels = [int(channel) for channel in re.findall(r"\d+", m.group(9))]
+         width = int(m.group(6)) if m.group(6).isdigit() else None
+         radios.append(ApRadio(m.group(1), m.group(2), int(m.group(3)), m.group(4), m.group(5), width,
+                               m.group(7), int(m.group(8)), channels, mode=m.group(10)))
+      else:
+         m = RADIO_3504.search(row)
+         if m is None:
+            continue
+         # 3504 lists every 20MHz channel of the bonded channel, e.g. (36,40,44,48)*
+         channels = [int(channel) for channel in re.findall(r"\d+", m.group(6))]
+         radios.append(ApRadio(m.group(1), m.group(2), int(m.group(3)), m.group(4), m.group(5), 20 * len(channels),
+                               m.group(7), int(m.group(8)), channels))
+   return radios
+
+
+class ControllerState(object):
+   """
+   Parsed "show ap summary" and AP radio summary of one controller, each kept for ttl seconds
+   so repeated checks do not query the controller again:
+
+      radio = controller.state.radio("APA453.0E7B.CF9C", slot=1)
+      print(radio.channel, radio.width, radio.txpower, radio.up)
+
+   CiscoController drops the cache when it sends anything but READ_ACTIONS, and refreshes it
+   from the output of summary and advanced actions run through it.
+   """
+   PARSERS = {"summary": parse_ap_summary, "advanced": parse_ap_radios}
+
+   def __init__(self, fetch, series="3504", ttl=5.0):
+      """
+      :param fetch: callable taking "summary" or "advanced" and returning the controller's output
+      """
+      self.fetch = fetch
+      self.series = series
+      self.ttl = ttl
+      self._cache = {}
+
+   def update(self, action, output):
+      self._cache[action] = (time.time(), self.PARSERS[action](output, self.series))
+
+   def invalidate(self):
+      self._cache.clear()
+
+   def _records(self, action, refresh):
+      cached = self._cache.get(action)
+      if refresh or (cached is None) or (time.time() - cached[0] > self.ttl):
+         self.update(action, self.fetch(action))
+      return self._cache[action][1]
+
+   def aps(self, refresh=False):
+      """
+      :return: ApSummary list
+      """
+      return self._records("summary", refresh)
+
+   def ap(self, name, refresh=False):
+      """
+      :return: ApSummary of AP name, None when the controller does not list it
+      """
+      for entry in self.aps(refresh):
+         if entry.ap == name:
+            return entry
+      return None
+
+   def radios(self, refresh=False):
+      """
+      :return: ApRadio list for the controller's band
+      """
+      return self._records("advanced", refresh)
+
+   def radio(self, name, slot=None, refresh=False):
+      """
+      :return: ApRadio of AP name, in slot when given, None when the controller does not list it
+      """
+      for radio in self.radios(refresh):
+         if (radio.ap == name) and ((slot is None) or (radio.slot == int(slot))):
+            return radio
+      return None
+
+
+class CiscoController(object):
+   """
+   The controller actions as methods over one session (a CiscoSession or a CiscoSessionClient).
+   main() runs its --action through run():
+
+      ctl = CiscoController.connect("192.168.100.112", user="admin", passwd="Cisco123", series="9800",
+                                    ap="APA453.0E7B.CF9C", band="a")
+      print(ctl.summary().output)
+      results = ctl.reconfigure(tx_power=3, channel=36, bandwidth=40)
+      ctl.close()
+
+   Each action returns a CommandResult. transaction() sends several actions back to back in
+   one session, entering config mode once for the config actions among them. self.state holds
+   the parsed AP summary and radio summary, see ControllerState.
+   """
+   # actions and their methods, as in --action
+   ACTIONS = ("config", "summary", "advanced", "show", "cmd", "country", "ap_country", "manual", "auto", "enable", "disable",
+              "txPower", "bandwidth", "channel", "ap_channel", "disable_network_5ghz", "disable_network_24ghz",
+              "enable_network_5ghz", "enable_network_24ghz", "wireless_tag_policy", "debug_disable_all",
+              "no_logging_console", "line_console_0", "no_wlan", "show_wlan_summary", "create_wlan", "delete_wlan",
+              "enable_wlan", "disable_wlan", "wlan_qos")
+
+   def __init__(self, session, series="3504", ap=None, band="a", wlan=None, wlanID=None, state_ttl=5.0):
+      """
+      :param state_ttl: seconds self.state keeps what it read from the controller
+      """
+      self.session = session
+      self.series = series
+      self.ap = ap
+      self.band = band
+      self.wlan = wlan
+      self.wlanID = wlanID
+      self.state = ControllerState(self._read, series=series, ttl=state_ttl)
+
+   @classmethod
+   def connect(cls, host=None, user=None, passwd=None, scheme="ssh", port=None, series="3504",
+               prompt="(Cisco Controller) >", socket_path=None, logg=None, tty="/dev/ttyUSB0", **kwargs):
+      """
+      Log in, or use the session daemon on socket_path when given.
+      :param kwargs: ap, band, wlan, wlanID, state_ttl
+      """
+      if socket_path is not None:
+         session = CiscoSessionClient(socket_path)
+      else:
+         session = CiscoSession(host, user=user, passwd=passwd, scheme=scheme, port=port, series=series,
+                                prompt=prompt, logg=logg, tty=tty)
+      return cls(session, series=series, **kwargs)
+
+   def close(self):
+      self.session.close()
+
+   def _require(self, action, **values):
+      for name, value in values.items():
+         if value is None:
+            raise ValueError("%s requires %s"%(action, name))
+
+   def commands(self, action, value=None):
+      """
+      :return: (config_mode, commands) that carry out action
+      """
+      is_9800 = (self.series == "9800")
+      dot11 = "5ghz" if self.band == "a" else "24ghz"
+      band = "-abgn" if self.band == "abgn" else self.band
+      if action in ("manual", "auto", "enable", "disable", "txPower", "bandwidth", "channel", "ap_channel"):
+         self._require(action, ap=self.ap)
+      if action in ("show", "cmd", "country", "ap_country", "txPower", "bandwidth", "channel"):
+         self._require(action, value=value)
+
+      if action == "config":
+         # log in and out only
+         return False, []
+      if action == "summary":
+         return False, ["show ap summary"]
+      if action == "advanced":
+         return False, ["show ap dot11 %s summary"%(dot11) if is_9800 else "show advanced 802.11%s summary"%(band)]
+      if action == "show":
+         return False, ["show %s"%(value)]
+      if action == "cmd":
+         return False, [value]
+      if action == "country":
+         return False, ["config country %s"%(value)]
+      if action == "ap_country":
+         return False, ["config ap country %s %s"%(value, self.ap)]
+      if action in ("manual", "auto"):
+         if not is_9800:
+            return False, []
+         role = "manual client-serving" if action == "manual" else "auto"
+         return False, ["ap name %s dot11 %s radio role %s"%(self.ap, dot11, role)]
+      if action in ("enable", "disable"):
+         if is_9800:
+            no = "no " if action == "enable" else ""
+            return False, ["ap name %s %sdot11 %s shutdown"%(self.ap, no, dot11)]
+         return False, ["config 802.11%s %s %s"%(band, action, self.ap)]
+      if action == "txPower":
+         if is_9800:
+            return False, ["ap name %s dot11 %s txpower %s"%(self.ap, dot11, value)]
+         return False, ["config 802.11%s txPower ap %s %s"%(band, self.ap, value)]
+      if action == "bandwidth":
+         if is_9800:
+            return False, ["ap name %s dot11 %s channel width %s"%(self.ap, dot11, value)]
+         return False, ["config 802.11%s chan_width %s %s"%(band, self.ap, value)]
+      if action == "channel":
+         if is_9800:
+            return False, ["ap name %s dot11 %s channel %s"%(self.ap, dot11, value)]
+         return False, ["config 802.11%s channel ap %s %s"%(band, self.ap, value)]
+      if action == "ap_channel":
+         return False, ["show ap dot11 %s summary"%(dot11) if is_9800 else "show ap channel %s"%(self.ap)]
+      if action.startswith("disable_network_") or action.startswith("enable_network_"):
+         no = "no " if action.startswith("enable") else ""
+         return True, ["%sap dot11 %s shutdown"%(no, action.split("_")[-1])]
+      if action == "wireless_tag_policy":
+         return True, ["wireless tag policy default-policy-tag", "wlan open-wlan policy default-policy-profile"]
+      if action == "debug_disable_all":
+         if is_9800:
+            raise ValueError("action %s not available on 9800"%(action))
+         return False, ["debug disable-all"]
+      if action == "no_logging_console":
+         return (True, ["no logging console"]) if is_9800 else (False, ["config logging debug console disable"])
+      if action == "line_console_0":
+         return True, ["line console 0"]
+      if action == "show_wlan_summary":
+         return False, ["show wlan summary"]
+      if action == "no_wlan":
+         self._require(action, wlan=self.wlan)
+         return True, ["no wlan %s"%(self.wlan)]
+      if action == "create_wlan":
+         self._require(action, wlan=self.wlan, wlanID=self.wlanID)
+         if is_9800:
+            return True, ["wlan %s %s %s"%(self.wlan, self.wlanID, self.wlan), "shutdown", "no security wpa",
+                          "no security wpa wpa2", "no security wpa wpa2 ciphers aes", "no security wpa akm dot1x",
+                          "no shutdown"]
+         return False, ["config wlan create %s %s %s"%(self.wlanID, self.wlan, self.wlan)]
+      if action == "delete_wlan":
+         if is_9800:
+            self._require(action, wlan=self.wlan)
+            return True, ["no wlan %s"%(self.wlan)]
+         self._require(action, wlanID=self.wlanID)
+         return False, ["config wlan delete %s"%(self.wlanID)]
+      if action in ("enable_wlan", "disable_wlan"):
+         shutdown = "no shutdown" if action == "enable_wlan" else "shutdown"
+         if is_9800:
+            self._require(action, wlan=self.wlan)
+            return True, ["wlan %s"%(self.wlan), shutdown]
+         self._require(action, wlanID=self.wlanID)
+         return False, ["config wlan %s %s"%(action.split("_")[0], self.wlanID)]
+      if action == "wlan_qos":
+         self._require(action, wlanID=self.wlanID)
+         return False, ["config wlan qos %s %s"%(self.wlanID, value)]
+      raise ValueError("unknown action %s"%(action))
+
+   def _read(self, action):
+      """
+      :return: output of a READ_ACTIONS action, for ControllerState
+      """
+      return "\n".join(self.session.send(command) for command in self.commands(action)[1])
+
+   def run(self, action, value=None):
+      """
+      :return: CommandResult of one action
+      """
+      return self.transaction([(action, value)])[0]
+
+   def transaction(self, actions):
+      """
+      Send several actions in one session, in order. Consecutive config mode actions share
+      one config mode visit.
+      :param actions: (action, value) pairs, e.g. [("disable", None), ("txPower", 3)]
+      :return: one CommandResult per action
+      """
+      planned = [(action, value) + self.commands(action, value) for action, value in actions]
+      results = []
+      position = 0
+      while position < len(planned):
+         config_mode = planned[position][2]
+         end = position
+         while (end < len(planned)) and (planned[end][2] == config_mode):
+            end += 1
+         group = planned[position:end]
+         commands = [command for _, _, _, action_commands in group for command in action_commands]
+         if len(commands) == 0:
+            outputs = []
+         elif config_mode:
+            outputs = self.session.config(commands)
+         else:
+            outputs = [self.session.send(command) for command in commands]
+         for action, value, _, action_commands in group:
+            output = "\n".join(text for text in outputs[:len(action_commands)] if text)
+            outputs = outputs[len(action_commands):]
+            result = CommandResult(action, action_commands, output)
+            if action in ControllerState.PARSERS:
+               if result.ok:
+                  self.state.update(action, output)
+            elif (action not in READ_ACTIONS) and not ((action == "cmd") and str(value).startswith("show")):
+               self.state.invalidate()
+            results.append(result)
+         position = end
+      return results
+
+   def reconfigure(self, tx_power=None, channel=None, bandwidth=None):
+      """
+      Disable the AP's radio, apply the settings given and enable it again, in one session.
+      :return: one CommandResult per step
+      """
+      actions = [("disable", None), ("manual", None)]
+      if tx_power is not None:
+         actions.append(("txPower", tx_power))
+      if channel is not None:
+         actions.append(("channel", channel))
+      if bandwidth is not None:
+         actions.append(("bandwidth", bandwidth))
+      actions.append(("enable", None))
+      return self.transaction(actions)
+
+   def summary(self):
+      return self.run("summary")
+
+   def advanced(self):
+      return self.run("advanced")
+
+   def show(self, value):
+      return self.run("show", value)
+
+   def cmd(self, value):
+      return self.run("cmd", value)
+
+   def country(self, value):
+      return self.run("country", value)
+
+   def ap_country(self, value):
+      return self.run("ap_country", value)
+
+   def manual(self):
+      return self.run("manual")
+
+   def auto(self):
+      return self.run("auto")
+
+   def enable(self):
+      return self.run("enable")
+
+   def disable(self):
+      return self.run("disable")
+
+   def tx_power(self, value):
+      return self.run("txPower", value)
+
+   def bandwidth(self, value):
+      return self.run("bandwidth", value)
+
+   def channel(self, value):
+      return self.run("channel", value)
+
+   def ap_channel(self):
+      return self.run("ap_channel")
+
+   def disable_network(self, dot11="5ghz"):
+      return self.run("disable_network_%s"%(dot11))
+
+   def enable_network(self, dot11="5ghz"):
+      return self.run("enable_network_%s"%(dot11))
+
+   def wireless_tag_policy(self):
+      return self.run("wireless_tag_policy")
+
+   def debug_disable_all(self):
+      return self.run("debug_disable_all")
+
+   def no_logging_console(self):
+      return self.run("no_logging_console")
+
+   def line_console_0(self):
+      return self.run("line_console_0")
+
+   def show_wlan_summary(self):
+      return self.run("show_wlan_summary")
+
+   def no_wlan(self):
+      return self.run("no_wlan")
+
+   def create_wlan(self):
+      return self.run("create_wlan")
+
+   def delete_wlan(self):
+      return self.run("delete_wlan")
+
+   def enable_wlan(self):
+      return self.run("enable_wlan")
+
+   def disable_wlan(self):
+      return self.run("disable_wlan")
+
+   def wlan_qos(self, value):
+      return self.run("wlan_qos", value)
+
+
 def main():
    parser = argparse.ArgumentParser(description="Cisco AP Control Script")
    parser.add_argument("-d", "--dest",    type=str, help="address of the cisco controller")
@@ -111,8 +992,10 @@ def main():
       "cmd", "txPower", "bandwidth", "manual", "auto","no_wlan","show_wlan_summary",
       "ap_channel", "channel", "show", "create_wlan", "enable_wlan", "disable_wlan", "wlan_qos",
       "disable_network_5ghz","disable_network_24ghz","enable_network_5ghz","enable_network_24ghz",
-      "wireless_tag_policy"])
+      "wireless_tag_policy", "delete_wlan"])
    parser.add_argument("--value",       type=str, help="set value")
+   parser.add_argument("--daemon",      type=str, help="log in once and serve commands on this Unix socket until shut down")
+   parser.add_argument("--socket",      type=str, help="run the action through the session daemon on this Unix socket")
 
    args = None
    try:
@@ -124,12 +1007,6 @@ def main():
       user = args.user
       passwd = args.passwd
       logfile = args.log
-      if (args.band != None):
-          band = args.band
-          if (band == "abgn"):
-              band = "-abgn"
-      else:
-          band = "a"
    except Exception as e:
       logging.exception(e)
       exit(2)
@@ -153,1224 +1030,40 @@ def main():
    print("cisco series {}".format(args.series))
    print("scheme {}".format(args.scheme))
 
-   try:
-      if (scheme == "serial"):
-         #eggspect = pexpect.fdpexpect.fdspan(telcon, logfile=sys.stdout.buffer)
-         import serial
-         from pexpect_serial import SerialSpawn
-         with serial.Serial('/dev/ttyUSB0', 115200, timeout=5) as ser:
-            egg = SerialSpawn(ser);
-            egg.logfile = FileAdapter(logg)
-            print("logg {}".format(logg))
-            egg.sendline(NL)
-            time.sleep(0.1)
-            egg.expect('login:', timeout=3)
-            time.sleep(0.1)
-            egg.sendline(user)
-            time.sleep(0.1)
-            egg.expect('ssword:')
-
-      elif (scheme == "ssh"):
-         if (port is None):
-            port = 22
-         cmd = "ssh -p%d %s@%s"%(port, user, host)
-         logg.info("Spawn: "+cmd+NL)
-         egg = pexpect.spawn(cmd)
-         #egg.logfile_read = sys.stdout.buffer
-         egg.logfile = FileAdapter(logg)
-         print("logg {}".format(logg))
-         time.sleep(0.1)
-         logged_in_9800 = False
-         loop_count = 0
-         found_escape = False
-         #9800 series
-         if args.series == "9800":
-            while logged_in_9800 == False and loop_count <= 4:
-               loop_count += 1
-               #logg.info("9800 establishing Telnet egg {} ".format(egg))
-               #sleep(2)
-               egg.sendline(CR)
-               sleep(0.4)
-               try:
-                  i = egg.expect_exact(["Escape character is '^]'.","WLC>","WLC#","User:","Password:","WLC(config)#","Bad secrets",pexpect.TIMEOUT],timeout=2)
-               except Exception as e:
-                  logg.info('connection failed. or refused Connection open by other process')
-                  logging.exception(e)
-                  exit(1)
-
-               if i == 0:
-                  logg.info("9800 found Escape character is '^] i:{} before: {} after: {}".format(i,egg.before,egg.after))
-                  #egg.sendline(CR)
-                  found_escape = True
-                  sleep(0.1)
-                  j = egg.expect_exact(["WLC>","WLC#","User:","Password:","WLC(config)#",pexpect.TIMEOUT],timeout=3)
-                  sleep(0.1)
-                  if j == 0:
-                     logg.info("9800 found WLC>  will elevate loging i:{} j:{} before {} after {}".format(i,j,egg.before,egg.after))
-                     egg.sendline("en")
-                     sleep(0.1)
-                     k = egg.expect_exact(["Password:",pexpect.TIMEOUT], timeout=2)
-                     if k == 0:
-                        logg.info("9800 received password prompt will send password: {} i:{} j:{} k:{} before {} after {}".format(args.passwd,i,j,k,egg.before,egg.after))
-                        egg.sendline(args.passwd)
-                        sleep(0.1)
-                        l = egg.expect_exact(["WLC#",pexpect.TIMEOUT],timeout=2)
-                        if l == 0:
-                           logg.info("9800 Successfully received # prompt i:{} j:{} k:{} l:{}".format(i,j,k,l))
-                           logged_in_9800 = True
-                        if l == 1:
-                           logg.info("9800 Timed out waiting for # prompt i:{} j:{} k:{} l:{} before {} after {}".format(i,j,k,l,egg.before,egg.after))
-                     if k == 1:
-                        logg.info("8900 received timeout after looking for password: prompt i:{} j:{} k:{} before {} after {}".format(i,j,k,egg.before,egg.after))
-                  if j == 1:
-                     logg.info("9800 found # so logged in can start sending commands i:{} j:{}".format(i,j))
-                     logged_in_9800 = True
-                  if j == 2:
-                     logg.info("9800 found User: will put in args.user {} i:{} j:{}".format(args.user,i,j))
-                     egg.sendline(args.user)
-                     sleep(0.1)
-                     k = egg.expect_exact(["Password:",pexpect.TIMEOUT], timeout=2)
-                     if k == 0:
-                        logg.info("9800 received password prompt after sending User, sending password: {} i:{} j:{} k:{}".format(args.passwd,i,j,k))
-                        egg.sendline(args.passwd)
-                        sleep(0.1)
-                        l = egg.expect_exact(["WLC#",pexpect.TIMEOUT],timeout=2)
-                        if l == 0:
-                           logg.info("8900 Successfully received # prompt i:{} j:{} k:{} l:{}".format(i,j,k,l))
-                           logged_in_9800 = True
-                        if l == 1:
-                           logg.info("9800 Timed out waiting for # prompt i:{} j:{} k:{} l:{} before {} after {}".format(i,j,k,l,egg.before,egg.after))
-                     if k == 1:
-                        logg.info("9800 received timeout after looking for password after sending user i:{} j:{} k:{} before {} after {}".format(i,j,k,egg.before,egg.after))
-                  if j == 3:
-                     sleep(0.1)
-                     logg.info("9800 received Password prompt will send password {} i:{} j:{} before {} after {}".format(args.passwd,i,j,egg.before,egg.after))
-                     egg.sendline(args.passwd)
-                     sleep(0.1)
-                     k = egg.expect(["WLC#",pexpect.TIMEOUT],timeout=2)
-                     if k == 0:
-                        logg.info("8900 Successfully received # prompt i:{} j:{} k:{} before {} after {}".format(i,j,k,egg.before,egg.after))
-                        logged_in_9800 = True
-                     if k == 1:
-                        logg.info("9800 Timed out waiting for # prompt i:{} j:{} k:{} before {} after {}".format(i,j,k,egg.before,egg.after))
-                  if j == 4:
-                     logg.info("9800 received WLC(config)# prompt doing some cleanup")
-                     egg.sendline("exit")
-                     sleep(0.1)
-                     k = egg.expect_exact(["WLC>","WLC#","User:","Password:",pexpect.TIMEOUT],timeout=3)
-                     sleep(0.1)
-                     if k == 0:
-                        logg.info("9800 found WLC>  will elevate loging i:{} j:{} k:{} before {} after {}".format(i,j,k,egg.before,egg.after))
-                        egg.sendline("en")
-                        sleep(0.1)
-                        l = egg.expect_exact(["Password:",pexpect.TIMEOUT], timeout=2)
-                        if l == 0:
-                           logg.info("9800 received password prompt will send password: {}  i:{} j:{} k:{} l:{} before {} after {}".format(args.passwd,i,j,k,l,egg.before,egg.after))
-                           egg.sendline(args.passwd)
-                           sleep(0.1)
-                           m = egg.expect_exact(["WLC#",pexpect.TIMEOUT],timeout=2)
-                           if m == 0:
-                              logg.info("9800 Successfully received # prompt i:{} j:{} k:{} l:{} m:{}".format(i,j,k,l,m))
-                              logged_in_9800 = True
-                           if m == 1:
-                              logg.info("9800 Timed out waiting for # prompt i:{} j:{} k:{} l:{} m:{} before {} after {}".format(i,j,k,l,m,egg.before,egg.after))
-                        if l == 1:
-                           logg.info("8900 received timeout after looking for password: prompt i:{} j:{} k:{} l:{} before {} after {}".format(i,j,k,l,egg.before,egg.after))
-                     if k == 1:
-                        logg.info("9800 found # so logged in can start sending commands i:{} j:{} k:{}".format(i,j,k))
-                        logged_in_9800 = True
-                     if k == 2:
-                        logg.info("9800 found User: will put in args.user {}  i:{} j:{} k:{}".format(args.user,i,j,k))
-                        egg.sendline(args.user)
-                        sleep(0.1)
-                        l = egg.expect_exact(["Password:",pexpect.TIMEOUT], timeout=2)
-                        if l == 0:
-                           logg.info("9800 received password prompt after sending User, sending password: {} i:{} j:{} k:{} l:{}".format(args.passwd,i,j,k,l))
-                           egg.sendline(args.passwd)
-                           sleep(0.1)
-                           m = egg.expect(["WLC#",pexpect.TIMEOUT],timeout=2)
-                           if m == 0:
-                              logg.info("8900 Successfully received # prompt i:{} j:{} k:{} l:{} m:{}".format(i,j,k,l,m))
-                              logged_in_9800 = True
-                           if m == 1:
-                              logg.info("9800 Timed out waiting for # prompt i:{} j:{} k:{} l:{} m:{} before {} after {}".format(i,j,k,l,m,egg.before,egg.after))
-                        if l == 1:
-                           logg.info("9800 received timeout after looking for password after sending user i:{} j:{} k:{} l:{} before {} after {}".format(i,j,k,l,egg.before,egg.after))
-                     if k == 3:
-                        sleep(0.1)
-                        logg.info("9800 received Password prompt will send password {} i:{} j:{} k:{}  before {} after {}".format(args.passwd,i,j,k,egg.before,egg.after))
-                        egg.sendline(args.passwd)
-                        sleep(0.1)
-                        l = egg.expect(["WLC#",pexpect.TIMEOUT],timeout=2)
-                        if l == 0:
-                           logg.info("8900 Successfully received # prompt i:{} j:{} k:{} l:{} before {} after {}".format(i,j,k,l,egg.before,egg.after))
-                           logged_in_9800 = True
-                        if l == 1:
-                           logg.info("9800 Timed out waiting for # prompt i:{} j:{} k:{} l:{} before {} after {}".format(i,j,k,l,egg.before,egg.after))
-                     if k == 4:
-                        logg.info("9800 timed out looking WLC>,  WLC#, User:, Password:  i:{} j:{} k:{} before {} after {}".format(i,j,k,egg.before,egg.after))
-                        logg.info("9800 Timed out waiting for initial prompt send logout loop_count: {} i: {} j: {} k:{} before {} after {}".format(loop_count, i, j, k, egg.before,egg.after))
-                        logg.info("9800  Closing the connection and try to re-establish, ")
-                        egg.close(force = True)
-                        sleep(1)
-                        egg.close(force = True)
-                        sleep(1)
-
-                        # re establish ssh
-                        cmd = "ssh -p%d %s@%s"%(port, user, host)
-                        logg.info("Spawn: "+cmd+NL)
-                        egg = pexpect.spawn(cmd)
-                        egg.logfile = FileAdapter(logg)
-                        time.sleep(2)
-                        logged_in_9800 = False
-                        found_escape = False
-
-                  if j == 5:
-                     logg.info("9800 timed out looking for WLC>,WLC#,User:,Password:,WLC(config)# loop_count {} i {} j {}  before {} after {}".format(loop_count,i,j,egg.before,egg.after))
-                     logg.info("9800  Closing the connection and try to re-establish loop_count {} i {} j {}".format(loop_count,i,j))
-                     egg.close(force = True)
-                     sleep(1)
-                     egg.close(force = True)
-                     sleep(1)
-
-                     # re establish ssh
-                     cmd = "ssh -p%d %s@%s"%(port, user, host)
-                     logg.info("Spawn: "+cmd+NL)
-                     egg = pexpect.spawn(cmd)
-                     egg.logfile = FileAdapter(logg)
-                     time.sleep(2)
-                     logged_in_9800 = False
-                     found_escape = False
-               
-               if i == 1:
-                  logg.info("9800 found WLC>  will elevate loging i:{} before {} after {}".format(i,egg.before,egg.after))
-                  egg.sendline("en")
-                  sleep(0.1)
-                  j = egg.expect_exact(["Password:",pexpect.TIMEOUT], timeout=2)
-                  if j == 0:
-                     logg.info("9800 received password prompt will send password: {} i:{} j:{} before {} after {}".format(args.passwd,i,j, egg.before,egg.after))
-                     egg.sendline(args.passwd)
-                     sleep(0.1)
-                     k = egg.expect(["WLC#",pexpect.TIMEOUT],timeout=2)
-                     if k == 0:
-                        logg.info("9800 Successfully received # prompt i:{} j:{} k:{} before {} after {}".format(i,j,k, egg.before,egg.after))
-                        logged_in_9800 = True
-                     if k == 1:
-                        logg.info("9800 Timed out waiting for # prompt i:{} j:{} k:{} before {} after {}".format(i,j,k,egg.before,egg.after))
-                  if j == 1:
-                     logg.info("8900 received timeout after looking for password: prompt  i:{} j:{} k:{}  before {} after {}".format(i,j,k,egg.before,egg.after))
-               
-               if i == 2:
-                  logg.info("9800 found WLC# This implies in incorrect logout or killed prior run test i:{} before {} after {}".format(i,egg.before,egg.after))
-                  logged_in_9800 = True
-
-               if i == 3:
-                  logg.info("9800 found User will put in args.user {} i:{} j:{} before {} after {}".format(args.user,i,j,egg.before,egg.after))
-                  egg.sendline(args.user)
-                  sleep(0.1)
-                  j = egg.expect_exact(["Password:",pexpect.TIMEOUT], timeout=2)
-                  if j == 0:
-                     logg.info("9800 received password prompt after sending User, sending password: {} i:{} j:{} before {} after {}".format(args.passwd,i,k,egg.before,egg.after))
-                     egg.sendline(args.passwd)
-                     sleep(0.1)
-                     l = egg.expect(["WLC#",pexpect.TIMEOUT],timeout=2)
-                     if k == 0:
-                        logg.info("8900 Successfully received # prompt i:{} j:{} k:{}".format(i,j,k))
-                        logged_in_9800 = True
-                     if k == 1:
-                        logg.info("9800 Timed out waiting for # prompt i:{} j:{} k:{} before {} after {}".format(i,j,k,egg.before,egg.after))
-                  if j == 1:
-                     logg.info("9800 received timeout after looking for password after sending user i:{} j:{} k:{} before {} after {}".format(i,j,k,egg.before,egg.after))
-
-               if i == 4:
-                  logg.info("9800 received password prompt will send password: {}  i:{} before {} after {}".format(args.passwd,i,egg.before,egg.after))
-                  egg.sendline(args.passwd)
-                  sleep(0.1)
-                  j = egg.expect(["WLC#",pexpect.TIMEOUT],timeout=2)
-                  if j == 0:
-                     logg.info("9800 Successfully received # prompt i:{} j:{} before {} after {}".format(i,j,egg.before,egg.after))
-                     logged_in_9800 = True
-                  if j == 1:
-                     logg.info("9800 Timed out waiting for # prompt i:{} j:{} before {} after {}".format(i,j,egg.before,egg.after))
-
-               if i == 5:
-                  logg.info("9800 received WLC(config)# prompt doing some cleanup")
-                  egg.sendline("exit")
-                  sleep(0.1)
-                  j = egg.expect_exact(["WLC>","WLC#","User:","Password:",pexpect.TIMEOUT],timeout=3)
-                  sleep(0.1)
-                  if j == 0:
-                     logg.info("9800 found WLC>  will elevate loging i:{} j:{} before {} after {}".format(i,j,egg.before,egg.after))
-                     egg.sendline("en")
-                     sleep(0.1)
-                     k = egg.expect_exact(["Password:",pexpect.TIMEOUT], timeout=2)
-                     if k == 0:
-                        logg.info("9800 received password prompt will send password: {}  i:{} j:{} k:{} before {} after {}".format(args.passwd,i,j,k,egg.before,egg.after))
-                        egg.sendline(args.passwd)
-                        sleep(0.1)
-                        l = egg.expect_exact(["WLC#",pexpect.TIMEOUT],timeout=2)
-                        if l == 0:
-                           logg.info("9800 Successfully received # prompt i:{} j:{} k:{} l:{}".format(i,j,k,l))
-                           logged_in_9800 = True
-                        if l == 1:
-                           logg.info("9800 Timed out waiting for # prompt i:{} j:{} k:{} l:{} before {} after {}".format(i,j,k,l,egg.before,egg.after))
-                     if k == 1:
-                        logg.info("8900 received timeout after looking for password: prompt i:{} j:{} k:{} before {} after {}".format(i,j,k,egg.before,egg.after))
-                  if j == 1:
-                     logg.info("9800 found # so logged in can start sending commands i:{} j:{}".format(i,j))
-                     logged_in_9800 = True
-                  if j == 2:
-                     logg.info("9800 found User: will put in args.user {}  i:{} j:{}".format(args.user,i,j))
-                     egg.sendline(args.user)
-                     sleep(0.1)
-                     k = egg.expect_exact(["Password:",pexpect.TIMEOUT], timeout=2)
-                     if k == 0:
-                        logg.info("9800 received password prompt after sending User, sending password: {} i:{} j:{} k:{}".format(args.passwd,i,j,k))
-                        egg.sendline(args.passwd)
-                        sleep(0.1)
-                        l = egg.expect(["WLC#",pexpect.TIMEOUT],timeout=2)
-                        if l == 0:
-                           logg.info("8900 Successfully received # prompt i:{} j:{} k:{} l:{}".format(i,j,k,l))
-                           logged_in_9800 = True
-                        if l == 1:
-                           logg.info("9800 Timed out waiting for # prompt i:{} j:{} k:{} l:{} before {} after {}".format(i,j,k,l,egg.before,egg.after))
-                     if k == 1:
-                        logg.info("9800 received timeout after looking for password after sending user i:{} j:{} k:{} before {} after {}".format(i,j,k,egg.before,egg.after))
-                  if j == 3:
-                     sleep(0.1)
-                     logg.info("9800 received Password prompt will send password {} i:{} j:{}  before {} after {}".format(args.passwd,i,j,egg.before,egg.after))
-                     egg.sendline(args.passwd)
-                     sleep(0.1)
-                     k = egg.expect(["WLC#",pexpect.TIMEOUT],timeout=2)
-                     if k == 0:
-                        logg.info("8900 Successfully received # prompt i:{} j:{} k:{} before {} after {}".format(i,j,k,egg.before,egg.after))
-                        logged_in_9800 = True
-                     if k == 1:
-                        logg.info("9800 Timed out waiting for # prompt i:{} j:{} k:{} before {} after {}".format(i,j,k,egg.before,egg.after))
-                  if j == 4:
-                     logg.info("9800 timed out looking WLC>,  WLC#, User:, Password:  i:{} j:{} before {} after {}".format(i,j,egg.before,egg.after))
-                     logg.info("9800 Timed out waiting for initial prompt send logout loop_count: {} i: {} j: {} before {} after {}".format(loop_count, i, j, egg.before,egg.after))
-                     logg.info("9800  Closing the connection and try to re-establish, ")
-                     egg.close(force = True)
-                     sleep(1)
-                     egg.close(force = True)
-                     sleep(1)
-
-                     # re establish ssh
-                     cmd = "ssh -p%d %s@%s"%(port, user, host)
-                     logg.info("Spawn: "+cmd+NL)
-                     egg = pexpect.spawn(cmd)
-                     egg.logfile = FileAdapter(logg)
-                     time.sleep(2)
-                     logged_in_9800 = False
-                     found_escape = False
-               if i == 6:
-                  logg.info("9800 recieved Bad secrets, to many password attempts i: {} before {} after {}".format(i, egg.before,egg.after))
-                  egg.sendline(CR)
-                  sleep(0.2)
-               if i == 7:
-                  logg.info("9800 Timed out waiting for initial prompt send logout loop_count: {} i: {} before {} after {}".format(loop_count, i, egg.before,egg.after))
-                  logg.info("9800  Closing the connection and try to re-establish, ")
-                  egg.close(force = True)
-                  sleep(1)
-                  egg.close(force = True)
-                  sleep(1)
-
-                  # re establish ssh
-                  cmd = "ssh -p%d %s@%s"%(port, user, host)
-                  logg.info("Spawn: "+cmd+NL)
-                  egg = pexpect.spawn(cmd)
-                  egg.logfile = FileAdapter(logg)
-                  time.sleep(2)
-                  logged_in_9800 = False
-                  found_escape = False
-
-            if loop_count >= 6:
-               if found_escape == True:
-                  logg.info("9800 initial prompt and log messages interfering")
-                  logg.info("9800 will send escape to close telnet")
-                  egg.close(force = True)
-                  exit(1)
-               else:
-                  logg.info("9800 the telnet session may need to be cleared will try to send logout")
-                  egg.sendline("logout")
-                  logg.info("9800 did not find the initial escape... exiting")
-                  egg.close(force = True)
-                  exit(1)
-
-
-         # 3504 series
-         else:
-            i = egg.expect(["ssword:", "continue connecting (yes/no)?"], timeout=3)
-            time.sleep(0.1)
-            if i == 1:
-               egg.sendline('yes')
-               sleep(0.1)
-               egg.expect('ssword:')
-            sleep(0.1)
-            egg.sendline(passwd)
-            sleep(0.1)
+   if (args.daemon is not None):
+      session = CiscoSession(host, user=user, passwd=passwd, scheme=scheme, port=port, series=args.series,
+                             prompt=args.prompt, logg=logg,
+                             tty=args.tty if args.tty is not None else "/dev/ttyUSB0")
+      logg.info("session daemon for {} on {}".format(host, args.daemon))
+      serve_session(session, args.daemon)
+      return
 
-      elif (scheme == "telnet"):
-         sleep(1)
-         if (port is None):
-            port = 23
-         cmd = "telnet %s %d"%(host, port)
-         logg.info("Spawn: "+cmd+NL)
-         egg = pexpect.spawn(cmd)
-         egg.logfile = FileAdapter(logg)
-         time.sleep(2)
-         logged_in_9800 = False
-         loop_count = 0
-         found_escape = False
-         CONFIG_I = "%SYS-5-CONFIG_I: Configured from console by console"
-         PRESS_RETURN = "Press RETURN to get started."
-
-         #9800 series
-         if args.series == "9800":
-            while logged_in_9800 == False and loop_count <= 7:
-               loop_count += 1
-               logg.info("9800 loop_count {}".format(loop_count))
-               #logg.info("9800 establishing Telnet egg {} ".format(egg))
-               #sleep(2)
-               egg.sendline(CR)
-               sleep(0.4)
-               try:
-                  i = egg.expect_exact(["Escape character is '^]'.","WLC>","WLC#","User:","Password:","WLC(config)#","Bad secrets", PRESS_RETURN, CONFIG_I,pexpect.TIMEOUT],timeout=2)
-               except Exception as e:
-                  logg.info('connection failed. or refused Connection open by other process')
-                  logg.exception(e)
-                  exit(1)
-
-               if i == 0:
-                  logg.info("9800 found Escape character is '^] i:{} before: {} after: {}".format(i,egg.before,egg.after))
-                  #egg.sendline(CR)
-                  found_escape = True
-                  sleep(0.1)
-                  j = egg.expect_exact(["WLC>","WLC#","User:","Password:",pexpect.TIMEOUT],timeout=3)
-                  sleep(0.1)
-                  if j == 0:
-                     logg.info("9800 found WLC>  will elevate loging i:{} j:{} before {} after {}".format(i,j,egg.before,egg.after))
-                     egg.sendline("en")
-                     sleep(0.1)
-                     k = egg.expect_exact(["Password:",pexpect.TIMEOUT], timeout=2)
-                     if k == 0:
-                        logg.info("9800 received password prompt will send password: {} i:{} j:{} k:{} before {} after {}".format(args.passwd,i,j,k,egg.before,egg.after))
-                        egg.sendline(args.passwd)
-                        sleep(0.1)
-                        l = egg.expect_exact(["WLC#",pexpect.TIMEOUT],timeout=2)
-                        if l == 0:
-                           logg.info("9800 Successfully received WLC# prompt i:{} j:{} k:{} l:{}".format(i,j,k,l))
-                           logged_in_9800 = True
-                        if l == 1:
-                           logg.info("9800 Timed out waiting for # prompt i:{} j:{} k:{} l:{} before {} after {}".format(i,j,k,l,egg.before,egg.after))
-                     if k == 1:
-                        logg.info("8900 received timeout after looking for password: prompt i:{} j:{} k:{} before {} after {}".format(i,j,k,egg.before,egg.after))
-                  if j == 1:
-                     logg.info("9800 found # so logged in can start sending commands i:{} j:{}".format(i,j))
-                     logged_in_9800 = True
-                  if j == 2:
-                     logg.info("9800 found User: will put in args.user {} i:{} j:{}".format(args.user,i,j))
-                     egg.sendline(args.user)
-                     sleep(0.1)
-                     k = egg.expect_exact(["Password:",pexpect.TIMEOUT], timeout=2)
-                     if k == 0:
-                        logg.info("9800 received password prompt after sending User, sending password: {} i:{} j:{} k:{}".format(args.passwd,i,j,k))
-                        egg.sendline(args.passwd)
-                        sleep(0.1)
-                        l = egg.expect_exact(["WLC#",pexpect.TIMEOUT],timeout=2)
-                        if l == 0:
-                           logg.info("8900 Successfully received # prompt i:{} j:{} k:{} l:{}".format(i,j,k,l))
-                           logged_in_9800 = True
-                        if l == 1:
-                           logg.info("9800 Timed out waiting for # prompt i:{} j:{} k:{} l:{} before {} after {}".format(i,j,k,l,egg.before,egg.after))
-                     if k == 1:
-                        logg.info("9800 received timeout after looking for password after sending user i:{} j:{} k:{} before {} after {}".format(i,j,k,egg.before,egg.after))
-                  if j == 3:
-                     sleep(0.1)
-                     logg.info("9800 received Password prompt will send password {} i:{} j:{} before {} after {}".format(args.passwd,i,j,egg.before,egg.after))
-                     egg.sendline(args.passwd)
-                     sleep(0.1)
-                     k = egg.expect(["WLC#",pexpect.TIMEOUT],timeout=2)
-                     if k == 0:
-                        logg.info("8900 Successfully received # prompt i:{} j:{} k:{} before {} after {}".format(i,j,k,egg.before,egg.after))
-                        logged_in_9800 = True
-                     if k == 1:
-                        logg.info("9800 Timed out waiting for # prompt i:{} j:{} k:{} before {} after {}".format(i,j,k,egg.before,egg.after))
-                  if j == 4:
-                     logg.info("9800 received WLC(config)# prompt doing some cleanup")
-                     egg.sendline("exit")
-                     sleep(0.1)
-                     k = egg.expect_exact(["WLC>","WLC#","User:","Password:",pexpect.TIMEOUT],timeout=3)
-                     sleep(0.1)
-                     if k == 0:
-                        logg.info("9800 found WLC>  will elevate loging i:{} j:{} k:{} before {} after {}".format(i,j,k,egg.before,egg.after))
-                        egg.sendline("en")
-                        sleep(0.1)
-                        l = egg.expect_exact(["Password:",pexpect.TIMEOUT], timeout=2)
-                        if l == 0:
-                           logg.info("9800 received password prompt will send password: {}  i:{} j:{} k:{} l:{} before {} after {}".format(args.passwd,i,j,k,l,egg.before,egg.after))
-                           egg.sendline(args.passwd)
-                           sleep(0.1)
-                           m = egg.expect_exact(["WLC#",pexpect.TIMEOUT],timeout=2)
-                           if m == 0:
-                              logg.info("9800 Successfully received # prompt i:{} j:{} k:{} l:{} m:{}".format(i,j,k,l,m))
-                              logged_in_9800 = True
-                           if m == 1:
-                              logg.info("9800 Timed out waiting for # prompt i:{} j:{} k:{} l:{} m:{} before {} after {}".format(i,j,k,l,m,egg.before,egg.after))
-                        if l == 1:
-                           logg.info("8900 received timeout after looking for password: prompt i:{} j:{} k:{} l:{} before {} after {}".format(i,j,k,l,egg.before,egg.after))
-                     if k == 1:
-                        logg.info("9800 found # so logged in can start sending commands i:{} j:{} k:{}".format(i,j,k))
-                        logged_in_9800 = True
-                     if k == 2:
-                        logg.info("9800 found User: will put in args.user {}  i:{} j:{} k:{}".format(args.user,i,j,k))
-                        egg.sendline(args.user)
-                        sleep(0.1)
-                        l = egg.expect_exact(["Password:",pexpect.TIMEOUT], timeout=2)
-                        if l == 0:
-                           logg.info("9800 received password prompt after sending User, sending password: {} i:{} j:{} k:{} l:{}".format(args.passwd,i,j,k,l))
-                           egg.sendline(args.passwd)
-                           sleep(0.1)
-                           m = egg.expect(["WLC#",pexpect.TIMEOUT],timeout=2)
-                           if m == 0:
-                              logg.info("8900 Successfully received # prompt i:{} j:{} k:{} l:{} m:{}".format(i,j,k,l,m))
-                              logged_in_9800 = True
-                           if m == 1:
-                              logg.info("9800 Timed out waiting for # prompt i:{} j:{} k:{} l:{} m:{} before {} after {}".format(i,j,k,l,m,egg.before,egg.after))
-                        if l == 1:
-                           logg.info("9800 received timeout after looking for password after sending user i:{} j:{} k:{} l:{} before {} after {}".format(i,j,k,l,egg.before,egg.after))
-                     if k == 3:
-                        sleep(0.1)
-                        logg.info("9800 received Password prompt will send password {} i:{} j:{} k:{}  before {} after {}".format(args.passwd,i,j,k,egg.before,egg.after))
-                        egg.sendline(args.passwd)
-                        sleep(0.1)
-                        l = egg.expect(["WLC#",pexpect.TIMEOUT],timeout=2)
-                        if l == 0:
-                           logg.info("8900 Successfully received # prompt i:{} j:{} k:{} l:{} before {} after {}".format(i,j,k,l,egg.before,egg.after))
-                           logged_in_9800 = True
-                        if l == 1:
-                           logg.info("9800 Timed out waiting for # prompt i:{} j:{} k:{} l:{} before {} after {}".format(i,j,k,l,egg.before,egg.after))
-                     if k == 4:
-                        logg.info("9800 timed out looking WLC>,  WLC#, User:, Password:  i:{} j:{} k:{} before {} after {}".format(i,j,k,egg.before,egg.after))
-                        logg.info("9800 Timed out waiting for initial prompt send logout loop_count: {} i: {} j: {} k:{} before {} after {}".format(loop_count, i, j, k, egg.before,egg.after))
-                        logg.info("9800  Closing the connection and try to re-establish, ")
-                        egg.close(force = True)
-                        sleep(1)
-                        egg.close(force = True)
-                        sleep(1)
-
-                        # re establish telnet
-                        cmd = "telnet %s %d"%(host, port)
-                        logg.info("Spawn: "+cmd+NL)
-                        egg = pexpect.spawn(cmd)
-                        egg.logfile = FileAdapter(logg)
-                        time.sleep(2)
-                        logged_in_9800 = False
-                        found_escape = False
-
-                  if j == 5:
-                     logg.info("9800 timed out looking for WLC>,WLC#,User:,Password: loop_count {} i {} j {}  before {} after {}".format(loop_count,i,j,egg.before,egg.after))
-                     logg.info("9800  Closing the connection and try to re-establish loop_count {} i {} j {}".format(loop_count,i,j))
-                     egg.close(force = True)
-                     sleep(1)
-                     egg.close(force = True)
-                     sleep(1)
-
-               
-               if i == 1:
-                  logg.info("9800 found WLC>  will elevate loging i:{} before {} after {}".format(i,egg.before,egg.after))
-                  egg.sendline("en")
-                  sleep(0.1)
-                  j = egg.expect_exact(["Password:",pexpect.TIMEOUT], timeout=2)
-                  if j == 0:
-                     logg.info("9800 received password prompt will send password: {} i:{} j:{} before {} after {}".format(args.passwd,i,j, egg.before,egg.after))
-                     egg.sendline(args.passwd)
-                     sleep(0.1)
-                     k = egg.expect(["WLC#",pexpect.TIMEOUT],timeout=2)
-                     if k == 0:
-                        logg.info("9800 Successfully received # prompt i:{} j:{} k:{} before {} after {}".format(i,j,k, egg.before,egg.after))
-                        logged_in_9800 = True
-                     if k == 1:
-                        logg.info("9800 Timed out waiting for # prompt i:{} j:{} k:{} before {} after {}".format(i,j,k,egg.before,egg.after))
-                  if j == 1:
-                     logg.info("8900 received timeout after looking for password: prompt  i:{} j:{} k:{}  before {} after {}".format(i,j,k,egg.before,egg.after))
-               
-               if i == 2:
-                  logg.info("9800 found WLC# This implies in incorrect logout or killed prior run test i:{} before {} after {}".format(i,egg.before,egg.after))
-                  logged_in_9800 = True
-
-               if i == 3:
-                  logg.info("9800 found User will put in args.user {} i:{} j:{} before {} after {}".format(args.user,i,j,egg.before,egg.after))
-                  egg.sendline(args.user)
-                  sleep(0.1)
-                  j = egg.expect_exact(["Password:",pexpect.TIMEOUT], timeout=2)
-                  if j == 0:
-                     logg.info("9800 received password prompt after sending User, sending password: {} i:{} j:{} before {} after {}".format(args.passwd,i,j,egg.before,egg.after))
-                     egg.sendline(args.passwd)
-                     sleep(0.1)
-                     l = egg.expect(["WLC#",pexpect.TIMEOUT],timeout=2)
-                     if k == 0:
-                        logg.info("8900 Successfully received # prompt i:{} j:{} k:{}".format(i,j,k))
-                        logged_in_9800 = True
-                     if k == 1:
-                        logg.info("9800 Timed out waiting for # prompt i:{} j:{} k:{} before {} after {}".format(i,j,k,egg.before,egg.after))
-                  if j == 1:
-                     logg.info("9800 received timeout after looking for password after sending user i:{} j:{} before {} after {}".format(i,j,egg.before,egg.after))
-
-               if i == 4:
-                  logg.info("9800 received password prompt will send password: {}   i:{}  before {} after {}".format(args.passwd,i, egg.before,egg.after))
-                  egg.sendline(args.passwd)
-                  sleep(0.1)
-                  j = egg.expect(["WLC#",pexpect.TIMEOUT],timeout=2)
-                  if j == 0:
-                     logg.info("9800 Successfully received # prompt i:{} j:{} before {} after {}".format(i,j,egg.before,egg.after))
-                     logged_in_9800 = True
-                  if j == 1:
-                     logg.info("9800 Timed out waiting for # prompt i:{} j:{} before {} after {}".format(i,j,egg.before,egg.after))
-
-               if i == 5:
-                  logg.info("9800 received WLC(config)# prompt doing some cleanup")
-                  egg.sendline("exit")
-                  sleep(0.3)
-                  j = egg.expect_exact(["WLC>","WLC#","User:","Password:",pexpect.TIMEOUT],timeout=3)
-                  sleep(0.1)
-                  if j == 0:
-                     logg.info("9800 found WLC>  will elevate loging i:{} j:{} before {} after {}".format(i,j,egg.before,egg.after))
-                     egg.sendline("en")
-                     sleep(0.1)
-                     k = egg.expect_exact(["Password:",pexpect.TIMEOUT], timeout=2)
-                     if k == 0:
-                        logg.info("9800 received password prompt will send password: {}  i:{} j:{} k:{} before {} after {}".format(args.passwd,i,j,k,egg.before,egg.after))
-                        egg.sendline(args.passwd)
-                        sleep(0.1)
-                        l = egg.expect_exact(["WLC#",pexpect.TIMEOUT],timeout=2)
-                        if l == 0:
-                           logg.info("9800 Successfully received # prompt i:{} j:{} k:{} l:{}".format(i,j,k,l))
-                           logged_in_9800 = True
-                        if l == 1:
-                           logg.info("9800 Timed out waiting for # prompt i:{} j:{} k:{} l:{} before {} after {}".format(i,j,k,l,egg.before,egg.after))
-                     if k == 1:
-                        logg.info("8900 received timeout after looking for password: prompt i:{} j:{} k:{} before {} after {}".format(i,j,k,egg.before,egg.after))
-                  if j == 1:
-                     logg.info("9800 found # so logged in can start sending commands i:{} j:{}".format(i,j))
-                     logged_in_9800 = True
-                  if j == 2:
-                     logg.info("9800 found User: will put in args.user {}  i:{} j:{}".format(args.user,i,j))
-                     egg.sendline(args.user)
-                     sleep(0.1)
-                     k = egg.expect_exact(["Password:",pexpect.TIMEOUT], timeout=2)
-                     if k == 0:
-                        logg.info("9800 received password prompt after sending User, sending password: {} i:{} j:{} k:{}".format(args.passwd,i,j,k))
-                        egg.sendline(args.passwd)
-                        sleep(0.1)
-                        l = egg.expect(["WLC#",pexpect.TIMEOUT],timeout=2)
-                        if l == 0:
-                           logg.info("8900 Successfully received # prompt i:{} j:{} k:{} l:{}".format(i,j,k,l))
-                           logged_in_9800 = True
-                        if l == 1:
-                           logg.info("9800 Timed out waiting for # prompt i:{} j:{} k:{} l:{} before {} after {}".format(i,j,k,l,egg.before,egg.after))
-                     if k == 1:
-                        logg.info("9800 received timeout after looking for password after sending user i:{} j:{} k:{} before {} after {}".format(i,j,k,egg.before,egg.after))
-                  if j == 3:
-                     sleep(0.1)
-                     logg.info("9800 received Password prompt will send password {} i:{} j:{}  before {} after {}".format(args.passwd,i,j,egg.before,egg.after))
-                     egg.sendline(args.passwd)
-                     sleep(0.1)
-                     k = egg.expect(["WLC#",pexpect.TIMEOUT],timeout=2)
-                     if k == 0:
-                        logg.info("8900 Successfully received # prompt i:{} j:{} k:{} before {} after {}".format(i,j,k,egg.before,egg.after))
-                        logged_in_9800 = True
-                     if k == 1:
-                        logg.info("9800 Timed out waiting for # prompt i:{} j:{} k:{} before {} after {}".format(i,j,k,egg.before,egg.after))
-                  if j == 4:
-                     logg.info("9800 timed out looking WLC>,  WLC#, User:, Password:  i:{} j:{} before {} after {}".format(i,j,egg.before,egg.after))
-                     logg.info("9800 Timed out waiting for initial prompt send logout loop_count: {} i: {} j: {} before {} after {}".format(loop_count, i, j, egg.before,egg.after))
-                     logg.info("9800  Closing the connection and try to re-establish, ")
-                     egg.close(force = True)
-                     sleep(1)
-                     egg.close(force = True)
-                     sleep(1)
-
-                     # re establish telnet
-                     cmd = "telnet %s %d"%(host, port)
-                     logg.info("Spawn: "+cmd+NL)
-                     egg = pexpect.spawn(cmd)
-                     egg.logfile = FileAdapter(logg)
-                     time.sleep(2)
-                     logged_in_9800 = False
-                     found_escape = False
-               if i == 6:
-                  logg.info("9800 recieved Bad secrets, to many password attempts i: {} before {} after {}".format(i, egg.before,egg.after))
-                  egg.sendline(CR)
-                  sleep(0.2)
-               if i == 7:
-                  logg.info("9800 received: {}  i: {} before {} after {}  send cr".format(PRESS_RETURN,i, egg.before, egg.after))
-                  egg.sentline(CR)
-                  sleep(0.2)
-               if i == 8:
-                  logg.info("9800 received: {} i: {} before {} after {} send cr".format(CONFIG_I,i, egg.before, egg.after))
-                  egg.sentline(CR)
-                  sleep(0.2)
-               if i == 9:
-                  logg.info("9800 Timed out waiting for initial prompt, Log message from controller interfering with expected prompts loop_count: {} i: {} before {} after {}".format(loop_count, i, egg.before,egg.after))
-                  logg.info("9800  Closing the connection and try to re-establish, ")
-                  egg.close(force = True)
-                  sleep(1)
-                  egg.close(force = True)
-                  sleep(1)
-
-                  # re establish telnet
-                  cmd = "telnet %s %d"%(host, port)
-                  logg.info("Spawn: "+cmd+NL)
-                  egg = pexpect.spawn(cmd)
-                  egg.logfile = FileAdapter(logg)
-                  time.sleep(2)
-                  logged_in_9800 = False
-                  found_escape = False
-
-            if loop_count >= 8:
-               if found_escape == True:
-                  logg.info("9800 outside major loop loop_count {}".format(loop_count))
-                  logg.info("9800 will look one more time for WLC#")
-                  egg.sentline(CR)
-                  sleep(0.2)
-                  r = egg.expect_exact(["WLC#",pexpect.TIMEOUT],timeout=3)
-                  if r == 0:
-                     logg.info("Found WLC# r {} before {}  after {} can move forward".format(r,egg.before,egg.after))
-                  if r == 1:
-                     egg.sendline("\x1b\r")
-                     egg.sendline("logout")
-                     logg.info("9800 the excape was found yet could not loging... close egg session")
-                     egg.close(force = True)
-                     exit(1)
-               else:
-                  logg.info("9800 the telnet session may need to be cleared will try to send logout")
-                  egg.sendline("logout")
-                  logg.info("9800 did not find the initial escape... exiting")
-                  egg.close(force = True)
-                  exit(1)
-
-         # 3504 series
-         else:
-            egg.sendline(' ')
-            egg.expect('User\:',timeout=3)
-            egg.sendline(user)
-            egg.expect('Password\:',timeout=3)
-            egg.sendline(passwd)
-            #if args.prompt in "WLC#" or args.prompt in "WLC>":
-            #   egg.sendline("enable")
-            #   time.sleep(0.1)
-            egg.sendline('config paging disable')
-            #egg.expect('(Voice-Talwar) >', timeout=3)
-            #time.sleep(0.1)
-            #egg.sendline(user)
-            #time.sleep(0.1)
-            #egg.expect('ssword:')
-            #time.sleep(0.1)
-            #egg.sendline(passwd)
-      else:
-         usage()
-         exit(1)
+   if (args.socket is None) and (scheme is None):
+      usage()
+      exit(1)
+
+   # every scheme, and the session daemon, runs the action through CiscoController
+   try:
+      controller = CiscoController.connect(host, user=user, passwd=passwd, scheme=scheme, port=port,
+                                           series=args.series, prompt=args.prompt, socket_path=args.socket,
+                                           logg=logg, tty=args.tty if args.tty is not None else "/dev/ttyUSB0",
+                                           ap=args.ap, band=args.band if args.band is not None else "a",
+                                           wlan=args.wlan, wlanID=args.wlanID)
    except Exception as e:
       logging.exception(e)
-
-   command = None
-   time.sleep(0.1)
-   CCPROMPT = args.prompt  #'\(Voice-Talwar\) >'
-   LEGACY_PROMPT = "(cisco) >"
-   LOGOUTPROMPT = 'User:'
-   EXITPROMPT = "Would you like to save them now? (y/N)"
-   AREYOUSURE = "Are you sure you want to continue? (y/n)"
-   CLOSEDBYREMOTE = "closed by remote host."
-   CLOSEDCX = "Connection to .* closed."
-
-   sleep(0.1)
-   if args.series == "9800":
-      pass
-   else:
-      #TODO  clean up 
-      logg.info("waiting for prompt: {} or {} ".format(CCPROMPT,LEGACY_PROMPT))
-      egg.expect(">", timeout=3)
+      exit(1)
 
    logg.info("Ap[%s] Action[%s] Value[%s] "%(args.ap, args.action, args.value))
    print("Ap[%s] Action[%s] Value[%s]"%(args.ap, args.action, args.value))
-
-   if ((args.action == "show") and (args.value is None)):
-      raise Exception("show requires value, like 'country' or 'ap summary'")
-
-   if (args.action == "show"):
-      command = "show "+args.value
-
-   if (args.action == "cmd"):
-       if (args.value is None):
-           raise Exception("cmd requires value to be set.")
-       command = "%s"%(args.value)
-
-   if (args.action == "summary"):
-      if args.series == "9800":
-         if band == "a":
-            command = "show ap summary"
-         else:
-            command = "show ap summary"
-      else:
-         command = "show ap summary"
-
-   if (args.action == "advanced"):
-      if args.series == "9800":
-         if band == "a":
-            command = "show ap dot11 5ghz summary"
-         else:
-            command = "show ap dot11 24ghz summary"
-      else:
-         command = "show advanced 802.11%s summary"%(band)
-
-   if ((args.action == "ap_country") and ((args.value is None) or (args.ap is None))):
-      raise  Exception("ap_country requires country and AP name")
-
-   if (args.action == "ap_country"):
-      command = "config ap country %s %s"%(args.value, args.ap)
-
-   if ((args.action == "country") and ((args.value is None))):
-      raise  Exception("country requires country value")
-
-   if (args.action == "country"):
-      command = "config country %s"%(args.value)
-
-   if (args.action == "manual" and args.ap is None):
-      raise Exception("action requires AP name")
-   if (args.action == "manual"):
-      if args.series == "9800":
-         if band == "a":
-            command = "ap name %s dot11 5ghz radio role manual client-serving"%(args.ap)
-         else:
-            command = "ap name %s dot11 24ghz radio role manual client-serving"%(args.ap)
-
-   if (args.action == "auto" and args.ap is None):
-      raise Exception("action requires AP name")
-   if (args.action == "auto"):
-      if args.series == "9800":
-         if band == "a":
-            command = "ap name %s dot11 5ghz radio role auto"%(args.ap)
-         else:
-            command = "ap name %s dot11 24ghz radio role auto"%(args.ap)
-
-   if (args.action == "disable_network_5ghz"):
-      if args.series == "9800":
-         egg.sendline("config t")
-         sleep(0.1)
-         i = egg.expect_exact(["(config)#",pexpect.TIMEOUT],timeout=2)
-         if i == 0:
-            egg.sendline("ap dot11 5ghz shutdown")
-            sleep(0.1)
-            i = egg.expect_exact(["Are you sure you want to continue? (y/n)[y]:",pexpect.TIMEOUT],timeout=2)
-            if j == 0:
-               logg.info("did get Are you sure you want to continue? (y/n)[y]:")
-               egg.sendline("y")
-               sleep(0.5)
-            if j == 1:
-               logg.info("did not get Are you sure you want to continue? (y/n)[y]:")
-               egg.sendline("y")
-               sleep(0.5)
-         if i == 1:
-            logg.info("timed out on (config)# disable_network_5ghz")
-
-   if (args.action == "disable_network_24ghz"):
-      if args.series == "9800":
-         egg.sendline("config t")
-         sleep(0.1)
-         i = egg.expect_exact(["(config)#",pexpect.TIMEOUT],timeout=2)
-         if i == 0:
-            egg.sendline("ap dot11 24ghz shutdown")
-            sleep(0.5)
-            i = egg.expect_exact(["Are you sure you want to continue? (y/n)[y]:",pexpect.TIMEOUT],timeout=2)
-            if j == 0:
-               logg.info("did get Are you sure you want to continue? (y/n)[y]:")
-               egg.sendline("y")
-               sleep(0.5)
-            if j == 1:
-               logg.info("did not get Are you sure you want to continue? (y/n)[y]:")
-               egg.sendline("y")
-               sleep(0.5)
-         if i == 1:
-            logg.info("timed out on (config)# disable_network_24ghz")
-
-   if (args.action == "enable_network_5ghz"):
-      if args.series == "9800":
-         egg.sendline("config t")
-         sleep(0.1)
-         i = egg.expect_exact(["(config)#",pexpect.TIMEOUT],timeout=2)
-         if i == 0:
-            egg.sendline("no ap dot11 5ghz shutdown")
-            sleep(0.1)
-         if i == 1:
-            logg.info("timed out on (config) prompt")
-
-   if (args.action == "enable_network_24ghz"):
-      if args.series == "9800":
-         egg.sendline("config t")
-         sleep(0.1)
-         i = egg.expect_exact(["(config)#",pexpect.TIMEOUT],timeout=2)
-         if i == 0:
-            egg.sendline("no ap dot11 24ghz shutdown")
-            sleep(0.1)
-         if i == 1:
-            logg.info("timed out on (config) prompt")
-
-   if (args.action == "enable" and (args.ap is None)):
-      raise Exception("action requires AP name")
-   if (args.action == "enable"):
-      if args.series == "9800":
-         if band == "a":
-            command = "ap name %s no dot11 5ghz shutdown"%(args.ap)
-         else:
-            command = "ap name %s no dot11 24ghz shutdown"%(args.ap)
-      else:
-         command = "config 802.11%s enable %s"%(band, args.ap)
-
-   if (args.action == "disable" and (args.ap is None)):
-      raise Exception("action requires AP name")
-   if (args.action == "disable"):
-      if args.series == "9800":
-         if band == "a":
-            command = "ap name %s dot11 5ghz shutdown"%(args.ap)
-         else:
-            command = "ap name %s dot11 24ghz shutdown"%(args.ap)
-      else:
-         command = "config 802.11%s disable %s"%(band, args.ap)
-
-   if (args.action == "txPower" and ((args.ap is None) or (args.value is None))):
-      raise Exception("txPower requires ap and value")
-   if (args.action == "txPower"):
-      if args.series == "9800":
-         if band == "a":
-            command = "ap name %s dot11 5ghz txpower %s"%(args.ap, args.value)
-         else:
-            command = "ap name %s dot11 24ghz txpower %s"%(args.ap, args.value)
-      else:
-         command = "config 802.11%s txPower ap %s %s"%(band, args.ap, args.value)
-
-   if (args.action == "bandwidth" and ((args.ap is None) or (args.value is None))):
-      raise Exception("bandwidth requires ap and value (20, 40, 80, 160)")
-   if (args.action == "bandwidth"):
-      if args.series == "9800":
-         if band == "a":
-            command = "ap name %s dot11 5ghz channel width %s"%(args.ap, args.value)
-         else:
-            command = "ap name %s dot11 24ghz channel width %s"%(args.ap, args.value)
-      else:
-         command = "config 802.11%s chan_width %s %s"%(band, args.ap, args.value)
-
-   if (args.action == "channel" and ((args.ap is None) or (args.value is None))):
-      raise Exception("channel requires ap and value 5Ghz ")
-   if (args.action == "channel"):
-      if args.series == "9800":
-         if band == "a":
-            command = "ap name %s dot11 5ghz channel %s"%(args.ap, args.value)
-         else:
-            command = "ap name %s dot11 24ghz channel %s"%(args.ap, args.value)
-      else:
-         command = "config 802.11%s channel ap %s %s"%(band, args.ap, args.value)
-
-   if (args.action == "ap_channel" and (args.ap is None)):
-      raise Exception("ap_channel requires ap")
-   if (args.action == "ap_channel"):
-      if args.series == "9800":
-         if band == "a":
-            command = "show ap dot11 5ghz summary"
-         else:
-            command = "show ap dot11 24ghz summary"
-      else:
-         command = "show ap channel %s"%(args.ap)
-
-   if (args.action == "wireless_tag_policy"):
-      logg.info("send wireless tag policy")
-      egg.sendline("config t")
-      sleep(0.1)
-      i = egg.expect_exact(["(config)#",pexpect.TIMEOUT],timeout=2)
-      if i == 0:
-         for command in ["wireless tag policy default-policy-tag","wlan open-wlan policy default-policy-profile"]:
-            egg.sendline(command)
-            sleep(1)
-            j = egg.expect_exact(["(config-policy-tag)#",pexpect.TIMEOUT],timeout=2)
-            if j == 0:
-               logg.info("command sent: {}".format(command))
-            if j == 1:
-               logg.info("timed out on command prompt (config-policy-tag)# for command {}".format(command))   
-      if i == 1:
-         logg.info("did not get the (config)# prompt")
-   if (args.action == "debug_disable_all"):
-      if args.series == "9800":
-         logg.info("action {} not avilable on 9800".format(args.action))
-      else:
-         command = "debug disable-all"
-
-   if (args.action == "no_logging_console"):
-      if args.series == "9800": 
-         logg.info("send no logging console")
-         egg.sendline("config t")
-         sleep(0.2)
-         i = egg.expect_exact(["(config)#",pexpect.TIMEOUT],timeout=2)
-         if i == 0:
-            egg.sendline("no logging console")
-            sleep(0.2)
-         if i == 1:
-            logg.info("did not get the (config)# prompt")  
-      else:
-         command = "config logging debug console disable" 
-
-   if (args.action == "line_console_0"):
-      logg.info("send: line console 0")
-      egg.sendline("config t")
-      sleep(0.2)
-      i = egg.expect_exact(["(config)#",pexpect.TIMEOUT],timeout=2)
-      if i == 0:
-         egg.sendline("line console 0")
-         sleep(0.1)
-      if i == 1:
-         logg.info("did not get the (config)# prompt") 
-
-   if (args.action == "no_wlan" and (args.wlan is None)):
-      raise Exception("wlan is required")
-   if (args.action == "no_wlan"):
-      egg.sendline("config t")
-      sleep(0.1)
-      i = egg.expect_exact(["(config)#",pexpect.TIMEOUT],timeout=2)
-      if i == 0:
-         command = "no wlan %s"%(args.wlan)
-         egg.sendline(command)
-         sleep(0.1)
-      if i == 1:
-         logg.info("did not get the (config)# prompt")
-
-   if (args.action == "show_wlan_summary"):
-      egg.sendline("show wlan summary")
-      sleep(0.1)
-      i = egg.expect(["WLC#",pexpect.TIMEOUT],timeout=2)
-      if i == 0:
-         logg.info("show wlan summary sent")
-      if i == 1:
-         logg.info("show wlan summary timed out")
-
-   if (args.action == "create_wlan" and ((args.wlanID is None) or (args.wlan is None))):
-      raise Exception("wlan  and wlanID is required an")
-   if (args.action == "wlan"):
-      if args.series == "9800":
-          egg.sendline("config t")
-          sleep(0.4)
-          i = egg.expect_exact(["(config)#",pexpect.TIMEOUT],timeout=2)
-          if i == 0:
-             logg.info("elevated to (config)#")
-             command = "wlan %s %s %s"%(args.wlan, args.wlanID, args.wlan)
-             logg.info("open network command {}".format(command))
-             egg.sendline(command)
-             sleep(0.4)
-             j = egg.expect_exact(["WLC(config-wlan)#",pexpect.TIMEOUT],timeout=2)
-             if j == 0:
-                 for command in ["shutdown","no security wpa","no security wpa wpa2","no security wpa wpa2 ciphers aes",
-                        "no security wpa akm dot1x","no shutdown"]:
-                    egg.sendline(command)
-                    sleep(1)
-                    k = egg.expect_exact(["WLC(config-wlan)#",pexpect.TIMEOUT],timeout=2)
-                    if k == 0:
-                       logg.info("command sent: {}".format(command))
-                    if k == 1:
-                         logg.info("command time out: {}".format(command))
-             if j == 1:
-                logg.info("did not get the (config-wlan)# prompt")
-          if i == 0:
-             logg.info("did not get the (config)# prompt")
-      else:   
-         command = "config wlan create %s %s %s"%(args.wlanID, args.wlan, args.wlan)
-
-   if (args.action == "delete_wlan"):
-      if args.series == "9800":
-         if (args.wlan is None):
-            raise Exception("9800 series wlan is required")
-         else:
-            egg.sendline("config t")
-            sleep(0.1)
-            i = egg.expect_exact(["(config)#",pexpect.TIMEOUT],timeout=2)
-            if i == 0:
-               logg.info("elevated to (config)#")
-               cmd = "no wlan %s"%(args.wlan)
-               egg.sendline(cmd)
-               sleep(0.1)
-            if i == 1:
-               logg.info("did not get the (config)# prompt")                            
-      else:
-         if (args.action == "delete_wlan" and (args.wlanID is None)):
-            raise Exception("wlan ID is required")
-         command = "config wlan delete %s"%(args.wlanID) 
-
-   if (args.action == ["enable_wlan","disble_wlan"]):
-      if args.series == "9800":
-         if (args.wlan is None):
-            raise Exception("9800 series wlan is required")
-         else:
-            egg.sendline("config t")
-            sleep(0.1)
-            i = egg.expect_exact(["(config)#",pexpect.TIMEOUT],timeout=2)
-            if i == 0:
-               logg.info("elevated to (config)#")
-               cmd = "wlan %s"%(args.wlan)
-               egg.sendline(cmd)
-               sleep(0.1)
-               j = egg.expect_exact(["(config-wlan)#",pexpect.TIMEOUT],timeout=2)
-               if j == 0:
-                  if (args.action == "enable_wlan"):
-                      cmd = "no shutdown"
-                  else:
-                      cmd = "shutdown"
-                  egg.sendline(cmd)
-                  sleep(0.1)
-               if j == 1:
-                  logg.info("did not get the (config-wlan)# prompt")
-            if i == 1:
-               logg.info("did not get the (config)# prompt")
-      else:
-         if (args.action == ["enable_wlan","disable_wlan"] and (args.wlanID is None)):
-            raise Exception("wlan ID is required")
-         if (args.action == "enable_wlan"):
-            command = "config wlan enable %s"%(args.wlanID)
-         else:   
-            command = "config wlan disable %s"%(args.wlanID) 
-
-   if (args.action == "wlan_qos" and (args.wlanID is None)):
-      raise Exception("wlan ID is required")
-   if (args.action == "wlan_qos"):
-      command = "config wlan qos %s %s"%(args.wlanID, args.value)
-
-   # separate the 3504 and 9800 logouts as the are conflicting
-   if (args.series == "9800"):
-      if (command is None ):
-         sleep(0.5)
-         logg.info("9800 Command processed earlier will logout")
-      else:
-         logg.info("Command[%s]"%command)
-         egg.sendline(command)
-         sleep(0.5)
-         logg.info("command sent {}".format(command))
-      logged_out_9800 = False
-      loop_count = 0
-      while logged_out_9800 == False and loop_count <= 6:
-         loop_count += 1
-         i = egg.expect_exact(["WLC>","WLC#", "WLC(config)#","(config-wlan)#","(config-policy-tag)#","(config-line)#",pexpect.TIMEOUT],timeout=5)
-         print (egg.before.decode('utf-8', 'ignore'))
-         if i == 0:
-            logg.info("WLC> prompt received can send logout")
-            egg.sendline("logout")
-            sleep(0.1)
-            logged_out_9800 = True
-            break
-         if i == 1:
-            logg.info("WLC# prompt received will send logout")
-            try:
-               egg.sendline("logout")
-               sleep(0.1)
-               logged_out_9800 = True
-            except:
-               logg.info("9800 exception on logout")
-               sleep(0.1)
-            break
-         if i == 2:
-            logg.info("WLC(config)# prompt received will send exit")
-            try:
-               egg.sendline("exit")
-               sleep(0.2)
-            except:
-               logg.info("9800 exception on exit")
-               sleep(0.1)
-         if i == 3:
-            logg.info("WLC(config-wlan)# prompt received will send exit")
-            try:
-               egg.sendline("exit")
-               sleep(0.2)
-            except:
-               logg.info("9800 exception on exit")
-               sleep(0.1)
-         if i == 4:
-            logg.info("(config-policy-tag)# prompt received will send exit")
-            try:
-               egg.sendline("exit")
-               sleep(0.2)
-            except:
-               logg.info("9800 exception on exit")
-               sleep(0.1)
-         if i == 5:
-            logg.info("(config-line)# prompt received will send exit")
-            try:
-               egg.sendline("exit")
-               sleep(0.2)
-            except:
-               logg.info("9800 exception on exit")
-               sleep(0.1)
-         if i == 6:
-            logg.info("9800 expect timeout send exit")
-            egg.sendline("exit")
-            break
-      if( logged_out_9800 == False):
-         logg.info("9800 did not send logout at end of command processing this could tie up the connection") 
-      if( scheme == "telnet"):
-         egg.sendline("\x1b\r")
-         logg.info("send escape to exit connection")  
-         sleep(0.2)
-      logg.info("send close to the egg child process")   
-      egg.close(force = True)   
-      sleep(0.1)
-   # 3504         
-   else:
-      if (command is None ):
-         sleep(0.5)
-         logg.info("No command specified, going to log out.")
-      else:
-         logg.info("Command[%s]"%command)
-         egg.sendline(command)
-         sleep(0.5)
-         logg.info("command sent {}".format(command))
-
-      command_sent = False
-      loop_count = 0
-      while command_sent == False and loop_count <= 3:
-         loop_count += 1
-         try:
-            i = egg.expect_exact([CCPROMPT,LEGACY_PROMPT,AREYOUSURE,'--More-- or','config paging disable',pexpect.TIMEOUT],timeout=2)
-            logg.info("before {} after {}".format(egg.before.decode('utf-8', 'ignore'),egg.after.decode('utf-8', 'ignore')))
-            print(egg.before.decode('utf-8', 'ignore'))
-            if i == 0: 
-               logg.info("{} prompt received after command sent".format(CCPROMPT))
-               # granted the break will exit the loop
-               command_sent = True
-            if i == 1:
-               logg.info("{} prompt received after command sent".format(LEGACY_PROMPT))
-               # granted the break will exit the loop
-               if loop_count > 2:
-                  command_sent = True
-            if i == 2:
-               egg.sendline("y")
-               command_sent = True
-            if i == 3:
-               egg.sendline(NL)
-               logg.info("received --More-- or")
-            if i == 4:
-               egg.sendline(NL)
-               logg.info("received: config paging disable ")
-               
-            if i == 5:
-               egg.sendline(NL)
-               logg.info(" Check to see if logging to console is disabled")
-               command_sent = True              
-
-         except:
-            logg.info("closing connection logout loop")      
-      try:  
-         egg.sendline("logout")
-         logg.info("logout")
-         logg.info("send close to the egg child process")   
-         egg.close(force = True)   
-         sleep(0.1)
-      except:
-         logg.info("closing connection on logout")      
+   try:
+      result = controller.run(args.action if args.action is not None else "config", args.value)
+   finally:
+      controller.close()
+   if result.output:
+      print(result.output)
+   if not result.ok:
+      logg.info("{} failed: {}".format(args.action, result.error))
+      exit(1)
 
 
 
@@ -67,6 +67,15 @@ NOTE:  Telnet port 23 unless specified ,  ssh  port 22 unless specified,  scheme
 --upstream_port eth2 --series 9800 --wlan open-wlan --wlanID 1 --verbose
 
 
+##########################################################
+# Sweep two APs on separate controllers at the same time
+##########################################################
+./lf_cisco_power.py -u admin -p Cisco123 -s ssh --port 22 --lfmgr 192.168.100.178 --bandwidth "20 40 80" --channel "36 149" \
+  --nss 4 --txpower "1 2 3 4 5 6 7 8" --pathloss 54 --antenna_gain 6 --band a --upstream_port eth2 --series 9800 \
+  --dut "dest==192.168.100.112 ap==APA453.0E7B.CF9C station==sta0000" \
+  --dut "dest==192.168.100.113 ap==AP6C71.0DE6.45D0 station==sta0001 lfresource==2 pathloss==56"
+Results of each (controller, AP, station) go to their own worksheet of the one xlsx file.
+
 ######################
 # to create a station 
 ######################
@@ -103,6 +112,7 @@ if sys.version_info[0] != 3:
     print("This script requires Python 3")
     exit()
 
+import os
 import re
 import logging
 import time
@@ -111,6 +121,13 @@ import argparse
 import subprocess
 import xlsxwriter
 import math
+import threading
+import concurrent.futures
+
+from cisco_wifi_ctl import CiscoController
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "py-json"))
+import realm
 
 NL = "\n"
 CR = "\r\n"
@@ -159,6 +176,7 @@ def usage():
    print("--station: LANforge station name for test(sta00000), use if station present and --create_station not used")
    print("--upstream_port: LANforge upstream port name (eth1)")
    print("--lfmgr: LANforge manager IP address")
+   print("--lfmgr_port: LANforge manager JSON API port, defaults to 8080")
    print("--lfresource: LANforge resource ID for station")
    print("--lfresource2: LANforge resource ID for upstream port")
    print("--outfile: Output file for txt and xlsx data")
@@ -185,6 +203,8 @@ def usage():
    print("--exit_on_fail","--exit_on_fail,  exit on test failure")
    print("--exit_on_error","--exit_on_error, exit on test error, test mechanics failed")
    print('-e','--email', "--email user==<from email> passwd==<email password> to==<to email> smtp==<smtp server> port==<smtp port> 465 (SSL)")
+   print("--dut", "--dut dest==<controller> ap==<AP> station==<LANforge station> ..., repeat to sweep several (controller, AP, station) concurrently, one per controller")
+   print("--workers", "--workers <n> sweeps to run at once, defaults to one per --dut")
 
 
    print("-h|--help")
@@ -207,6 +227,988 @@ def exit_test(workbook):
    exit(1)
 
 
+def send_email(email_dicts, subject, body, logg, capture_output=True):
+   for email_dict in email_dicts:
+      try:
+         logg.info("Sending Email ")
+         email_out = subprocess.run(["./lf_mail.py", "--user", email_dict['user'] , "--passwd", email_dict['passwd'], "--to",email_dict['to'] ,
+            "--subject", subject, "--body", body , "--smtp", email_dict['smtp'], "--port", email_dict['port'] ], capture_output=capture_output, check=True)
+         pss = email_out.stdout.decode('utf-8','ignore') if email_out.stdout else ""
+         logg.info(pss)
+      except subprocess.CalledProcessError as process_error:
+         logg.info("Unable to send email smtp {} port {} error code: {} output {}".format(email_dict['smtp'],email_dict['port'],process_error.returncode, process_error.output))
+
+
+class SweepAbort(Exception):
+   pass
+
+
+# Everything the sweep reads off the station, fetched with one /port query
+PORT_FIELDS = "ap,ip,mode,channel,signal,noise,rx-rate,parent+dev,down"
+
+def parse_rx_bitrate(probe_results):
+   """
+   :param probe_results: text of the station's probe results
+   :return: (nss, bandwidth) of the 'rx bitrate' line, (None, None) when there is none
+   """
+   m = re.search('rx bitrate:\s+(.*)', probe_results)
+   if (m == None):
+      return None, None
+   rate = m.group(1)
+   # iw leaves out the width for 20Mhz
+   bw = "20"
+   m = re.search('(\d+)MHz', rate)
+   if (m != None):
+      bw = m.group(1)
+   m = re.search('NSS (\d+)', rate)
+   if (m != None):
+      return m.group(1), bw
+   # HT rates carry no NSS, MCS 0-7 is one stream, 8-15 two...
+   m = re.search('MCS (\d+)', rate)
+   if (m != None):
+      return str(int(m.group(1)) // 8 + 1), bw
+   return "1", bw
+
+
+class SweepTarget(object):
+   """
+   One (controller, AP, LANforge station) tuple of the sweep.  Settings a --dut spec leaves
+   out come from the command line.
+   """
+   KEYS = ("dest", "user", "passwd", "scheme", "port", "series", "ap", "band", "slot", "wlan", "wlanID",
+           "lfmgr", "lfmgr_port", "lfresource", "lfresource2", "station", "create_station", "radio", "upstream_port",
+           "pathloss", "antenna_gain")
+
+   def __init__(self, name, **settings):
+      self.name = name
+      for key in self.KEYS:
+         setattr(self, key, settings.get(key))
+
+
+def parse_duts(args, defaults):
+   """
+   :param defaults: settings from the command line, keyed as SweepTarget.KEYS
+   :return: one SweepTarget per --dut, or the command line's own tuple without --dut
+   :raise ValueError: on an unknown key, or two --dut entries on the same controller, since
+      each sweep disables the whole band on its controller while it configures the AP
+   """
+   specs = [{}]
+   if args.dut:
+      specs = []
+      for _dut in args.dut:
+         spec = dict(map(lambda x: x.split('==', 1), str(_dut[0]).split()))
+         for key in spec:
+            if key not in SweepTarget.KEYS:
+               raise ValueError("unknown --dut key {}, known keys are {}".format(key, SweepTarget.KEYS))
+         specs.append(spec)
+
+   targets = []
+   names = set()
+   dests = {}
+   for spec in specs:
+      settings = dict(defaults)
+      settings.update(spec)
+      if settings["dest"] in dests:
+         raise ValueError("--dut {} and --dut {} both use controller {}, sweeps on one controller would disable each other's band".format(
+            dests[settings["dest"]], len(targets) + 1, settings["dest"]))
+      dests[settings["dest"]] = len(targets) + 1
+      if "create_station" in spec:
+         settings["station"] = spec["create_station"]
+      elif "station" in spec:
+         settings["create_station"] = None
+      # worksheet names are at most 31 characters
+      name = "{}-{}".format(settings["ap"], settings["station"])[:31]
+      if name in names:
+         name = "{}-{}".format(name[:28], len(targets))
+      names.add(name)
+      targets.append(SweepTarget(name, **settings))
+   return targets
+
+
+class SweepReport(object):
+   """
+   The xlsx workbook shared by all sweeps, one worksheet per SweepTarget.  xlsxwriter is not
+   thread safe, so the worksheets are written under self.lock; the workbook is written out
+   as a whole when closed.
+   """
+   def __init__(self, outfile_xlsx, adjust_nf=False, rssi_to_use="combined", pf_dbm=pf_dbm):
+      self.workbook = xlsxwriter.Workbook(outfile_xlsx)
+      self.adjust_nf = adjust_nf
+      self.rssi_to_use = rssi_to_use
+      self.pf_dbm = pf_dbm
+      self.lock = threading.Lock()
+      self.closed = False
+      self.formats = {}
+      self._add_formats()
+
+   def _add_format(self, name, bg_color, **properties):
+      fmt = self.workbook.add_format(properties)
+      fmt.set_bg_color(bg_color)
+      fmt.set_border(1)
+      self.formats[name] = fmt
+
+   def _add_formats(self):
+      self._add_format("dblue_bold",       "#b8cbe4", bold=True, align='center')
+      self._add_format("dtan_bold",        "#dcd8c3", bold=True, align='center')
+      self._add_format("dpeach_bold",      "#ffd8bb", bold=True, align='center')
+      self._add_format("dpink_bold",       "#fcc8ca", bold=True, align='center')
+      self._add_format("dyel_bold",        "#ffe699", bold=True, align='center')
+      self._add_format("dgreen_bold",      "#c6e0b4", bold=True, align='center')
+      self._add_format("dgreen_bold_left", "#c6e0b4", bold=True, align='left')
+      self._add_format("center_blue",      "#dbe5f1", align='center')
+      self._add_format("center_tan",       "#edede1", align='center')
+      self._add_format("center_peach",     "#fce4d6", align='center')
+      self._add_format("center_yel",       "#fdf2cc", align='center')
+      self._add_format("center_yel_red",   "#fdf2cc", align='center', color='red')
+      self._add_format("center_pink",      "ffd2d3",  align='center')
+      self._add_format("red",              "#e0efda", color='red', align='center')
+      self._add_format("red_left",         "#e0efda", color='red', align='left')
+      self._add_format("green",            "#e0efda", color='green', align='center')
+      self._add_format("green_left",       "#e0efda", color='green', align='left')
+
+   def add_sheet(self, name):
+      """
+      :return: a new worksheet with the results header
+      """
+      f = self.formats
+      with self.lock:
+         worksheet = self.workbook.add_worksheet(name)
+
+         worksheet.set_row(0, 45) # Set height
+         worksheet.set_column(0, 0, 10) # Set width
+
+         col = 0
+         row = 0
+         worksheet.write(row, col, 'Regulatory\nDomain', f["dblue_bold"]); col += 1
+         worksheet.write(row, col, 'AP\nChannel', f["dblue_bold"]); col += 1
+         worksheet.write(row, col, 'NSS', f["dblue_bold"]); col += 1
+         worksheet.set_column(col, col, 10) # Set width
+         worksheet.write(row, col, 'Controller\nBW', f["dblue_bold"]); col += 1
+         worksheet.write(row, col, 'STA\nRpt\nBW', f["dblue_bold"]); col += 1
+         worksheet.write(row, col, 'Tx\nPower', f["dtan_bold"]); col += 1
+         worksheet.write(row, col, 'Allowed\nPer\nPath', f["dtan_bold"]); col += 1
+         worksheet.write(row, col, 'Cabling\nPathloss', f["dtan_bold"]); col += 1
+         worksheet.write(row, col, 'Antenna\nGain', f["dtan_bold"]); col += 1
+         worksheet.write(row, col, 'Noise\n', f["dpeach_bold"]); col += 1
+         if (self.adjust_nf):
+            worksheet.write(row, col, 'Noise\nAdjust\n(vs -105)', f["dpeach_bold"]); col += 1
+
+         worksheet.set_column(col, col, 15) # Set width
+         worksheet.write(row, col, 'Last\nMCS\n', f["dpeach_bold"]); col += 1
+         if(self.rssi_to_use == "beacon"):
+            worksheet.set_column(col, col, 10) # Set width
+            worksheet.write(row, col, 'Beacon\nRSSI USED\n', f["dpeach_bold"]); col += 1
+            worksheet.set_column(col, col, 10) # Set width
+            worksheet.write(row, col, 'Combined\nRSSI\n', f["dpeach_bold"]); col += 1
+         else:
+            worksheet.set_column(col, col, 10) # Set width
+            worksheet.write(row, col, 'Beacon\nRSSI\n', f["dpeach_bold"]); col += 1
+            worksheet.set_column(col, col, 10) # Set width
+            worksheet.write(row, col, 'Combined\nRSSI USED\n', f["dpeach_bold"]); col += 1
+         worksheet.write(row, col, 'RSSI\n1', f["dpeach_bold"]); col += 1
+         worksheet.write(row, col, 'RSSI\n2', f["dpeach_bold"]); col += 1
+         worksheet.write(row, col, 'RSSI\n3', f["dpeach_bold"]); col += 1
+         worksheet.write(row, col, 'RSSI\n4', f["dpeach_bold"]); col += 1
+         worksheet.write(row, col, 'Ant\n1', f["dpink_bold"]); col += 1
+         worksheet.write(row, col, 'Ant\n2', f["dpink_bold"]); col += 1
+         worksheet.write(row, col, 'Ant\n3', f["dpink_bold"]); col += 1
+         worksheet.write(row, col, 'Ant\n4', f["dpink_bold"]); col += 1
+         worksheet.write(row, col, 'Offset\n1', f["dyel_bold"]); col += 1
+         worksheet.write(row, col, 'Offset\n2', f["dyel_bold"]); col += 1
+         worksheet.write(row, col, 'Offset\n3', f["dyel_bold"]); col += 1
+         worksheet.write(row, col, 'Offset\n4', f["dyel_bold"]); col += 1
+         worksheet.set_column(col, col, 12) # Set width
+         worksheet.write(row, col, "PASS /\nFAIL\n( += %s dBm)"%(self.pf_dbm), f["dgreen_bold"]); col += 1
+         worksheet.set_column(col, col, 24) # Set width
+         worksheet.write(row, col, 'Time Stamp\n', f["dgreen_bold"]); col += 1
+         worksheet.set_column(col, col, 100) # Set width
+         worksheet.write(row, col, 'Warnings and Errors', f["dgreen_bold_left"]); col += 1
+      return worksheet
+
+   def close(self):
+      with self.lock:
+         if not self.closed:
+            self.closed = True
+            self.workbook.close()
+
+
+class PowerSweep(object):
+   """
+   The channel / NSS / bandwidth / tx-power sweep of one SweepTarget: its own controller
+   session, LANforge station and connection, text files and worksheet.  Sweeps of several
+   targets run side by side in a thread pool; stop is shared so --exit_on_fail and
+   --exit_on_error end all of them.
+   """
+   def __init__(self, target, args, report, stop, logg, outfile, full_outfile, outfile_xlsx,
+                rssi_to_use="combined", email_dicts=None, cx_name="c-udp-power"):
+      self.target = target
+      self.args = args
+      self.report = report
+      self.stop = stop
+      self.logg = logg
+      self.outfile = outfile
+      self.full_outfile = full_outfile
+      self.outfile_xlsx = outfile_xlsx
+      self.rssi_to_use = rssi_to_use
+      self.email_dicts = email_dicts if email_dicts is not None else []
+      self.cx_name = cx_name
+      self.failed = False
+      self.worksheet = None
+      self.row = 1
+      self.myrd = ""
+      self.parent = None
+      self.controller = None
+      self.lanforge = None
+
+   def _controller(self):
+      t = self.target
+      if self.controller is None:
+         self.controller = CiscoController.connect(t.dest, user=t.user, passwd=t.passwd, scheme=t.scheme,
+                                                   port=t.port, series=t.series, logg=self.logg, ap=t.ap,
+                                                   band=t.band, wlan=t.wlan, wlanID=t.wlanID)
+      return self.controller
+
+   def _lanforge(self):
+      t = self.target
+      if self.lanforge is None:
+         self.lanforge = realm.Realm(t.lfmgr, int(t.lfmgr_port))
+      return self.lanforge
+
+   def port_state(self):
+      """
+      :return: the station's /port record with PORT_FIELDS, {} when the manager does not report it
+      """
+      t = self.target
+      response = self._lanforge().json_get("/port/1/{}/{}?fields={}".format(t.lfresource, t.station, PORT_FIELDS))
+      if (response == None) or ("interface" not in response):
+         return {}
+      return response["interface"]
+
+   def probe_results(self):
+      """
+      Ask the manager to probe the station, then read back what the probe found.
+      :return: text of the probe results, "" when there are none
+      """
+      t = self.target
+      lf = self._lanforge()
+      lf.json_post("/cli-json/probe_port", {"shelf": 1, "resource": t.lfresource, "port": t.station})
+      time.sleep(1)
+      response = lf.json_get("/probe/1/{}/{}".format(t.lfresource, t.station))
+      if (response == None) or ("probe-results" not in response):
+         return ""
+      records = response["probe-results"]
+      if isinstance(records, dict):
+         records = [records]
+      return "\n".join(record.get("probe results", "") for entry in records for record in entry.values())
+
+   def set_cx_state(self, cx_state):
+      self._lanforge().json_post("/cli-json/set_cx_state", {"test_mgr": "ALL", "cx_name": self.cx_name,
+                                                           "cx_state": cx_state})
+
+   def station_eid(self):
+      return "1.{}.{}".format(self.target.lfresource, self.target.station)
+
+   def ctl_state(self, read):
+      """
+      :param read: callable given the controller's ControllerState
+      :return: what read returns; reads within a few seconds of the last one come from the cache
+      """
+      try:
+         return read(self._controller().state)
+      except Exception as error:
+         self.logg.info("Controller unable to commicate to AP or unable to communicate to controller error: {}".format(error))
+         raise SweepAbort(error)
+
+   def ctl(self, actions, log_output=None):
+      """
+      Run controller actions, see CiscoController.transaction()
+      :param log_output: log what the controller printed, defaults to --verbose
+      :return: output of all actions
+      """
+      t = self.target
+      logg = self.logg
+      if log_output is None:
+         log_output = self.args.verbose
+      logg.info("{} cisco_wifi_ctl: {}".format(t.series, " ".join(
+         action if value is None else "{} {}".format(action, value) for action, value in actions)))
+      try:
+         results = self._controller().transaction(actions)
+      except Exception as error:
+         logg.info("Controller unable to commicate to AP or unable to communicate to controller error: {}".format(error))
+         raise SweepAbort(error)
+      for result in results:
+         if not result.ok:
+            logg.info("Controller refused {}: {}".format(result.action, result.error))
+      output = "\n".join(result.output for result in results)
+      if log_output:
+         logg.info(output)
+      return output
+
+   def run(self):
+      """
+      Run the whole sweep and put the AP back to defaults afterwards, unless it was stopped.
+      :return: True when the sweep ran to completion
+      """
+      if self.stop.is_set():
+         return False
+      try:
+         self.worksheet = self.report.add_sheet(self.target.name)
+         with open(self.full_outfile, "w") as csv, open(self.outfile, "w") as csvs:
+            self.write_headers(csv, csvs)
+            self.setup()
+            for step in self.steps():
+               if self.stop.is_set():
+                  self.logg.info("Stopping sweep of {}".format(self.target.name))
+                  return False
+               self.measure(csv, csvs, *step)
+         if self.stop.is_set():
+            return False
+         self.restore()
+         return True
+      except SweepAbort:
+         self.failed = True
+         self.stop.set()
+         return False
+      finally:
+         if self.controller is not None:
+            self.controller.close()
+
+   def write_headers(self, csv, csvs):
+      if (self.rssi_to_use == "beacon"):
+         use_beacon   = "-USED"
+         use_combined = ""
+      else:
+         use_beacon   = ""
+         use_combined = "-USED"
+
+      # Full spread-sheet data
+      csv.write("Regulatory Domain\tCabling Pathloss\tAntenna Gain\tCfg-Channel\tCfg-NSS\tCfg-AP-BW\tTx Power\tBeacon-Signal%s\tCombined-Signal%s\tRSSI 1\tRSSI 2\tRSSI 3\tRSSI 4\tAP-BSSID\tRpt-BW\tRpt-Channel\tRpt-Mode\tRpt-NSS\tRpt-Noise\tRpt-Rxrate\tCtrl-AP-MAC\tCtrl-Channel\tCtrl-Power\tCtrl-dBm\tCalc-dBm-Combined\tDiff-dBm-Combined\tAnt-1\tAnt-2\tAnt-3\tAnt-4\tOffset-1\tOffset-2\tOffset-3\tOffset-4\tPASS/FAIL(+-%sdB)\tTimeStamp\tWarnings-and-Errors"%(use_beacon,use_combined,pf_dbm))
+      csv.write("\n");
+      csv.flush()
+
+      # Summary spread-sheet data
+      csvs.write("Regulatory Domain\tCabling Pathloss\tAntenna Gain\tAP Channel\tNSS\tAP BW\tTx Power\tAllowed Per-Path\tRSSI 1\tRSSI 2\tRSSI 3\tRSSI 4\tAnt-1\tAnt-2\tAnt-3\tAnt-4\tOffset-1\tOffset-2\tOffset-3\tOffset-4\tPASS/FAIL(+-%sdB)\tTimeStamp\tWarnings-and-Errors"%(pf_dbm))
+      csvs.write("\n");
+      csvs.flush()
+
+   def setup(self):
+      """
+      Create the station and its connection, and read the regulatory domain from the controller.
+      """
+      t = self.target
+      args = self.args
+      logg = self.logg
+
+      if (t.create_station != None):
+         if (t.radio == None):
+            logg.info("WARNING --create needs a radio")
+            raise SweepAbort("no radio for {}".format(t.create_station))
+         elif (args.vht160):
+            logg.info("creating station with VHT160 set: {} on radio {}".format(t.create_station,t.radio))
+            subprocess.run(["./lf_associate_ap.pl", "--mgr", t.lfmgr, "--resource", t.lfresource, "--radio", t.radio, "--ssid", args.ssid , "--passphrase", args.ssidpw,
+                    "--security", args.security, "--upstream", t.upstream_port, "--first_ip", "DHCP",
+                    "--first_sta",t.create_station,"--action","add","--xsec","ht160_enable"], timeout=20, capture_output=True)
+            sleep(3)
+         else:
+            logg.info("creating station: {} on radio {}".format(t.create_station,t.radio))
+            subprocess.run(["./lf_associate_ap.pl", "--mgr", t.lfmgr, "--resource", t.lfresource, "--radio", t.radio, "--ssid", args.ssid , "--passphrase", args.ssidpw,
+                    "--security", args.security, "--upstream", t.upstream_port, "--first_ip", "DHCP",
+                    "--first_sta",t.create_station,"--action","add"], timeout=20, capture_output=True)
+            sleep(3)
+
+      # Find LANforge station parent radio
+      self.parent = self.port_state().get("parent dev")
+      if (self.parent == ""):
+         self.parent = None
+
+      # Create downstream connection
+      # First, delete any old one
+      lf = self._lanforge()
+      batch = lf.new_cli_batch(concurrency=1)
+      batch.add("/cli-json/rm_cx", {"test_mgr": "ALL", "cx_name": self.cx_name})
+      batch.add("/cli-json/rm_endp", {"endp_name": "%s-A"%(self.cx_name)})
+      batch.add("/cli-json/rm_endp", {"endp_name": "%s-B"%(self.cx_name)})
+      batch.flush()
+
+      # Now, create the new connection
+      for side, resource, port, rate in (("A", t.lfresource, t.station, 0), ("B", t.lfresource2, t.upstream_port, 1000000)):
+         batch.add("/cli-json/add_endp", {"alias": "%s-%s"%(self.cx_name, side), "shelf": 1, "resource": resource,
+                                          "port": port, "type": "lf_udp", "ip_port": -1, "min_rate": rate,
+                                          "max_rate": rate})
+      batch.barrier()
+      for side in ("A", "B"):
+         batch.add("/cli-json/set_endp_report_timer", {"endp_name": "%s-%s"%(self.cx_name, side), "milliseconds": 1000})
+      batch.add("/cli-json/add_cx", {"alias": self.cx_name, "test_mgr": "default_tm",
+                                     "tx_endp": "%s-A"%(self.cx_name), "rx_endp": "%s-B"%(self.cx_name)})
+      batch.barrier()
+      batch.add("/cli-json/set_cx_report_timer", {"test_mgr": "default_tm", "cx_name": self.cx_name, "milliseconds": 1000})
+      for result in batch.flush():
+         if not result.ok:
+            logg.info("WARNING: {} failed for {}: {}".format(result.url, self.cx_name, result.errors))
+
+      if t.series == "9800":
+         self.ctl([("no_logging_console", None), ("line_console_0", None)], log_output=True)
+
+      self.ctl([("summary", None)], log_output=True)
+
+      # Find our current regulatory domain so we can report it properly
+      entry = self.ctl_state(lambda state: state.ap(t.ap))
+      if (entry != None):
+         self.myrd = entry.country
+
+   def steps(self):
+      """
+      Yield (ch, pathloss, n, bw, tx) for every test point, setting the LANforge radio's NSS
+      as the sweep moves on to each NSS / bandwidth pair.
+      """
+      t = self.target
+      args = self.args
+      logg = self.logg
+      # Loop through all iterations and run txpower tests.
+      for ch in args.channel.split():
+         pathloss = t.pathloss
+         ch_colon = ch.count(":")
+         if (ch_colon == 1):
+            cha = ch.split(":")
+            pathloss = cha[1]
+            ch = cha[0]
+         for n in args.nss.split():
+            for bw in args.bandwidth.split():
+               if (n != "NA"):
+                  ni = int(n)
+                  if (self.parent == None):
+                     logg.info("ERROR:  Skipping setting the spatial streams because cannot find Parent radio for station: %s."%(t.station))
+                  else:
+                     # Set nss on LANforge Station, not sure it can be done on AP
+                     if (bw == "160"):
+                        # 9984 hardware needs 2 chains to do one NSS at 160Mhz
+                        if (ni > 2):
+                           if(args.vht160):
+                              ni = 2
+                              logg.info("NOTE: --vht160 set will set ni : {}".format(ni))
+                              # Set radio to 2x requested value
+                              ni *=2
+                              logg.info("NOTE: --vht160 set will set  ni * 2 : {}".format(ni))
+                           else:
+                              logg.info("NOTE: Skipping NSS %s for 160Mhz, LANforge radios do not support more than 2NSS at 160Mhz currently."%(n))
+                              logg.info("NOTE: use --vht160 to force 2NSS at 160Mhz")
+                              continue
+                        else:
+                           # Set radio to 2x requested value for 160Mhz
+                           ni *= 2
+                  antset = 0 # all available
+                  if (ni == 1):
+                     antset = 1
+                  if (ni == 2):
+                     antset = 4
+                  if (ni == 3):
+                     antset = 7
+                  set_data = {"shelf": 1, "resource": t.lfresource, "radio": self.parent, "antenna": antset}
+                  logg.info("Setting LANforge radio to %s NSS with set_wifi_radio: %s"%(ni, set_data))
+                  self._lanforge().json_post("/cli-json/set_wifi_radio", set_data)
+
+               for tx in args.txpower.split():
+                  yield ch, pathloss, n, bw, tx
+
+   def configure_ap(self, ch, bw, tx):
+      """
+      Disable the AP, apply the settings and enable it again, in one controller transaction.
+      """
+      t = self.target
+      self.logg.info("9800/3504 test_parameters_summary: set : tx: {} ch: {} bw: {}".format(tx,ch,bw))
+      if t.series == "9800":
+         # 9800 series need to  "Configure radio for manual channel assignment"
+         actions = [("disable", None), ("disable_wlan", None), ("disable_network_5ghz", None),
+                    ("disable_network_24ghz", None), ("manual", None)]
+      else:
+         actions = [("disable", None), ("cmd", "config 802.11a disable network"), ("cmd", "config 802.11b disable network")]
+      if (tx != "NA"):
+         actions.append(("txPower", tx))
+      # NSS is set on the station earlier...
+      if (ch != "NA"):
+         actions.append(("channel", ch))
+      if (bw != "NA"):
+         actions.append(("bandwidth", bw))
+      # enable transmission for the entier 802.11z network
+      if t.series == "9800":
+         actions += [("create_wlan", None), ("wireless_tag_policy", None), ("enable_wlan", None),
+                     ("enable_network_5ghz", None), ("enable_network_24ghz", None)]
+      else:
+         actions += [("cmd", "config 802.11a enable network"), ("cmd", "config 802.11b enable network")]
+      actions.append(("enable", None))
+      self.ctl(actions)
+
+   def read_ap_power(self):
+      """
+      :return: (cc_mac, cc_ch, cc_bw, cc_power, cc_dbm) as the controller reports them, "" when unknown
+      """
+      t = self.target
+      logg = self.logg
+      slot = t.slot if t.series == "9800" else None
+      radio = self.ctl_state(lambda state: state.radio(t.ap, slot=slot))
+      if (radio == None):
+         return "", "", "", "", ""
+      logg.info("{} test_parameters: read : {}".format(t.series, radio))
+      cc_ch = ",".join(str(channel) for channel in radio.channels)
+      cc_power = radio.txpower.replace("/", " of ") # spread-sheets turn 1/8 into a date
+      return radio.mac, cc_ch, radio.width, cc_power, str(radio.tx_dbm)
+
+   def measure(self, csv, csvs, ch, pathloss, n, bw, tx):
+      """
+      Configure the AP for one test point, run traffic, and record the result.
+      """
+      t = self.target
+      args = self.args
+      logg = self.logg
+      lf = self._lanforge()
+      antenna_gain = t.antenna_gain
+
+      e_tot = ""
+
+      # Stop traffic
+      self.set_cx_state("STOPPED")
+
+      # TODO:  Down station
+      lf.admin_down(self.station_eid())
+
+      # Disable AP, apply settings, enable AP
+      self.configure_ap(ch, bw, tx)
+
+      # Wait a bit for AP to come back up
+      time.sleep(2)
+      cc_mac, cc_ch, cc_bw, cc_power, cc_dbm = self.read_ap_power()
+      if (cc_dbm == ""):
+         # Could not talk to controller?
+         err = "ERROR:  Could not query dBm from controller, maybe controller died?"
+         logg.info(err)
+         e_tot += err
+         e_tot += "  "
+         if t.series == "9800":
+            logg.info("Check controller and AP , Command on AP to erase the config: capwap ap erase all")
+            self.ctl([("show_wlan_summary", None)], log_output=True)
+
+      # Up station
+      lf.admin_up(self.station_eid())
+
+      i = 0
+      wait_ip_print = False;
+      wait_assoc_print = False;
+      # Wait untill LANforge station connects
+      while True:
+         port = self.port_state()
+         _ip = port.get("ip")
+         # 'ap' is the BSSID once associated, Not-Associated before
+         _associated = re.match('([0-9a-fA-F]{2}:){5}[0-9a-fA-F]{2}$', str(port.get("ap"))) != None
+
+         #logg.info("IP %s  AP %s"%(_ip, port.get("ap")))
+
+         if (_associated):
+            if ((_ip != None) and (_ip != "0.0.0.0")):
+               logg.info("Station is associated with IP address.")
+               break
+            else:
+               if (not wait_ip_print):
+                  logg.info("Waiting for station to get IP Address.")
+                  wait_ip_print = True
+         else:
+            if (not wait_assoc_print):
+               logg.info("Waiting up to 180s for station to associate.")
+               wait_assoc_print = True
+
+         i += 1
+         # We wait a fairly long time since AP will take a long time to start on a CAC channel.
+         if (i > 180):
+            err = "ERROR:  Station did not connect within 180 seconds."
+            logg.info(err)
+            e_tot += err
+            e_tot += "  "
+            if t.series == "9800":
+               self.ctl([("advanced", None)], log_output=True)
+
+            if (args.wait_forever and not self.stop.is_set()):
+               logg.info("Will continue waiting, you may wish to debug the system...")
+               i = 0
+            else:
+               break
+
+         time.sleep(1)
+
+      # Start traffic
+      self.set_cx_state("RUNNING")
+
+      # Wait 10 more seconds
+      logg.info("Waiting {} seconds to let traffic run for a bit, Channel {} NSS {} BW {} TX-Power {}".format(args.duration,ch, n, bw, tx))
+      time.sleep(int(args.duration))
+
+      # Gather probe results and record data, verify NSS, BW, Channel
+      i = 0;
+      beacon_sig = None
+      sig = None
+      pf = 1
+      ants = []
+      while True:
+         pss = self.probe_results()
+
+         foundit = False
+         for line in pss.splitlines():
+            #logg.info("probe-line: %s"%(line))
+            m = re.search('signal avg:\s+(\S+)\s+\[(.*)\]\s+dBm', line)
+            if (m != None):
+               sig = m.group(1)
+               ants = m.group(2).split()
+               q = 0
+               for a in ants:
+                  ants[q] = ants[q].replace(",", "", 1)
+                  q += 1
+               logg.info("sig: %s  ants: %s ants-len: %s n: %s"%(sig, m.group(2), len(ants), n))
+
+               if (len(ants) == int(n)):
+                  foundit = True
+               else:
+                  logg.info("Looking for %s spatial streams, signal avg reported fewer: %s"%(n, m.group(1)))
+
+            m = re.search('beacon signal avg:\s+(\S+)\s+dBm', line)
+            if (m != None):
+               beacon_sig = m.group(1)
+               logg.info("beacon_sig: %s "%(beacon_sig))
+
+         if (foundit):
+            break
+
+         i += 1
+         if (i > 10):
+            err = "Tried and failed 10 times to find correct spatial streams, continuing."
+            logg.info(err)
+            e_tot += err
+            e_tot += "  "
+            while (len(ants) < int(n)):
+               ants.append("")
+            break
+
+      # The station's endpoint receives the downstream traffic
+      endp_stats = lf.json_get("/endp/%s-A?fields=name,rx+bytes"%(self.cx_name))
+      if (endp_stats != None) and ("endpoint" in endp_stats):
+         rx_bytes = int(endp_stats["endpoint"].get("rx bytes", 0))
+         if (rx_bytes == 0):
+            err = "ERROR:  No bytes received by data connection, test results may not be valid."
+            e_tot += err
+            e_tot += "  "
+
+      # Stop traffic
+      self.set_cx_state("STOPPED")
+
+      antstr = ""
+      for x in range(4):
+         if (x < int(n)):
+            #logg.info("x: %s n: %s  len(ants): %s"%(x, n, len(ants)))
+            antstr += ants[x]
+         else:
+            antstr += " "
+         antstr += "\t"
+
+      port = self.port_state()
+      _ap = port.get("ap")
+      _ch = port.get("channel")
+      _mode = port.get("mode")
+      _noise = port.get("noise")
+      _rxrate = port.get("rx-rate")
+      _noise_bare = None
+      if (_noise != None):
+         m = re.search('(-?\d+)', str(_noise))
+         if (m != None):
+            _noise_bare = m.group(1)
+      # NSS and bandwidth the station is receiving at, from the last probe
+      _nss, _bw = parse_rx_bitrate(pss)
+      # without the NSS there is no per-chain result, see _nss_i below
+      _nss_i = 0
+      if (_nss == None) or (_bw == None):
+         e_tot += "ERROR:  Could not detect station NSS and bandwidth.  "
+         pf = 0
+      else:
+         _nss_i = int(_nss)
+
+      # ath10k radios now take noise-floor into account, so adjust_nf
+      # should remain set to false when using those radios.  Possibly other
+      # radios would need this, so leave code in place.
+      rssi_adj = 0
+      if (args.adjust_nf and _noise_bare != None):
+         _noise_i = int(_noise_bare)
+         if (_noise_i == 0):
+            # Guess we could not detect noise properly?
+            e_tot += "WARNING:  Invalid noise-floor, calculations may be inaccurate.  "
+            pf = 0
+         else:
+            rssi_adj = (_noise_i - nf_at_calibration)
+
+      if (sig == None):
+         e_tot += "ERROR:  Could not detect signal level.  "
+         sig = -100
+         pf = 0
+
+      if (beacon_sig == None):
+         e_tot += "ERROR:  Could not detect beacon signal level.  "
+         beacon_sig = -100
+         pf = 0
+
+      pi = int(pathloss)
+      ag = int(antenna_gain)
+      if(self.rssi_to_use == "beacon"):
+         logg.info("rssi_to_use == beacon: beacon_sig: %s "%(beacon_sig))
+         calc_dbm = int(beacon_sig) + pi + rssi_adj + ag
+      else:
+         logg.info("rssi_to_use == combined: sig: %s"%sig)
+         calc_dbm = int(sig) + pi + rssi_adj + ag
+      logg.info("calc_dbm %s"%(calc_dbm))
+
+
+      # Calculated per-antenna power is what we calculate the AP transmitted
+      # at (rssi + pathloss + antenna_gain ).  So, if we see -30 rssi, with pathloss of 44 ,
+      # with antenna gain of 6
+      # then we calculate AP transmitted at +20
+      calc_ant1 = 0
+      if (ants[0] != ""):
+         calc_ant1 = int(ants[0]) + pi + rssi_adj + ag
+      calc_ant2 = 0
+      calc_ant3 = 0
+      calc_ant4 = 0
+      if (len(ants) > 1 and ants[1] != ""):
+         calc_ant2 = int(ants[1]) + pi + rssi_adj + ag
+      if (len(ants) > 2 and ants[2] != ""):
+         calc_ant3 = int(ants[2]) + pi + rssi_adj + ag
+      if (len(ants) > 3 and ants[3] != ""):
+         calc_ant4 = int(ants[3]) + pi + rssi_adj + ag
+
+      diff_a1 = ""
+      diff_a2 = ""
+      diff_a3 = ""
+      diff_a4 = ""
+
+      if (cc_dbm == ""):
+         cc_dbmi = 0
+      else:
+         cc_dbmi = int(cc_dbm)
+      diff_dbm = calc_dbm - cc_dbmi
+      pfs = "PASS"
+      pfrange = pf_dbm;
+
+      # Allowed per path is what we expect the AP should be transmitting at.
+      # calc_ant1 is what we calculated it actually transmitted at based on rssi
+      # pathloss and antenna gain.  Allowed per-path is modified taking into account that multi
+      # NSS tranmission will mean that each chain should be decreased so that sum total
+      # of all chains is equal to the maximum allowed txpower.
+      allowed_per_path = cc_dbmi
+      if (_nss_i == 1):
+         diff_a1 = calc_ant1 - cc_dbmi
+         if (abs(diff_a1) > pfrange):
+            pf = 0
+      if (_nss_i == 2):
+         # NSS of 2 means each chain should transmit at 1/2 total power, thus the '- 3'
+         allowed_per_path = cc_dbmi - 3
+         diff_a1 = calc_ant1 - allowed_per_path
+         diff_a2 = calc_ant2 - allowed_per_path
+         if ((abs(diff_a1) > pfrange) or
+             (abs(diff_a2) > pfrange)):
+            pf = 0
+      if (_nss_i == 3):
+         # NSS of 3 means each chain should transmit at 1/3 total power, thus the '- 5'
+         allowed_per_path = cc_dbmi - 5
+         diff_a1 = calc_ant1 - allowed_per_path
+         diff_a2 = calc_ant2 - allowed_per_path
+         diff_a3 = calc_ant3 - allowed_per_path
+         if ((abs(diff_a1) > pfrange) or
+             (abs(diff_a2) > pfrange) or
+             (abs(diff_a3) > pfrange)):
+            pf = 0
+      if (_nss_i == 4):
+         # NSS of 4 means each chain should transmit at 1/4 total power, thus the '- 6'
+         allowed_per_path = cc_dbmi - 6
+         diff_a1 = calc_ant1 - allowed_per_path
+         diff_a2 = calc_ant2 - allowed_per_path
+         diff_a3 = calc_ant3 - allowed_per_path
+         diff_a4 = calc_ant4 - allowed_per_path
+         # DUT transmits one chain at lower power when using higher MCS, so allow
+         # for that as passing result.
+         failed_low = 0
+         least = 0
+         if (diff_a1 < -pfrange):
+            failed_low += 1
+            least = diff_a1
+         if (diff_a2 < -pfrange):
+            failed_low += 1
+            least = min(least, diff_a2)
+         if (diff_a3 < -pfrange):
+            failed_low += 1
+            least = min(least, diff_a3)
+         if (diff_a4 < -pfrange):
+            failed_low += 1
+            least = min(least, diff_a4)
+
+         if ((least < (-pfrange - pf_a4_dropoff)) or (failed_low >= 1)):
+            pf = 0
+
+         if (diff_a1 > pfrange):
+            pf = 0
+         if (diff_a2 > pfrange):
+            pf = 0
+         if (diff_a3 > pfrange):
+            pf = 0
+         if (diff_a4 > pfrange):
+            pf = 0
+
+      logg.info("_nss {}  allowed_per_path (AP should be transmitting at) {}".format(_nss, allowed_per_path))
+
+      if (pf == 0 or e_tot != ""):
+         pfs = "FAIL"
+
+      time_stamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime()) + "{:.3f}".format(time.time() - (math.floor(time.time())))[1:]
+      ln = "%s\t%s\t%s\t%s\t%s\t%s\t%s\t%s\t%s\t%s%s\t%s\t%s\t%s\t%s\t%s\t%s\t%s\t%s\t%s\t%s\t%s\t%s\t%s\t%s\t%s\t%s\t%s\t%s\t%s\t%s\t%s\t%s"%(
+         self.myrd, pathloss, antenna_gain, ch, n, bw, tx, beacon_sig, sig,
+         antstr, _ap, _bw, _ch, _mode, _nss, _noise, _rxrate,
+         cc_mac, cc_ch, cc_power, cc_dbm,
+         calc_dbm, diff_dbm, calc_ant1, calc_ant2, calc_ant3, calc_ant4,
+         diff_a1, diff_a2, diff_a3, diff_a4, pfs, time_stamp
+         )
+
+      #logg.info("RESULT: %s"%(ln))
+      csv.write(ln)
+      csv.write("\t")
+
+      ln = "%s\t%s\t%s\t%s\t%s\t%s\t%s\t%s\t%s%s\t%s\t%s\t%s\t%s\t%s\t%s\t%s\t%s\t%s"%(
+         self.myrd, pathloss, antenna_gain, _ch, _nss, _bw, tx, allowed_per_path,
+         antstr,
+         calc_ant1, calc_ant2, calc_ant3, calc_ant4,
+         diff_a1, diff_a2, diff_a3, diff_a4, pfs, time_stamp
+         )
+      csvs.write(ln)
+      csvs.write("\t")
+
+      if (_bw != bw):
+         err = "ERROR:  Requested bandwidth: %s != station's reported bandwidth: %s.  "%(bw, _bw)
+         e_tot += err
+         logg.info(err)
+         csv.write(err)
+         csvs.write(err)
+      if (_nss != n):
+         err = "ERROR:  Station NSS: %s != configured: %s.  "%(_nss, n)
+         logg.info(err)
+         csv.write(err)
+         csvs.write(err)
+         e_tot += err
+
+      f = self.report.formats
+      values = [(self.myrd, f["center_blue"]), (_ch, f["center_blue"]), (_nss, f["center_blue"]),
+                (cc_bw, f["center_blue"]), (_bw, f["center_blue"]), (tx, f["center_tan"]),
+                (allowed_per_path, f["center_tan"]), (pathloss, f["center_tan"]), (antenna_gain, f["center_tan"]),
+                (_noise, f["center_tan"])]
+      if (args.adjust_nf):
+         values.append((rssi_adj, f["center_tan"]))
+      values += [(_rxrate, f["center_tan"]), (beacon_sig, f["center_tan"]), (sig, f["center_tan"])]
+      for x in range(4):
+         if (x < int(n)):
+            values.append((ants[x], f["center_peach"]))
+         else:
+            values.append((" ", f["center_peach"]))
+      for calc_ant in (calc_ant1, calc_ant2, calc_ant3, calc_ant4):
+         values.append((calc_ant, f["center_pink"]))
+      for diff_a in (diff_a1, diff_a2, diff_a3, diff_a4):
+         if (diff_a != "" and abs(diff_a) > pfrange):
+            values.append((diff_a, f["center_yel_red"]))
+         else:
+            values.append((diff_a, f["center_yel"]))
+      if (pfs == "FAIL"):
+         values.append((pfs, f["red"]))
+      else:
+         values.append((pfs, f["green"]))
+      values.append((time_stamp, f["green"]))
+      if (e_tot == ""):
+         values.append((e_tot, f["green_left"]))
+      else:
+         values.append((e_tot, f["red_left"]))
+
+      with self.report.lock:
+         for col, (value, cell_format) in enumerate(values):
+            self.worksheet.write(self.row, col, value, cell_format)
+      self.row += 1
+
+      csv.write("\n");
+      csv.flush()
+
+      csvs.write("\n");
+      csvs.flush()
+
+      # write out the data and exit on error : error takes presidence over failure
+      if (e_tot != ""):
+         if(args.exit_on_error):
+            logg.info("EXITING ON ERROR, exit_on_error err: {} ".format(e_tot))
+            subject = "Lanforge: Error {}".format(self.outfile_xlsx)
+            body    = "Lanforeg: Error: AP: {} Channel: {} NSS: {} BW: {} TX-Power {}, pfs: {} time_stamp: {}  {}".format(t.ap, ch, n, bw, tx, pfs, time_stamp, self.outfile_xlsx)
+            send_email(self.email_dicts, subject, body, logg, capture_output=not args.verbose)
+            self.failed = True
+            self.stop.set()
+            return
+
+      # write out the data and exit on failure
+      if (pf == 0):
+         if(args.exit_on_fail):
+            if(e_tot != ""):
+               logg.info("EXITING ON FAILURE as a result of  err {}".format(e_tot))
+            else:
+               logg.info("EXITING ON FAILURE, exit_on_fail set there was no err ")
+            subject = "Lanforge: Failure Found {}".format(self.outfile_xlsx)
+            body    = "Lanforge: Failure Found:  AP: {} Channel: {} NSS: {} BW: {} TX-Power {}, pfs: {} time_stamp: {} {}".format(t.ap,ch, n, bw, tx, pfs, time_stamp,self.outfile_xlsx)
+            send_email(self.email_dicts, subject, body, logg, capture_output=not args.verbose)
+            self.failed = True
+            self.stop.set()
+
+   def restore(self):
+      """
+      Set things back to defaults, or leave them as they are with --keep_state.
+      """
+      t = self.target
+      args = self.args
+      logg = self.logg
+
+      # check if keeping the existing state
+      if(args.keep_state):
+         logg.info("9800/3504 flag --keep_state set thus keeping state")
+         self.ctl([("advanced", None), ("summary", None)], log_output=True)
+         return
+
+      # remove the station
+      if(args.cleanup):
+         logg.info("--cleanup set Deleting all stations on radio {}".format(t.radio))
+         subprocess.run(["./lf_associate_ap.pl", "--mgr", t.lfmgr, "--resource", t.lfresource, "--action", "del_all_phy","--port_del", t.radio], timeout=20, capture_output=True)
+
+      # Disable AP, apply settings, enable AP
+      if t.series == "9800":
+         actions = [("disable", None), ("disable_network_5ghz", None), ("disable_network_24ghz", None)]
+      else:
+         actions = [("disable", None), ("cmd", "config 802.11a disable network"), ("cmd", "config 802.11b disable network")]
+      if (args.txpower.split()[-1] != "NA"):
+         actions.append(("txPower", "1"))
+      # NSS is set on the station earlier...
+      if (args.channel.split()[-1] != "NA"):
+         actions.append(("channel", "36"))
+      if (args.bandwidth.split()[-1] != "NA"):
+         actions.append(("bandwidth", "20"))
+      if t.series == "9800":
+         actions += [("enable_network_5ghz", None), ("enable_network_24ghz", None), ("auto", None)]
+      else:
+         actions += [("cmd", "config 802.11a enable network"), ("cmd", "config 802.11b enable network")]
+      actions.append(("enable", None))
+      self.ctl(actions)
+
+      # Remove LANforge traffic connection
+      batch = self._lanforge().new_cli_batch(concurrency=1)
+      batch.add("/cli-json/set_cx_state", {"test_mgr": "ALL", "cx_name": self.cx_name, "cx_state": "DELETED"})
+      batch.add("/cli-json/rm_endp", {"endp_name": "%s-A"%(self.cx_name)})
+      batch.add("/cli-json/rm_endp", {"endp_name": "%s-B"%(self.cx_name)})
+      batch.flush()
+
+      # Show controller status
+      self.ctl([("advanced", None)], log_output=True)
+
+
 def main():
    global lfmgr
    global lfstation
@@ -240,6 +1242,7 @@ def main():
    parser.add_argument("--station",          type=str, help="LANforge station to use (sta0000, etc)")
    parser.add_argument("--upstream_port",    type=str, help="LANforge upsteram-port to use (eth1, etc)")
    parser.add_argument("--lfmgr",            type=str, help="LANforge Manager IP address")
+   parser.add_argument("--lfmgr_port",       type=int, help="LANforge Manager JSON API port, defaults to 8080",default=8080)
    parser.add_argument("--lfresource",       type=str, help="LANforge resource ID for the station")
    parser.add_argument("--lfresource2",      type=str, help="LANforge resource ID for the upstream port system")
    parser.add_argument("--outfile",          type=str, help="Output file for csv data",default="cisco_power_results")
@@ -267,6 +1270,9 @@ def main():
    parser.add_argument("--exit_on_fail",     action='store_true',help="--exit_on_fail,  exit on test failure")
    parser.add_argument("--exit_on_error",    action='store_true',help="--exit_on_error, exit on test error, test mechanics failed")
    parser.add_argument('-e','--email',       action='append', nargs=1, type=str, help="--email user==<from email> passwd==<email password> to==<to email> smtp==<smtp server> port==<smtp port> 465 (SSL)")
+   parser.add_argument('--dut',              action='append', nargs=1, type=str, help="--dut dest==<controller> ap==<AP> station==<LANforge station> ... one (controller, AP, station) to sweep,\n"
+                       "repeat to sweep several concurrently, each on its own controller.  Keys: %s.  Keys left out come from the command line"%(", ".join(SweepTarget.KEYS)))
+   parser.add_argument('--workers',          type=int, help="--workers <n> sweeps to run at once, defaults to one per --dut")
 
    #current_time = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime()) + "{:.3f}".format(time.time() - (math.floor(time.time())))[1:]  
    #print(current_time)
@@ -399,1221 +1405,67 @@ def main():
        logg.info("ERROR: Antenna gain must be specified.")
        exit(1)
 
-   if (rssi_to_use == "beacon"):
-       use_beacon   = "-USED"
-       use_combined = ""
-   else:
-       use_beacon   = ""
-       use_combined = "-USED"
-
-        
-   # Full spread-sheet data
-   csv = open(full_outfile, "w")
-   csv.write("Regulatory Domain\tCabling Pathloss\tAntenna Gain\tCfg-Channel\tCfg-NSS\tCfg-AP-BW\tTx Power\tBeacon-Signal%s\tCombined-Signal%s\tRSSI 1\tRSSI 2\tRSSI 3\tRSSI 4\tAP-BSSID\tRpt-BW\tRpt-Channel\tRpt-Mode\tRpt-NSS\tRpt-Noise\tRpt-Rxrate\tCtrl-AP-MAC\tCtrl-Channel\tCtrl-Power\tCtrl-dBm\tCalc-dBm-Combined\tDiff-dBm-Combined\tAnt-1\tAnt-2\tAnt-3\tAnt-4\tOffset-1\tOffset-2\tOffset-3\tOffset-4\tPASS/FAIL(+-%sdB)\tTimeStamp\tWarnings-and-Errors"%(use_beacon,use_combined,pf_dbm))
-   csv.write("\n");
-   csv.flush()
-
-   # Summary spread-sheet data
-   csvs = open(outfile, "w")
-   csvs.write("Regulatory Domain\tCabling Pathloss\tAntenna Gain\tAP Channel\tNSS\tAP BW\tTx Power\tAllowed Per-Path\tRSSI 1\tRSSI 2\tRSSI 3\tRSSI 4\tAnt-1\tAnt-2\tAnt-3\tAnt-4\tOffset-1\tOffset-2\tOffset-3\tOffset-4\tPASS/FAIL(+-%sdB)\tTimeStamp\tWarnings-and-Errors"%(pf_dbm))
-   csvs.write("\n");
-   csvs.flush()
-
-   # XLSX file
-   workbook = xlsxwriter.Workbook(outfile_xlsx)
-   worksheet = workbook.add_worksheet()
-
-   #bold = workbook.add_format({'bold': True, 'align': 'center'})
-   dblue_bold = workbook.add_format({'bold': True, 'align': 'center'})
-   dblue_bold.set_bg_color("#b8cbe4")
-   dblue_bold.set_border(1)
-   dtan_bold = workbook.add_format({'bold': True, 'align': 'center'})
-   dtan_bold.set_bg_color("#dcd8c3")
-   dtan_bold.set_border(1)
-   dpeach_bold = workbook.add_format({'bold': True, 'align': 'center'})
-   dpeach_bold.set_bg_color("#ffd8bb")
-   dpeach_bold.set_border(1)
-   dpink_bold = workbook.add_format({'bold': True, 'align': 'center'})
-   dpink_bold.set_bg_color("#fcc8ca")
-   dpink_bold.set_border(1)
-   dyel_bold = workbook.add_format({'bold': True, 'align': 'center'})
-   dyel_bold.set_bg_color("#ffe699")
-   dyel_bold.set_border(1)
-   dgreen_bold = workbook.add_format({'bold': True, 'align': 'center'})
-   dgreen_bold.set_bg_color("#c6e0b4")
-   dgreen_bold.set_border(1)
-   dgreen_bold_left = workbook.add_format({'bold': True, 'align': 'left'})
-   dgreen_bold_left.set_bg_color("#c6e0b4")
-   dgreen_bold_left.set_border(1)
-   #center = workbook.add_format({'align': 'center'})
-   center_blue = workbook.add_format({'align': 'center'})
-   center_blue.set_bg_color("#dbe5f1")
-   center_blue.set_border(1)
-   center_tan = workbook.add_format({'align': 'center'})
-   center_tan.set_bg_color("#edede1")
-   center_tan.set_border(1)
-   center_peach = workbook.add_format({'align': 'center'})
-   center_peach.set_bg_color("#fce4d6")
-   center_peach.set_border(1)
-   center_yel = workbook.add_format({'align': 'center'})
-   center_yel.set_bg_color("#fdf2cc")
-   center_yel.set_border(1)
-   center_yel_red = workbook.add_format({'align': 'center', 'color': 'red'})
-   center_yel_red.set_bg_color("#fdf2cc")
-   center_yel_red.set_border(1)
-   center_pink = workbook.add_format({'align': 'center'})
-   center_pink.set_bg_color("ffd2d3")
-   center_pink.set_border(1)
-   red = workbook.add_format({'color': 'red', 'align': 'center'})
-   red.set_bg_color("#e0efda")
-   red.set_border(1)
-   red_left = workbook.add_format({'color': 'red', 'align': 'left'})
-   red_left.set_bg_color("#e0efda")
-   red_left.set_border(1)
-   green = workbook.add_format({'color': 'green', 'align': 'center'})
-   green.set_bg_color("#e0efda")
-   green.set_border(1)
-   green_left = workbook.add_format({'color': 'green', 'align': 'left'})
-   green_left.set_bg_color("#e0efda")
-   green_left.set_border(1)
-
-   worksheet.set_row(0, 45) # Set height
-   worksheet.set_column(0, 0, 10) # Set width
-
-   col = 0
-   row = 0
-   worksheet.write(row, col, 'Regulatory\nDomain', dblue_bold); col += 1
-   worksheet.write(row, col, 'AP\nChannel', dblue_bold); col += 1
-   worksheet.write(row, col, 'NSS', dblue_bold); col += 1
-   worksheet.set_column(col, col, 10) # Set width
-   worksheet.write(row, col, 'Controller\nBW', dblue_bold); col += 1
-   worksheet.write(row, col, 'STA\nRpt\nBW', dblue_bold); col += 1
-   worksheet.write(row, col, 'Tx\nPower', dtan_bold); col += 1
-   worksheet.write(row, col, 'Allowed\nPer\nPath', dtan_bold); col += 1
-   worksheet.write(row, col, 'Cabling\nPathloss', dtan_bold); col += 1
-   worksheet.write(row, col, 'Antenna\nGain', dtan_bold); col += 1
-   worksheet.write(row, col, 'Noise\n', dpeach_bold); col += 1
-   if (args.adjust_nf):
-       worksheet.write(row, col, 'Noise\nAdjust\n(vs -105)', dpeach_bold); col += 1
-
-   worksheet.set_column(col, col, 15) # Set width
-   worksheet.write(row, col, 'Last\nMCS\n', dpeach_bold); col += 1
-   if(rssi_to_use == "beacon"):
-       worksheet.set_column(col, col, 10) # Set width
-       worksheet.write(row, col, 'Beacon\nRSSI USED\n', dpeach_bold); col += 1
-       worksheet.set_column(col, col, 10) # Set width
-       worksheet.write(row, col, 'Combined\nRSSI\n', dpeach_bold); col += 1
-   else:
-       worksheet.set_column(col, col, 10) # Set width
-       worksheet.write(row, col, 'Beacon\nRSSI\n', dpeach_bold); col += 1
-       worksheet.set_column(col, col, 10) # Set width
-       worksheet.write(row, col, 'Combined\nRSSI USED\n', dpeach_bold); col += 1
-   worksheet.write(row, col, 'RSSI\n1', dpeach_bold); col += 1
-   worksheet.write(row, col, 'RSSI\n2', dpeach_bold); col += 1
-   worksheet.write(row, col, 'RSSI\n3', dpeach_bold); col += 1
-   worksheet.write(row, col, 'RSSI\n4', dpeach_bold); col += 1
-   worksheet.write(row, col, 'Ant\n1', dpink_bold); col += 1
-   worksheet.write(row, col, 'Ant\n2', dpink_bold); col += 1
-   worksheet.write(row, col, 'Ant\n3', dpink_bold); col += 1
-   worksheet.write(row, col, 'Ant\n4', dpink_bold); col += 1
-   worksheet.write(row, col, 'Offset\n1', dyel_bold); col += 1
-   worksheet.write(row, col, 'Offset\n2', dyel_bold); col += 1
-   worksheet.write(row, col, 'Offset\n3', dyel_bold); col += 1
-   worksheet.write(row, col, 'Offset\n4', dyel_bold); col += 1
-   worksheet.set_column(col, col, 12) # Set width
-   worksheet.write(row, col, "PASS /\nFAIL\n( += %s dBm)"%(pf_dbm), dgreen_bold); col += 1
-   worksheet.set_column(col, col, 24) # Set width
-   worksheet.write(row, col, 'Time Stamp\n', dgreen_bold); col += 1
-   worksheet.set_column(col, col, 100) # Set width
-   worksheet.write(row, col, 'Warnings and Errors', dgreen_bold_left); col += 1
-   row += 1
-
-   bandwidths = args.bandwidth.split()
-   channels = args.channel.split()
-   nss = args.nss.split()
-   txpowers = args.txpower.split()
-       
-   if (args.create_station != None):
-       if (args.radio == None):
-           logg.info("WARNING --create needs a radio")
-           exit_test(workbook)
-       elif (args.vht160):
-           logg.info("creating station with VHT160 set: {} on radio {}".format(args.create_station,args.radio))
-           subprocess.run(["./lf_associate_ap.pl", "--radio", args.radio, "--ssid", args.ssid , "--passphrase", args.ssidpw,
-                   "--security", args.security, "--upstream", args.upstream_port, "--first_ip", "DHCP",
-                   "--first_sta",args.create_station,"--action","add","--xsec","ht160_enable"], timeout=20, capture_output=True)
-           sleep(3)
-       else:    
-           logg.info("creating station: {} on radio {}".format(args.create_station,args.radio))
-           subprocess.run(["./lf_associate_ap.pl", "--radio", args.radio, "--ssid", args.ssid , "--passphrase", args.ssidpw,
-                   "--security", args.security, "--upstream", args.upstream_port, "--first_ip", "DHCP",
-                   "--first_sta",args.create_station,"--action","add"], timeout=20, capture_output=True)
-           sleep(3)
-
-
-   # Find LANforge station parent radio
-   parent = None
-   port_stats = subprocess.run(["./lf_portmod.pl", "--manager", lfmgr, "--card",  lfresource, "--port_name", lfstation,
-                                "--show_port", "Parent/Peer"], capture_output=True);
-   pss = port_stats.stdout.decode('utf-8', 'ignore');
-   for line in pss.splitlines():
-       m = re.search('Parent/Peer:\s+(.*)', line)
-       if (m != None):
-           parent = m.group(1)
-
-
-   # Create downstream connection
-   # First, delete any old one
-   subprocess.run(["./lf_firemod.pl", "--manager", lfmgr, "--resource",  lfresource, "--action", "do_cmd",
-                   "--cmd", "rm_cx all c-udp-power"], capture_output=True);
-   subprocess.run(["./lf_firemod.pl", "--manager", lfmgr, "--resource",  lfresource, "--action", "do_cmd",
-                   "--cmd", "rm_endp c-udp-power-A"], capture_output=True);
-   subprocess.run(["./lf_firemod.pl", "--manager", lfmgr, "--resource",  lfresource2, "--action", "do_cmd",
-                   "--cmd", "rm_endp c-udp-power-B"], capture_output=True);
-
-   # Now, create the new connection
-   subprocess.run(["./lf_firemod.pl", "--manager", lfmgr, "--resource",  lfresource, "--action", "create_endp", "--port_name", lfstation,
-                   "--endp_type", "lf_udp", "--endp_name", "c-udp-power-A", "--speed", "0", "--report_timer", "1000"], capture_output=True);
-   subprocess.run(["./lf_firemod.pl", "--manager", lfmgr, "--resource",  lfresource2, "--action", "create_endp", "--port_name", upstream_port,
-                   "--endp_type", "lf_udp", "--endp_name", "c-udp-power-B", "--speed", "1000000", "--report_timer", "1000"], capture_output=True);
-   subprocess.run(["./lf_firemod.pl", "--manager", lfmgr, "--resource",  lfresource, "--action", "create_cx", "--cx_name", "c-udp-power",
-                   "--cx_endps", "c-udp-power-A,c-udp-power-B", "--report_timer", "1000"], capture_output=True);
-
-   myrd = ""
-
-   if args.series == "9800": 
-
-      try:
-         logg.info("9800 cisco_wifi_ctl.py: no_logging_console")
-         advanced = subprocess.run(["./cisco_wifi_ctl.py", "--scheme", scheme, "-d", args.dest, "-u", args.user, "-p", args.passwd, "-a", args.ap, "--band", band,
-                                    "--action", "no_logging_console","--series",args.series,"--port",args.port], capture_output=True, check=True)
-         pss = advanced.stdout.decode('utf-8', 'ignore');
-         logg.info(pss)
-      except subprocess.CalledProcessError as process_error:
-         logg.info("Controller unable to commicate to AP or unable to communicate to controller error code {}  output {}".format(process_error.returncode, process_error.output))
-         exit_test(workbook)
-
-      try:
-         logg.info("9800 cisco_wifi_ctl.py: line_console_0")
-         advanced = subprocess.run(["./cisco_wifi_ctl.py", "--scheme", scheme, "-d", args.dest, "-u", args.user, "-p", args.passwd, "-a", args.ap, "--band", band,
-                                    "--action", "line_console_0","--series",args.series,"--port",args.port], capture_output=True, check=True)
-         pss = advanced.stdout.decode('utf-8', 'ignore');
-         logg.info(pss)
-      except subprocess.CalledProcessError as process_error:
-         logg.info("Controller unable to commicate to AP or unable to communicate to controller error code {}  output {}".format(process_error.returncode, process_error.output))
-         exit_test(workbook)
-
-
-   try:
-      logg.info("9800/3504 cisco_wifi_ctl.py: summary")
-      advanced = subprocess.run(["./cisco_wifi_ctl.py", "--scheme", scheme, "-d", args.dest, "-u", args.user, "-p", args.passwd, "-a", args.ap, "--band", band,
-                                 "--action", "summary","--series",args.series,"--port",args.port], capture_output=True, check=True)
-      pss = advanced.stdout.decode('utf-8', 'ignore');
-      logg.info(pss)
-   except subprocess.CalledProcessError as process_error:
-      logg.info("Controller unable to commicate to AP or unable to communicate to controller error code {}  output {}".format(process_error.returncode, process_error.output))
-      exit_test(workbook)
-         
-   # Find our current regulatory domain so we can report it properly
-   searchap = False
-   for line in pss.splitlines():
-       if (line.startswith("---------")):
-           searchap = True
-           continue
-
-       if (searchap):
-           if args.series == "9800":
-               pat = "%s\s+\S+\s+\S+\s+\S+\s+\S+\s+\S+\s+\S+\s+(\S+)"%(args.ap)
-           else:
-               pat = "%s\s+\S+\s+\S+\s+\S+\s+\S+.*  (\S+)\s+\S+\s*\S+\s+\["%(args.ap)
-           m = re.search(pat, line)
-           if (m != None):
-               myrd = m.group(1)
-
-   # Loop through all iterations and run txpower tests.
-   for ch in channels:
-       pathloss = args.pathloss
-       antenna_gain = args.antenna_gain
-       ch_colon = ch.count(":")
-       if (ch_colon == 1):
-           cha = ch.split(":")
-           pathloss = cha[1]
-           ch = cha[0]
-       for n in nss:
-           for bw in bandwidths:
-               if (n != "NA"):
-                   ni = int(n)
-                   if (parent == None):
-                       logg.info("ERROR:  Skipping setting the spatial streams because cannot find Parent radio for station: %s."%(lfstation))
-                   else:
-                       # Set nss on LANforge Station, not sure it can be done on AP
-                       if (bw == "160"):
-                           # 9984 hardware needs 2 chains to do one NSS at 160Mhz
-                           if (ni > 2):
-                               if(args.vht160):
-                                   ni = 2
-                                   logg.info("NOTE: --vht160 set will set ni : {}".format(ni))
-                                   # Set radio to 2x requested value
-                                   ni *=2
-                                   logg.info("NOTE: --vht160 set will set  ni * 2 : {}".format(ni))
-                               else:    
-                                   logg.info("NOTE: Skipping NSS %s for 160Mhz, LANforge radios do not support more than 2NSS at 160Mhz currently."%(n))
-                                   logg.info("NOTE: use --vht160 to force 2NSS at 160Mhz")
-                                   continue
-                           else:
-                               # Set radio to 2x requested value for 160Mhz
-                               ni *= 2
-                   antset = 0 # all available
-                   if (ni == 1):
-                       antset = 1
-                   if (ni == 2):
-                       antset = 4
-                   if (ni == 3):
-                       antset = 7
-                   set_cmd = "set_wifi_radio 1 %s %s NA NA NA NA NA NA NA NA NA %s"%(lfresource, parent, antset)
-                   logg.info("Setting LANforge radio to %s NSS with command: %s"%(ni, set_cmd))
-                   subprocess.run(["./lf_portmod.pl", "--manager", lfmgr, "--card",  lfresource, "--port_name", parent,
-                                   "--cli_cmd", set_cmd], capture_output=True)
-               
-               for tx in txpowers:
-
-                   e_tot = ""
-
-                   # Stop traffic
-                   subprocess.run(["./lf_firemod.pl", "--manager", lfmgr, "--resource",  lfresource, "--action", "do_cmd",
-                                   "--cmd", "set_cx_state all c-udp-power STOPPED"], capture_output=True);
-
-                   # TODO:  Down station
-                   port_stats = subprocess.run(["./lf_portmod.pl", "--manager", lfmgr, "--card",  lfresource, "--port_name", lfstation,
-                                                "--set_ifstate", "down"]);
-                   
-                   # Disable AP, apply settings, enable AP
-                   logg.info("3504/9800 cisco_wifi_ctl.py: disable AP {}".format(args.ap))
-                   subprocess.run(["./cisco_wifi_ctl.py", "--scheme", scheme, "-d", args.dest, "-u", args.user, "-p", args.passwd, "-a", args.ap, "--band", band,
-                                   "--action", "disable","--series",args.series,"--port", args.port], capture_output=cap_ctl_out, check=True)
-
-                   if args.series == "9800": 
-                       # 9800 series need to  "Configure radio for manual channel assignment"
-                       logg.info("9800 Configure radio for manual channel assignment")
-
-                       try:
-                          logg.info("9800 cisco_wifi_ctl.py: disable_wlan")
-                          subprocess.run(["./cisco_wifi_ctl.py", "--scheme", scheme, "-d", args.dest, "-u", args.user, "-p", args.passwd, "-a", args.ap, "--band", band,
-                                   "--action", "disable_wlan","--series",args.series,"--port", args.port], capture_output=cap_ctl_out, check=True)
-
-                       except subprocess.CalledProcessError as process_error:
-                          logg.info("Controller unable to commicate to AP or unable to communicate to controller error code: {} output {}".format(process_error.returncode, process_error.output)) 
-                          exit_test(workbook)
-                       try:
-                          logg.info("9800 cisco_wifi_ctl.py: disable_network_5ghz")
-                          subprocess.run(["./cisco_wifi_ctl.py", "--scheme", scheme, "-d", args.dest, "-u", args.user, "-p", args.passwd, "-a", args.ap, "--band", band,
-                                   "--action", "disable_network_5ghz","--series",args.series,"--port", args.port], capture_output=cap_ctl_out, check=True) 
-                          
-                       except subprocess.CalledProcessError as process_error:
-                          logg.info("Controller unable to commicate to AP or unable to communicate to controller error code: {} output {}".format(process_error.returncode, process_error.output)) 
-                          exit_test(workbook)
-
-                       try:
-                          logg.info("9800 cisco_wifi_ctl.py: disable_network_24ghz")
-                          subprocess.run(["./cisco_wifi_ctl.py", "--scheme", scheme, "-d", args.dest, "-u", args.user, "-p", args.passwd, "-a", args.ap, "--band", band,
-                                   "--action", "disable_network_24ghz","--series",args.series,"--port", args.port], capture_output=cap_ctl_out, check=True)    
-                       except subprocess.CalledProcessError as process_error:
-                          logg.info("Controller unable to commicate to AP or unable to communicate to controller error code: {} output {}".format(process_error.returncode, process_error.output)) 
-                          exit_test(workbook)
-
-                       try:
-                          logg.info("9800 cisco_wifi_ctl.py: manual")
-                          subprocess.run(["./cisco_wifi_ctl.py", "--scheme", scheme, "-d", args.dest, "-u", args.user, "-p", args.passwd, "-a", args.ap, "--band", band,
-                                   "--action", "manual","--series",args.series,"--port", args.port], capture_output=cap_ctl_out, check=True)
-                       except subprocess.CalledProcessError as process_error:
-                          logg.info("Controller unable to commicate to AP or unable to communicate to controller error code: {} output {}".format(process_error.returncode, process_error.output)) 
-                          exit_test(workbook)
-                   else:
-                       try:
-                          logg.info("3504 cisco_wifi_ctl.py: config 802.11a disable network")
-                          subprocess.run(["./cisco_wifi_ctl.py", "--scheme", scheme, "-d", args.dest, "-u", args.user, "-p", args.passwd, "-a", args.ap, "--band", band,
-                                   "--action", "cmd", "--value", "config 802.11a disable network","--series",args.series,"--port", args.port], capture_output=cap_ctl_out, check=True)
-                       except subprocess.CalledProcessError as process_error:
-                         logg.info("Controller unable to commicate to AP or unable to communicate to controller error code: {} output {}".format(process_error.returncode, process_error.output)) 
-                         exit_test(workbook)
-                         
- 
-                       try:
-                          logg.info("3504 cisco_wifi_ctl.py: config 802.11b disable network")
-                          subprocess.run(["./cisco_wifi_ctl.py", "--scheme", scheme, "-d", args.dest, "-u", args.user, "-p", args.passwd, "-a", args.ap, "--band", band,
-                                   "--action", "cmd", "--value", "config 802.11b disable network","--port", args.port], capture_output=cap_ctl_out, check=True)
-                       except subprocess.CalledProcessError as process_error:
-                          logg.info("Controller unable to commicate to AP or unable to communicate to controller error code: {} output {}".format(process_error.returncode, process_error.output))
-                          exit_test(workbook) 
-
-                   logg.info("9800/3504 test_parameters_summary: set : tx: {} ch: {} bw: {}".format(tx,ch,bw))
-                   if (tx != "NA"):
-                       logg.info("9800/3504 test_parameters: set txPower: {}".format(tx))
-                       try:
-                          logg.info("9800/3504 cisco_wifi_ctl.py: txPower {}".format(tx))
-                          subprocess.run(["./cisco_wifi_ctl.py", "--scheme", scheme, "-d", args.dest, "-u", args.user, "-p", args.passwd, "-a", args.ap, "--band", band,
-                                       "--action", "txPower", "--value", tx, "--series" , args.series,"--port", args.port], capture_output=cap_ctl_out, check=True)
-                       except subprocess.CalledProcessError as process_error:
-                          logg.info("Controller unable to commicate to AP or unable to communicate to controller error code: {} output {}".format(process_error.returncode, process_error.output)) 
-                          exit_test(workbook)
-
-                   # NSS is set on the station earlier...
-                       
-                   if (ch != "NA"):
-                       logg.info("9800/3504 test_parameters set channel: {}".format(ch))
-                       try:
-                          logg.info("9800/3504 cisco_wifi_ctl.py: channel {}".format(ch))
-                          subprocess.run(["./cisco_wifi_ctl.py", "--scheme", scheme, "-d", args.dest, "-u", args.user, "-p", args.passwd, "-a", args.ap, "--band", band,
-                                       "--action", "channel", "--value", ch, "--series" , args.series,"--port", args.port], capture_output=cap_ctl_out, check=True)
-                       except subprocess.CalledProcessError as process_error:
-                          logg.info("Controller unable to commicate to AP or unable to communicate to controller error code: {} output {}".format(process_error.returncode, process_error.output)) 
-                          exit_test(workbook)
-
-                   if (bw != "NA"):
-                       logg.info("9800/3504 test_parameters bandwidth: set : {}".format(bw))
-                       try:
-                          logg.info("9800/3504 cisco_wifi_ctl.py: bandwidth {}".format(bw))
-                          subprocess.run(["./cisco_wifi_ctl.py", "--scheme", scheme, "-d", args.dest, "-u", args.user, "-p", args.passwd, "-a", args.ap, "--band", band,
-                                       "--action", "bandwidth", "--value", bw, "--series" , args.series,"--port", args.port], capture_output=cap_ctl_out, check=True)
-                       except subprocess.CalledProcessError as process_error:
-                          logg.info("Controller unable to commicate to AP or unable to communicate to controller error code: {} output {}".format(process_error.returncode, process_error.output))
-                          exit_test(workbook) 
-
-                   if args.series == "9800":
-                       #logg.info("9800 cisco_wifi_ctl.py: delete_wlan")
-                       #subprocess.run(["./cisco_wifi_ctl.py", "--scheme", scheme, "-d", args.dest, "-u", args.user, "-p", args.passwd, "-a", args.ap, "--band", band,
-                       #            "--action", "delete_wlan","--series",args.series, "--wlan", args.wlan, "--wlanID", args.wlanID], capture_output=True, check=True)    
-
-                       try:
-                           logg.info("9800 cisco_wifi_ctl.py: create_wlan wlan {} wlanID {} port {}".format(args.wlan, args.wlanID, args.port))
-                           subprocess.run(["./cisco_wifi_ctl.py", "--scheme", scheme, "-d", args.dest, "-u", args.user, "-p", args.passwd, "-a", args.ap, "--band", band,
-                                   "--action", "create_wlan","--series",args.series, "--wlan", args.wlan, "--wlanID", args.wlanID,"--port", args.port], capture_output=cap_ctl_out, check=True)    
-                       except subprocess.CalledProcessError as process_error:
-                          logg.info("Controller unable to commicate to AP or unable to communicate to controller error code: {} output {}".format(process_error.returncode, process_error.output)) 
-                          exit_test(workbook)
-
-                       try:
-                          logg.info("9800 cisco_wifi_ctl.py: wireless_tag_policy")
-                          subprocess.run(["./cisco_wifi_ctl.py", "--scheme", scheme, "-d", args.dest, "-u", args.user, "-p", args.passwd, "-a", args.ap, "--band", band,
-                                   "--action", "wireless_tag_policy","--series",args.series,"--port", args.port], capture_output=cap_ctl_out, check=True) 
-                       except subprocess.CalledProcessError as process_error:
-                          logg.info("Controller unable to commicate to AP or unable to communicate to controller error code: {} output {}".format(process_error.returncode, process_error.output)) 
-                          exit_test(workbook)
-
-                       try:
-                          logg.info("9800 cisco_wifi_ctl.py: enable_wlan")
-                          subprocess.run(["./cisco_wifi_ctl.py", "--scheme", scheme, "-d", args.dest, "-u", args.user, "-p", args.passwd, "-a", args.ap, "--band", band,
-                                   "--action", "enable_wlan","--series",args.series,"--port", args.port], capture_output=cap_ctl_out, check=True)                 
-                       except subprocess.CalledProcessError as process_error:
-                          logg.info("Controller unable to commicate to AP or unable to communicate to controller error code: {} output {}".format(process_error.returncode, process_error.output)) 
-                          exit_test(workbook)
-
-                   # enable transmission for the entier 802.11z network
-                   if args.series == "9800":
-                       try:  
-                          logg.info("9800 cisco_wifi_ctl.py: enable_network_5ghz")
-                          subprocess.run(["./cisco_wifi_ctl.py", "--scheme", scheme, "-d", args.dest, "-u", args.user, "-p", args.passwd, "-a", args.ap, "--band", band,
-                                   "--action", "enable_network_5ghz","--series",args.series,"--port", args.port], capture_output=cap_ctl_out, check=True)   
-                       except subprocess.CalledProcessError as process_error:
-                          logg.info("Controller unable to commicate to AP or unable to communicate to controller error code: {} output {}".format(process_error.returncode, process_error.output)) 
-                          exit_test(workbook)
-
-                       try:
-                          logg.info("9800 cisco_wifi_ctl.py: enable_network_24ghz")
-                          subprocess.run(["./cisco_wifi_ctl.py", "--scheme", scheme, "-d", args.dest, "-u", args.user, "-p", args.passwd, "-a", args.ap, "--band", band,
-                                   "--action", "enable_network_24ghz","--series",args.series,"--port", args.port], capture_output=cap_ctl_out, check=True)                 
-                       except subprocess.CalledProcessError as process_error:
-                          logg.info("Controller unable to commicate to AP or unable to communicate to controller error code: {} output {}".format(process_error.returncode, process_error.output)) 
-                          exit_test(workbook)
-                   else:    
-                       try:
-                          logg.info("3504 cisco_wifi_ctl.py: config 802.11a enable network")
-                          subprocess.run(["./cisco_wifi_ctl.py", "--scheme", scheme, "-d", args.dest, "-u", args.user, "-p", args.passwd, "-a", args.ap, "--band", band,
-                                   "--action", "cmd", "--value", "config 802.11a enable network","--port", args.port], capture_output=cap_ctl_out, check=True)
-                       except subprocess.CalledProcessError as process_error:
-                          logg.info("Controller unable to commicate to AP or unable to communicate to controller error code: {} output {}".format(process_error.returncode, process_error.output)) 
-                          exit_test(workbook)
-
-                       try:
-                          logg.info("3504 cisco_wifi_ctl.py: config 802.11a enable network")
-                          subprocess.run(["./cisco_wifi_ctl.py", "--scheme", scheme, "-d", args.dest, "-u", args.user, "-p", args.passwd, "-a", args.ap, "--band", band,
-                                   "--action", "cmd", "--value", "config 802.11b enable network","--port", args.port], capture_output=cap_ctl_out, check=True)
-                       except subprocess.CalledProcessError as process_error:
-                          logg.info("Controller unable to commicate to AP or unable to communicate to controller error code: {} output {}".format(process_error.returncode, process_error.output)) 
-                          exit_test(workbook)
-
-                   try: 
-                      logg.info("9800/3504 cisco_wifi_ctl.py: enable")
-                      subprocess.run(["./cisco_wifi_ctl.py", "--scheme", scheme, "-d", args.dest, "-u", args.user, "-p", args.passwd, "-a", args.ap, "--band", band,
-                                   "--action", "enable", "--series" , args.series,"--port", args.port], capture_output=cap_ctl_out, check=True)
-                   except subprocess.CalledProcessError as process_error:
-                      logg.info("Controller unable to commicate to AP or unable to communicate to controller error code: {} output {}".format(process_error.returncode, process_error.output)) 
-                      exit_test(workbook)
-
-                   # Wait a bit for AP to come back up
-                   time.sleep(2)
-                   if args.series == "9800":
-                       try:
-                          logg.info("9800 cisco_wifi_ctl.py: advanced")
-                          advanced = subprocess.run(["./cisco_wifi_ctl.py", "--scheme", scheme, "-d", args.dest, "-u", args.user, "-p", args.passwd, "-a", args.ap, "--band", band,
-                                              "--action", "advanced","--series" , args.series,"--port", args.port], capture_output=True, check=True)
-                          pss = advanced.stdout.decode('utf-8', 'ignore')
-                          logg.info(pss)
-                       except subprocess.CalledProcessError as process_error:
-                          logg.info("Controller unable to commicate to AP or unable to communicate to controller error code: {} output {}".format(process_error.returncode, process_error.output)) 
-                          exit_test(workbook)
-
-                       searchap = False
-                       cc_mac = ""
-                       cc_ch = ""
-                       cc_bw = ""
-                       cc_power = ""
-                       cc_dbm = ""
-                       for line in pss.splitlines():
-                           if (line.startswith("---------")):
-                               searchap = True
-                               continue
-
-                           if (searchap):
-                               pat = "%s\s+(\S+)\s+(%s)\s+\S+\s+\S+\s+(\S+)\s+(\S+)\s+(\S+)\s+dBm\)+\s+(\S+)+\s"%(args.ap,args.slot)
-                               m = re.search(pat, line)
-                               if (m != None):
-                                   if(m.group(2) == args.slot):
-                                       cc_mac = m.group(1)
-                                       cc_slot = m.group(2)
-                                       cc_ch = m.group(6);  # (132,136,140,144)
-                                       cc_power = m.group(4)
-                                       cc_power = cc_power.replace("/", " of ") # spread-sheets turn 1/8 into a date
-                                       cc_dbm = m.group(5)
-                                       cc_dbm = cc_dbm.replace("(","")
-
-                                       cc_ch_count = cc_ch.count(",") + 1
-                                       cc_bw = m.group(3)
-                                       logg.info("group 1: {} 2: {} 3: {} 4: {} 5: {} 6: {}".format(m.group(1),m.group(2),m.group(3),m.group(4),m.group(5),m.group(6)))
-                                       logg.info("9800 test_parameters_summary:  read: tx: {} ch: {} bw: {}".format(tx,ch,bw))
-
-                                       logg.info("9800 test_parameters cc_mac: read : {}".format(cc_mac))
-                                       logg.info("9800 test_parameters cc_slot: read : {}".format(cc_slot))
-                                       logg.info("9800 test_parameters cc_count: read : {}".format(cc_ch_count))
-                                       logg.info("9800 test_parameters cc_bw: read : {}".format(cc_bw))
-                                       logg.info("9800 test_parameters cc_power: read : {}".format(cc_power))
-                                       logg.info("9800 test_parameters cc_dbm: read : {}".format(cc_dbm))
-                                       logg.info("9800 test_parameters cc_ch: read : {}".format(cc_ch))
-                                       break
-
-                       if (cc_dbm == ""):
-                          # Could not talk to controller?
-                          err = "ERROR:  Could not query dBm from controller, maybe controller died?"
-                          logg.info(err)
-                          logg.info("Check controller and AP , Command on AP to erase the config: capwap ap erase all")
-                          e_tot += err
-                          e_tot += "  "
-                       try:
-                          logg.info("9800 cisco_wifi_ctl.py: show_wlan_summary")
-                          wlan_summary = subprocess.run(["./cisco_wifi_ctl.py", "--scheme", scheme, "-d", args.dest, "-u", args.user, "-p", args.passwd, "-a", args.ap, "--band", band,
-                                              "--action", "show_wlan_summary","--series" , args.series,"--port", args.port], capture_output=True, check=True)
-                          pss = wlan_summary.stdout.decode('utf-8', 'ignore')
-                          logg.info(pss)
-                       except subprocess.CalledProcessError as process_error:
-                          logg.info("Controller unable to commicate to AP or unable to communicate to controller error code: {} output {}".format(process_error.returncode, process_error.output)) 
-                   else:
-                       try:
-                           logg.info("3504 cisco_wifi_ctl.py: advanced")
-                           advanced = subprocess.run(["./cisco_wifi_ctl.py", "--scheme", scheme, "-d", args.dest, "-u", args.user, "-p", args.passwd, "-a", args.ap, "--band", band,
-                                              "--action", "advanced","--port", args.port], capture_output=True, check=True)
-                           pss = advanced.stdout.decode('utf-8', 'ignore')
-                           logg.info(pss)
-                       except subprocess.CalledProcessError as process_error:
-                           logg.info("Controller unable to commicate to AP or unable to communicate to controller error code: {} output {}".format(process_error.returncode, process_error.output)) 
-                           exit_test(workbook)
-
-                       searchap = False
-                       cc_mac = ""
-                       cc_ch = ""
-                       cc_bw = ""
-                       cc_power = ""
-                       cc_dbm = ""
-                       ch_count = ""
-                       for line in pss.splitlines():
-                           if (line.startswith("---------")):
-                               searchap = True
-                               continue
-
-                           if (searchap):
-                               pat = "%s\s+(\S+)\s+\S+\s+\S+\s+\S+\s+(\S+)\s+(\S+)\s+\(\s*(\S+)\s+dBm"%(args.ap)
-                               m = re.search(pat, line)
-                               if (m != None):
-                                   cc_mac = m.group(1)
-                                   cc_ch = m.group(2);  # (132,136,140,144)
-                                   cc_power = m.group(3)
-                                   cc_power = cc_power.replace("/", " of ", 1) # spread-sheets turn 1/8 into a date
-                                   cc_dbm = m.group(4)
-
-                                   ch_count = cc_ch.count(",")
-                                   cc_bw = 20 * (ch_count + 1)
-                                   
-                                   break
-                                
-                       if (cc_dbm == ""):
-                          # Could not talk to controller?
-                          err = "ERROR:  Could not query dBm from controller, maybe controller died?"
-                          logg.info(err)
-                          e_tot += err
-                          e_tot += "  "
-
-                       logg.info("3504 test_parameters cc_mac: read : {}".format(cc_mac))
-                       logg.info("3504 test_parameters cc_count: read : {}".format(ch_count))
-                       logg.info("3504 test_parameters cc_bw: read : {}".format(cc_bw))
-                       logg.info("3504 test_parameters cc_power: read : {}".format(cc_power))
-                       logg.info("3504 test_parameters cc_dbm: read : {}".format(cc_dbm))
-                       logg.info("3504 test_parameters cc_ch: read : {}".format(cc_ch))
-
-
-                   # Up station
-                   subprocess.run(["./lf_portmod.pl", "--manager", lfmgr, "--card",  lfresource, "--port_name", lfstation,
-                                   "--set_ifstate", "up"]);
-
-                   i = 0
-                   wait_ip_print = False;
-                   wait_assoc_print = False;
-                   # Wait untill LANforge station connects
-                   while True:
-                       port_stats = subprocess.run(["./lf_portmod.pl", "--manager", lfmgr, "--card",  lfresource, "--port_name", lfstation,
-                                                    "--show_port", "AP,IP,Mode,NSS,Bandwidth,Channel,Signal,Noise,Status,RX-Rate"],capture_output=True, check=True)
-                       pss = port_stats.stdout.decode('utf-8', 'ignore');
-
-                       _status = None
-                       _ip = None
-
-                       for line in pss.splitlines():
-                           m = re.search('Status:\s+(.*)', line)
-                           if (m != None):
-                               _status = m.group(1)
-                           m = re.search('IP:\s+(.*)', line)
-                           if (m != None):
-                               _ip = m.group(1)
-
-                       #logg.info("IP %s  Status %s"%(_ip, _status))
-                       
-                       if (_status == "Authorized"):
-                           if ((_ip != None) and (_ip != "0.0.0.0")):
-                               logg.info("Station is associated with IP address.")
-                               break
-                           else:
-                               if (not wait_ip_print):
-                                   logg.info("Waiting for station to get IP Address.")
-                                   wait_ip_print = True
-                       else:
-                           if (not wait_assoc_print):
-                               logg.info("Waiting up to 180s for station to associate.")
-                               wait_assoc_print = True
-
-                       i += 1
-                       # We wait a fairly long time since AP will take a long time to start on a CAC channel.
-                       if (i > 180):
-                           err = "ERROR:  Station did not connect within 180 seconds."
-                           logg.info(err)
-                           e_tot += err
-                           e_tot += "  "
-                           if args.series == "9800":
-                               try:
-                                  logg.info("9800 cisco_wifi_ctl.py: advanced")
-                                  advanced = subprocess.run(["./cisco_wifi_ctl.py", "--scheme", scheme, "-d", args.dest, "-u", args.user, "-p", args.passwd, "-a", args.ap, "--band", band,
-                                              "--action", "advanced","--series" , args.series,"--port", args.port], capture_output=True, check=True)
-                                  pss = advanced.stdout.decode('utf-8', 'ignore')
-                                  logg.info(pss)
-                               except subprocess.CalledProcessError as process_error:
-                                  logg.info("Controller unable to commicate to AP or unable to communicate to controller error code: {} output {}".format(process_error.returncode, process_error.output)) 
-                                  exit_test(workbook)
-
-                           if (args.wait_forever):
-                               logg.info("Will continue waiting, you may wish to debug the system...")
-                               i = 0
-                           else:
-                               break
-
-                       time.sleep(1)
-
-                   # Start traffic
-                   subprocess.run(["./lf_firemod.pl", "--manager", lfmgr, "--resource",  lfresource, "--action", "do_cmd",
-                                   "--cmd", "set_cx_state all c-udp-power RUNNING"], capture_output=True, check=True)
-
-                   # Wait 10 more seconds
-                   logg.info("Waiting {} seconds to let traffic run for a bit, Channel {} NSS {} BW {} TX-Power {}".format(args.duration,ch, n, bw, tx))
-                   time.sleep(int(args.duration))
-
-                   # Gather probe results and record data, verify NSS, BW, Channel
-                   i = 0;
-                   beacon_sig = None
-                   sig = None
-                   pf = 1
-                   ants = []
-                   while True:                       
-                       time.sleep(1)
-                       port_stats = subprocess.run(["./lf_portmod.pl", "--manager", lfmgr, "--card",  lfresource, "--port_name", lfstation,
-                                                    "--cli_cmd", "probe_port 1 %s %s"%(lfresource, lfstation)],capture_output=True, check=True)
-                       pss = port_stats.stdout.decode('utf-8', 'ignore')
-
-                       foundit = False
-                       for line in pss.splitlines():
-                           #logg.info("probe-line: %s"%(line))
-                           m = re.search('signal avg:\s+(\S+)\s+\[(.*)\]\s+dBm', line)
-                           if (m != None):
-                               sig = m.group(1)
-                               ants = m.group(2).split()
-                               q = 0
-                               for a in ants:
-                                   ants[q] = ants[q].replace(",", "", 1)
-                                   q += 1
-
-                               logg.info("sig: %s  ants: %s ants-len: %s n: %s"%(sig, m.group(2), len(ants), n))
-
-                               if (len(ants) == int(n)):
-                                   foundit = True
-                               else:
-                                   logg.info("Looking for %s spatial streams, signal avg reported fewer: %s"%(n, m.group(1)))
-
-                           m = re.search('beacon signal avg:\s+(\S+)\s+dBm', line)
-                           if (m != None):
-                               beacon_sig = m.group(1)
-                               logg.info("beacon_sig: %s "%(beacon_sig))
-                               
-                       if (foundit):
-                           break
-
-                       i += 1
-                       if (i > 10):
-                           err = "Tried and failed 10 times to find correct spatial streams, continuing."
-                           logg.info(err)
-                           e_tot += err
-                           e_tot += "  "
-                           while (len(ants) < int(n)):
-                               ants.append("")
-                           break
-
-                   endp_stats = subprocess.run(["./lf_firemod.pl", "--manager", lfmgr, "--resource",  lfresource, "--endp_vals", "rx_bps",
-                                                "--cx_name", "c-udp-power"],capture_output=True, check=True)
-
-                   pss = endp_stats.stdout.decode('utf-8', 'ignore');
-
-                   for line in pss.splitlines():
-                       #logg.info("probe-line: %s"%(line))
-                       m = re.search('Rx Bytes:\s+(\d+)', line)
-                       if (m != None):
-                           rx_bytes = int(m.group(1))
-                           if (rx_bytes == 0):
-                               err = "ERROR:  No bytes received by data connection, test results may not be valid."
-                               e_tot += err
-                               e_tot += "  "
-
-                   # Stop traffic
-                   subprocess.run(["./lf_firemod.pl", "--manager", lfmgr, "--resource",  lfresource, "--action", "do_cmd",
-                                   "--cmd", "set_cx_state all c-udp-power STOPPED"],capture_output=True, check=True)
-
-                   antstr = ""
-                   for x in range(4):
-                       if (x < int(n)):
-                           #logg.info("x: %s n: %s  len(ants): %s"%(x, n, len(ants)))
-                           antstr += ants[x]
-                       else:
-                           antstr += " "
-                       antstr += "\t"
-
-                   port_stats = subprocess.run(["./lf_portmod.pl", "--manager", lfmgr, "--card",  lfresource, "--port_name", lfstation,
-                                                "--show_port", "AP,IP,Mode,NSS,Bandwidth,Channel,Signal,Noise,Status,RX-Rate"], capture_output=True, check=True)
-                   pss = port_stats.stdout.decode('utf-8', 'ignore');
-
-                   _ap = None
-                   _bw = None
-                   _ch = None
-                   _mode = None
-                   _nss = None
-                   _noise = None
-                   _rxrate = None
-                   _noise_bare = None
-
-                   for line in pss.splitlines():
-                       m = re.search('AP:\s+(.*)', line)
-                       if (m != None):
-                           _ap = m.group(1)
-                       m = re.search('Bandwidth:\s+(.*)Mhz', line)
-                       if (m != None):
-                           _bw = m.group(1)
-                       m = re.search('Channel:\s+(.*)', line)
-                       if (m != None):
-                           _ch = m.group(1)
-                       m = re.search('Mode:\s+(.*)', line)
-                       if (m != None):
-                           _mode = m.group(1)
-                       m = re.search('NSS:\s+(.*)', line)
-                       if (m != None):
-                           _nss = m.group(1)
-                       m = re.search('Noise:\s+(.*)', line)
-                       if (m != None):
-                           _noise = m.group(1)
-                       m = re.search('Noise:\s+(.*)dBm', line)
-                       if (m != None):
-                           _noise_bare = m.group(1)
-                       m = re.search('RX-Rate:\s+(.*)', line)
-                       if (m != None):
-                           _rxrate = m.group(1)
-
-                   # ath10k radios now take noise-floor into account, so adjust_nf
-                   # should remain set to false when using those radios.  Possibly other
-                   # radios would need this, so leave code in place.
-                   rssi_adj = 0
-                   if (args.adjust_nf and _noise_bare != None):
-                       _noise_i = int(_noise_bare)
-                       if (_noise_i == 0):
-                           # Guess we could not detect noise properly?
-                           e_tot += "WARNING:  Invalid noise-floor, calculations may be inaccurate.  "
-                           pf = 0
-                       else:
-                           rssi_adj = (_noise_i - nf_at_calibration)
-
-                   if (sig == None):
-                       e_tot += "ERROR:  Could not detect signal level.  "
-                       sig = -100
-                       pf = 0
-
-                   if (beacon_sig == None):   
-                       e_tot += "ERROR:  Could not detect beacon signal level.  "
-                       beacon_sig = -100
-                       pf = 0
-
-                   pi = int(pathloss)
-                   ag = int(antenna_gain)   
-                   if(rssi_to_use == "beacon"):
-                       logg.info("rssi_to_use == beacon: beacon_sig: %s "%(beacon_sig))
-                       calc_dbm = int(beacon_sig) + pi + rssi_adj + ag
-                   else:
-                       logg.info("rssi_to_use == combined: sig: %s"%sig)
-                       calc_dbm = int(sig) + pi + rssi_adj + ag
-                   logg.info("calc_dbm %s"%(calc_dbm))
-
-
-                   # Calculated per-antenna power is what we calculate the AP transmitted
-                   # at (rssi + pathloss + antenna_gain ).  So, if we see -30 rssi, with pathloss of 44 ,
-                   # with antenna gain of 6 
-                   # then we calculate AP transmitted at +20
-                   calc_ant1 = 0
-                   if (ants[0] != ""):
-                       calc_ant1 = int(ants[0]) + pi + rssi_adj + ag
-                   calc_ant2 = 0
-                   calc_ant3 = 0
-                   calc_ant4 = 0
-                   if (len(ants) > 1 and ants[1] != ""):
-                       calc_ant2 = int(ants[1]) + pi + rssi_adj + ag
-                   if (len(ants) > 2 and ants[2] != ""):
-                       calc_ant3 = int(ants[2]) + pi + rssi_adj + ag
-                   if (len(ants) > 3 and ants[3] != ""):
-                       calc_ant4 = int(ants[3]) + pi + rssi_adj + ag
-
-                   diff_a1 = ""
-                   diff_a2 = ""
-                   diff_a3 = ""
-                   diff_a4 = ""
-
-                   if (cc_dbm == ""):
-                      cc_dbmi = 0
-                   else:
-                      cc_dbmi = int(cc_dbm)
-                   diff_dbm = calc_dbm - cc_dbmi
-                   pfs = "PASS"
-                   pfrange = pf_dbm;
-
-                   # Allowed per path is what we expect the AP should be transmitting at.
-                   # calc_ant1 is what we calculated it actually transmitted at based on rssi
-                   # pathloss and antenna gain.  Allowed per-path is modified taking into account that multi
-                   # NSS tranmission will mean that each chain should be decreased so that sum total
-                   # of all chains is equal to the maximum allowed txpower.
-                   allowed_per_path = cc_dbmi
-                   if (int(_nss) == 1):
-                       diff_a1 = calc_ant1 - cc_dbmi
-                       if (abs(diff_a1) > pfrange):
-                           pf = 0
-                   if (int(_nss) == 2):
-                       # NSS of 2 means each chain should transmit at 1/2 total power, thus the '- 3'
-                       allowed_per_path = cc_dbmi - 3
-                       diff_a1 = calc_ant1 - allowed_per_path
-                       diff_a2 = calc_ant2 - allowed_per_path
-                       if ((abs(diff_a1) > pfrange) or
-                           (abs(diff_a2) > pfrange)):
-                           pf = 0
-                   if (int(_nss) == 3):
-                       # NSS of 3 means each chain should transmit at 1/3 total power, thus the '- 5'
-                       allowed_per_path = cc_dbmi - 5
-                       diff_a1 = calc_ant1 - allowed_per_path
-                       diff_a2 = calc_ant2 - allowed_per_path
-                       diff_a3 = calc_ant3 - allowed_per_path
-                       if ((abs(diff_a1) > pfrange) or
-                           (abs(diff_a2) > pfrange) or
-                           (abs(diff_a3) > pfrange)):
-                           pf = 0
-                   if (int(_nss) == 4):
-                       # NSS of 4 means each chain should transmit at 1/4 total power, thus the '- 6'
-                       allowed_per_path = cc_dbmi - 6
-                       diff_a1 = calc_ant1 - allowed_per_path
-                       diff_a2 = calc_ant2 - allowed_per_path
-                       diff_a3 = calc_ant3 - allowed_per_path
-                       diff_a4 = calc_ant4 - allowed_per_path
-                       # DUT transmits one chain at lower power when using higher MCS, so allow
-                       # for that as passing result.
-                       failed_low = 0
-                       least = 0
-                       if (diff_a1 < -pfrange):
-                           failed_low += 1
-                           least = diff_a1
-                       if (diff_a2 < -pfrange):
-                           failed_low += 1
-                           least = min(least, diff_a2)
-                       if (diff_a3 < -pfrange):
-                           failed_low += 1
-                           least = min(least, diff_a3)
-                       if (diff_a4 < -pfrange):
-                           failed_low += 1
-                           least = min(least, diff_a4)
-
-                       if ((least < (-pfrange - pf_a4_dropoff)) or (failed_low >= 1)):
-                           pf = 0
-
-                       if (diff_a1 > pfrange):
-                           pf = 0
-                       if (diff_a2 > pfrange):
-                           pf = 0
-                       if (diff_a3 > pfrange):
-                           pf = 0
-                       if (diff_a4 > pfrange):
-                           pf = 0
-                       
-                   logg.info("_nss {}  allowed_per_path (AP should be transmitting at) {}".format(_nss, allowed_per_path))
-
-                   if (pf == 0 or e_tot != ""):
-                       pfs = "FAIL"
-
-                   time_stamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime()) + "{:.3f}".format(time.time() - (math.floor(time.time())))[1:]  
-                   ln = "%s\t%s\t%s\t%s\t%s\t%s\t%s\t%s\t%s\t%s%s\t%s\t%s\t%s\t%s\t%s\t%s\t%s\t%s\t%s\t%s\t%s\t%s\t%s\t%s\t%s\t%s\t%s\t%s\t%s\t%s\t%s\t%s"%(
-                       myrd, pathloss, antenna_gain, ch, n, bw, tx, beacon_sig, sig,
-                       antstr, _ap, _bw, _ch, _mode, _nss, _noise, _rxrate,
-                       cc_mac, cc_ch, cc_power, cc_dbm,
-                       calc_dbm, diff_dbm, calc_ant1, calc_ant2, calc_ant3, calc_ant4,
-                       diff_a1, diff_a2, diff_a3, diff_a4, pfs, time_stamp
-                     )
-
-                   #logg.info("RESULT: %s"%(ln))
-                   csv.write(ln)
-                   csv.write("\t")
-
-                   ln = "%s\t%s\t%s\t%s\t%s\t%s\t%s\t%s\t%s%s\t%s\t%s\t%s\t%s\t%s\t%s\t%s\t%s\t%s"%(
-                       myrd, pathloss, antenna_gain, _ch, _nss, _bw, tx, allowed_per_path,
-                       antstr,
-                       calc_ant1, calc_ant2, calc_ant3, calc_ant4,
-                       diff_a1, diff_a2, diff_a3, diff_a4, pfs, time_stamp
-                       )
-                   csvs.write(ln)
-                   csvs.write("\t")
-                   
-
-                   col = 0
-                   worksheet.write(row, col, myrd, center_blue); col += 1
-                   worksheet.write(row, col, _ch, center_blue); col += 1
-                   worksheet.write(row, col, _nss, center_blue); col += 1
-                   worksheet.write(row, col, cc_bw, center_blue); col += 1
-                   worksheet.write(row, col, _bw, center_blue); col += 1
-                   worksheet.write(row, col, tx, center_tan); col += 1
-                   worksheet.write(row, col, allowed_per_path, center_tan); col += 1
-                   worksheet.write(row, col, pathloss, center_tan); col += 1
-                   worksheet.write(row, col, antenna_gain, center_tan); col += 1
-                   worksheet.write(row, col, _noise, center_tan); col += 1
-                   if (args.adjust_nf):
-                       worksheet.write(row, col, rssi_adj, center_tan); col += 1
-                   worksheet.write(row, col, _rxrate, center_tan); col += 1
-                   worksheet.write(row, col, beacon_sig, center_tan); col += 1
-                   worksheet.write(row, col, sig, center_tan); col += 1
-                   for x in range(4):
-                       if (x < int(n)):
-                           worksheet.write(row, col, ants[x], center_peach); col += 1
-                       else:
-                           worksheet.write(row, col, " ", center_peach); col += 1
-                   worksheet.write(row, col, calc_ant1, center_pink); col += 1
-                   worksheet.write(row, col, calc_ant2, center_pink); col += 1
-                   worksheet.write(row, col, calc_ant3, center_pink); col += 1
-                   worksheet.write(row, col, calc_ant4, center_pink); col += 1
-
-                   if (diff_a1 != "" and abs(diff_a1) > pfrange):
-                       worksheet.write(row, col, diff_a1, center_yel_red); col += 1
-                   else:
-                       worksheet.write(row, col, diff_a1, center_yel); col += 1
-                   if (diff_a2 != "" and abs(diff_a2) > pfrange):
-                       worksheet.write(row, col, diff_a2, center_yel_red); col += 1
-                   else:
-                       worksheet.write(row, col, diff_a2, center_yel); col += 1
-                   if (diff_a3 != "" and abs(diff_a3) > pfrange):
-                       worksheet.write(row, col, diff_a3, center_yel_red); col += 1
-                   else:
-                       worksheet.write(row, col, diff_a3, center_yel); col += 1
-                   if (diff_a4 != "" and abs(diff_a4) > pfrange):
-                       worksheet.write(row, col, diff_a4, center_yel_red); col += 1
-                   else:
-                       worksheet.write(row, col, diff_a4, center_yel); col += 1
-                       
-                   if (pfs == "FAIL"):
-                       worksheet.write(row, col, pfs, red); col += 1
-                   else:
-                       worksheet.write(row, col, pfs, green); col += 1
-                   worksheet.write(row, col, time_stamp, green); col += 1
-                   if (_bw != bw):
-                       err = "ERROR:  Requested bandwidth: %s != station's reported bandwidth: %s.  "%(bw, _bw)
-                       e_tot += err
-                       logg.info(err)
-                       csv.write(err)
-                       csvs.write(err)
-                   if (_nss != n):
-                       err = "ERROR:  Station NSS: %s != configured: %s.  "%(_nss, n)
-                       logg.info(err)
-                       csv.write(err)
-                       csvs.write(err)
-                       e_tot += err
-
-                   if (e_tot == ""):
-                       worksheet.write(row, col, e_tot, green_left); col += 1
-                   else:
-                       worksheet.write(row, col, e_tot, red_left); col += 1
-                   row += 1
-
-                   csv.write("\n");
-                   csv.flush()
-
-                   csvs.write("\n");
-                   csvs.flush()
-
-                   # write out the data and exit on error : error takes presidence over failure
-                   if (e_tot != ""):
-                       if(args.exit_on_error):
-                           logg.info("EXITING ON ERROR, exit_on_error err: {} ".format(e_tot))
-                           if bool(email_dicts):
-                               for email_dict in email_dicts:
-                                  try:
-                                     logg.info("Sending Email ")
-                                     subject = "Lanforge: Error {}".format(outfile_xlsx)
-                                     body    = "Lanforeg: Error: AP: {} Channel: {} NSS: {} BW: {} TX-Power {}, pfs: {} time_stamp: {}  {}".format(args.ap, ch, n, bw, tx, pfs, time_stamp, outfile_xlsx)
-                                     email_out = subprocess.run(["./lf_mail.py", "--user", email_dict['user'] , "--passwd", email_dict['passwd'], "--to",email_dict['to'] , 
-                                       "--subject", subject, "--body", body , "--smtp", email_dict['smtp'], "--port", email_dict['port'] ], capture_output=cap_ctl_out, check=True)
-                                     pss = email_out.stdout.decode('utf-8','ignore')
-                                     logg.info(pss)
-                                  except subprocess.CalledProcessError as process_error:
-                                    logg.info("Unable to send email smtp {} port {} error code: {} output {}".format(email_dict['smtp'],email_dict['port'],process_error.returncode, process_error.output))
-                           exit_test(workbook)
-
-
-                   # write out the data and exit on failure
-                   if (pf == 0):
-                       if(args.exit_on_fail):
-                           if(e_tot != ""):
-                               logg.info("EXITING ON FAILURE as a result of  err {}".format(e_tot))
-                           else:
-                               logg.info("EXITING ON FAILURE, exit_on_fail set there was no err ")
-                           if bool(email_dicts):
-                               for email_dict in email_dicts: 
-                                   try:
-                                      logg.info("Sending Email ")
-                                      subject = "Lanforge: Failure Found {}".format(outfile_xlsx)
-                                      body    = "Lanforge: Failure Found:  AP: {} Channel: {} NSS: {} BW: {} TX-Power {}, pfs: {} time_stamp: {} {}".format(args.ap,ch, n, bw, tx, pfs, time_stamp,outfile_xlsx)
-                                      email_out =subprocess.run(["./lf_mail.py", "--user", email_dict['user'] , "--passwd", email_dict['passwd'], "--to",email_dict['to'] , 
-                                         "--subject", subject, "--body", body , "--smtp", email_dict['smtp'], "--port", email_dict['port'] ], capture_output=cap_ctl_out, check=True)
-                                      pss = email_out.stdout.decode('utf-8','ignore')
-                                      logg.info(pss)
-                                   except subprocess.CalledProcessError as process_error:
-                                       logg.info("Unable to send email smtp {} port {} error code: {} output {}".format(email_dict['smtp'],email_dict['port'],process_error.returncode, process_error.output))
-
-                           exit_test(workbook)
-                            
-
-   if bool(email_dicts):
-       for email_dict in email_dicts:
-           try:
-               logg.info("Sending Email ")
-               subject = "Lanforge Test Compete {}".format(outfile_xlsx)
-               body    = "Lanforeg Test Complete : AP: {} time_stamp: {}  {}".format(args.ap, time_stamp, outfile_xlsx)
-               email_out = subprocess.run(["./lf_mail.py", "--user", email_dict['user'] , "--passwd", email_dict['passwd'], "--to",email_dict['to'] , 
-               "--subject", subject, "--body", body , "--smtp", email_dict['smtp'], "--port", email_dict['port'] ], capture_output=cap_ctl_out, check=True)
-               pss = email_out.stdout.decode('utf-8','ignore')
-               logg.info(pss)
-           except subprocess.CalledProcessError as process_error:
-               logg.info("Unable to send email smtp {} port {} error code: {} output {}".format(email_dict['smtp'],email_dict['port'],process_error.returncode, process_error.output))
-
-
-   workbook.close()
-
-   # check if keeping the existing state
-   if(args.keep_state):
-       logg.info("9800/3504 flag --keep_state set thus keeping state")
-       try:
-          logg.info("9800/3504 cisco_wifi_ctl.py: advanced")
-          advanced = subprocess.run(["./cisco_wifi_ctl.py", "--scheme", scheme, "-d", args.dest, "-u", args.user, "-p", args.passwd, "-a", args.ap, "--band", band,
-             "--action", "advanced","--series" , args.series,"--port", args.port], capture_output=True, check=True)
-          pss = advanced.stdout.decode('utf-8', 'ignore')
-          logg.info(pss)
-       except subprocess.CalledProcessError as process_error:
-          logg.info("Controller unable to commicate to AP or unable to communicate to controller error code: {} output {}".format(process_error.returncode, process_error.output))
-          exit_test(workbook) 
-       try:
-          logg.info("9800/3504 cisco_wifi_ctl.py: summary")
-          advanced = subprocess.run(["./cisco_wifi_ctl.py", "--scheme", scheme, "-d", args.dest, "-u", args.user, "-p", args.passwd, "-a", args.ap, "--band", band,
-             "--action", "summary","--series" , args.series,"--port", args.port], capture_output=True, check=True)
-          pss = advanced.stdout.decode('utf-8', 'ignore')
-          logg.info(pss)
-       except subprocess.CalledProcessError as process_error:
-           logg.info("Controller unable to commicate to AP or unable to communicate to controller error code: {} output {}".format(process_error.returncode, process_error.output))
-           exit_test(workbook) 
-
-       exit_test(workbook)
-  
-   # Set things back to defaults
-   # remove the station
-   if(args.cleanup):
-       logg.info("--cleanup set Deleting all stations on radio {}".format(args.radio))
-       subprocess.run(["./lf_associate_ap.pl", "--action", "del_all_phy","--port_del", args.radio], timeout=20, capture_output=True)
-
-   # Disable AP, apply settings, enable AP
-   try:
-      logg.info("9800/3504 cisco_wifi_ctl.py: disable AP {}".format(args.ap))
-      subprocess.run(["./cisco_wifi_ctl.py", "--scheme", scheme, "-d", args.dest, "-u", args.user, "-p", args.passwd, "-a", args.ap, "--band", band,
-                   "--action", "disable", "--series" , args.series,"--port", args.port],capture_output=cap_ctl_out, check=True)
-   except subprocess.CalledProcessError as process_error:
-      logg.info("Controller unable to commicate to AP or unable to communicate to controller error code: {} output {}".format(process_error.returncode, process_error.output))
-      exit_test(workbook) 
-
-   if args.series == "9800":
-       try:
-          logg.info("9800 cisco_wifi_ctl.py: disable_network_5ghz")
-          subprocess.run(["./cisco_wifi_ctl.py", "--scheme", scheme, "-d", args.dest, "-u", args.user, "-p", args.passwd, "-a", args.ap, "--band", band,
-                                   "--action", "disable_network_5ghz","--series",args.series,"--port", args.port],capture_output=cap_ctl_out, check=True)      
-       except subprocess.CalledProcessError as process_error:
-          logg.info("Controller unable to commicate to AP or unable to communicate to controller error code: {} output {}".format(process_error.returncode, process_error.output))
-          exit_test(workbook) 
-
-       try:
-          logg.info("9800 cisco_wifi_ctl.py: disable_network_24ghz")
-          subprocess.run(["./cisco_wifi_ctl.py", "--scheme", scheme, "-d", args.dest, "-u", args.user, "-p", args.passwd, "-a", args.ap, "--band", band,
-                                   "--action", "disable_network_24ghz","--series",args.series,"--port", args.port],capture_output=cap_ctl_out, check=True)                 
-       except subprocess.CalledProcessError as process_error:
-          logg.info("Controller unable to commicate to AP or unable to communicate to controller error code: {} output {}".format(process_error.returncode, process_error.output))
-          exit_test(workbook) 
-
-   else:
-       try:
-          logg.info("3504 cisco_wifi_ctl.py: config 802.11a disable network")
-          subprocess.run(["./cisco_wifi_ctl.py", "--scheme", scheme, "-d", args.dest, "-u", args.user, "-p", args.passwd, "-a", args.ap, "--band", band,
-                   "--action", "cmd", "--value", "config 802.11a disable network","--port", args.port],capture_output=cap_ctl_out, check=True)
-       except subprocess.CalledProcessError as process_error:
-          logg.info("Controller unable to commicate to AP or unable to communicate to controller error code: {} output {}".format(process_error.returncode, process_error.output))
-          exit_test(workbook) 
-
-       try:
-          logg.info("3504 cisco_wifi_ctl.py: config 802.11b disable network")
-          subprocess.run(["./cisco_wifi_ctl.py", "--scheme", scheme, "-d", args.dest, "-u", args.user, "-p", args.passwd, "-a", args.ap, "--band", band,
-                   "--action", "cmd", "--value", "config 802.11b disable network","--port", args.port],capture_output=cap_ctl_out, check=True)
-       except subprocess.CalledProcessError as process_error:
-          logg.info("Controller unable to commicate to AP or unable to communicate to controller error code: {} output {}".format(process_error.returncode, process_error.output))
-          exit_test(workbook) 
-
-   if (tx != "NA"):
-       try: 
-          logg.info("9800/3504 cisco_wifi_ctl.py: txPower tx 1")
-          subprocess.run(["./cisco_wifi_ctl.py", "--scheme", scheme, "-d", args.dest, "-u", args.user, "-p", args.passwd, "-a", args.ap, "--band", band,
-                       "--action", "txPower", "--value", "1", "--series" , args.series,"--port", args.port],capture_output=cap_ctl_out, check=True)
-       except subprocess.CalledProcessError as process_error:
-          logg.info("Controller unable to commicate to AP or unable to communicate to controller error code: {} output {}".format(process_error.returncode, process_error.output))
-          exit_test(workbook) 
-
-   # NSS is set on the station earlier...
-   if (ch != "NA"):
-       try:
-          logg.info("9800/3504 cisco_wifi_ctl.py: channel 36")
-          subprocess.run(["./cisco_wifi_ctl.py", "--scheme", scheme, "-d", args.dest, "-u", args.user, "-p", args.passwd, "-a", args.ap, "--band", band,
-                       "--action", "channel", "--value", "36", "--series" , args.series,"--port", args.port],capture_output=cap_ctl_out, check=True)
-       except subprocess.CalledProcessError as process_error:
-          logg.info("Controller unable to commicate to AP or unable to communicate to controller error code: {} output {}".format(process_error.returncode, process_error.output))
-          exit_test(workbook) 
-
-   if (bw != "NA"):
-       try:
-          logg.info("9800/3504 cisco_wifi_ctl.py: bandwidth 20")
-          subprocess.run(["./cisco_wifi_ctl.py", "--scheme", scheme, "-d", args.dest, "-u", args.user, "-p", args.passwd, "-a", args.ap, "--band", band,
-                       "--action", "bandwidth", "--value", "20", "--series" , args.series,"--port", args.port],capture_output=cap_ctl_out, check=True)
-       except subprocess.CalledProcessError as process_error:
-          logg.info("Controller unable to commicate to AP or unable to communicate to controller error code: {} output {}".format(process_error.returncode, process_error.output))
-          exit_test(workbook)
-
-   if args.series == "9800":
-       try:
-          logg.info("9800 cisco_wifi_ctl.py: enable_network_5ghz")
-          subprocess.run(["./cisco_wifi_ctl.py", "--scheme", scheme, "-d", args.dest, "-u", args.user, "-p", args.passwd, "-a", args.ap, "--band", band,
-                                   "--action", "enable_network_5ghz","--series",args.series,"--port", args.port],capture_output=cap_ctl_out, check=True)         
-       except subprocess.CalledProcessError as process_error:
-          logg.info("Controller unable to commicate to AP or unable to communicate to controller error code: {} output {}".format(process_error.returncode, process_error.output))
-          exit_test(workbook) 
-
-       try:
-          logg.info("9800 cisco_wifi_ctl.py: enable_network_24ghz")
-          subprocess.run(["./cisco_wifi_ctl.py", "--scheme", scheme, "-d", args.dest, "-u", args.user, "-p", args.passwd, "-a", args.ap, "--band", band,
-                                   "--action", "enable_network_24ghz","--series",args.series,"--port", args.port],capture_output=cap_ctl_out, check=True) 
-       except subprocess.CalledProcessError as process_error:
-          logg.info("Controller unable to commicate to AP or unable to communicate to controller error code: {} output {}".format(process_error.returncode, process_error.output))
-          exit_test(workbook) 
-
-       try:
-          logg.info("9800 cisco_wifi_ctl.py: auto")
-          subprocess.run(["./cisco_wifi_ctl.py", "--scheme", scheme, "-d", args.dest, "-u", args.user, "-p", args.passwd, "-a", args.ap, "--band", band,
-                                   "--action", "auto","--series",args.series,"--port", args.port],capture_output=cap_ctl_out, check=True)
-       except subprocess.CalledProcessError as process_error:
-          logg.info("Controller unable to commicate to AP or unable to communicate to controller error code: {} output {}".format(process_error.returncode, process_error.output))
-          exit_test(workbook) 
-
-   else:     
-       try:
-          logg.info("3504 cisco_wifi_ctl.py: config 802.11a enable network")
-          subprocess.run(["./cisco_wifi_ctl.py", "--scheme", scheme, "-d", args.dest, "-u", args.user, "-p", args.passwd, "-a", args.ap, "--band", band,
-                   "--action", "cmd", "--value", "config 802.11a enable network","--port", args.port],capture_output=cap_ctl_out, check=True)
-       except subprocess.CalledProcessError as process_error:
-          logg.info("Controller unable to commicate to AP or unable to communicate to controller error code: {} output {}".format(process_error.returncode, process_error.output))
-          exit_test(workbook) 
-
-       try:
-          logg.info("3504 cisco_wifi_ctl.py: config 802.11b enable network")
-          subprocess.run(["./cisco_wifi_ctl.py", "--scheme", scheme, "-d", args.dest, "-u", args.user, "-p", args.passwd, "-a", args.ap, "--band", band,
-                   "--action", "cmd", "--value", "config 802.11b enable network","--port", args.port],capture_output=cap_ctl_out, check=True)
-       except subprocess.CalledProcessError as process_error:
-          logg.info("Controller unable to commicate to AP or unable to communicate to controller error code: {} output {}".format(process_error.returncode, process_error.output))
-          exit_test(workbook) 
-
    try:
-      logg.info("9800/3504 cisco_wifi_ctl.py: enable")
-      subprocess.run(["./cisco_wifi_ctl.py", "--scheme", scheme, "-d", args.dest, "-u", args.user, "-p", args.passwd, "-a", args.ap, "--band", band,
-                   "--action", "enable", "--series" , args.series,"--port", args.port],capture_output=cap_ctl_out, check=True)
-   except subprocess.CalledProcessError as process_error:
-      logg.info("Controller unable to commicate to AP or unable to communicate to controller error code: {} output {}".format(process_error.returncode, process_error.output))
-      exit_test(workbook) 
-
-   # Remove LANforge traffic connection
-   subprocess.run(["./lf_firemod.pl", "--manager", lfmgr, "--resource",  lfresource, "--action", "do_cmd",
-                   "--cmd", "set_cx_state all c-udp-power DELETED"], capture_output=True);
-   subprocess.run(["./lf_firemod.pl", "--manager", lfmgr, "--resource",  lfresource, "--action", "do_cmd",
-                   "--cmd", "rm_endp c-udp-power-A"], capture_output=True);
-   subprocess.run(["./lf_firemod.pl", "--manager", lfmgr, "--resource",  lfresource, "--action", "do_cmd",
-                   "--cmd", "rm_endp c-udp-power-B"], capture_output=True);
-
-   # Show controller status
+      targets = parse_duts(args, {
+         "dest": args.dest, "user": args.user, "passwd": args.passwd, "scheme": scheme, "port": args.port,
+         "series": args.series, "ap": args.ap, "band": band, "slot": args.slot, "wlan": args.wlan,
+         "wlanID": args.wlanID, "lfmgr": lfmgr, "lfmgr_port": args.lfmgr_port, "lfresource": lfresource, "lfresource2": lfresource2,
+         "station": lfstation, "create_station": args.create_station, "radio": args.radio,
+         "upstream_port": upstream_port, "pathloss": args.pathloss, "antenna_gain": args.antenna_gain})
+   except ValueError as error:
+      logg.info("ERROR:  {}".format(error))
+      exit(1)
+
+   # XLSX file, one worksheet per (controller, AP, station)
+   report = SweepReport(outfile_xlsx, adjust_nf=args.adjust_nf, rssi_to_use=rssi_to_use, pf_dbm=pf_dbm)
+
+   stop = threading.Event()
+   sweeps = []
+   outfiles = []
+   full_outfiles = []
+   for index, target in enumerate(targets):
+      sweep_outfile = outfile
+      sweep_full_outfile = full_outfile
+      cx_name = "c-udp-power"
+      if len(targets) > 1:
+         sweep_outfile = "{}_{}_{}.txt".format(args.outfile, target.name, current_time)
+         sweep_full_outfile = "{}_full_{}_{}.txt".format(args.outfile, target.name, current_time)
+         cx_name = "c-udp-power-{}".format(index)
+         logg.info("{}: output file: {} output file full: {}".format(target.name, sweep_outfile, sweep_full_outfile))
+      outfiles.append(sweep_outfile)
+      full_outfiles.append(sweep_full_outfile)
+      sweep_logg = logg.getChild(target.name) if len(targets) > 1 else logg
+      sweeps.append(PowerSweep(target, args, report, stop, sweep_logg, sweep_outfile, sweep_full_outfile, outfile_xlsx,
+                               rssi_to_use=rssi_to_use, email_dicts=email_dicts, cx_name=cx_name))
+
+   outfile = ", ".join(outfiles)
+   full_outfile = ", ".join(full_outfiles)
+
+   workers = args.workers if args.workers else len(sweeps)
+   # whatever ends the run, the worksheets written so far are saved
    try:
-      logg.info("9800/3504 cisco_wifi_ctl.py: advanced")
-      advanced = subprocess.run(["./cisco_wifi_ctl.py", "--scheme", scheme, "-d", args.dest, "-u", args.user, "-p", args.passwd, "-a", args.ap, "--band", band,
-                              "--action", "advanced", "--series" , args.series,"--port", args.port], capture_output=True, check=True)
-      pss = advanced.stdout.decode('utf-8', 'ignore');
-      logg.info(pss)
-   except subprocess.CalledProcessError as process_error:
-      logg.info("Controller unable to commicate to AP or unable to communicate to controller error code: {} output {}".format(process_error.returncode, process_error.output))
-      exit_test(workbook) 
+      with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+         futures = {executor.submit(sweep.run): sweep for sweep in sweeps}
+         for future in concurrent.futures.as_completed(futures):
+            sweep = futures[future]
+            try:
+               future.result()
+            except BaseException as error:
+               # includes SystemExit, e.g. from LANforge connection checks in a worker
+               logg.exception("sweep of {} failed: {!r}".format(sweep.target.name, error))
+               sweep.failed = True
+               stop.set()
+
+      if any(sweep.failed for sweep in sweeps):
+         exit_test(report)
+
+      if bool(email_dicts):
+         time_stamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime()) + "{:.3f}".format(time.time() - (math.floor(time.time())))[1:]
+         subject = "Lanforge Test Compete {}".format(outfile_xlsx)
+         body    = "Lanforeg Test Complete : AP: {} time_stamp: {}  {}".format(" ".join(target.ap for target in targets), time_stamp, outfile_xlsx)
+         send_email(email_dicts, subject, body, logg, capture_output=cap_ctl_out)
+   finally:
+      report.close()
 
 
 # ----- ----- ----- ----- ----- ----- ----- ----- ----- ----- ----- -----
@@ -0,0 +1,348 @@
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+# Keep-alive HTTP/1.1 connection pool shared by LFRequest        -
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+import sys
+
+if sys.version_info[0] != 3:
+    print("This script requires Python 3")
+    exit()
+
+import http.client
+import io
+import select
+import socket
+import threading
+import urllib.error
+import urllib.parse
+
+DEFAULT_POOL_SIZE = 8
+DEFAULT_TIMEOUT_SEC = 120
+# methods that may be sent again after the server dropped the connection mid-response
+IDEMPOTENT_METHODS = ("GET", "HEAD")
+STALE_SOCKET_ERRORS = (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError,
+                       http.client.CannotSendRequest, http.client.BadStatusLine)
+
+
+class LFPooledResponse:
+    """
+    Fully-read response returned by the pool. The body is consumed before the
+    connection is returned to the pool, so this object stays valid after the
+    socket is reused. It mimics the parts of http.client.HTTPResponse that
+    LFRequest callers use: read(), status, reason, getheaders(), headers.
+    """
+    def __init__(self, url, status, reason, headers, body):
+        self.url = url
+        self.status = status
+        self.code = status
+        self.reason = reason
+        self.headers = headers
+        self.body = body
+        self._fp = io.BytesIO(body)
+
+    def read(self, amt=None):
+        return self._fp.read(amt)
+
+    def readinto(self, buffer):
+        return self._fp.readinto(buffer)
+
+    def getheaders(self):
+        return self.headers.items()
+
+    def getheader(self, name, default=None):
+        return self.headers.get(name, default)
+
+    def getcode(self):
+        return self.status
+
+    def geturl(self):
+        return self.url
+
+    def close(self):
+        self._fp.close()
+
+
+class LFStreamingResponse:
+    """
+    Response whose body is read straight from the pooled socket. The connection
+    goes back to the pool once the body has been read to the end, or is closed
+    if the caller calls close() early.
+    """
+    def __init__(self, pool, conn, resp, url):
+        self.pool = pool
+        self.conn = conn
+        self.resp = resp
+        self.url = url
+        self.status = resp.status
+        self.reason = resp.reason
+        self.headers = resp.msg
+        self.released = False
+        self.bytes_read = 0
+
+    def read(self, amt=None):
+        if self.released:
+            return b""
+        try:
+            data = self.resp.read(amt)
+        except (OSError, http.client.HTTPException) as x:
+            self._release(reusable=False)
+            raise urllib.error.URLError(x)
+        self.bytes_read += len(data)
+        if (not data) or self.resp.isclosed():
+            self._release(reusable=not self.resp.will_close)
+        return data
+
+    def getheaders(self):
+        return self.headers.items()
+
+    def getheader(self, name, default=None):
+        return self.headers.get(name, default)
+
+    def _release(self, reusable):
+        if not self.released:
+            self.released = True
+            self.pool._checkin(self.conn, reusable=reusable)
+
+    def close(self):
+        # a partially read body leaves the socket mid-response, so it cannot be reused
+        self._release(reusable=self.resp.isclosed() and not self.resp.will_close)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class LFConnectionPool:
+    """
+    Bounded set of persistent connections to one LANforge manager (scheme, host, port).
+    At most max_size requests are in flight at once; idle connections are
+    reused LIFO so the hottest socket stays warm.
+    """
+    def __init__(self, scheme="http", host="localhost", port=8080, max_size=DEFAULT_POOL_SIZE,
+                 timeout=DEFAULT_TIMEOUT_SEC):
+        if max_size < 1:
+            raise ValueError("LFConnectionPool: max_size must be at least 1, given %s" % max_size)
+        self.scheme = scheme
+        self.host = host
+        self.port = port
+        self.max_size = max_size
+        self.timeout = timeout
+        self.idle = []
+        self.lock = threading.Lock()
+        self.slots = threading.BoundedSemaphore(max_size)
+        self.connections_opened = 0
+        self.requests_sent = 0
+
+    def _new_connection(self):
+        with self.lock:
+            self.connections_opened += 1
+        if self.scheme == "https":
+            conn = http.client.HTTPSConnection(self.host, self.port, timeout=self.timeout)
+        else:
+            conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        # small request/response pairs stall on Nagle + delayed ACK without this
+        conn.connect()
+        conn.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return conn
+
+    def _checkout(self):
+        self.slots.acquire()
+        with self.lock:
+            while len(self.idle) > 0:
+                conn = self.idle.pop()
+                if not self._dropped(conn):
+                    return conn, True
+                conn.close()
+        try:
+            return self._new_connection(), False
+        except OSError as x:
+            self.slots.release()
+            raise urllib.error.URLError(x)
+
+    @staticmethod
+    def _dropped(conn):
+        """
+        An idle keep-alive socket that is readable was closed by the server (or holds
+        stray bytes); either way it must not carry the next request.
+        """
+        if conn.sock is None:
+            return True
+        try:
+            readable, _, _ = select.select([conn.sock], [], [], 0)
+        except (OSError, ValueError):
+            return True
+        return len(readable) > 0
+
+    def _send(self, conn, reused, method, path, body, headers):
+        """
+        Send one request, replacing a reused socket the server had already closed.
+        A failure while sending means the server saw no complete request, so any
+        method is sent again; once the request is out, only idempotent methods are,
+        since a POST to /cli-json may already have been carried out.
+        :return: (connection, response)
+        """
+        try:
+            conn.request(method, path, body=body, headers=headers)
+        except STALE_SOCKET_ERRORS:
+            conn.close()
+            if not reused:
+                raise
+            conn = self._new_connection()
+            conn.request(method, path, body=body, headers=headers)
+            return conn, conn.getresponse()
+        try:
+            return conn, conn.getresponse()
+        except STALE_SOCKET_ERRORS:
+            conn.close()
+            if (not reused) or (method.upper() not in IDEMPOTENT_METHODS):
+                raise
+            conn = self._new_connection()
+            conn.request(method, path, body=body, headers=headers)
+            return conn, conn.getresponse()
+
+    def _checkin(self, conn, reusable=True):
+        if reusable:
+            with self.lock:
+                self.idle.append(conn)
+        else:
+            conn.close()
+        self.slots.release()
+
+    def request(self, method, url, body=None, headers=None):
+        """
+        Send one request over a pooled connection and return an LFPooledResponse.
+        Raises urllib.error.HTTPError for status >= 400 and urllib.error.URLError
+        for connection failures, so callers can keep their urllib error handling.
+        :param method: GET or POST
+        :param url: absolute url, used for error reporting and path extraction
+        :param body: bytes to send, or None
+        :param headers: dict of request headers
+        :return: LFPooledResponse
+        """
+        parsed = urllib.parse.urlsplit(url)
+        path = parsed.path or "/"
+        if parsed.query:
+            path += "?" + parsed.query
+        send_headers = {"Connection": "keep-alive"}
+        if headers is not None:
+            send_headers.update(headers)
+
+        conn, reused = self._checkout()
+        try:
+            conn, resp = self._send(conn, reused, method, path, body, send_headers)
+            data = resp.read()
+        except (OSError, http.client.HTTPException) as x:
+            conn.close()
+            self.slots.release()
+            raise urllib.error.URLError(x)
+
+        with self.lock:
+            self.requests_sent += 1
+        self._checkin(conn, reusable=not resp.will_close)
+        pooled = LFPooledResponse(url, resp.status, resp.reason, resp.msg, data)
+        if resp.status >= 400:
+            raise urllib.error.HTTPError(url, resp.status, resp.reason, resp.msg, io.BytesIO(data))
+        return pooled
+
+    def stream(self, method, url, body=None, headers=None):
+        """
+        Like request() but returns an LFStreamingResponse that reads the body from the
+        socket on demand. Close it (or use it as a context manager) when done.
+        """
+        parsed = urllib.parse.urlsplit(url)
+        path = parsed.path or "/"
+        if parsed.query:
+            path += "?" + parsed.query
+        send_headers = {"Connection": "keep-alive"}
+        if headers is not None:
+            send_headers.update(headers)
+
+        conn, reused = self._checkout()
+        try:
+            conn, resp = self._send(conn, reused, method, path, body, send_headers)
+            if resp.status >= 400:
+                data = resp.read()
+        except (OSError, http.client.HTTPException) as x:
+            conn.close()
+            self.slots.release()
+            raise urllib.error.URLError(x)
+
+        with self.lock:
+            self.requests_sent += 1
+        if resp.status >= 400:
+            self._checkin(conn, reusable=not resp.will_close)
+            raise urllib.error.HTTPError(url, resp.status, resp.reason, resp.msg, io.BytesIO(data))
+        return LFStreamingResponse(self, conn, resp, url)
+
+    def close(self):
+        with self.lock:
+            for conn in self.idle:
+                conn.close()
+            self.idle.clear()
+
+# ~class
+
+
+_pools = {}
+_pool_sizes = {}
+_pools_lock = threading.Lock()
+
+
+def _pool_key(url):
+    parsed = urllib.parse.urlsplit(url)
+    scheme = parsed.scheme or "http"
+    port = parsed.port
+    if port is None:
+        port = 443 if scheme == "https" else 80
+    return scheme, parsed.hostname, port
+
+
+def set_pool_size(host, port=8080, size=DEFAULT_POOL_SIZE, scheme="http"):
+    """
+    Configure the number of concurrent keep-alive connections used for one manager.
+    Takes effect the next time a pool for that manager is created; an existing
+    pool is closed and replaced.
+    """
+    if size < 1:
+        raise ValueError("set_pool_size: size must be at least 1, given %s" % size)
+    key = (scheme, host, int(port))
+    with _pools_lock:
+        _pool_sizes[key] = size
+        if key in _pools:
+            _pools[key].close()
+            del _pools[key]
+
+
+def ensure_pool_size(host, port=8080, size=DEFAULT_POOL_SIZE, scheme="http"):
+    """
+    Grow the pool for one manager to at least size connections; never shrinks it.
+    """
+    key = (scheme, host, int(port))
+    with _pools_lock:
+        current = _pool_sizes.get(key, DEFAULT_POOL_SIZE)
+    if size > current:
+        set_pool_size(host, port, size, scheme)
+
+
+def get_pool(url):
+    """
+    Return the shared pool for the manager addressed by url, creating it on first use.
+    """
+    key = _pool_key(url)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = LFConnectionPool(scheme=key[0], host=key[1], port=key[2],
+                                    max_size=_pool_sizes.get(key, DEFAULT_POOL_SIZE))
+            _pools[key] = pool
+        return pool
+
+
+def close_all():
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.close()
+        _pools.clear()
+
+# ~LFConnectionPool
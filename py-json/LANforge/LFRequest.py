@@ -12,7 +12,13 @@ import urllib.request
 import urllib.error
 import urllib.parse
 import json
+import time
+import weakref
 from LANforge import LFUtils
+from LANforge import LFConnectionPool
+from LANforge import json_stream
+from LANforge import response_cache
+from LANforge import request_stats
 
 
 class LFRequest:
@@ -21,6 +27,8 @@ class LFRequest:
     requested_url = ""
     post_data = No_Data
     default_headers = { 'Accept': 'application/json'}
+    # set to False to fall back to one urlopen() connection per request
+    use_pool = True
 
     def __init__(self, url, uri=None, debug_=False, die_on_error_=False):
         self.debug = debug_
@@ -72,7 +80,7 @@ class LFRequest:
         request.headers['Content-type'] = 'application/x-www-form-urlencoded'
         resp = ''
         try:
-            resp = urllib.request.urlopen(request)
+            resp = urlopen(request, use_pool=self.use_pool)
             responses.append(resp)
             return responses[0]
         except urllib.error.HTTPError as error:
@@ -121,7 +129,7 @@ class LFRequest:
 
         request.headers['Content-type'] = 'application/json'
         try:
-            resp = urllib.request.urlopen(request)
+            resp = urlopen(request, use_pool=self.use_pool)
             resp_data = resp.read().decode('utf-8')
             if (debug):
                 print("----- LFRequest::jsonPost:118 debug: --------------------------------------------")
@@ -184,7 +192,7 @@ class LFRequest:
         myrequest = urllib.request.Request(url=self.requested_url, headers=self.default_headers)
         myresponses = []
         try:
-            myresponses.append(urllib.request.urlopen(myrequest))
+            myresponses.append(urlopen(myrequest, use_pool=self.use_pool))
             return myresponses[0]
         except urllib.error.HTTPError as error:
             if debug:
@@ -236,6 +244,51 @@ class LFRequest:
         json_data = json.loads(responses[0].read().decode('utf-8'))
         return json_data
 
+    def get_as_json_stream(self, keys=json_stream.DEFAULT_RECORD_KEYS, die_on_error_=False, debug_=False):
+        """
+        Like get_as_json, but decodes the response while it is read from the socket.
+        :param keys: top-level lists (e.g. 'interfaces', 'endpoint') whose elements are yielded
+        :return: iterator of records, or None if the request failed
+        """
+        if self.debug:
+            debug_ = True
+        if self.die_on_error:
+            die_on_error_ = True
+        if debug_:
+            print("LFRequest.get_as_json_stream: url: "+self.requested_url)
+        started = time.perf_counter()
+        try:
+            response = LFConnectionPool.get_pool(self.requested_url).stream("GET", self.requested_url,
+                                                                            headers=self.default_headers)
+        except urllib.error.HTTPError as error:
+            request_stats.record_request("GET", self.requested_url, time.perf_counter() - started)
+            if debug_:
+                print("<%s> HTTP %s: %s" % (self.requested_url, error.code, error.reason))
+            if die_on_error_:
+                exit(1)
+            return None
+        except urllib.error.URLError as uerror:
+            request_stats.record_request("GET", self.requested_url, time.perf_counter() - started)
+            if debug_:
+                print("Reason: %s; URL: %s" % (uerror.reason, self.requested_url))
+            if die_on_error_:
+                exit(1)
+            return None
+        records = self._iter_stream(response, keys, time.perf_counter() - started)
+        # the connection is already taken; give it back even if records is never iterated
+        weakref.finalize(records, response.close)
+        return records
+
+    @staticmethod
+    def _iter_stream(response, keys, elapsed_sec=0.0):
+        # latency is time to the response headers; bytes are whatever the caller read
+        try:
+            with response:
+                for record in json_stream.iter_json_records(response, keys=keys):
+                    yield record
+        finally:
+            request_stats.record_request("GET", response.url, elapsed_sec, response=response)
+
     def addPostData(self, data):
         self.add_post_data(data=data)
 
@@ -243,11 +296,38 @@ class LFRequest:
         self.post_data = data
 
 
+def urlopen(request, use_pool=True):
+    """
+    Send a urllib.request.Request over the shared keep-alive pool for its manager.
+    Raises the same urllib.error exceptions as urllib.request.urlopen.
+    Posts drop any cached responses the command may have made stale.
+    With request_stats enabled, the time until the response (or only its
+    headers, for a stream) has arrived is recorded under the endpoint.
+    """
+    started = time.perf_counter()
+    response = None
+    try:
+        if not use_pool:
+            response = urllib.request.urlopen(request)
+        else:
+            pool = LFConnectionPool.get_pool(request.full_url)
+            response = pool.request(request.get_method(),
+                                    request.full_url,
+                                    body=request.data,
+                                    headers=dict(request.header_items()))
+        return response
+    finally:
+        if request.data is not None:
+            response_cache.invalidate_for_post(request.full_url)
+        request_stats.record_request(request.get_method(), request.full_url,
+                                     time.perf_counter() - started, request.data, response)
+
+
 def plain_get(url_=None, debug_=False, die_on_error_=False):
     myrequest = urllib.request.Request(url=url_)
     myresponses = []
     try:
-        myresponses.append(urllib.request.urlopen(myrequest))
+        myresponses.append(urlopen(myrequest))
         return myresponses[0]
     except urllib.error.HTTPError as error:
         if debug_:
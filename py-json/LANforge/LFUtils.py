@@ -16,6 +16,8 @@ import re
 seed(int(round(time.time() * 1000)))
 from random import randint
 from LANforge import LFRequest
+from LANforge import request_stats
+from LANforge import port_poller
 
 debug_printer = pprint.PrettyPrinter(indent=2)
 
@@ -379,78 +381,38 @@ def waitUntilPortsAdminDown(resource_id=1, base_url="http://localhost:8080", por
     return wait_until_ports_admin_down(resource_id=resource_id, base_url=base_url, port_list=port_list)
 
 
-def wait_until_ports_admin_down(resource_id=1, base_url="http://localhost:8080", port_list=()):
+def wait_until_ports_admin_down(resource_id=1, base_url="http://localhost:8080", port_list=(), timeout_sec=None):
     print("Waiting until ports appear admin-down...")
-    up_stations = port_list.copy()
-    sleep(1)
-    port_url = "/port/1"
-    while len(up_stations) > 0:
-        up_stations = []
-        for port_name in port_list:
-            uri = "%s/%s/%s?fields=device,down" % (port_url, resource_id, port_name)
-            lf_r = LFRequest.LFRequest(base_url, uri)
-            json_response = lf_r.getAsJson(debug_=False)
-            if json_response == None:
-                print("port %s disappeared" % port_name)
-                continue
-            if "interface" in json_response:
-                json_response = json_response['interface']
-            if json_response['down'] == "false":
-                up_stations.append(port_name)
-        sleep(1)
-    return None
+    request_stats.sleep(1, "LFUtils.wait_until_ports_admin_down")
+    # a port that disappeared no longer counts as up
+    return port_poller.get_poller(base_url).wait(port_list,
+                                                 lambda record: (record is None) or (record['down'] != "false"),
+                                                 timeout_sec=timeout_sec,
+                                                 resource_id=resource_id)
 
 
 def waitUntilPortsAdminUp(resource_id=1, base_url="http://localhost:8080", port_list=()):
     return wait_until_ports_admin_up(resource_id=resource_id, base_url=base_url, port_list=port_list)
 
-def wait_until_ports_admin_up(resource_id=1, base_url="http://localhost:8080", port_list=()):
+def wait_until_ports_admin_up(resource_id=1, base_url="http://localhost:8080", port_list=(), timeout_sec=None):
     print("Waiting until  ports appear admin-up...")
-    down_stations = port_list.copy()
-    sleep(1)
-    port_url = "/port/1"
-    # url = /%s/%s?fields=device,down" % (resource_id, port_name)
-    while len(down_stations) > 0:
-        down_stations = []
-        for port_name in port_list:
-            uri = "%s/%s/%s?fields=device,down" % (port_url, resource_id, port_name)
-            lf_r = LFRequest.LFRequest(base_url, uri)
-            json_response = lf_r.getAsJson(debug_=False)
-            if json_response == None:
-                print("port %s appeared" % port_name)
-                continue
-            if "interface" in json_response:
-                json_response = json_response['interface']
-            if json_response['down'] == "true":
-                down_stations.append(port_name)
-        sleep(1)
-    return None
+    request_stats.sleep(1, "LFUtils.wait_until_ports_admin_up")
+    # a port that is not listed no longer counts as down
+    return port_poller.get_poller(base_url).wait(port_list,
+                                                 lambda record: (record is None) or (record['down'] != "true"),
+                                                 timeout_sec=timeout_sec,
+                                                 resource_id=resource_id)
 
 def waitUntilPortsDisappear(base_url="http://localhost:8080", port_list=[], debug=False):
     wait_until_ports_disappear(base_url, port_list, debug)
 
-def wait_until_ports_disappear(base_url="http://localhost:8080", port_list=[], debug=False):
+def wait_until_ports_disappear(base_url="http://localhost:8080", port_list=[], debug=False, timeout_sec=None):
     print("Waiting until ports disappear...")
-    url = "/port/1"
-    found_stations = port_list.copy()
-
-    while len(found_stations) > 0:
-        found_stations = []
-        sleep(1)
-
-        for port_eid in port_list:
-            eid = name_to_eid(port_eid)
-            shelf = eid[0]
-            resource_id = eid[1]
-            port_name = eid[2]
-
-            check_url = "%s/%s/%s" % (url, resource_id, port_name)
-            if debug:
-                print("checking:" + check_url)
-            lf_r = LFRequest.LFRequest(base_url, check_url)
-            json_response = lf_r.getAsJson(debug_=debug)
-            if (json_response != None):
-                found_stations.append(port_name)
+    remaining = port_poller.get_poller(base_url).wait(port_list,
+                                                      lambda record: record is None,
+                                                      timeout_sec=timeout_sec)
+    if debug and (len(remaining) > 0):
+        print("These ports did not disappear: " + ", ".join(remaining))
     return
 
 
@@ -483,45 +445,40 @@ def name_to_eid(eid):
 
     return rv;
 
-def wait_until_ports_appear(base_url="http://localhost:8080", port_list=(), debug=False):
+def wait_until_ports_appear(base_url="http://localhost:8080", port_list=(), debug=False, timeout_sec=None):
     """
 
     :param base_url:
     :param port_list:
     :param debug:
-    :return:
+    :param timeout_sec: None waits forever
+    :return: list of ports that did not appear
     """
     print("Waiting until ports appear...")
-    found_stations = []
-    port_url = "/port/1"
     ncshow_url = "/cli-json/nc_show_ports"
     if base_url.endswith('/'):
-        port_url = port_url[1:]
         ncshow_url = ncshow_url[1:]
-
-    while len(found_stations) < len(port_list):
-        found_stations = []
-        for port_eid in port_list:
+    last_probe = [time.time()]
+
+    # ask the manager to refresh ports it has not reported yet, at most every 2 seconds
+    def probe(pending):
+        if time.time() - last_probe[0] < 2:
+            return
+        last_probe[0] = time.time()
+        for port_eid in pending:
             eid = name_to_eid(port_eid)
-            shelf = eid[0]
-            resource_id = eid[1]
-            port_name = eid[2]
-            
-            uri = "%s/%s/%s" % (port_url, resource_id, port_name)
-            lf_r = LFRequest.LFRequest(base_url, uri)
-            json_response = lf_r.getAsJson(debug_=False)
-            if (json_response != None):
-                found_stations.append(port_name)
-            else:
-                lf_r = LFRequest.LFRequest(base_url, ncshow_url)
-                lf_r.addPostData({"shelf": shelf, "resource": resource_id, "port": port_name, "probe_flags": "1"})
-                lf_r.jsonPost()
-        if (len(found_stations) < len(port_list)):
-            sleep(2)
-
+            lf_r = LFRequest.LFRequest(base_url, ncshow_url)
+            lf_r.addPostData({"shelf": eid[0], "resource": eid[1], "port": eid[2], "probe_flags": "1"})
+            lf_r.jsonPost()
+
+    remaining = port_poller.get_poller(base_url).wait(port_list,
+                                                      lambda record: record is not None,
+                                                      timeout_sec=timeout_sec,
+                                                      on_pending=probe)
     if debug:
-        print("These stations appeared: " + ", ".join(found_stations))
-    return
+        print("These stations appeared: " + ", ".join([p for p in port_list
+                                                      if port_poller.port_eid_key(p) not in remaining]))
+    return remaining
 
 def wait_until_endps(base_url="http://localhost:8080", endp_list=(), debug=False):
     """
@@ -558,7 +515,7 @@ def wait_until_endps(base_url="http://localhost:8080", endp_list=(), debug=False
                 lf_r.addPostData({"shelf": shelf, "resource": resource_id, "port": port_name, "flags": 1})
                 lf_r.formPost()
         if (len(found_stations) < len(port_list)):
-            sleep(2)
+            request_stats.sleep(2, "LFUtils.wait_until_endps")
 
     if debug:
         print("These stations appeared: " + ", ".join(found_stations))
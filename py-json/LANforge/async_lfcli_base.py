@@ -0,0 +1,184 @@
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+# asyncio flavor of LFCliBase: awaitable json_get/json_post      -
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+import sys
+
+if sys.version_info[0] != 3:
+    print("This script requires Python 3")
+    exit()
+
+import asyncio
+import concurrent.futures
+import functools
+import threading
+
+from LANforge.lfcli_base import LFCliBase
+from LANforge import LFConnectionPool
+
+
+class AsyncLFCliBase(LFCliBase):
+    """
+    Extends LFCliBase with awaitable json_get/json_post. Requests are sent on a
+    thread pool over the shared keep-alive connection pool, at most
+    max_concurrency at a time, and each one is bounded by timeout_sec.
+    A request that times out keeps its slot until its thread finishes, since
+    the thread cannot be cancelled and still holds a pool connection.
+    The blocking json_get/json_post inherited from LFCliBase keep working.
+
+        async def poll(base, eids):
+            urls = ["/port/%s/%s/%s?fields=alias,ip" % tuple(LFUtils.name_to_eid(e)) for e in eids]
+            return await base.async_json_get_many(urls)
+    """
+    def __init__(self, _lfjson_host, _lfjson_port,
+                 _debug=False,
+                 _halt_on_error=False,
+                 _exit_on_error=False,
+                 _exit_on_fail=False,
+                 _local_realm=False,
+                 _max_concurrency=32,
+                 _timeout_sec=30):
+        super().__init__(_lfjson_host, _lfjson_port,
+                         _debug=_debug,
+                         _halt_on_error=_halt_on_error,
+                         _exit_on_error=_exit_on_error,
+                         _exit_on_fail=_exit_on_fail,
+                         _local_realm=_local_realm)
+        # give every concurrent request its own keep-alive connection
+        LFConnectionPool.ensure_pool_size(self.lfclient_host, self.lfclient_port, _max_concurrency)
+        self.max_concurrency = _max_concurrency
+        self.timeout_sec = _timeout_sec
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=_max_concurrency,
+                                                              thread_name_prefix="lfcli-async")
+        # semaphores bind to the running loop, so one is created per loop on demand
+        self._semaphores = {}
+        self._semaphores_lock = threading.Lock()
+
+    def _semaphore(self):
+        loop = asyncio.get_running_loop()
+        with self._semaphores_lock:
+            # every asyncio.run() makes a new loop; drop the ones that have finished
+            for closed in [l for l in self._semaphores if l.is_closed()]:
+                del self._semaphores[closed]
+            sem = self._semaphores.get(loop)
+            if sem is None:
+                sem = asyncio.Semaphore(self.max_concurrency)
+                self._semaphores[loop] = sem
+            return sem
+
+    async def _run(self, func, timeout_sec):
+        if timeout_sec is None:
+            timeout_sec = self.timeout_sec
+        loop = asyncio.get_running_loop()
+        sem = self._semaphore()
+        await sem.acquire()
+        try:
+            future = loop.run_in_executor(self.executor, func)
+        except BaseException:
+            sem.release()
+            raise
+        # the slot is given back when the request ends, not when the caller stops waiting
+        future.add_done_callback(lambda _: sem.release())
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), timeout_sec)
+        except asyncio.TimeoutError:
+            # nobody will read the late result; keep it from being logged as unretrieved
+            future.add_done_callback(lambda f: f.cancelled() or f.exception())
+            raise
+
+    async def async_json_get(self, _req_url, debug_=False, timeout_sec=None):
+        """
+        Awaitable LFCliBase.json_get
+        :param _req_url: requested url
+        :param debug_: turn on debugging output
+        :param timeout_sec: seconds before asyncio.TimeoutError, defaults to self.timeout_sec
+        :return: decoded json or None
+        """
+        return await self._run(functools.partial(self.json_get, _req_url, debug_=debug_), timeout_sec)
+
+    async def async_json_post(self, _req_url, _data, debug_=False, suppress_related_commands_=None,
+                              response_json_list_=None, timeout_sec=None):
+        """
+        Awaitable LFCliBase.json_post
+        :param _req_url: requested url
+        :param _data: json data to send
+        :param debug_: turn on debugging output
+        :param suppress_related_commands_: see LFCliBase.json_post
+        :param response_json_list_: array for json results in the response object
+        :param timeout_sec: seconds before asyncio.TimeoutError, defaults to self.timeout_sec
+        :return: http response object
+        """
+        return await self._run(functools.partial(self.json_post, _req_url, _data,
+                                                 debug_=debug_,
+                                                 suppress_related_commands_=suppress_related_commands_,
+                                                 response_json_list_=response_json_list_),
+                               timeout_sec)
+
+    async def async_json_get_many(self, urls, debug_=False, timeout_sec=None):
+        """
+        Fan out one GET per url, bounded by max_concurrency.
+        A url that times out or raises yields None in its slot.
+        :return: list of responses in the same order as urls
+        """
+        results = await asyncio.gather(*[self.async_json_get(url, debug_=debug_, timeout_sec=timeout_sec)
+                                         for url in urls],
+                                       return_exceptions=True)
+        return [None if isinstance(r, BaseException) else r for r in results]
+
+    async def async_json_post_many(self, url_data_pairs, debug_=False, suppress_related_commands_=None,
+                                   timeout_sec=None):
+        """
+        Fan out one POST per (url, data) pair, bounded by max_concurrency.
+        :return: list of http response objects (None on timeout/error) in input order
+        """
+        results = await asyncio.gather(*[self.async_json_post(url, data,
+                                                              debug_=debug_,
+                                                              suppress_related_commands_=suppress_related_commands_,
+                                                              timeout_sec=timeout_sec)
+                                         for url, data in url_data_pairs],
+                                       return_exceptions=True)
+        return [None if isinstance(r, BaseException) else r for r in results]
+
+    def json_get_many(self, urls, debug_=False, timeout_sec=None):
+        """
+        Blocking wrapper around async_json_get_many for callers without an event loop.
+        """
+        return run_sync(self.async_json_get_many(urls, debug_=debug_, timeout_sec=timeout_sec))
+
+    def json_post_many(self, url_data_pairs, debug_=False, suppress_related_commands_=None, timeout_sec=None):
+        """
+        Blocking wrapper around async_json_post_many for callers without an event loop.
+        """
+        return run_sync(self.async_json_post_many(url_data_pairs,
+                                                  debug_=debug_,
+                                                  suppress_related_commands_=suppress_related_commands_,
+                                                  timeout_sec=timeout_sec))
+
+    def shutdown(self):
+        self.executor.shutdown(wait=True)
+
+
+def run_sync(coroutine):
+    """
+    Run a coroutine to completion from synchronous code. When called from inside
+    a running loop (e.g. a notebook), the coroutine is run on a helper thread.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coroutine)
+    return _run_sync_helper().submit(asyncio.run, coroutine).result()
+
+
+_helper = None
+_helper_lock = threading.Lock()
+
+
+def _run_sync_helper():
+    # one helper thread pool for every run_sync call made from inside a running loop
+    global _helper
+    with _helper_lock:
+        if _helper is None:
+            _helper = concurrent.futures.ThreadPoolExecutor(max_workers=4, thread_name_prefix="lfcli-run-sync")
+        return _helper
+
+# ~class
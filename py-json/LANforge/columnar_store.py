@@ -0,0 +1,241 @@
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+# Append-only per-endpoint time series in chunked .npy segments  -
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+import sys
+
+if sys.version_info[0] != 3:
+    print("This script requires Python 3")
+    exit()
+
+import csv
+import json
+import os
+import time
+
+# You will need numpy: apt install python3-numpy, or pip3 install numpy
+import numpy as np
+
+MANIFEST = "manifest.json"
+TIME_FORMAT = '%m_%d_%Y_%H_%M_%S'
+
+
+class ColumnarStore:
+    """
+    Records one row of per-endpoint values per monitor (e.g. 'rx', 'rx_delta',
+    'rx_drop_percent') per poll. Rows are buffered in memory and written once
+    buffer_rows accumulate or flush_sec pass, whichever comes first, so a crash
+    loses at most that much. Each segment is a pair of .npy files: an epoch vector
+    and a rows x endpoints matrix. Column i is always endpoint names[i]; the
+    endpoint list may only grow, older segments are padded on read.
+
+        store = ColumnarStore("/home/lanforge/report-data/longevity-01")
+        store.append("rx", epoch, rx_values, names=metrics.names)
+        ...
+        store.close()
+        epochs, values = ColumnarStore.open(path).window("rx", start_epoch, end_epoch)
+        ColumnarStore.open(path).to_csv("longevity.csv")
+
+    manifest.json lists endpoint names and, per monitor, each segment's file
+    names, row count and epoch range, so a time window only loads the
+    segments it overlaps.
+    """
+    def __init__(self, directory, buffer_rows=60, flush_sec=60, create=True):
+        """
+        :param directory: where segments and manifest.json are kept
+        :param buffer_rows: rows per monitor held in memory before a segment is written
+        :param flush_sec: longest a buffered row waits before its segment is written
+        :param create: False opens an existing store, see open()
+        """
+        if buffer_rows < 1:
+            raise ValueError("ColumnarStore: buffer_rows must be at least 1, given %s" % buffer_rows)
+        self.directory = directory
+        self.buffer_rows = buffer_rows
+        self.flush_sec = flush_sec
+        self.names = []
+        self.monitors = {}
+        self.buffers = {}
+        self.buffer_started = {}
+        manifest_path = os.path.join(directory, MANIFEST)
+        if os.path.exists(manifest_path):
+            with open(manifest_path, "r") as fp:
+                manifest = json.load(fp)
+            self.names = manifest["names"]
+            self.monitors = manifest["monitors"]
+        elif create:
+            os.makedirs(directory, exist_ok=True)
+        else:
+            raise ValueError("ColumnarStore: no %s in %s" % (MANIFEST, directory))
+
+    @classmethod
+    def open(cls, directory):
+        return cls(directory, create=False)
+
+    def set_names(self, names):
+        """
+        :param names: endpoint names in column order; must extend the current list
+        """
+        if len(names) < len(self.names):
+            raise ValueError("ColumnarStore: endpoint list may only grow (%d < %d)" % (len(names), len(self.names)))
+        # existing columns keep their endpoint, e.g. when reopening a store_dir
+        if list(names[:len(self.names)]) != list(self.names):
+            mismatch = [(old, new) for old, new in zip(self.names, names) if old != new]
+            raise ValueError("ColumnarStore: endpoint names do not match the existing columns, first difference %s != %s"
+                             % mismatch[0])
+        if len(names) > len(self.names):
+            self.names = list(names)
+
+    def append(self, monitor, epoch, values, names=None):
+        """
+        Buffer one row.
+        :param monitor: series name, like 'rx'
+        :param epoch: seconds since 1970 of this row
+        :param values: 1-d numpy array in endpoint index order
+        :param names: current endpoint names, when the index may have grown
+        """
+        if names is not None:
+            self.set_names(names)
+        if monitor not in self.monitors:
+            self.monitors[monitor] = {"dtype": np.asarray(values).dtype.str, "segments": []}
+        buffer = self.buffers.setdefault(monitor, [])
+        if len(buffer) < 1:
+            self.buffer_started[monitor] = time.monotonic()
+        buffer.append((int(epoch), np.array(values, dtype=self.monitors[monitor]["dtype"])))
+        if (len(buffer) >= self.buffer_rows) or (time.monotonic() - self.buffer_started[monitor] >= self.flush_sec):
+            self.flush(monitor)
+
+    def _pad(self, matrix, width):
+        if matrix.shape[1] >= width:
+            return matrix
+        padded = np.zeros((matrix.shape[0], width), dtype=matrix.dtype)
+        padded[:, :matrix.shape[1]] = matrix
+        return padded
+
+    def flush(self, monitor=None):
+        """
+        Write buffered rows of one monitor (or all) as new segments, then the manifest.
+        """
+        monitors = [monitor] if monitor is not None else list(self.buffers.keys())
+        for name in monitors:
+            buffer = self.buffers.get(name)
+            if not buffer:
+                continue
+            width = max(len(values) for _, values in buffer)
+            matrix = np.zeros((len(buffer), width), dtype=self.monitors[name]["dtype"])
+            for row, (_, values) in enumerate(buffer):
+                matrix[row, :len(values)] = values
+            epochs = np.array([epoch for epoch, _ in buffer], dtype=np.int64)
+            segments = self.monitors[name]["segments"]
+            base = "%s-%06d" % (name, len(segments))
+            np.save(os.path.join(self.directory, base + ".values.npy"), matrix)
+            np.save(os.path.join(self.directory, base + ".epochs.npy"), epochs)
+            segments.append({"values": base + ".values.npy",
+                             "epochs": base + ".epochs.npy",
+                             "rows": len(buffer),
+                             "width": width,
+                             "first": int(epochs[0]),
+                             "last": int(epochs[-1])})
+            self.buffers[name] = []
+        self._write_manifest()
+
+    def _write_manifest(self):
+        manifest_path = os.path.join(self.directory, MANIFEST)
+        with open(manifest_path + ".tmp", "w") as fp:
+            json.dump({"names": self.names, "monitors": self.monitors}, fp)
+        os.replace(manifest_path + ".tmp", manifest_path)
+
+    def close(self):
+        self.flush()
+
+    def window(self, monitor, start_epoch=None, end_epoch=None):
+        """
+        Rows of one monitor with start_epoch <= epoch <= end_epoch, buffered rows included.
+        :return: (epochs, values) with values shaped rows x len(names)
+        """
+        if monitor not in self.monitors:
+            raise KeyError("ColumnarStore: no monitor %s" % monitor)
+        dtype = self.monitors[monitor]["dtype"]
+        width = len(self.names)
+        epoch_parts = []
+        value_parts = []
+        for segment in self.monitors[monitor]["segments"]:
+            if (start_epoch is not None) and (segment["last"] < start_epoch):
+                continue
+            if (end_epoch is not None) and (segment["first"] > end_epoch):
+                continue
+            epochs = np.load(os.path.join(self.directory, segment["epochs"]))
+            values = np.load(os.path.join(self.directory, segment["values"]), mmap_mode="r")
+            keep = np.ones(len(epochs), dtype=bool)
+            if start_epoch is not None:
+                keep &= epochs >= start_epoch
+            if end_epoch is not None:
+                keep &= epochs <= end_epoch
+            epoch_parts.append(epochs[keep])
+            value_parts.append(self._pad(np.asarray(values[keep]), width))
+        buffer = [(epoch, values) for epoch, values in self.buffers.get(monitor, ())
+                  if ((start_epoch is None) or (epoch >= start_epoch))
+                  and ((end_epoch is None) or (epoch <= end_epoch))]
+        if len(buffer) > 0:
+            matrix = np.zeros((len(buffer), width), dtype=dtype)
+            for row, (_, values) in enumerate(buffer):
+                matrix[row, :len(values)] = values
+            epoch_parts.append(np.array([epoch for epoch, _ in buffer], dtype=np.int64))
+            value_parts.append(matrix)
+        if len(epoch_parts) < 1:
+            return np.zeros(0, dtype=np.int64), np.zeros((0, width), dtype=dtype)
+        return np.concatenate(epoch_parts), np.concatenate(value_parts)
+
+    def column(self, monitor, endpoint, start_epoch=None, end_epoch=None):
+        """
+        :return: (epochs, values) of one endpoint
+        """
+        epochs, values = self.window(monitor, start_epoch, end_epoch)
+        return epochs, values[:, self.names.index(endpoint)]
+
+    def rows(self, monitors=None, start_epoch=None, end_epoch=None):
+        """
+        Yield [epoch, time, monitor, value, ...] rows ordered by epoch, like the longevity csv.
+        """
+        if monitors is None:
+            monitors = list(self.monitors.keys())
+        merged = []
+        for order, monitor in enumerate(monitors):
+            epochs, values = self.window(monitor, start_epoch, end_epoch)
+            for epoch, row in zip(epochs.tolist(), values):
+                merged.append((epoch, order, monitor, row))
+        merged.sort(key=lambda item: (item[0], item[1]))
+        for epoch, _, monitor, row in merged:
+            yield [epoch, time.strftime(TIME_FORMAT, time.localtime(epoch)), monitor] + row.tolist()
+
+    def header(self):
+        return ['Time epoch', 'Time', 'Monitor'] + self.names
+
+    def to_csv(self, path, monitors=None, start_epoch=None, end_epoch=None):
+        with open(path, "w", newline="") as fp:
+            writer = csv.writer(fp, delimiter=",")
+            writer.writerow(self.header())
+            writer.writerows(self.rows(monitors, start_epoch, end_epoch))
+        return path
+
+    def to_excel(self, path, monitors=None, start_epoch=None, end_epoch=None):
+        """
+        Write one worksheet per monitor.
+        """
+        # You will need xlsxwriter: sudo yum install python3-xlsxwriter
+        import xlsxwriter
+        if monitors is None:
+            monitors = list(self.monitors.keys())
+        workbook = xlsxwriter.Workbook(path, {'constant_memory': True})
+        bold = workbook.add_format({'bold': True, 'align': 'center'})
+        for monitor in monitors:
+            worksheet = workbook.add_worksheet(monitor[:31])
+            worksheet.write_row(0, 0, self.header(), bold)
+            row_number = 1
+            for row in self.rows([monitor], start_epoch, end_epoch):
+                worksheet.write_row(row_number, 0, row)
+                row_number += 1
+        workbook.close()
+        return path
+
+# ~class
+
+# ~columnar_store
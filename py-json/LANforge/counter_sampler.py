@@ -0,0 +1,156 @@
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+# Poll counters of a known set of endpoints by name             -
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+import sys
+
+if sys.version_info[0] != 3:
+    print("This script requires Python 3")
+    exit()
+
+import time
+import urllib.parse
+
+DEFAULT_FIELDS = ("rx bytes", "rx drop %")
+# keep request lines well under what the GUI's http server accepts
+DEFAULT_MAX_URL_LEN = 2000
+
+
+class CounterSample:
+    """
+    Result of one EndpCounterSampler.sample():
+    changed: map of field to {endpoint name: value} for values that differ from the last sample
+    missing: endpoint names the manager did not report this time
+    epoch: when sampling started, seconds since 1970
+    """
+    __slots__ = ("changed", "missing", "requests", "epoch")
+
+    def __init__(self, fields, epoch=None):
+        self.changed = {field: {} for field in fields}
+        self.missing = []
+        self.requests = 0
+        self.epoch = epoch if epoch is not None else time.time()
+
+    def __repr__(self):
+        return "CounterSample(changed=%s missing=%s)" % ({f: len(c) for f, c in self.changed.items()},
+                                                         len(self.missing))
+
+
+class EndpCounterSampler:
+    """
+    Requests only the named endpoints, e.g. /endp/LT-sta0000-A,LT-sta0001-A?fields=name,rx+bytes,
+    split into as few urls as stay under max_url_len. The urls and the name to
+    index mapping are built once; each sample() compares against the previous
+    one and returns only what changed, so the cost follows the test's endpoint
+    count rather than every endpoint on the manager.
+
+        sampler = realm.new_counter_sampler(cx_profile.created_endp.keys())
+        sample = sampler.sample()
+        rx_changes = sample.changed["rx bytes"]
+    """
+    def __init__(self, lfcli, endp_names=(), fields=DEFAULT_FIELDS, max_url_len=DEFAULT_MAX_URL_LEN, debug=False):
+        """
+        :param lfcli: LFCliBase (or Realm) used for the requests
+        :param endp_names: endpoints to poll
+        :param fields: counter names as they appear in /endp responses
+        :param max_url_len: longest url to request before starting another chunk
+        """
+        self.lfcli = lfcli
+        self.fields = tuple(fields)
+        self.max_url_len = max_url_len
+        self.debug = debug
+        self.names = []
+        self.index = {}
+        self.urls = []
+        self.values = {field: [] for field in self.fields}
+        self.seen = []
+        self.sample_count = 0
+        self.set_names(endp_names)
+
+    def set_names(self, endp_names):
+        """
+        Replace the endpoint list; values of endpoints kept in the list carry over.
+        """
+        old_index = self.index
+        old_values = self.values
+        old_seen = self.seen
+        self.names = []
+        self.index = {}
+        for name in endp_names:
+            if name not in self.index:
+                self.index[name] = len(self.names)
+                self.names.append(name)
+        self.values = {field: [None] * len(self.names) for field in self.fields}
+        self.seen = [False] * len(self.names)
+        for name, position in self.index.items():
+            old_position = old_index.get(name)
+            if old_position is None:
+                continue
+            for field in self.fields:
+                self.values[field][position] = old_values[field][old_position]
+            self.seen[position] = old_seen[old_position]
+        self.urls = self._build_urls()
+
+    def _build_urls(self):
+        query = "?fields=" + ",".join(urllib.parse.quote_plus(f) for f in ("name",) + self.fields)
+        urls = []
+        chunk = []
+        length = len("/endp/") + len(query)
+        for name in self.names:
+            quoted = urllib.parse.quote(name, safe="-_.")
+            if (len(chunk) > 0) and (length + len(quoted) + 1 > self.max_url_len):
+                urls.append("/endp/" + ",".join(chunk) + query)
+                chunk = []
+                length = len("/endp/") + len(query)
+            chunk.append(quoted)
+            length += len(quoted) + 1
+        if len(chunk) > 0:
+            urls.append("/endp/" + ",".join(chunk) + query)
+        return urls
+
+    def _records(self, url):
+        records = self.lfcli.json_get_stream(url, keys=("endpoint",), debug_=self.debug)
+        for record in (records or []):
+            # a single endpoint comes back as a bare record carrying its name
+            if "name" in record and not isinstance(record["name"], dict):
+                yield record["name"], record
+                continue
+            for name, values in record.items():
+                yield name, values
+
+    def sample(self):
+        """
+        :return: CounterSample with the counters that changed since the previous sample
+            (every counter on the first one)
+        """
+        sample = CounterSample(self.fields)
+        reported = [False] * len(self.names)
+        for url in self.urls:
+            sample.requests += 1
+            for name, record in self._records(url):
+                position = self.index.get(name)
+                if position is None:
+                    continue
+                reported[position] = True
+                for field in self.fields:
+                    value = record.get(field)
+                    if (value != self.values[field][position]) or not self.seen[position]:
+                        self.values[field][position] = value
+                        sample.changed[field][name] = value
+                self.seen[position] = True
+        for position, was_reported in enumerate(reported):
+            if not was_reported:
+                sample.missing.append(self.names[position])
+                self.seen[position] = False
+        self.sample_count += 1
+        return sample
+
+    def values_map(self, field):
+        """
+        :return: {endpoint name: latest value} of one field for endpoints reported last time
+        """
+        column = self.values[field]
+        return {name: column[position] for name, position in self.index.items() if self.seen[position]}
+
+# ~class
+
+# ~counter_sampler
@@ -0,0 +1,225 @@
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+# Long-lived client for the LANforge :8081 event websocket       -
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+import sys
+
+if sys.version_info[0] != 3:
+    print("This script requires Python 3")
+    exit()
+
+import concurrent.futures
+import json
+import re
+import threading
+import time
+import traceback
+
+try:
+    import websocket
+except ImportError:
+    # You will need websocket-client: apt install python3-websocket
+    websocket = None
+
+cre = {
+    "port":             re.compile(r'Port (\S+)', re.I),
+    "ip_change":        re.compile(r' IP change from (\S+) to (\S+)', re.I),
+    "phy":              re.compile(r'^(1\.\d+):\s+(\S+)\s+\(phy', re.I),
+    "ifname":           re.compile(r'(1\.\d+):\s+IFNAME=(\S+)\s+', re.I),
+    "connected":        re.compile(r'.*?CTRL-EVENT-CONNECTED - Connection to ([a-f0-9:]+) complete', re.I),
+    "associated":       re.compile(r'^.*?Associated with ([a-f0-9:]+)$', re.I),
+    "authenticated":    re.compile(r'.*?Authenticated with ([a-f0-9:]+)', re.I),
+    "endp":             re.compile(r'Endpoint (\S+)', re.I),
+}
+
+
+class LFEvent:
+    """
+    One websocket message reduced to what waiters care about.
+    kind is one of: ip, connected, associated, authenticated, endp, port, wifi, other
+    """
+    __slots__ = ("kind", "resource", "name", "value", "message")
+
+    def __init__(self, kind, resource=None, name=None, value=None, message=None):
+        self.kind = kind
+        self.resource = resource
+        self.name = name
+        self.value = value
+        self.message = message
+
+    def __repr__(self):
+        return "LFEvent(%s %s.%s %s)" % (self.kind, self.resource, self.name, self.value)
+
+
+def parse_event(message):
+    """
+    :param message: decoded json message from the websocket
+    :return: LFEvent
+    """
+    if not isinstance(message, dict):
+        return LFEvent("other", message=message)
+    name = message.get("name")
+    resource = None
+    if "resource" in message:
+        resource = "1.%s" % message["resource"]
+
+    if "event_type" in message:
+        details = message.get("details", "")
+        match = cre["ip_change"].search(details)
+        port_match = cre["port"].match(details)
+        if port_match is not None:
+            name = port_match.group(1)
+        if match is not None:
+            return LFEvent("ip", resource, name, match.group(2), message)
+        endp_match = cre["endp"].match(details)
+        if endp_match is not None:
+            return LFEvent("endp", resource, endp_match.group(1), details, message)
+        return LFEvent("port", resource, name, details, message)
+
+    if "wifi-event" in message:
+        text = message["wifi-event"]
+        for pattern in ("phy", "ifname"):
+            match = cre[pattern].match(text)
+            if match is not None:
+                resource = match.group(1)
+                name = match.group(2)
+                break
+        for kind in ("connected", "associated", "authenticated"):
+            match = cre[kind].match(text)
+            if match is not None:
+                return LFEvent(kind, resource, name, match.group(1), message)
+        return LFEvent("wifi", resource, name, text, message)
+
+    return LFEvent("other", resource, name, None, message)
+
+
+class EventStream:
+    """
+    Keeps one websocket to the manager's event port open on a daemon thread and
+    hands every parsed LFEvent to subscribers. expect() turns an event pattern
+    into a concurrent.futures.Future, e.g.
+
+        stream = EventStream("localhost").start()
+        created = stream.endp_exists("udp-A")
+        created.result(timeout=30)
+
+    The socket reconnects after reconnect_sec if the manager drops it.
+    """
+    def __init__(self, host="localhost", port=8081, reconnect_sec=5, debug=False):
+        self.url = "ws://%s:%s" % (host, port)
+        self.reconnect_sec = reconnect_sec
+        self.debug = debug
+        self.subscribers = []
+        self.lock = threading.Lock()
+        self.activity = threading.Condition()
+        self.event_count = 0
+        self.connected = False
+        self.running = False
+        self.thread = None
+        self.websock = None
+
+    def start(self):
+        if websocket is None:
+            raise ImportError("EventStream requires websocket-client: apt install python3-websocket")
+        if self.thread is None:
+            self.running = True
+            self.thread = threading.Thread(target=self._run, name="lf-event-stream", daemon=True)
+            self.thread.start()
+        return self
+
+    def stop(self):
+        self.running = False
+        if self.websock is not None:
+            self.websock.close()
+
+    def _run(self):
+        while self.running:
+            self.websock = websocket.WebSocketApp(self.url,
+                                                  on_open=self._on_open,
+                                                  on_message=self._on_message,
+                                                  on_error=self._on_error,
+                                                  on_close=self._on_close)
+            self.websock.run_forever()
+            self.connected = False
+            if self.running:
+                time.sleep(self.reconnect_sec)
+
+    def _on_open(self, wsock):
+        self.connected = True
+        wsock.send('{"text":"ping"}')
+        if self.debug:
+            print("EventStream: connected to %s" % self.url)
+
+    def _on_error(self, wsock, err):
+        if self.debug:
+            print("EventStream: %s" % err)
+
+    def _on_close(self, wsock, *args):
+        self.connected = False
+
+    def _on_message(self, wsock, text):
+        try:
+            message = json.loads(text)
+        except ValueError:
+            return
+        event = parse_event(message)
+        with self.lock:
+            subscribers = list(self.subscribers)
+        for callback in subscribers:
+            try:
+                callback(event)
+            except Exception as x:
+                traceback.print_exception(Exception, x, x.__traceback__, chain=True)
+        with self.activity:
+            self.event_count += 1
+            self.activity.notify_all()
+
+    def subscribe(self, callback):
+        """
+        :param callback: callable(LFEvent), run on the websocket thread
+        """
+        with self.lock:
+            self.subscribers.append(callback)
+        return callback
+
+    def unsubscribe(self, callback):
+        with self.lock:
+            if callback in self.subscribers:
+                self.subscribers.remove(callback)
+
+    def wait_for_activity(self, timeout_sec):
+        """
+        Sleep up to timeout_sec, waking early when any event arrives.
+        :return: True if an event arrived
+        """
+        with self.activity:
+            seen = self.event_count
+            self.activity.wait_for(lambda: self.event_count != seen, timeout_sec)
+            return self.event_count != seen
+
+    def expect(self, predicate):
+        """
+        :param predicate: callable(LFEvent) -> bool
+        :return: Future resolved with the first matching LFEvent; cancel() it to stop listening
+        """
+        future = concurrent.futures.Future()
+
+        def check(event):
+            if future.done():
+                self.unsubscribe(check)
+                return
+            if predicate(event):
+                self.unsubscribe(check)
+                # the waiter may have cancelled it meanwhile
+                if future.set_running_or_notify_cancel():
+                    future.set_result(event)
+
+        self.subscribe(check)
+        return future
+
+    def endp_exists(self, endp_name):
+        """
+        :return: Future resolved when an event mentions endpoint endp_name
+        """
+        return self.expect(lambda event: (event.kind == "endp") and (event.name == endp_name))
+
+# ~class
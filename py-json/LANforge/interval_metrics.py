@@ -0,0 +1,227 @@
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+# Per-poll endpoint counters as arrays on a fixed endpoint index -
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+import sys
+
+if sys.version_info[0] != 3:
+    print("This script requires Python 3")
+    exit()
+
+# You will need numpy: apt install python3-numpy, or pip3 install numpy
+import numpy as np
+
+
+class IntervalMetrics:
+    """
+    Keeps the latest two polls of one counter (e.g. rx bytes) as numpy arrays.
+    Position i in every array is always the same endpoint, so deltas are a
+    single subtraction and best/worst-k use argpartition instead of sorting
+    every endpoint each interval:
+
+        rx = IntervalMetrics(dtype=np.int64, exclude=("mtx",))
+        rx.push({"A-rx": 1000, "B-rx": 5})      # first poll
+        rx.push({"A-rx": 3000, "B-rx": 5})
+        deltas = rx.deltas()                    # array([2000, 0])
+        worst = rx.bottom_k(deltas)             # [('B-rx', 0), ('A-rx', 2000)]
+
+    Endpoints seen for the first time are appended to the index; a poll that
+    lacks an endpoint marks it absent in that poll's `present` mask.
+    """
+    def __init__(self, dtype=np.int64, exclude=(), k=5):
+        """
+        :param dtype: numpy dtype of the counter
+        :param exclude: endpoints whose name contains any of these strings are ignored
+        :param k: default count for top_k() and bottom_k()
+        """
+        self.dtype = np.dtype(dtype)
+        self.exclude = tuple(exclude)
+        self.k = k
+        self.names = []
+        self.index = {}
+        self.poll_count = 0
+        self.values = np.zeros(0, dtype=self.dtype)
+        self.present = np.zeros(0, dtype=bool)
+        self.prev_values = None
+        self.prev_present = None
+
+    def __len__(self):
+        return len(self.names)
+
+    def wanted(self, name):
+        for pattern in self.exclude:
+            if pattern in name:
+                return False
+        return True
+
+    def add_names(self, names):
+        """
+        Append endpoints not yet indexed.
+        :return: number of names added
+        """
+        added = 0
+        for name in names:
+            if (name not in self.index) and self.wanted(name):
+                self.index[name] = len(self.names)
+                self.names.append(name)
+                added += 1
+        return added
+
+    def align(self, values_map):
+        """
+        :param values_map: map of endpoint name to counter value
+        :return: (values, present) arrays in index order
+        """
+        self.add_names(values_map.keys())
+        values = np.zeros(len(self.names), dtype=self.dtype)
+        present = np.zeros(len(self.names), dtype=bool)
+        for name, value in values_map.items():
+            position = self.index.get(name)
+            if (position is None) or (value is None):
+                continue
+            values[position] = value
+            present[position] = True
+        return values, present
+
+    @staticmethod
+    def _pad(array, length):
+        if len(array) >= length:
+            return array
+        return np.concatenate((array, np.zeros(length - len(array), dtype=array.dtype)))
+
+    def push(self, values_map):
+        """
+        Record one poll; the previous poll is kept for deltas().
+        :return: values array of this poll
+        """
+        values, present = self.align(values_map)
+        return self._advance(values, present)
+
+    def push_changes(self, changes, missing=()):
+        """
+        Record one poll given only what changed since the last one, as returned
+        by EndpCounterSampler; endpoints in missing are marked absent.
+        :return: values array of this poll
+        """
+        self.add_names(changes.keys())
+        values = self._pad(self.values, len(self.names)).copy()
+        present = self._pad(self.present, len(self.names)).copy()
+        for name, value in changes.items():
+            position = self.index.get(name)
+            if (position is None) or (value is None):
+                continue
+            values[position] = value
+            present[position] = True
+        for name in missing:
+            position = self.index.get(name)
+            if position is not None:
+                values[position] = 0
+                present[position] = False
+        return self._advance(values, present)
+
+    def _advance(self, values, present):
+        if self.poll_count > 0:
+            self.prev_values = self._pad(self.values, len(values))
+            self.prev_present = self._pad(self.present, len(present))
+        self.values = values
+        self.present = present
+        self.poll_count += 1
+        return values
+
+    def both_present(self):
+        """
+        :return: mask of endpoints reported in both of the last two polls
+        """
+        if self.prev_present is None:
+            return self.present.copy()
+        return self.present & self.prev_present
+
+    def same_endpoints(self):
+        """
+        :return: True if the last two polls reported exactly the same endpoints
+        """
+        if self.prev_present is None:
+            return True
+        return bool(np.array_equal(self.present, self.prev_present))
+
+    def deltas(self):
+        """
+        :return: last poll minus the one before it, 0 where either poll lacked the endpoint
+        """
+        if self.prev_values is None:
+            return np.zeros(len(self.values), dtype=self.dtype)
+        return np.where(self.both_present(), self.values - self.prev_values, 0).astype(self.dtype)
+
+    def increased(self):
+        """
+        :return: mask of endpoints whose counter went up since the previous poll
+        """
+        if self.prev_values is None:
+            return np.zeros(len(self.values), dtype=bool)
+        return self.both_present() & (self.values > self.prev_values)
+
+    def _mask(self, present):
+        if present is None:
+            return self.present
+        return present
+
+    def average_nonzero(self, values, present=None):
+        """
+        Mean of the non-zero values, 0 if there are none.
+        """
+        selected = values[self._mask(present) & (values != 0)]
+        if len(selected) < 1:
+            return 0
+        return selected.mean().item()
+
+    def percentiles(self, values, pcts=(50, 90, 99), present=None):
+        """
+        :return: map of percentile to value over the present endpoints
+        """
+        selected = values[self._mask(present)]
+        if len(selected) < 1:
+            return {pct: 0 for pct in pcts}
+        return dict(zip(pcts, np.percentile(selected, pcts).tolist()))
+
+    def _select(self, values, present, k, largest):
+        if k is None:
+            k = self.k
+        positions = np.flatnonzero(self._mask(present))
+        if (len(positions) < 1) or (k < 1):
+            return []
+        candidates = values[positions]
+        if k < len(candidates):
+            if largest:
+                picked = np.argpartition(-candidates, k - 1)[:k]
+            else:
+                picked = np.argpartition(candidates, k - 1)[:k]
+            positions = positions[picked]
+        # order the k picked entries the way sorted() on (value, name) would
+        pairs = [(self.names[p], values[p].item()) for p in positions]
+        pairs.sort(key=lambda pair: (pair[1], pair[0]), reverse=largest)
+        return pairs
+
+    def bottom_k(self, values, k=None, present=None):
+        """
+        :return: up to k (name, value) pairs with the smallest values, smallest first
+        """
+        return self._select(values, present, k, largest=False)
+
+    def top_k(self, values, k=None, present=None):
+        """
+        :return: up to k (name, value) pairs with the largest values, largest first
+        """
+        return self._select(values, present, k, largest=True)
+
+    def row_values(self, values, present=None):
+        """
+        :return: values of the present endpoints as python numbers, in index order
+        """
+        return values[self._mask(present)].tolist()
+
+    def row_names(self, present=None):
+        mask = self._mask(present)
+        return [name for name, keep in zip(self.names, mask) if keep]
+
+# ~class
+
+# ~interval_metrics
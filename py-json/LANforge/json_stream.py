@@ -0,0 +1,178 @@
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+# Incremental decoding of large LANforge list responses         -
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+import sys
+
+if sys.version_info[0] != 3:
+    print("This script requires Python 3")
+    exit()
+
+import codecs
+import json
+import re
+
+# structural characters outside of strings, and the two that matter inside them
+TOKEN_RE = re.compile(r'[{}\[\]":,]')
+STRING_RE = re.compile(r'["\\]')
+
+DEFAULT_RECORD_KEYS = ("interfaces", "interface", "endpoint", "endpoints")
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+
+class JsonRecordStreamer:
+    """
+    Feed it pieces of a json document like
+        {"handler": "...", "interfaces": [{"1.1.eth0": {...}}, {"1.1.eth1": {...}}], ...}
+    and it returns each element of the top-level array named in keys as soon
+    as that element is complete. Only the element being decoded is held in
+    memory, so peak memory does not grow with the size of the list. A key
+    whose value is a single object (e.g. "interface") yields that object.
+    """
+    def __init__(self, keys=DEFAULT_RECORD_KEYS):
+        self.keys = set(keys)
+        self.buf = ""
+        self.pos = 0
+        self.depth = 0
+        self.in_str = False
+        self.str_start = -1
+        self.key_candidate = None
+        self.after_colon = False
+        self.target_depth = None
+        self.target_is_array = False
+        self.elem_start = -1
+        self.decoder = json.JSONDecoder()
+
+    def _decode_record(self, buf, start):
+        # records are small next to the read size, so decode each one whole at C speed;
+        # a truncated record raises and is retried once more text has arrived
+        try:
+            record, end = self.decoder.raw_decode(buf, start)
+        except ValueError:
+            self.elem_start = start
+            return None, start
+        self.elem_start = -1
+        return record, end
+
+    def _value_started(self, char):
+        # first token after "key": decides whether we descend into a record list
+        self.after_colon = False
+        key = self.key_candidate
+        self.key_candidate = None
+        if (key is None) or (key not in self.keys) or (self.target_depth is not None):
+            return
+        if char == '[':
+            self.target_is_array = True
+            self.target_depth = self.depth + 1
+        elif char == '{':
+            self.target_is_array = False
+            self.target_depth = self.depth
+
+    def feed(self, text):
+        """
+        :param text: next piece of the document
+        :return: list of decoded records completed by this piece
+        """
+        records = []
+        self.buf += text
+        buf = self.buf
+        while True:
+            if self.in_str:
+                match = STRING_RE.search(buf, self.pos)
+                if match is None:
+                    self.pos = len(buf)
+                    break
+                if match.group() == '\\':
+                    if match.end() >= len(buf):
+                        self.pos = match.start()
+                        break
+                    self.pos = match.end() + 1
+                    continue
+                self.in_str = False
+                self.pos = match.end()
+                if (self.depth == 1) and not self.after_colon:
+                    self.key_candidate = buf[self.str_start + 1:match.start()]
+                elif self.after_colon:
+                    self.after_colon = False
+                    self.key_candidate = None
+                continue
+
+            match = TOKEN_RE.search(buf, self.pos)
+            if match is None:
+                self.pos = len(buf)
+                break
+            char = match.group()
+            self.pos = match.start()
+            if char == '"':
+                if self.after_colon and (self.depth == 1):
+                    self.after_colon = False
+                    self.key_candidate = None
+                self.in_str = True
+                self.str_start = self.pos
+            elif char == ':':
+                if (self.depth == 1) and (self.key_candidate is not None):
+                    self.after_colon = True
+            elif char == ',':
+                if self.depth == 1:
+                    self.after_colon = False
+                    self.key_candidate = None
+            elif char in '{[':
+                if self.after_colon and (self.depth == 1):
+                    self._value_started(char)
+                if (char == '{') and (self.target_depth is not None) and (self.depth == self.target_depth):
+                    record, end = self._decode_record(buf, self.pos)
+                    if record is None:
+                        break
+                    records.append(record)
+                    self.pos = end
+                    if not self.target_is_array:
+                        self.target_depth = None
+                    continue
+                self.depth += 1
+            else:
+                self.depth -= 1
+                if self.target_is_array and (self.target_depth is not None) \
+                        and (self.depth == self.target_depth - 1):
+                    self.target_depth = None
+                    self.target_is_array = False
+                if self.depth == 1:
+                    self.after_colon = False
+                    self.key_candidate = None
+            self.pos += 1
+
+        # drop everything that can no longer be part of a record
+        cut = self.pos
+        if self.elem_start >= 0:
+            cut = min(cut, self.elem_start)
+        if self.in_str:
+            cut = min(cut, self.str_start)
+        if cut > 0:
+            self.buf = buf[cut:]
+            self.pos -= cut
+            if self.elem_start >= 0:
+                self.elem_start -= cut
+            if self.in_str:
+                self.str_start -= cut
+        return records
+
+
+def iter_json_records(fp, keys=DEFAULT_RECORD_KEYS, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Yield records from a binary file-like object (e.g. an http response) as they are read.
+    :param fp: object with read(n) returning bytes
+    :param keys: names of the top-level lists (or single objects) whose elements are yielded
+    :param chunk_size: bytes per read
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    streamer = JsonRecordStreamer(keys)
+    while True:
+        chunk = fp.read(chunk_size)
+        if not chunk:
+            break
+        for record in streamer.feed(decoder.decode(chunk)):
+            yield record
+    for record in streamer.feed(decoder.decode(b"", final=True)):
+        yield record
+    if streamer.elem_start >= 0:
+        raise ValueError("iter_json_records: truncated or malformed record at end of document")
+
+# ~json_stream
@@ -7,6 +7,9 @@ from pprint import pprint
 
 import LANforge.LFUtils
 from LANforge.LFUtils import *
+from LANforge import LFConnectionPool
+from LANforge import response_cache
+from LANforge import request_stats
 import argparse
 
 
@@ -19,7 +22,8 @@ class LFCliBase:
                  _halt_on_error=False,
                  _exit_on_error=False,
                  _exit_on_fail=False,
-                 _local_realm=False):
+                 _local_realm=False,
+                 _pool_size=None):
         self.fail_pref = "FAILED: "
         self.pass_pref = "PASSED: "
         self.lfclient_host = _lfjson_host
@@ -29,6 +33,10 @@ class LFCliBase:
             self.local_realm = _local_realm
 
         self.lfclient_url = "http://%s:%s" % (self.lfclient_host, self.lfclient_port)
+        # every LFRequest to this manager shares one keep-alive pool; _pool_size bounds
+        # how many connections it may hold open at once
+        if _pool_size is not None:
+            LFConnectionPool.set_pool_size(self.lfclient_host, self.lfclient_port, _pool_size)
         self.test_results = []
         self.halt_on_error = _halt_on_error
         self.exit_on_error = _exit_on_error
@@ -39,6 +47,47 @@ class LFCliBase:
         # Otherwise, preexec methods use more processing time because they add an extra CLI call
         # into the queue, and inspect it -- typically nc_show_port
         self.suppress_related_commands = None
+        # see enable_response_cache(); off unless asked for
+        self.response_cache = None
+
+    def enable_response_cache(self, max_entries=256, default_ttl_sec=0.5, ttls=None):
+        """
+        Serve repeated json_get/json_get_stream queries from a short-lived cache. Posts to
+        /cli-json on the same manager, from this object or any other, drop the entries they
+        can change. Cached responses are shared between callers: do not modify them.
+        :param max_entries: least recently used entries are dropped past this many
+        :param default_ttl_sec: lifetime of entries for urls not listed in ttls
+        :param ttls: map of url prefix to lifetime, like {"/port": 1.0, "/cx": 0}; 0 disables caching
+        """
+        if self.response_cache is None:
+            self.response_cache = response_cache.LFResponseCache(max_entries=max_entries,
+                                                                 default_ttl_sec=default_ttl_sec,
+                                                                 ttls=ttls)
+            response_cache.register(self.lfclient_url, self.response_cache)
+        return self.response_cache
+
+    def disable_response_cache(self):
+        if self.response_cache is not None:
+            response_cache.unregister(self.lfclient_url, self.response_cache)
+            self.response_cache = None
+
+    @staticmethod
+    def enable_request_stats(report_at_exit=True, json_path=None):
+        """
+        Record count, bytes and latency percentiles of every request per endpoint, and the
+        time the library's retry and wait helpers spend sleeping. The recorder is process wide.
+        :param report_at_exit: print a summary table when the script exits
+        :param json_path: also write the numbers as json to this file at exit
+        :return: LANforge.request_stats.RequestStats
+        """
+        return request_stats.enable(report_at_exit=report_at_exit, json_path=json_path)
+
+    @staticmethod
+    def get_request_stats():
+        """
+        :return: RequestStats being recorded, or None when disabled
+        """
+        return request_stats.get_stats()
 
     def clear_test_results(self):
         self.test_results.clear()
@@ -99,6 +148,12 @@ class LFCliBase:
     def json_get(self, _req_url, debug_=False):
         if self.debug or debug_:
             print("URL: "+_req_url)
+        cache_key = None
+        if self.response_cache is not None:
+            cache_key = response_cache.cache_key(_req_url)
+            json_response = self.response_cache.get(cache_key)
+            if json_response is not response_cache.MISS:
+                return json_response
         json_response = None
         try:
             lf_r = LFRequest.LFRequest(self.lfclient_url, _req_url, debug_=(self.debug or debug_), die_on_error_=self.exit_on_error)
@@ -107,6 +162,8 @@ class LFCliBase:
             if (json_response is None) and (self.debug or debug_):
                 print("LFCliBase.json_get: no entity/response, probabily status 404")
                 return None
+            if cache_key is not None:
+                self.response_cache.put(cache_key, json_response)
         except ValueError as ve:
             if self.debug or self.halt_on_error or self.exit_on_error:
                 print("jsonGet asked for " + _req_url)
@@ -117,6 +174,41 @@ class LFCliBase:
 
         return json_response
 
+    def json_get_stream(self, _req_url, keys=("interfaces", "interface", "endpoint"), debug_=False):
+        """
+        Streams a list response record by record instead of decoding it all at once,
+        so callers can filter while parsing.
+        :param _req_url: requested url
+        :param keys: top-level lists whose elements are yielded
+        :return: iterator of records like {"1.1.sta0000": {...}}, or None on error
+        """
+        if self.debug or debug_:
+            print("URL: "+_req_url)
+        cache_key = None
+        if self.response_cache is not None:
+            # streamed records are cached apart from whole json_get documents
+            cache_key = "%s#%s" % (response_cache.cache_key(_req_url), ",".join(keys))
+            cached = self.response_cache.get(cache_key)
+            if cached is not response_cache.MISS:
+                return iter(cached)
+        lf_r = LFRequest.LFRequest(self.lfclient_url, _req_url, debug_=(self.debug or debug_),
+                                   die_on_error_=self.exit_on_error)
+        records = lf_r.get_as_json_stream(keys=keys, debug_=(self.debug or debug_),
+                                          die_on_error_=self.halt_on_error)
+        if (records is None) and (self.debug or debug_):
+            print("LFCliBase.json_get_stream: no entity/response, probabily status 404")
+        if (records is not None) and (cache_key is not None):
+            return self._cache_stream(cache_key, records)
+        return records
+
+    def _cache_stream(self, cache_key, records):
+        # only a stream read to the end is cached
+        seen = []
+        for record in records:
+            seen.append(record)
+            yield record
+        self.response_cache.put(cache_key, seen)
+
     @staticmethod
     def response_list_to_map(json_list, key, debug_=False):
         reverse_map = {}
@@ -166,7 +258,7 @@ class LFCliBase:
         while (response is None) and (duration < 300):
             print("LANforge GUI connection not found sleeping 5 seconds, tried: %s" % self.lfclient_url)
             duration += 2
-            time.sleep(2)
+            request_stats.sleep(2, "LFCliBase.check_connect")
             response = self.json_get("", debug_=self.debug)
 
         if duration >= 300:
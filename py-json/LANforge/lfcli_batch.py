@@ -0,0 +1,130 @@
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+# Queue CLI-JSON commands and submit them in bulk                -
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+import sys
+
+if sys.version_info[0] != 3:
+    print("This script requires Python 3")
+    exit()
+
+import concurrent.futures
+import time
+from pprint import pprint
+
+from LANforge import LFConnectionPool
+
+
+class LFCliResult:
+    """
+    Outcome of one queued command after LFCliBatch.flush()
+    """
+    __slots__ = ("url", "data", "ok", "response", "errors", "elapsed_sec")
+
+    def __init__(self, url, data):
+        self.url = url
+        self.data = data
+        self.ok = False
+        self.response = None
+        self.errors = []
+        self.elapsed_sec = 0.0
+
+    def __repr__(self):
+        return "LFCliResult(%s ok=%s errors=%s)" % (self.url, self.ok, self.errors)
+
+
+class LFCliBatch:
+    """
+    Collects /cli-json commands and sends them in bulk. Commands are grouped in
+    stages: everything in one stage may run concurrently, and a stage starts
+    only after the previous one has finished. Within a stage the commands are
+    dealt into `concurrency` chunks; each chunk is posted in order by one worker
+    over its own keep-alive connection.
+
+        batch = LFCliBatch(realm, concurrency=8)
+        batch.add("/cli-json/add_endp", endp_a)
+        batch.add("/cli-json/add_endp", endp_b)
+        batch.barrier()
+        batch.add("/cli-json/set_endp_flag", flag_a)
+        results = batch.flush()
+    """
+    def __init__(self, lfcli, concurrency=8, debug_=False):
+        """
+        :param lfcli: LFCliBase (or Realm) whose json_post is used to send
+        :param concurrency: number of chunks posted at the same time
+        :param debug_: print failed commands after each flush
+        """
+        if concurrency < 1:
+            raise ValueError("LFCliBatch: concurrency must be at least 1, given %s" % concurrency)
+        self.lfcli = lfcli
+        self.concurrency = concurrency
+        self.debug = debug_
+        self.stages = [[]]
+        self.results = []
+        LFConnectionPool.ensure_pool_size(lfcli.lfclient_host, lfcli.lfclient_port, concurrency)
+
+    def __len__(self):
+        return sum(len(stage) for stage in self.stages)
+
+    def add(self, url, data, suppress_related_commands_=None, debug_=False):
+        """
+        Queue one command; data is copied so the caller may reuse its dict.
+        :param debug_: passed to json_post when the command is sent
+        :return: the LFCliResult that flush() will fill in
+        """
+        if not url.startswith("/"):
+            url = "/" + url
+        result = LFCliResult(url, dict(data))
+        self.stages[-1].append((result, suppress_related_commands_, debug_))
+        return result
+
+    def barrier(self):
+        """
+        Commands added after this call are sent only once the ones before it have completed.
+        """
+        if len(self.stages[-1]) > 0:
+            self.stages.append([])
+
+    def _post_chunk(self, chunk):
+        for result, suppress, debug_ in chunk:
+            response_json = []
+            started = time.perf_counter()
+            response = self.lfcli.json_post(result.url, result.data,
+                                            debug_=debug_,
+                                            suppress_related_commands_=suppress,
+                                            response_json_list_=response_json)
+            result.elapsed_sec = time.perf_counter() - started
+            if len(response_json) > 0:
+                result.response = response_json[0]
+            if response is None:
+                result.errors.append("no response")
+            elif isinstance(result.response, dict) and result.response.get("errors"):
+                result.errors.extend(result.response["errors"])
+            result.ok = len(result.errors) == 0
+
+    def flush(self):
+        """
+        Send every queued command, stage by stage, and clear the queue.
+        :return: list of LFCliResult in the order the commands were added
+        """
+        flushed = []
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            for stage in self.stages:
+                if len(stage) < 1:
+                    continue
+                chunks = [stage[i::self.concurrency] for i in range(self.concurrency)]
+                futures = [executor.submit(self._post_chunk, chunk) for chunk in chunks if len(chunk) > 0]
+                for future in futures:
+                    future.result()
+                flushed.extend(command[0] for command in stage)
+        self.stages = [[]]
+        self.results.extend(flushed)
+        if self.debug:
+            for result in flushed:
+                if not result.ok:
+                    pprint(result)
+        return flushed
+
+    def failed(self):
+        return [result for result in self.results if not result.ok]
+
+# ~class
@@ -0,0 +1,157 @@
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+# Run independent periodic jobs, each on its own schedule        -
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+import sys
+
+if sys.version_info[0] != 3:
+    print("This script requires Python 3")
+    exit()
+
+import concurrent.futures
+import heapq
+import random
+import threading
+import time
+import traceback
+
+
+class PeriodicTask:
+    """
+    One job of a PeriodicScheduler. A run that is still going when the next
+    one comes due is not started twice; that round is counted in skipped.
+    """
+    __slots__ = ("name", "period_sec", "callback", "jitter_sec", "running", "runs", "skipped",
+                 "errors", "last_duration_sec")
+
+    def __init__(self, name, period_sec, callback, jitter_sec=0.0):
+        self.name = name
+        self.period_sec = period_sec
+        self.callback = callback
+        self.jitter_sec = jitter_sec
+        self.running = False
+        self.runs = 0
+        self.skipped = 0
+        self.errors = 0
+        self.last_duration_sec = 0.0
+
+    def next_delay(self):
+        if self.jitter_sec <= 0:
+            return self.period_sec
+        return max(0.0, self.period_sec + random.uniform(-self.jitter_sec, self.jitter_sec))
+
+    def __repr__(self):
+        return "PeriodicTask(%s every %ss runs=%d skipped=%d errors=%d)" % (self.name, self.period_sec, self.runs,
+                                                                          self.skipped, self.errors)
+
+
+class PeriodicScheduler:
+    """
+    Keeps a heap of next due times and hands each due task to a worker thread,
+    so a slow task (a controller query, a big csv flush) never holds up the
+    others. Due times are kept on the task's own grid, not measured from when
+    the previous run finished, so periods do not drift:
+
+        scheduler = PeriodicScheduler()
+        scheduler.add("sample", 60, sample_counters)
+        scheduler.add("reset_ports", 1, reset_port_check)
+        scheduler.add("controller", 300, query_controller, jitter_sec=30)
+        scheduler.run(duration_sec=3600)
+    """
+    def __init__(self, debug=False):
+        self.debug = debug
+        self.tasks = []
+        self.heap = []
+        self.sequence = 0
+        self.condition = threading.Condition()
+        self.running = False
+
+    def add(self, name, period_sec, callback, jitter_sec=0.0, first_delay_sec=None):
+        """
+        :param period_sec: seconds between runs
+        :param callback: callable() run on a worker thread
+        :param jitter_sec: each delay is randomized by up to +/- this much
+        :param first_delay_sec: delay before the first run; defaults to one period
+        :return: PeriodicTask
+        """
+        if period_sec <= 0:
+            raise ValueError("PeriodicScheduler: period_sec of %s must be positive, given %s" % (name, period_sec))
+        task = PeriodicTask(name, period_sec, callback, jitter_sec=jitter_sec)
+        if first_delay_sec is None:
+            first_delay_sec = task.next_delay()
+        with self.condition:
+            self.tasks.append(task)
+            self._push(time.monotonic() + first_delay_sec, task)
+            self.condition.notify()
+        return task
+
+    def _push(self, due, task):
+        self.sequence += 1
+        heapq.heappush(self.heap, (due, self.sequence, task))
+
+    def _run_task(self, task):
+        started = time.monotonic()
+        try:
+            task.callback()
+        except Exception as x:
+            task.errors += 1
+            print("PeriodicScheduler: task %s failed:" % task.name)
+            traceback.print_exception(Exception, x, x.__traceback__, chain=True)
+        finally:
+            task.last_duration_sec = time.monotonic() - started
+            task.runs += 1
+            with self.condition:
+                task.running = False
+                self.condition.notify()
+
+    def run(self, duration_sec=None):
+        """
+        Dispatch tasks until duration_sec has passed or stop() is called, then wait
+        for runs in progress to finish.
+        """
+        end = None
+        if duration_sec is not None:
+            end = time.monotonic() + duration_sec
+        self.running = True
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=max(1, len(self.tasks)),
+                                                         thread_name_prefix="periodic")
+        try:
+            while True:
+                with self.condition:
+                    now = time.monotonic()
+                    if (not self.running) or ((end is not None) and (now >= end)):
+                        break
+                    if len(self.heap) < 1:
+                        self.condition.wait(None if end is None else end - now)
+                        continue
+                    due, _, task = self.heap[0]
+                    if due > now:
+                        timeout = due - now
+                        if end is not None:
+                            timeout = min(timeout, end - now)
+                        self.condition.wait(timeout)
+                        continue
+                    heapq.heappop(self.heap)
+                    # next due time stays on the task's grid; skip past rounds we fell behind on
+                    next_due = due + task.next_delay()
+                    while next_due <= now:
+                        next_due += task.period_sec
+                    self._push(next_due, task)
+                    if task.running:
+                        task.skipped += 1
+                        if self.debug:
+                            print("PeriodicScheduler: %s still running, skipping a round" % task.name)
+                        continue
+                    task.running = True
+                executor.submit(self._run_task, task)
+        finally:
+            self.running = False
+            executor.shutdown(wait=True)
+
+    def stop(self):
+        with self.condition:
+            self.running = False
+            self.condition.notify_all()
+
+# ~class
+
+# ~periodic_scheduler
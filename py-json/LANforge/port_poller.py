@@ -0,0 +1,250 @@
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+# One /port/list query per tick shared by every port waiter      -
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+import sys
+
+if sys.version_info[0] != 3:
+    print("This script requires Python 3")
+    exit()
+
+import threading
+import time
+
+from LANforge import LFUtils
+from LANforge import port_table
+from LANforge import request_stats
+
+DEFAULT_FIELDS = "alias,down,ip,ipv6+address,port+type"
+
+
+def port_eid_key(port_eid, resource_id=None):
+    """
+    Normalize sta0, 1.sta0 or 1.1.sta0 to the shelf.resource.name keys used in /port/list
+    :param resource_id: resource to assume when port_eid has none
+    """
+    eid = LFUtils.name_to_eid(port_eid)
+    if (resource_id is not None) and (str(port_eid).find('.') < 0):
+        eid[1] = resource_id
+    return "%s.%s.%s" % (eid[0], eid[1], eid[2])
+
+
+class PortWaiter:
+    """
+    A set of ports and a predicate(record) -> bool that each must satisfy.
+    record is the port's /port/list entry, or None when the port is absent.
+    error is set when the waiter was released because its predicate or the poller failed.
+    """
+    def __init__(self, port_keys, predicate, timeout_sec=None, on_pending=None):
+        self.pending = set(port_keys)
+        self.predicate = predicate
+        self.on_pending = on_pending
+        self.deadline = None
+        if (timeout_sec is not None) and (timeout_sec >= 0):
+            self.deadline = time.time() + timeout_sec
+        self.timed_out = False
+        self.error = None
+        self.done = threading.Event()
+
+    def evaluate(self, snapshot):
+        """
+        :return: True if any port moved out of pending
+        """
+        before = len(self.pending)
+        for key in list(self.pending):
+            if self.predicate(snapshot.get(key)):
+                self.pending.discard(key)
+        if len(self.pending) < 1:
+            self.done.set()
+        elif not self.expire() and (self.on_pending is not None):
+            self.on_pending(sorted(self.pending))
+        return len(self.pending) < before
+
+    def expire(self):
+        """
+        Release the waiter if its deadline has passed.
+        :return: True if it timed out
+        """
+        if (self.deadline is not None) and (time.time() >= self.deadline):
+            self.timed_out = True
+            self.done.set()
+        return self.timed_out
+
+    def fail(self, error):
+        """
+        Release the waiter with its ports still pending.
+        """
+        self.error = error
+        self.done.set()
+
+
+class PortPoller:
+    """
+    Fetches /port/list?fields=... once per tick and evaluates every registered
+    PortWaiter against that one snapshot. The tick interval starts at
+    min_interval_sec and backs off toward max_interval_sec while no waiter
+    makes progress; it drops back when one does. The polling thread runs only
+    while there are waiters. With an EventStream attached, port events wake the
+    poller immediately and polling only continues as a slow fallback.
+    """
+    def __init__(self, base_url="http://localhost:8080", fields=DEFAULT_FIELDS,
+                 min_interval_sec=0.25, max_interval_sec=2.0, debug=False):
+        self.base_url = base_url.rstrip('/')
+        self.fields = fields
+        self.min_interval_sec = min_interval_sec
+        self.max_interval_sec = max_interval_sec
+        self.debug = debug
+        self.waiters = []
+        self.lock = threading.Lock()
+        self.thread = None
+        self.snapshot_count = 0
+        self.table = port_table.PortTable(self.base_url, fields=fields, debug=debug)
+        self.wake = threading.Event()
+        self.event_stream = None
+        self.fallback_interval_sec = None
+
+    def notify(self):
+        """
+        Take the next snapshot now instead of waiting out the current interval.
+        """
+        self.wake.set()
+
+    def attach_event_stream(self, event_stream, fallback_interval_sec=5.0):
+        """
+        Wake on port, ip and wifi events from event_stream; while it is connected, poll
+        every fallback_interval_sec otherwise. A disconnected stream wakes nobody, so
+        polling goes back to max_interval_sec.
+        """
+        if self.event_stream is not None:
+            return
+        self.event_stream = event_stream
+        self.fallback_interval_sec = fallback_interval_sec
+        event_stream.subscribe(lambda event: self.notify() if event.kind not in ("endp", "other") else None)
+
+    def longest_interval(self):
+        """
+        :return: the interval the tick backs off to, given the event stream's current state
+        """
+        if (self.event_stream is not None) and self.event_stream.connected:
+            return max(self.max_interval_sec, self.fallback_interval_sec)
+        return self.max_interval_sec
+
+    def snapshot(self):
+        """
+        Refresh the poller's PortTable from a single /port/list request; records are
+        updated in place instead of rebuilding a map every tick.
+        :return: PortTable keyed by shelf.resource.name, None if the request failed
+        """
+        self.snapshot_count += 1
+        if self.table.refresh() is None:
+            return None
+        return self.table
+
+    def _tick(self, waiters):
+        """
+        Evaluate waiters against one snapshot. A failed request counts as no progress:
+        an absent port must not look like one that went away.
+        :return: True if any waiter made progress
+        """
+        try:
+            snapshot = self.snapshot()
+        except Exception as e:
+            print("PortPoller: /port/list request failed: %s" % e)
+            snapshot = None
+        progress = False
+        for waiter in waiters:
+            if snapshot is None:
+                waiter.expire()
+                continue
+            try:
+                if waiter.evaluate(snapshot):
+                    progress = True
+            except BaseException as e:
+                # a predicate or on_pending probe that raises (or exits) releases only its own waiter
+                print("PortPoller: releasing waiter for %s: %r" % (", ".join(sorted(waiter.pending)), e))
+                waiter.fail(e)
+        return progress
+
+    def _run(self):
+        try:
+            self._poll()
+        finally:
+            # never leave waiters blocked behind a dead thread
+            with self.lock:
+                if self.thread is not threading.current_thread():
+                    return
+                for waiter in self.waiters:
+                    if not waiter.done.is_set():
+                        waiter.fail(RuntimeError("port poller stopped"))
+                self.waiters = []
+                self.thread = None
+
+    def _poll(self):
+        interval = self.min_interval_sec
+        while True:
+            with self.lock:
+                waiters = list(self.waiters)
+                if len(waiters) < 1:
+                    self.thread = None
+                    return
+            # events arriving while this snapshot is taken still wake the next tick
+            self.wake.clear()
+            progress = self._tick(waiters)
+            with self.lock:
+                self.waiters = [w for w in self.waiters if not w.done.is_set()]
+                if len(self.waiters) < 1:
+                    self.thread = None
+                    return
+            if progress:
+                interval = self.min_interval_sec
+            else:
+                interval = min(interval * 1.5, self.longest_interval())
+            started = time.time()
+            self.wake.wait(interval)
+            # bursts of events still leave min_interval_sec between snapshots
+            spent = time.time() - started
+            if spent < self.min_interval_sec:
+                request_stats.sleep(self.min_interval_sec - spent, "PortPoller")
+
+    def wait(self, port_list, predicate, timeout_sec=None, resource_id=None, on_pending=None):
+        """
+        Block until predicate holds for every port in port_list, or timeout_sec passes.
+        :param port_list: port names or EIDs
+        :param predicate: callable(record or None) -> bool
+        :param timeout_sec: None or negative waits forever
+        :param resource_id: resource to use for port names without one
+        :param on_pending: callable(list of pending EIDs) run after each tick that leaves ports pending
+        :return: list of EIDs that never satisfied predicate (empty on success); ports are
+            left pending when the waiter fails, see PortWaiter.error
+        """
+        if (port_list is None) or (len(port_list) < 1):
+            return []
+        waiter = PortWaiter([port_eid_key(p, resource_id) for p in port_list], predicate,
+                            timeout_sec=timeout_sec, on_pending=on_pending)
+        with self.lock:
+            self.waiters.append(waiter)
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._run, name="port-poller", daemon=True)
+                self.thread.start()
+        waiter.done.wait()
+        return sorted(waiter.pending)
+
+# ~class
+
+
+_pollers = {}
+_pollers_lock = threading.Lock()
+
+
+def get_poller(base_url="http://localhost:8080"):
+    """
+    Return the PortPoller shared by every waiter on this manager.
+    """
+    key = base_url.rstrip('/')
+    with _pollers_lock:
+        poller = _pollers.get(key)
+        if poller is None:
+            poller = PortPoller(key)
+            _pollers[key] = poller
+        return poller
+
+# ~port_poller
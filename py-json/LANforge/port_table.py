@@ -0,0 +1,346 @@
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+# Indexed, incrementally refreshed table of /port records        -
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+import sys
+
+if sys.version_info[0] != 3:
+    print("This script requires Python 3")
+    exit()
+
+import re
+
+from LANforge import LFRequest
+from LANforge import LFUtils
+
+DEFAULT_FIELDS = "_links,alias,device,down,ip,ipv6+address,port+type"
+RECORD_KEYS = ("interfaces", "interface")
+
+
+def attr_name(field):
+    """
+    'port type' -> port_type, 'rx-rate' -> rx_rate
+    """
+    name = re.sub(r'[^0-9a-zA-Z_]', '_', field).lower()
+    if name[:1].isdigit():
+        name = "_" + name
+    return name
+
+
+def resource_key(resource):
+    """
+    2, '2' or '1.2' -> '1.2'
+    """
+    resource = str(resource)
+    if resource.find('.') < 0:
+        return "1.%s" % resource
+    return resource
+
+
+class PortRecord:
+    """
+    One port. Requested fields are slots named by attr_name(), so record.port_type
+    and record['port type'] both work; fields the manager sent without being asked
+    for land in extra. Subclassed per field list by make_record_class().
+    """
+    __slots__ = ("eid", "resource", "name", "extra")
+    field_attrs = {}
+
+    def __init__(self, eid):
+        self.eid = eid
+        hunks = eid.split('.')
+        self.resource = "%s.%s" % (hunks[0], hunks[1])
+        self.name = ".".join(hunks[2:])
+        self.extra = None
+        for attr in self.field_attrs.values():
+            setattr(self, attr, None)
+
+    def __getitem__(self, field):
+        attr = self.field_attrs.get(field)
+        if attr is not None:
+            return getattr(self, attr)
+        if (self.extra is None) or (field not in self.extra):
+            raise KeyError(field)
+        return self.extra[field]
+
+    def __contains__(self, field):
+        return (field in self.field_attrs) or ((self.extra is not None) and (field in self.extra))
+
+    def get(self, field, default=None):
+        try:
+            return self[field]
+        except KeyError:
+            return default
+
+    def update(self, values):
+        """
+        :return: True if any value changed
+        """
+        changed = False
+        extra = None
+        for field, value in values.items():
+            attr = self.field_attrs.get(field)
+            if attr is None:
+                if extra is None:
+                    extra = {}
+                extra[field] = value
+            elif getattr(self, attr) != value:
+                setattr(self, attr, value)
+                changed = True
+        if extra != self.extra:
+            self.extra = extra
+            changed = True
+        return changed
+
+    def to_dict(self):
+        """
+        :return: the record as /port/list would have returned it
+        """
+        result = {field: getattr(self, attr) for field, attr in self.field_attrs.items()}
+        if self.extra is not None:
+            result.update(self.extra)
+        return result
+
+    def __repr__(self):
+        return "%s(%s)" % (self.__class__.__name__, self.eid)
+
+
+def make_record_class(fields):
+    """
+    :param fields: field names as they appear in responses, like ['alias', 'port type']
+    :return: PortRecord subclass with one slot per field
+    """
+    field_attrs = {}
+    for field in fields:
+        attr = attr_name(field)
+        if (attr in PortRecord.__slots__) or (attr in field_attrs.values()):
+            attr = "f_" + attr
+        field_attrs[field] = attr
+    return type("PortRecord", (PortRecord,), {"__slots__": tuple(field_attrs.values()),
+                                              "field_attrs": field_attrs})
+
+
+class PortTable:
+    """
+    Ports keyed by EID with indexes by alias, resource and port type. Records are
+    updated in place, so a refresh only touches ports that changed and the indexes
+    only move when an alias or port type does:
+
+        table = PortTable(realm.lfclient_url)
+        table.refresh()
+        for record in table.of_type("WIFI-STA"):
+            print(record.eid, record.ip)
+        table.refresh_ports(["1.1.sta0000"])
+
+    Records are not copied out: treat them as read-only.
+    """
+    def __init__(self, base_url="http://localhost:8080", fields=DEFAULT_FIELDS, debug=False):
+        self.base_url = base_url.rstrip('/')
+        self.fields = fields
+        self.debug = debug
+        self.record_class = make_record_class([f.replace('+', ' ') for f in fields.split(',')])
+        self.records = {}
+        self.alias_index = {}
+        self.resource_index = {}
+        self.type_index = {}
+        self.refresh_count = 0
+
+    def __len__(self):
+        return len(self.records)
+
+    def __iter__(self):
+        return iter(self.records.values())
+
+    def __contains__(self, port_eid):
+        return port_eid in self.records
+
+    def get(self, port_eid, default=None):
+        return self.records.get(port_eid, default)
+
+    def __getitem__(self, port_eid):
+        return self.records[port_eid]
+
+    def eids(self):
+        return list(self.records.keys())
+
+    def by_alias(self, alias):
+        """
+        :return: records with this alias, one per resource it exists on
+        """
+        return [self.records[eid] for eid in self.alias_index.get(alias, ())]
+
+    def on_resource(self, resource):
+        """
+        :param resource: '1.2' or 2
+        """
+        return [self.records[eid] for eid in self.resource_index.get(resource_key(resource), ())]
+
+    def of_type(self, port_type):
+        return [self.records[eid] for eid in self.type_index.get(port_type, ())]
+
+    def stations(self):
+        return self.of_type("WIFI-STA")
+
+    def to_map(self):
+        """
+        :return: map of EID to plain dict, like LFUtils.port_list_to_alias_map()
+        """
+        return {eid: record.to_dict() for eid, record in self.records.items()}
+
+    @staticmethod
+    def _add_to(index, key, eid):
+        if key is None:
+            return
+        members = index.get(key)
+        if members is None:
+            members = set()
+            index[key] = members
+        members.add(eid)
+
+    @staticmethod
+    def _remove_from(index, key, eid):
+        members = index.get(key)
+        if members is not None:
+            members.discard(eid)
+            if len(members) < 1:
+                del index[key]
+
+    def _index(self, record):
+        self._add_to(self.alias_index, record.get("alias"), record.eid)
+        self._add_to(self.resource_index, record.resource, record.eid)
+        self._add_to(self.type_index, record.get("port type"), record.eid)
+
+    def _unindex(self, record):
+        self._remove_from(self.alias_index, record.get("alias"), record.eid)
+        self._remove_from(self.resource_index, record.resource, record.eid)
+        self._remove_from(self.type_index, record.get("port type"), record.eid)
+
+    def _put(self, eid, values):
+        """
+        :return: 'added', 'changed' or None
+        """
+        record = self.records.get(eid)
+        if record is None:
+            record = self.record_class(eid)
+            record.update(values)
+            self.records[eid] = record
+            self._index(record)
+            return "added"
+        old_alias = record.get("alias")
+        old_type = record.get("port type")
+        if not record.update(values):
+            return None
+        if (old_alias != record.get("alias")) or (old_type != record.get("port type")):
+            self._remove_from(self.alias_index, old_alias, eid)
+            self._remove_from(self.type_index, old_type, eid)
+            self._index(record)
+        return "changed"
+
+    def remove(self, port_eid):
+        record = self.records.pop(port_eid, None)
+        if record is not None:
+            self._unindex(record)
+        return record
+
+    def load(self, port_records, scope=None):
+        """
+        Merge records as found in /port/list 'interfaces' into the table.
+        :param port_records: iterable of {eid: {field: value}}
+        :param scope: EIDs the records are a complete answer for; those not seen are removed.
+            None means the records cover every port.
+        :return: (added, changed, removed) lists of EIDs
+        """
+        added = []
+        changed = []
+        seen = set()
+        for port_record in port_records:
+            for eid, values in port_record.items():
+                # skip uninitialized port records
+                if eid.find("Unknown") >= 0:
+                    continue
+                seen.add(eid)
+                outcome = self._put(eid, values)
+                if outcome == "added":
+                    added.append(eid)
+                elif outcome == "changed":
+                    changed.append(eid)
+        if scope is None:
+            scope = list(self.records.keys())
+        removed = [eid for eid in scope if (eid not in seen) and (self.remove(eid) is not None)]
+        self.refresh_count += 1
+        return added, changed, removed
+
+    def _fetch(self, url):
+        lf_r = LFRequest.LFRequest(self.base_url, url, debug_=self.debug)
+        return lf_r.get_as_json_stream(keys=RECORD_KEYS, debug_=self.debug)
+
+    def refresh(self, resource=None):
+        """
+        Query /port/list (or one resource of it) and merge the result.
+        :param resource: '1.2' or 2 to refresh only the ports of that resource
+        :return: (added, changed, removed) lists of EIDs, or None if the request failed
+        """
+        if resource is None:
+            url = "/port/list?fields=%s" % self.fields
+            scope = None
+        else:
+            resource = resource_key(resource)
+            url = "/port/%s/list?fields=%s" % (resource.replace('.', '/'), self.fields)
+            scope = list(self.resource_index.get(resource, ()))
+        records = self._fetch(url)
+        if records is None:
+            return None
+        try:
+            # parse the whole response first so a truncated one leaves the table as it was
+            records = [_key_record(record, resource) for record in records]
+        except ValueError as x:
+            if self.debug:
+                print("PortTable.refresh: %s" % x)
+            return None
+        return self.load(records, scope=scope)
+
+    def refresh_ports(self, port_eids):
+        """
+        Query only the named ports, one request per resource.
+        :param port_eids: EIDs like 1.1.sta0000
+        :return: (added, changed, removed) lists of EIDs, or None if a request failed
+        """
+        by_resource = {}
+        for port_eid in port_eids:
+            eid = LFUtils.name_to_eid(port_eid)
+            by_resource.setdefault((eid[0], eid[1]), []).append(eid[2])
+        totals = ([], [], [])
+        for (shelf, resource), names in by_resource.items():
+            scope = ["%s.%s.%s" % (shelf, resource, name) for name in names]
+            records = self._fetch("/port/%s/%s/%s?fields=%s" % (shelf, resource, ",".join(names), self.fields))
+            if records is None:
+                return None
+            # a single port comes back as a bare record under 'interface'
+            records = [record if _is_keyed(record) else {scope[0]: record} for record in records]
+            for total, eids in zip(totals, self.load(records, scope=scope)):
+                total.extend(eids)
+        return totals
+
+
+def _is_keyed(record):
+    if len(record) != 1:
+        return False
+    for value in record.values():
+        return isinstance(value, dict)
+
+
+def _key_record(record, resource=None):
+    """
+    A list with a single port comes back as a bare record under 'interface';
+    key it by EID like the records of an 'interfaces' list.
+    :param resource: '1.2' when the list was for one resource
+    """
+    if _is_keyed(record):
+        return record
+    links = str(record.get("_links", "")).strip('/').split('/')
+    if (resource is None) and (len(links) >= 3) and (links[0] == "port"):
+        resource = "%s.%s" % (links[1], links[2])
+    if (resource is None) or (record.get("alias") is None):
+        raise ValueError("cannot tell the EID of port record %s" % record)
+    return {"%s.%s" % (resource, record["alias"]): record}
+
+# ~port_table
@@ -0,0 +1,234 @@
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+# Per-endpoint counts, bytes and latency of LANforge requests   -
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+import sys
+
+if sys.version_info[0] != 3:
+    print("This script requires Python 3")
+    exit()
+
+import atexit
+import json
+import math
+import random
+import threading
+import time
+import urllib.parse
+
+def endpoint_name(method, url):
+    """
+    Collapse a request url to the endpoint it is reported under:
+    /cli-json/add_sta stays as is, /port/1/1/sta0000?fields=alias becomes GET /port
+    """
+    parts = [p for p in urllib.parse.urlsplit(url).path.split("/") if p != ""]
+    if len(parts) < 1:
+        return "%s /" % method
+    if parts[0] in ("cli-json", "cli-form") and len(parts) > 1:
+        return "%s /%s/%s" % (method, parts[0], parts[1])
+    return "%s /%s" % (method, parts[0])
+
+
+class TimingStats:
+    """
+    Count, total and a bounded reservoir of samples for percentile estimates.
+    """
+    __slots__ = ("count", "errors", "bytes_sent", "bytes_received", "total_sec", "max_sec", "samples")
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.total_sec = 0.0
+        self.max_sec = 0.0
+        self.samples = []
+
+    def add(self, seconds, max_samples):
+        self.count += 1
+        self.total_sec += seconds
+        if seconds > self.max_sec:
+            self.max_sec = seconds
+        if len(self.samples) < max_samples:
+            self.samples.append(seconds)
+        else:
+            index = random.randrange(self.count)
+            if index < max_samples:
+                self.samples[index] = seconds
+
+    def percentile(self, pct):
+        if len(self.samples) < 1:
+            return 0.0
+        ordered = sorted(self.samples)
+        rank = max(int(math.ceil(pct / 100.0 * len(ordered))) - 1, 0)
+        return ordered[rank]
+
+    def to_dict(self):
+        result = {
+            "count": self.count,
+            "errors": self.errors,
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+            "total_sec": round(self.total_sec, 6),
+            "mean_ms": round(1000 * self.total_sec / self.count, 3) if self.count else 0.0,
+            "max_ms": round(1000 * self.max_sec, 3),
+        }
+        for pct in (50, 90, 99):
+            result["p%d_ms" % pct] = round(1000 * self.percentile(pct), 3)
+        return result
+
+
+class RequestStats:
+    """
+    Collects request and sleep timings while enabled. Use through the module
+    functions, or LFCliBase.enable_request_stats():
+
+        stats = request_stats.enable(json_path="/tmp/stats.json")
+        ... run the test ...
+        print(stats.summary_table())
+    """
+    def __init__(self, max_samples=10000):
+        self.max_samples = max_samples
+        self.lock = threading.Lock()
+        self.requests = {}
+        self.sleeps = {}
+        self.started = time.time()
+
+    def reset(self):
+        with self.lock:
+            self.requests = {}
+            self.sleeps = {}
+            self.started = time.time()
+
+    def record_request(self, method, url, elapsed_sec, bytes_sent=0, bytes_received=0, ok=True):
+        name = endpoint_name(method, url)
+        with self.lock:
+            stats = self.requests.get(name)
+            if stats is None:
+                stats = TimingStats()
+                self.requests[name] = stats
+            stats.add(elapsed_sec, self.max_samples)
+            stats.bytes_sent += bytes_sent
+            stats.bytes_received += bytes_received
+            if not ok:
+                stats.errors += 1
+
+    def record_sleep(self, where, seconds):
+        with self.lock:
+            stats = self.sleeps.get(where)
+            if stats is None:
+                stats = TimingStats()
+                self.sleeps[where] = stats
+            stats.add(seconds, self.max_samples)
+
+    def to_dict(self):
+        with self.lock:
+            return {
+                "elapsed_sec": round(time.time() - self.started, 3),
+                "requests": {name: stats.to_dict() for name, stats in self.requests.items()},
+                "sleeps": {where: stats.to_dict() for where, stats in self.sleeps.items()},
+            }
+
+    def to_json(self, path=None):
+        """
+        :param path: file to write to; None only returns the text
+        :return: json text
+        """
+        text = json.dumps(self.to_dict(), indent=2, sort_keys=True)
+        if path is not None:
+            with open(path, "w") as fp:
+                fp.write(text)
+        return text
+
+    def summary_table(self):
+        data = self.to_dict()
+        lines = ["Request stats over %.1fs:" % data["elapsed_sec"]]
+        header = "%-36s %7s %5s %10s %10s %9s %9s %9s %9s" % ("endpoint", "count", "err", "sent", "received",
+                                                              "p50 ms", "p90 ms", "p99 ms", "max ms")
+        lines.append(header)
+        lines.append("-" * len(header))
+        ordered = sorted(data["requests"].items(), key=lambda item: -item[1]["total_sec"])
+        for name, row in ordered:
+            lines.append("%-36s %7d %5d %10d %10d %9.1f %9.1f %9.1f %9.1f"
+                         % (name, row["count"], row["errors"], row["bytes_sent"], row["bytes_received"],
+                            row["p50_ms"], row["p90_ms"], row["p99_ms"], row["max_ms"]))
+        if len(data["sleeps"]) > 0:
+            lines.append("")
+            lines.append("%-52s %7s %10s" % ("sleeps in wait helpers", "count", "total s"))
+            for where, row in sorted(data["sleeps"].items(), key=lambda item: -item[1]["total_sec"]):
+                lines.append("%-52s %7d %10.2f" % (where, row["count"], row["total_sec"]))
+        return "\n".join(lines)
+
+# ~class
+
+
+_stats = None
+
+
+def sleep(seconds, where):
+    """
+    time.sleep() for the library's retry and wait helpers; while recording is enabled
+    the time is charged to where, like "LFUtils.wait_until_ports_admin_up".
+    """
+    stats = _stats
+    if stats is None:
+        time.sleep(seconds)
+        return
+    started = time.perf_counter()
+    time.sleep(seconds)
+    stats.record_sleep(where, time.perf_counter() - started)
+
+
+def get_stats():
+    """
+    :return: the active RequestStats, or None when disabled
+    """
+    return _stats
+
+
+def enable(report_at_exit=True, json_path=None, max_samples=10000):
+    """
+    Start recording every LFRequest and every sleep() made by the library's wait helpers.
+    :param report_at_exit: print summary_table() when the interpreter exits
+    :param json_path: also write to_json() to this file at exit
+    """
+    global _stats
+    if _stats is None:
+        _stats = RequestStats(max_samples=max_samples)
+
+        def report(stats=_stats):
+            if report_at_exit:
+                print(stats.summary_table())
+            if json_path is not None:
+                stats.to_json(json_path)
+
+        atexit.register(report)
+    return _stats
+
+
+def disable():
+    global _stats
+    _stats = None
+
+
+def record_request(method, url, elapsed_sec, body=None, response=None):
+    """
+    Called by LFRequest.urlopen for every request; a no-op unless enabled.
+    :param response: response object, or None if the request failed
+    """
+    stats = _stats
+    if stats is None:
+        return
+    bytes_sent = len(body) if body is not None else 0
+    bytes_received = 0
+    if response is not None:
+        if getattr(response, "body", None) is not None:
+            bytes_received = len(response.body)
+        elif getattr(response, "bytes_read", None) is not None:
+            bytes_received = response.bytes_read
+        else:
+            length = response.getheader("Content-Length")
+            if length is not None and length.isdigit():
+                bytes_received = int(length)
+    stats.record_request(method, url, elapsed_sec, bytes_sent, bytes_received, ok=response is not None)
+
+# ~request_stats
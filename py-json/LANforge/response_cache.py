@@ -0,0 +1,188 @@
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+# Short-lived cache for read-only LANforge json queries          -
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+import sys
+
+if sys.version_info[0] != 3:
+    print("This script requires Python 3")
+    exit()
+
+import collections
+import threading
+import time
+import urllib.parse
+
+# which cached resources a /cli-json (or /cli-form) command can change;
+# commands not listed here invalidate everything cached for the manager
+COMMAND_INVALIDATES = {
+    "add_sta":          ("/port",),
+    "add_vap":          ("/port",),
+    "add_mvlan":        ("/port",),
+    "add_monitor":      ("/port",),
+    "add_rdd":          ("/port",),
+    "rm_vlan":          ("/port", "/endp", "/cx"),
+    "set_port":         ("/port",),
+    "set_wifi_extra":   ("/port",),
+    "reset_port":       ("/port",),
+    "nc_show_ports":    ("/port",),
+    "add_endp":         ("/endp",),
+    "rm_endp":          ("/endp", "/cx"),
+    "set_endp_flag":    ("/endp",),
+    "set_endp_tos":     ("/endp",),
+    "set_endp_details": ("/endp",),
+    "nc_show_endpoints": ("/endp",),
+    "add_cx":           ("/cx", "/endp"),
+    "rm_cx":            ("/cx", "/endp"),
+    "set_cx_state":     ("/cx", "/endp"),
+    "set_cx_report_timer": ("/cx",),
+    "show_cx":          ("/cx",),
+    "show_cxe":         ("/cx", "/endp"),
+    "gossip":           (),
+}
+
+# default time to live per resource, seconds
+DEFAULT_TTLS = {
+    "/port": 0.5,
+    "/endp": 0.5,
+    "/cx":   0.5,
+}
+
+MISS = object()
+
+
+def cache_key(url):
+    """
+    Normalize a url to path?fields=... with the field list sorted, so that the
+    same query spelled with fields in another order shares one entry.
+    """
+    parsed = urllib.parse.urlsplit(url)
+    path = "/" + parsed.path.strip("/")
+    params = urllib.parse.parse_qsl(parsed.query, keep_blank_values=True)
+    normalized = []
+    for name, value in sorted(params):
+        if name == "fields":
+            value = ",".join(sorted(f.strip() for f in value.split(",")))
+        normalized.append("%s=%s" % (name, value))
+    if len(normalized) > 0:
+        return path + "?" + "&".join(normalized)
+    return path
+
+
+class LFResponseCache:
+    """
+    LRU cache of decoded GET responses for one manager. Entries expire after the
+    ttl of the longest matching resource prefix in ttls (default_ttl_sec if none
+    match); a ttl of 0 disables caching for that prefix. Any /cli-json post that
+    reaches LFRequest drops the entries its command can affect, see
+    COMMAND_INVALIDATES. Cached objects are shared: treat them as read-only.
+    """
+    def __init__(self, max_entries=256, default_ttl_sec=0.5, ttls=None):
+        if max_entries < 1:
+            raise ValueError("LFResponseCache: max_entries must be at least 1, given %s" % max_entries)
+        self.max_entries = max_entries
+        self.default_ttl_sec = default_ttl_sec
+        self.ttls = dict(DEFAULT_TTLS)
+        if ttls is not None:
+            self.ttls.update(ttls)
+        self.entries = collections.OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def ttl_for(self, key):
+        best = None
+        for prefix in self.ttls.keys():
+            if key.startswith(prefix) and ((best is None) or (len(prefix) > len(best))):
+                best = prefix
+        if best is None:
+            return self.default_ttl_sec
+        return self.ttls[best]
+
+    def get(self, key):
+        """
+        :return: cached value, or MISS
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return MISS
+            expires, value = entry
+            if time.time() >= expires:
+                del self.entries[key]
+                self.misses += 1
+                return MISS
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        ttl = self.ttl_for(key)
+        if (ttl is None) or (ttl <= 0) or (value is None):
+            return
+        with self.lock:
+            self.entries[key] = (time.time() + ttl, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def invalidate(self, prefixes=None):
+        """
+        :param prefixes: resource prefixes like '/port' to drop; None drops everything
+        """
+        with self.lock:
+            if prefixes is None:
+                self.entries.clear()
+                return
+            for key in list(self.entries.keys()):
+                for prefix in prefixes:
+                    if key.startswith(prefix):
+                        del self.entries[key]
+                        break
+
+    def invalidate_command(self, command_url):
+        """
+        Drop the entries a /cli-json/<command> post can change.
+        """
+        command = urllib.parse.urlsplit(command_url).path.rstrip("/").split("/")[-1]
+        self.invalidate(COMMAND_INVALIDATES.get(command))
+
+# ~class
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def _manager_key(url):
+    parsed = urllib.parse.urlsplit(url)
+    return parsed.hostname, parsed.port
+
+
+def register(base_url, cache):
+    """
+    Have posts to this manager invalidate cache. Several LFCliBase objects may register.
+    """
+    with _caches_lock:
+        caches = _caches.setdefault(_manager_key(base_url), [])
+        if cache not in caches:
+            caches.append(cache)
+
+
+def unregister(base_url, cache):
+    with _caches_lock:
+        caches = _caches.get(_manager_key(base_url), [])
+        if cache in caches:
+            caches.remove(cache)
+
+
+def invalidate_for_post(url):
+    """
+    Called by LFRequest for every post: invalidates the caches of that manager.
+    """
+    with _caches_lock:
+        caches = list(_caches.get(_manager_key(url), ()))
+    for cache in caches:
+        cache.invalidate_command(url)
+
+# ~response_cache
@@ -1,16 +1,24 @@
 #!/usr/bin/env python3
+import concurrent.futures
 import re
+import threading
 import time
 import pprint
 from pprint import pprint
 from LANforge import LFRequest
 from LANforge import LFUtils
+from LANforge import request_stats
 from LANforge import set_port
 from LANforge import add_sta
 from LANforge import add_dut
 from LANforge import lfcli_base
 from LANforge import add_vap
 from LANforge.lfcli_base import LFCliBase
+from LANforge.async_lfcli_base import AsyncLFCliBase
+from LANforge.lfcli_batch import LFCliBatch
+from LANforge.event_stream import EventStream
+from LANforge.port_table import PortTable
+from LANforge.counter_sampler import EndpCounterSampler
 from generic_cx import GenericCx
 from LANforge import add_monitor
 from LANforge.add_monitor import *
@@ -48,6 +56,9 @@ class Realm(LFCliBase):
         super().__init__(_lfjson_host=lfclient_host, _lfjson_port=lfclient_port, _debug=debug_, _halt_on_error=halt_on_error_)
         # self.lfclient_url = "http://%s:%s" % (lfclient_host, lfclient_port)
         self.debug = debug_
+        self.event_stream = None
+        self.port_tables = {}
+        self.async_clients = {}
         self.check_connect()
         self.chan_to_freq = {}
         self.freq_to_chan = {}
@@ -145,6 +156,28 @@ class Realm(LFCliBase):
         self.freq_to_chan[4970] = 194
         self.freq_to_chan[4980] = 196
 
+    def start_event_stream(self, ws_port=8081):
+        """
+        Open the manager's event websocket so port and endpoint waits resolve on push;
+        polling continues only as a fallback. Requires websocket-client.
+        """
+        if self.event_stream is None:
+            self.event_stream = EventStream(self.lfclient_host, ws_port, debug=self.debug).start()
+            LFUtils.port_poller.get_poller(self.lfclient_url).attach_event_stream(self.event_stream)
+        return self.event_stream
+
+    # sleeps up to seconds, returning early when the event stream reports activity, or only
+    # when one of futures (see EventStream.expect) resolves if they are given
+    def event_nap(self, seconds, futures=None):
+        if (self.event_stream is None) or (not self.event_stream.connected):
+            request_stats.sleep(seconds, "Realm.event_nap")
+        elif futures is None:
+            self.event_stream.wait_for_activity(seconds)
+        elif len(futures) > 0:
+            concurrent.futures.wait(futures, seconds, return_when=concurrent.futures.FIRST_COMPLETED)
+        else:
+            request_stats.sleep(seconds, "Realm.event_nap")
+
     def wait_until_ports_appear(self, sta_list=None, debug_=False):
         if (sta_list is None) or (len(sta_list) < 1):
             print("realm.wait_until_ports_appear: no stations provided")
@@ -222,6 +255,11 @@ class Realm(LFCliBase):
 
     def set_endp_tos(self, ename, _tos, debug_=False, suppress_related_commands_=True):
         req_url = "cli-json/set_endp_tos"
+        data = self.endp_tos_data(ename, _tos)
+        self.json_post(req_url, data, debug_=debug_, suppress_related_commands_=suppress_related_commands_)
+
+    # returns set_endp_tos parameters, converting BK/BE/VI/VO to numeric values
+    def endp_tos_data(self, ename, _tos):
         tos = _tos
         # Convert some human readable values to numeric needed by LANforge.
         if _tos == "BK":
@@ -232,11 +270,10 @@ class Realm(LFCliBase):
             tos = "128"
         if _tos == "VO":
             tos = "192"
-        data = {
+        return {
             "name": ename,
             "tos": tos
             }
-        self.json_post(req_url, data, debug_=debug_, suppress_related_commands_=suppress_related_commands_)
 
     def stop_cx(self, cx_name):
         self.json_post("/cli-json/set_cx_state", {
@@ -287,7 +324,7 @@ class Realm(LFCliBase):
             if (last_response != "YES"):
                 last_response = None
                 response_json = []
-                time.sleep(1)
+                request_stats.sleep(1, "Realm.wait_while_building")
             else:
                 return
         return
@@ -304,7 +341,7 @@ class Realm(LFCliBase):
             "clean_chambers": "yes"
         }
         self.json_post("/cli-json/load", _data=data, debug_=self.debug)
-        time.sleep(1)
+        request_stats.sleep(1, "Realm.load")
 
     # Returns json response from webpage of all layer 3 cross connects
     def cx_list(self):
@@ -314,11 +351,15 @@ class Realm(LFCliBase):
     def waitUntilEndpsAppear(self, these_endp, debug=False):
         return self.wait_until_endps_appear(these_endp, debug=debug)
 
-    def wait_until_endps_appear(self, these_endp, debug=False):
+    def wait_until_endps_appear(self, these_endp, debug=False, timeout_sec=100):
         wait_more = True
-        count = 0
+        deadline = time.time() + timeout_sec
+        # wake on events about these endpoints only, a busy manager sends plenty of others
+        created = []
+        if self.event_stream is not None:
+            created = [self.event_stream.endp_exists(name) for name in these_endp]
         while wait_more:
-            time.sleep(1)
+            self.event_nap(1, [future for future in created if not future.done()])
             wait_more = False
             endp_list = self.json_get("/endp/list")
             found_endps = {}
@@ -333,20 +374,21 @@ class Realm(LFCliBase):
                     if debug:
                         print("Waiting on endpoint: %s"%(req))
                     wait_more = True
-            count += 1
-            if (count > 100):
+            if time.time() > deadline:
                 break
 
+        for future in created:
+            future.cancel()
         return not wait_more
 
     def waitUntilCxsAppear(self, these_cx, debug=False):
         return self.wait_until_cxs_appear(these_cx, debug=debug)
 
-    def wait_until_cxs_appear(self, these_cx, debug=False):
+    def wait_until_cxs_appear(self, these_cx, debug=False, timeout_sec=100):
         wait_more = True
-        count = 0
+        deadline = time.time() + timeout_sec
         while wait_more:
-            time.sleep(1)
+            self.event_nap(1)
             wait_more = False
             found_cxs = {}
             cx_list = self.cx_list()
@@ -362,53 +404,49 @@ class Realm(LFCliBase):
                     if debug:
                         print("Waiting on CX: %s"%(req))
                     wait_more = True
-            count += 1
-            if (count > 100):
+            if time.time() > deadline:
                 break
 
         return not wait_more
 
     # Returns map of all stations with port+type == WIFI-STATION
     def station_map(self):
-        response = super().json_get("/port/list?fields=_links,alias,device,port+type")
-        if (response is None) or ("interfaces" not in response):
-            pprint(response)
+        records = super().json_get_stream("/port/list?fields=_links,alias,device,port+type", keys=("interfaces",))
+        if records is None:
             print("station_list: incomplete response, halting")
             exit(1)
         sta_map = {}
-        temp_map = LFUtils.portListToAliasMap(response)
-        for k, v in temp_map.items():
-            if (v['port type'] == "WIFI-STA"):
-                sta_map[k] = v
-        temp_map.clear()
-        del temp_map
-        del response
+        # filter while the response is decoded, one interface record at a time
+        for record in records:
+            for k, v in record.items():
+                if k.find("Unknown") >= 0:
+                    continue
+                if (v['port type'] == "WIFI-STA"):
+                    sta_map[k] = v
         return sta_map
 
     # Returns list of all stations with port+type == WIFI-STATION
     def station_list(self):
         sta_list = []
-        response = super().json_get("/port/list?fields=_links,alias,device,port+type")
-        if (response is None) or ("interfaces" not in response):
-            print("station_list: incomplete response:")
-            pprint(response)
+        records = super().json_get_stream("/port/list?fields=_links,alias,device,port+type", keys=("interfaces",))
+        if records is None:
+            print("station_list: incomplete response")
             exit(1)
 
-        for x in range(len(response['interfaces'])):
-            for k, v in response['interfaces'][x].items():
+        for record in records:
+            for k, v in record.items():
                 if v['port type'] == "WIFI-STA":
-                    sta_list.append(response['interfaces'][x])
-        del response
+                    sta_list.append(record)
         return sta_list
 
     # Returns list of all VAPs with "vap" in their name
     def vap_list(self):
         sta_list = []
-        response = super().json_get("/port/list?fields=_links,alias,device,port+type")
-        for x in range(len(response['interfaces'])):
-            for k, v in response['interfaces'][x].items():
+        records = super().json_get_stream("/port/list?fields=_links,alias,device,port+type", keys=("interfaces",))
+        for record in (records or []):
+            for k, v in record.items():
                 if "vap" in v['device']:
-                    sta_list.append(response['interfaces'][x])
+                    sta_list.append(record)
 
         return sta_list
 
@@ -434,25 +472,23 @@ class Realm(LFCliBase):
             url = "/port/1/list?fields=%s" % _fields
         else:
             url = "/port/1/%s/list?fields=%s" % (resource, _fields)
-        response = self.json_get(url)
         if debug_:
             print("# find_ports_like r:%s, u:%s #" % (resource, url))
-            pprint(response)
-        alias_map = LFUtils.portListToAliasMap(response, debug_=debug_)
-        if debug_:
-            pprint(alias_map)
         prelim_map = {}
         matched_map = {}
-        for name, record in alias_map.items():
-            try:
-                if debug_:
-                    print("- prelim - - - - - - - - - - - - - - - - - - -")
-                    pprint(record)
-                if (record["port type"] == "WIFI-STA"):
-                    prelim_map[name] = record
+        for port_record in (self.json_get_stream(url, keys=("interfaces",)) or []):
+            for name, record in port_record.items():
+                if name.find("Unknown") >= 0:
+                    continue
+                try:
+                    if debug_:
+                        print("- prelim - - - - - - - - - - - - - - - - - - -")
+                        pprint(record)
+                    if (record["port type"] == "WIFI-STA"):
+                        prelim_map[name] = record
 
-            except Exception as x:
-                self.error(x)
+                except Exception as x:
+                    self.error(x)
 
         prefix = ""
         try:
@@ -499,6 +535,82 @@ class Realm(LFCliBase):
     def name_to_eid(self, eid):
         return LFUtils.name_to_eid(eid)
 
+    def create_stations(self, jobs, window=32, debug=False):
+        """
+        Runs StationProfile.create for several radios in parallel, one thread per radio.
+        All radios share one in-flight window of `window` stations.
+        :param jobs: list of (station_profile, radio, sta_names) tuples
+        """
+        if (jobs is None) or (len(jobs) < 1):
+            return
+        in_flight = threading.BoundedSemaphore(window)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=len(jobs)) as executor:
+            futures = [executor.submit(station_profile.create,
+                                       radio=radio,
+                                       sta_names_=sta_names,
+                                       debug=debug,
+                                       window=window,
+                                       in_flight_=in_flight)
+                       for station_profile, radio, sta_names in jobs]
+            for future in futures:
+                future.result()
+
+    def new_cli_batch(self, concurrency=8):
+        """
+        Returns an LFCliBatch that queues /cli-json commands for bulk submission.
+        """
+        return LFCliBatch(self, concurrency=concurrency, debug_=self.debug)
+
+    def new_counter_sampler(self, endp_names, fields=("rx bytes", "rx drop %")):
+        """
+        Returns an EndpCounterSampler that polls only endp_names and reports changed counters.
+        """
+        return EndpCounterSampler(self, endp_names, fields=fields, debug=self.debug)
+
+    def new_async_client(self, max_concurrency=32, timeout_sec=30):
+        """
+        Returns an AsyncLFCliBase talking to the same manager, for awaitable
+        json_get/json_post with bounded concurrency.
+        """
+        return AsyncLFCliBase(self.lfclient_host, self.lfclient_port,
+                              _debug=self.debug,
+                              _halt_on_error=self.halt_on_error,
+                              _max_concurrency=max_concurrency,
+                              _timeout_sec=timeout_sec)
+
+    # Queries every port in port_eids concurrently; returns map of eid to 'interface' record (None if missing)
+    def port_info_map(self, port_eids, fields="alias,ip,port+type,ipv6+address,down", max_concurrency=32):
+        if (port_eids is None) or (len(port_eids) < 1):
+            return {}
+        urls = []
+        for port_eid in port_eids:
+            eid = self.name_to_eid(port_eid)
+            urls.append("/port/%s/%s/%s?fields=%s" % (eid[0], eid[1], eid[2], fields))
+        # one client (and thread pool) per concurrency, kept between calls
+        async_client = self.async_clients.get(max_concurrency)
+        if async_client is None:
+            async_client = self.new_async_client(max_concurrency=max_concurrency)
+            self.async_clients[max_concurrency] = async_client
+        responses = async_client.json_get_many(urls)
+        port_map = {}
+        for port_eid, response in zip(port_eids, responses):
+            if (response is not None) and ("interface" in response):
+                port_map[port_eid] = response["interface"]
+            else:
+                port_map[port_eid] = None
+        return port_map
+
+    # Returns the PortTable for these fields, refreshed in place; keep using the same
+    # table between polls instead of rebuilding port maps
+    def port_table(self, fields="_links,alias,device,down,ip,ipv6+address,port+type", refresh=True, resource=None):
+        table = self.port_tables.get(fields)
+        if table is None:
+            table = PortTable(self.lfclient_url, fields=fields, debug=self.debug)
+            self.port_tables[fields] = table
+        if refresh and (table.refresh(resource=resource) is None):
+            print("port_table: incomplete response for /port/list")
+        return table
+
     def wait_for_ip(self, station_list=None, ipv4=True, ipv6=False, timeout_sec=60, debug=False):
         print("Waiting for ips, timeout: %i..."%(timeout_sec))
         #print(station_list)
@@ -506,52 +618,26 @@ class Realm(LFCliBase):
         if (station_list is None) or (len(station_list) < 1):
             raise ValueError("wait_for_ip: expects non-empty list of ports")
 
-        wait_more = True
-        while wait_more and timeout_sec != 0:
-            wait_more = False
-
-            for sta_eid in station_list:
-                if debug:
-                    print("checking sta-eid: %s"%(sta_eid))
-                eid = self.name_to_eid(sta_eid)
-
-                response = super().json_get("/port/%s/%s/%s?fields=alias,ip,port+type,ipv6+address" %
-                                            (eid[0], eid[1], eid[2]))
-                #pprint(response)
+        def has_ip(record):
+            if record is None:
+                return False
+            if ipv4 and (record['ip'] == '0.0.0.0'):
+                return False
+            if ipv6 and ((record['ipv6 address'] == 'DELETED') or record['ipv6 address'].startswith('fe80')
+                         or (record['ipv6 address'] == 'AUTO')):
+                return False
+            return True
 
-                if (response is None) or ("interface" not in response):
-                    print("station_list: incomplete response:")
-                    pprint(response)
-                    wait_more = True
-                    break
-
-                if ipv4:
-                    v = response['interface']
-                    if v['ip'] == '0.0.0.0':
-                        wait_more = True
-                        if debug:
-                            print("Waiting for port %s to get IPv4 Address."%(sta_eid))
-                    else:
-                        if debug:
-                            print("Found IP: %s on port: %s"%(v['ip'], sta_eid))
-
-                if ipv6:
-                    v = response['interface']
-                    #print(v)
-                    if v['ipv6 address'] != 'DELETED' and not v['ipv6 address'].startswith('fe80') \
-                           and v['ipv6 address'] != 'AUTO':
-                        if debug:
-                            print("Found IPv6: %s on port: %s" % (v['ipv6 address'], sta_eid))
-                    else:
-                        wait_more = True
-                        if debug:
-                            print("Waiting for port %s to get IPv6 Address."%(sta_eid))
-
-            if wait_more:
-                time.sleep(1)
-                timeout_sec -= 1
+        def report(pending):
+            if debug:
+                print("Waiting for ports to get IP addresses: %s" % ", ".join(pending))
 
-        return not wait_more
+        # every station is checked against one shared /port/list snapshot per tick
+        waiting = LFUtils.port_poller.get_poller(self.lfclient_url).wait(station_list,
+                                                                         has_ip,
+                                                                         timeout_sec=timeout_sec,
+                                                                         on_pending=report)
+        return len(waiting) < 1
 
     def duration_time_to_seconds(self, time_string):
         if isinstance(time_string, str):
@@ -995,10 +1081,21 @@ class L3CXProfile(LFCliBase):
                     print("Cleaning endpoint: %s"%(ename))
                     self.local_realm.rm_endp(self.created_cx[cx_name][side])
 
-    def create(self, endp_type, side_a, side_b, sleep_time=0.03, suppress_related_commands=None, debug_=False, tos=None):
+    def create(self, endp_type, side_a, side_b, sleep_time=0.03, suppress_related_commands=None, debug_=False, tos=None,
+               batch_concurrency=8):
+        """
+        Queues add_endp, set_endp_flag, set_endp_tos and add_cx commands and submits them in
+        bulk through an LFCliBatch. Endpoints are added first, then their flags, then
+        cross connects once the endpoints exist.
+        :param sleep_time: unused, kept for callers that still pass it
+        :param batch_concurrency: number of command chunks posted at the same time
+        """
         if self.debug:
             debug_=True
 
+        endp_post_data = []
+        flag_post_data = []
+        tos_post_data = []
         cx_post_data = []
         timer_post_data = []
         these_endp = []
@@ -1059,32 +1156,27 @@ class L3CXProfile(LFCliBase):
                     "ip_port": -1
                 }
 
-                url = "/cli-json/add_endp"
-                self.local_realm.json_post(url, endp_side_a, debug_=debug_, suppress_related_commands_=suppress_related_commands)
-                self.local_realm.json_post(url, endp_side_b, debug_=debug_, suppress_related_commands_=suppress_related_commands)
-                #print("napping %f sec"%sleep_time)
-                time.sleep(sleep_time)
+                endp_post_data.append(endp_side_a)
+                endp_post_data.append(endp_side_b)
 
-                url = "cli-json/set_endp_flag"
-                data = {
-                    "name": endp_a_name,
-                    "flag": "AutoHelper",
-                    "val": 1
-                }
-                self.local_realm.json_post(url, data, debug_=debug_, suppress_related_commands_=suppress_related_commands)
-                data["name"] = endp_b_name
-                self.local_realm.json_post(url, data, debug_=debug_, suppress_related_commands_=suppress_related_commands)
+                for endp_name in (endp_a_name, endp_b_name):
+                    flag_post_data.append({
+                        "name": endp_name,
+                        "flag": "AutoHelper",
+                        "val": 1
+                    })
 
                 if (endp_type == "lf_udp") or (endp_type == "udp") or (endp_type == "lf_udp6") or (endp_type == "udp6"):
-                    data["name"] = endp_a_name
-                    data["flag"] = "UseAutoNAT"
-                    self.local_realm.json_post(url, data, debug_=debug_, suppress_related_commands_=suppress_related_commands)
-                    data["name"] = endp_b_name
-                    self.local_realm.json_post(url, data, debug_=debug_, suppress_related_commands_=suppress_related_commands)
+                    for endp_name in (endp_a_name, endp_b_name):
+                        flag_post_data.append({
+                            "name": endp_name,
+                            "flag": "UseAutoNAT",
+                            "val": 1
+                        })
 
                 if tos != None:
-                    self.local_realm.set_endp_tos(endp_a_name, tos)
-                    self.local_realm.set_endp_tos(endp_b_name, tos)
+                    tos_post_data.append(self.local_realm.endp_tos_data(endp_a_name, tos))
+                    tos_post_data.append(self.local_realm.endp_tos_data(endp_b_name, tos))
 
                 data = {
                     "alias": cx_name,
@@ -1147,27 +1239,15 @@ class L3CXProfile(LFCliBase):
                     "ip_port": -1
                 }
 
-                url = "/cli-json/add_endp"
-                self.local_realm.json_post(url, endp_side_a, debug_=debug_, suppress_related_commands_=suppress_related_commands)
-                self.local_realm.json_post(url, endp_side_b, debug_=debug_, suppress_related_commands_=suppress_related_commands)
-                #print("napping %f sec" %sleep_time )
-                time.sleep(sleep_time)
-
-                url = "cli-json/set_endp_flag"
-                data = {
-                    "name": endp_a_name,
-                    "flag": "autohelper",
-                    "val": 1
-                }
-                self.local_realm.json_post(url, data, debug_=debug_, suppress_related_commands_=suppress_related_commands)
+                endp_post_data.append(endp_side_a)
+                endp_post_data.append(endp_side_b)
 
-                url = "cli-json/set_endp_flag"
-                data = {
-                    "name": endp_b_name,
-                    "flag": "autohelper",
-                    "val": 1
-                }
-                self.local_realm.json_post(url, data, debug_=debug_, suppress_related_commands_=suppress_related_commands)
+                for endp_name in (endp_a_name, endp_b_name):
+                    flag_post_data.append({
+                        "name": endp_name,
+                        "flag": "autohelper",
+                        "val": 1
+                    })
                 #print("CXNAME451: %s" % cx_name)
                 data = {
                     "alias": cx_name,
@@ -1184,12 +1264,25 @@ class L3CXProfile(LFCliBase):
         else:
             raise ValueError("side_a or side_b must be of type list but not both: side_a is type %s side_b is type %s" % (type(side_a), type(side_b)))
 
+        batch = self.local_realm.new_cli_batch(concurrency=batch_concurrency)
+        for data in endp_post_data:
+            batch.add("/cli-json/add_endp", data, suppress_related_commands_=suppress_related_commands, debug_=debug_)
+        batch.barrier()
+        for data in flag_post_data:
+            batch.add("/cli-json/set_endp_flag", data, suppress_related_commands_=suppress_related_commands, debug_=debug_)
+        for data in tos_post_data:
+            batch.add("/cli-json/set_endp_tos", data, suppress_related_commands_=True, debug_=debug_)
+        batch.flush()
+
         self.local_realm.wait_until_endps_appear(these_endp, debug=debug_)
 
         for data in cx_post_data:
-            url = "/cli-json/add_cx"
-            self.local_realm.json_post(url, data, debug_=debug_, suppress_related_commands_=suppress_related_commands)
-            time.sleep(0.01)
+            batch.add("/cli-json/add_cx", data, suppress_related_commands_=suppress_related_commands, debug_=debug_)
+        batch.flush()
+        for result in batch.failed():
+            print("L3CXProfile.create: %s failed for %s: %s" % (result.url,
+                                                                result.data.get("alias", result.data.get("name")),
+                                                                result.errors))
 
         self.local_realm.wait_until_cxs_appear(these_cx, debug=debug_)
 
@@ -1293,7 +1386,7 @@ class L4CXProfile(LFCliBase):
             }
             url = "cli-json/add_l4_endp"
             self.local_realm.json_post(url, endp_data, debug_=debug_, suppress_related_commands_=suppress_related_commands_)
-            time.sleep(sleep_time)
+            request_stats.sleep(sleep_time, "L4CXProfile.create")
 
             endp_data = {
                 "alias": "CX_" + name + "_l4",
@@ -1307,7 +1400,7 @@ class L4CXProfile(LFCliBase):
         for cx_data in cx_post_data:
             url = "/cli-json/add_cx"
             self.local_realm.json_post(url, cx_data, debug_=debug_, suppress_related_commands_=suppress_related_commands_)
-            time.sleep(sleep_time)
+            request_stats.sleep(sleep_time, "L4CXProfile.create")
 
 
 class GenCXProfile(LFCliBase):
@@ -1420,7 +1513,7 @@ class GenCXProfile(LFCliBase):
             # genl.create_gen_endp(alias=gen_name_b, shelf=shelf, resource=resource, port=name)
 
         self.local_realm.json_post("/cli-json/nc_show_endpoints", {"endpoint": "all"})
-        time.sleep(sleep_time)
+        request_stats.sleep(sleep_time, "GenCXProfile.create")
         
         for endp_tpl in endp_tpls:
             gen_name_a  = endp_tpl[2]
@@ -1428,7 +1521,7 @@ class GenCXProfile(LFCliBase):
             genl.set_flags(gen_name_a, "ClearPortOnStart", 1)
             # genl.set_flags(gen_name_b, "ClearPortOnStart", 1)
             # genl.set_flags(gen_name_b, "Unmanaged", 1)
-        time.sleep(sleep_time)
+        request_stats.sleep(sleep_time, "GenCXProfile.create")
 
         for endp_tpl in endp_tpls:
             name        = endp_tpl[1]
@@ -1436,7 +1529,7 @@ class GenCXProfile(LFCliBase):
             # gen_name_b  = endp_tpl[3]
             self.parse_command(name)
             genl.set_cmd(gen_name_a, self.cmd)
-        time.sleep(sleep_time)
+        request_stats.sleep(sleep_time, "GenCXProfile.create")
 
         for endp_tpl in endp_tpls:
             name        = endp_tpl[1]
@@ -1454,21 +1547,21 @@ class GenCXProfile(LFCliBase):
             self.created_endp.append(gen_name_a)
             self.created_endp.append(gen_name_b)
 
-        time.sleep(sleep_time)
+        request_stats.sleep(sleep_time, "GenCXProfile.create")
 
         for data in post_data:
             url = "/cli-json/add_cx"
             if self.debug:
                 pprint(data)
             self.local_realm.json_post(url, data, debug_=debug_, suppress_related_commands_=suppress_related_commands_)
-            time.sleep(10)
-        time.sleep(sleep_time)
+            request_stats.sleep(10, "GenCXProfile.create")
+        request_stats.sleep(sleep_time, "GenCXProfile.create")
         for data in post_data:
             self.local_realm.json_post("/cli-json/show_cx", {
                 "test_mgr":"default_tm",
                 "cross_connect": data["alias"]
             })
-        time.sleep(sleep_time)
+        request_stats.sleep(sleep_time, "GenCXProfile.create")
 
 class WifiMonitor:
     def __init__(self, lfclient_url, local_realm, up=True, debug_=False, resource_=1):
@@ -1514,7 +1607,7 @@ class WifiMonitor:
             "frequency": self.local_realm.channel_freq(channel_=channel)
         }
         self.local_realm.json_post("/cli-json/set_wifi_radio", _data=data)
-        time.sleep(1)
+        request_stats.sleep(1, "WifiMonitor.create")
         self.local_realm.json_post("/cli-json/add_monitor", {
             "shelf": 1,
             "resource": resource_,
@@ -1666,7 +1759,7 @@ class VAPProfile(LFCliBase):
         req_json["port"] = self.vap_name
         set_port_r.addPostData(req_json)
         json_response = set_port_r.jsonPost(self.debug)
-        time.sleep(0.03)
+        request_stats.sleep(0.03, "VAPProfile.admin_up")
 
     def admin_down(self, resource):
         set_port_r = LFRequest.LFRequest(self.lfclient_url, "/cli-json/set_port", debug_=self.debug)
@@ -1674,7 +1767,7 @@ class VAPProfile(LFCliBase):
         req_json["port"] = self.vap_name
         set_port_r.addPostData(req_json)
         json_response = set_port_r.jsonPost(self.debug)
-        time.sleep(0.03)
+        request_stats.sleep(0.03, "VAPProfile.admin_down")
 
     def use_security(self, security_type, ssid=None, passwd=None):
         types = {"wep": "wep_enable", "wpa": "wpa_enable", "wpa2": "wpa2_enable", "wpa3": "use-wpa3", "open": "[BLANK]"}
@@ -1878,10 +1971,10 @@ class VAPProfile(LFCliBase):
 
         json_response = add_vap_r.jsonPost(debug)
         # time.sleep(0.03)
-        time.sleep(2)
+        request_stats.sleep(2, "VAPProfile.create")
         set_port_r.addPostData(self.set_port_data)
         json_response = set_port_r.jsonPost(debug)
-        time.sleep(0.03)
+        request_stats.sleep(0.03, "VAPProfile.create")
 
         self.wifi_extra_data["resource"] = resource
         self.wifi_extra_data["port"] = self.vap_name
@@ -1897,7 +1990,7 @@ class VAPProfile(LFCliBase):
                 for k,v in port.items():
                     if v['alias'] == 'br0':
                         self.local_realm.rm_port(k, check_exists=True)
-                        time.sleep(5)
+                        request_stats.sleep(5, "VAPProfile.create")
 
         # create bridge
         data = {
@@ -2309,7 +2402,7 @@ class FIOEndpProfile(LFCliBase):
 
             url = "cli-json/add_file_endp"
             self.local_realm.json_post(url, endp_data, debug_=debug_, suppress_related_commands_=suppress_related_commands_)
-            time.sleep(sleep_time)
+            request_stats.sleep(sleep_time, "FIOEndpProfile.create")
 
             data = {
                 "name": self.cx_prefix + name + "_fio",
@@ -2331,7 +2424,7 @@ class FIOEndpProfile(LFCliBase):
         for cx_data in cx_post_data:
             url = "/cli-json/add_cx"
             self.local_realm.json_post(url, cx_data, debug_=debug_, suppress_related_commands_=suppress_related_commands_)
-            time.sleep(sleep_time)
+            request_stats.sleep(sleep_time, "FIOEndpProfile.create")
 
 
 class MACVLANProfile(LFCliBase):
@@ -2468,17 +2561,17 @@ class MACVLANProfile(LFCliBase):
             self.set_port_data["port"] = name  # for set_port calls.
 
             # time.sleep(0.03)
-            time.sleep(sleep_time)
+            request_stats.sleep(sleep_time, "MACVLANProfile.create")
             set_port_r.addPostData(self.set_port_data)
             json_response = set_port_r.jsonPost(debug)
-            time.sleep(0.03)
+            request_stats.sleep(0.03, "MACVLANProfile.create")
 
     def cleanup(self):
         print("Cleaning up MACVLANs...")
         print(self.created_macvlans)
         for port_eid in self.created_macvlans:
             self.local_realm.rm_port(port_eid, check_exists=True)
-            time.sleep(.2)
+            request_stats.sleep(.2, "MACVLANProfile.cleanup")
         # And now see if they are gone
         # LFUtils.wait_until_ports_disappear(base_url=self.lfclient_url,  port_list=self.created_macvlans)
 
@@ -2694,7 +2787,7 @@ class HTTPProfile(LFCliBase):
             }
             url = "cli-json/add_l4_endp"
             self.local_realm.json_post(url, endp_data, debug_=debug_, suppress_related_commands_=suppress_related_commands_)
-            time.sleep(sleep_time)
+            request_stats.sleep(sleep_time, "HTTPProfile.create")
 
             endp_data = {
                 "alias": "CX_" + name + "_l4",
@@ -2708,7 +2801,7 @@ class HTTPProfile(LFCliBase):
         for cx_data in cx_post_data:
             url = "/cli-json/add_cx"
             self.local_realm.json_post(url, cx_data, debug_=debug_, suppress_related_commands_=suppress_related_commands_)
-            time.sleep(sleep_time)
+            request_stats.sleep(sleep_time, "HTTPProfile.create")
 
 
 # use the station profile to set the combination of features you want on your stations
@@ -3016,7 +3109,19 @@ class StationProfile:
                suppress_related_commands_=True,
                use_radius=False,
                hs20_enable=False,
-               sleep_time=2):
+               sleep_time=2,
+               window=16,
+               ready_timeout_sec=30,
+               in_flight_=None):
+        """
+        Creates stations as a pipeline: up to `window` stations are in flight at once.
+        add_sta is posted for each station in the window, then /port is polled until the
+        new ports exist, then set_port and set_wifi_extra are posted for them.
+        :param sleep_time: unused; the fixed nap after add_sta is replaced by readiness checks on /port
+        :param window: maximum number of stations between add_sta and set_port at once
+        :param ready_timeout_sec: how long to wait for added stations to show up in /port
+        :param in_flight_: semaphore shared with other create() calls to bound the window across radios
+        """
         radio_eid = self.local_realm.name_to_eid(radio)
         radio_shelf = radio_eid[0]
         radio_resource = radio_eid[1]
@@ -3054,11 +3159,6 @@ class StationProfile:
                                                                    set_port.set_port_current_flags)
         self.set_port_data["interest"] = self.add_named_flags(self.desired_set_port_interest_flags,
                                                               set_port.set_port_interest_flags)
-        # these are unactivated LFRequest objects that we can modify and
-        # re-use inside a loop, reducing the number of object creations
-        add_sta_r = LFRequest.LFRequest(self.lfclient_url + "/cli-json/add_sta")
-        set_port_r = LFRequest.LFRequest(self.lfclient_url + "/cli-json/set_port")
-        wifi_extra_r = LFRequest.LFRequest(self.lfclient_url + "/cli-json/set_wifi_extra")
         my_sta_names = []
         if num_stations > 0:
             my_sta_names = LFUtils.portNameSeries("sta", 0, num_stations - 1, int("1" + self.number_template))
@@ -3071,59 +3171,99 @@ class StationProfile:
             self.set_port_data["suppress_preexec_cli"] = "yes"
             self.set_port_data["suppress_preexec_method"] = 1
 
-        num = 0
-        #pprint(self.station_names)
-        #exit(1)
-        for eidn in my_sta_names:
-            eid = self.local_realm.name_to_eid(eidn)
-            name = eid[2]
-            num += 1
-            self.add_sta_data["shelf"] = radio_shelf
-            self.add_sta_data["resource"] = radio_resource
-            self.add_sta_data["radio"] = radio_port
-            self.add_sta_data["sta_name"] = name # for create station calls
-            self.set_port_data["port"] = name  # for set_port calls.
+        if in_flight_ is None:
+            in_flight_ = threading.BoundedSemaphore(window)
 
+        names = [self.local_realm.name_to_eid(eidn)[2] for eidn in my_sta_names]
+        for name in names:
             self.station_names.append("%s.%s.%s" % (radio_shelf, radio_resource, name))
-            add_sta_r.addPostData(self.add_sta_data)
-            if debug:
-                print("- 381 - %s- - - - - - - - - - - - - - - - - - " % name)
-                pprint(self.add_sta_data)
-                pprint(self.set_port_data)
-                pprint(add_sta_r)
-                print("- ~381 - - - - - - - - - - - - - - - - - - - ")
-            if dry_run:
-                print("dry run")
-                continue
-
-            json_response = add_sta_r.jsonPost(debug)
-            # time.sleep(0.03)
-            time.sleep(sleep_time)
-            set_port_r.addPostData(self.set_port_data)
-            json_response = set_port_r.jsonPost(debug)
-            time.sleep(0.03)
+        if dry_run:
+            for name in names:
+                print("dry run: %s.%s.%s" % (radio_shelf, radio_resource, name))
+            return
 
-            self.wifi_extra_data["resource"] = radio_resource
-            self.wifi_extra_data["port"] = name
-            if self.wifi_extra_data_modified:
-                wifi_extra_r.addPostData(self.wifi_extra_data)
-                json_response = wifi_extra_r.jsonPost(debug)
- 
+        # stations move through the window in groups: every member of a group holds one
+        # in_flight_ slot from add_sta until its set_port is posted. Only the first slot of a
+        # group is waited for, so radios sharing in_flight_ can never starve each other.
+        num = 0
+        while num < len(names):
+            in_flight_.acquire()
+            group = [names[num]]
+            num += 1
+            while (num < len(names)) and (len(group) < window) and in_flight_.acquire(blocking=False):
+                group.append(names[num])
+                num += 1
+            try:
+                self._create_group(radio_shelf, radio_resource, radio_port, group, ready_timeout_sec, debug)
+            finally:
+                for _ in group:
+                    in_flight_.release()
 
         LFUtils.waitUntilPortsAppear(self.lfclient_url, self.station_names)
 
         # and set ports up
-        if dry_run:
-            return
         if (self.up):
             self.admin_up()
             self.admin_up()
-        # for sta_name in self.station_names:
-        #     req = LFUtils.portUpRequest(resource, sta_name, debug_on=False)
-        #     set_port_r.addPostData(req)
-        #     json_response = set_port_r.jsonPost(debug)
-        #     time.sleep(0.03)
 
         print("created %s stations" % num)
 
+    # posts add_sta for a group of stations, waits for them in /port, then posts set_port and set_wifi_extra
+    def _create_group(self, shelf, resource, radio_port, names, ready_timeout_sec=30, debug=False):
+        for name in names:
+            add_sta_data = dict(self.add_sta_data)
+            add_sta_data["shelf"] = shelf
+            add_sta_data["resource"] = resource
+            add_sta_data["radio"] = radio_port
+            add_sta_data["sta_name"] = name  # for create station calls
+            if debug:
+                print("- 381 - %s- - - - - - - - - - - - - - - - - - " % name)
+                pprint(add_sta_data)
+                print("- ~381 - - - - - - - - - - - - - - - - - - - ")
+            add_sta_r = LFRequest.LFRequest(self.lfclient_url + "/cli-json/add_sta")
+            add_sta_r.addPostData(add_sta_data)
+            add_sta_r.jsonPost(debug)
+
+        self.wait_for_ports(shelf, resource, names, timeout_sec=ready_timeout_sec)
+
+        for name in names:
+            set_port_data = dict(self.set_port_data)
+            set_port_data["shelf"] = shelf
+            set_port_data["resource"] = resource
+            set_port_data["port"] = name  # for set_port calls.
+            set_port_r = LFRequest.LFRequest(self.lfclient_url + "/cli-json/set_port")
+            set_port_r.addPostData(set_port_data)
+            set_port_r.jsonPost(debug)
+
+            if self.wifi_extra_data_modified:
+                wifi_extra_data = dict(self.wifi_extra_data)
+                wifi_extra_data["resource"] = resource
+                wifi_extra_data["port"] = name
+                wifi_extra_r = LFRequest.LFRequest(self.lfclient_url + "/cli-json/set_wifi_extra")
+                wifi_extra_r.addPostData(wifi_extra_data)
+                wifi_extra_r.jsonPost(debug)
+
+    # polls the resource port list until every name is present; returns names still missing
+    def wait_for_ports(self, shelf, resource, names, timeout_sec=30, poll_sec=0.1):
+        missing = set(names)
+        deadline = time.time() + timeout_sec
+        while len(missing) > 0:
+            response = self.local_realm.json_get("/port/%s/%s/list?fields=alias" % (shelf, resource))
+            if response is None:
+                response = {}
+            if "interfaces" in response:
+                for eid in LFUtils.port_list_to_alias_map(response).keys():
+                    missing.discard(self.local_realm.name_to_eid(eid)[2])
+            elif "interface" in response:
+                # a resource with a single port answers with one bare record
+                missing.discard(response["interface"].get("alias"))
+            if (len(missing) < 1) or (time.time() > deadline):
+                break
+            request_stats.sleep(poll_sec, "StationProfile.wait_for_ports")
+            poll_sec = min(poll_sec * 2, 1.0)
+        if len(missing) > 0:
+            print("StationProfile: %s.%s ports not seen after %ss: %s" % (shelf, resource, timeout_sec,
+                                                                          ", ".join(sorted(missing))))
+        return missing
+
 #
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+# Drive several LANforge managers as one test                    -
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+import sys
+
+if sys.version_info[0] != 3:
+    print("This script requires Python 3")
+    exit()
+
+import concurrent.futures
+import threading
+import time
+from LANforge.counter_sampler import CounterSample
+import realm
+
+
+def parse_manager(manager, default_port=8080):
+    """
+    :param manager: "host" or "host:port"
+    :return: (host, port)
+    """
+    manager = manager.strip()
+    if (manager.count(":") == 1) and not manager.startswith("["):
+        host, port = manager.split(":")
+        return host, int(port)
+    return manager, default_port
+
+
+class RealmGroup:
+    """
+    One Realm per LANforge manager, with helpers that run the same step on
+    every manager at once and wait for all of them, so a test can spread its
+    stations over several systems:
+
+        group = RealmGroup(["192.168.100.178", "192.168.100.179:8080"])
+        group.run_parallel(lambda r: r.create_stations(jobs_by_host[r.lfclient_host]))
+        group.start_together(lambda r: r.json_post("/cli-json/set_cx_state", ...))
+        sampler = group.new_counter_sampler([endps_a, endps_b])
+        sample = sampler.sample()   # names are "host:port/endp" across managers
+    """
+    def __init__(self, managers=(), realms=None, debug_=False, halt_on_error_=False):
+        """
+        :param managers: "host[:port]" strings, a Realm is created for each
+        :param realms: existing Realms to use instead of managers
+        """
+        self.debug = debug_
+        self.halt_on_error = halt_on_error_
+        if realms is not None:
+            self.realms = list(realms)
+        else:
+            addresses = [parse_manager(manager) for manager in managers]
+            self.realms = self.run_parallel(lambda address: realm.Realm(lfclient_host=address[0],
+                                                                        lfclient_port=address[1],
+                                                                        debug_=debug_,
+                                                                        halt_on_error_=halt_on_error_),
+                                            items=addresses)
+        self.labels = ["%s:%s" % (r.lfclient_host, r.lfclient_port) for r in self.realms]
+
+    def __len__(self):
+        return len(self.realms)
+
+    def run_parallel(self, fn, items=None):
+        """
+        Call fn(item) for every item (every realm by default) on its own thread.
+        Every call runs to completion; the first exception raised is re-raised afterwards.
+        :return: results in item order
+        """
+        if items is None:
+            items = self.realms
+        items = list(items)
+        if len(items) < 1:
+            return []
+        if len(items) == 1:
+            return [fn(items[0])]
+        with concurrent.futures.ThreadPoolExecutor(max_workers=len(items), thread_name_prefix="realm") as executor:
+            futures = [executor.submit(fn, item) for item in items]
+            concurrent.futures.wait(futures)
+        for future in futures:
+            if future.exception() is not None:
+                raise future.exception()
+        return [future.result() for future in futures]
+
+    def start_together(self, fn, items=None):
+        """
+        Like run_parallel, but every thread waits at a barrier so the calls are
+        issued as close together as possible, e.g. starting traffic.
+        """
+        if items is None:
+            items = self.realms
+        items = list(items)
+        barrier = threading.Barrier(max(1, len(items)))
+
+        def call(item):
+            try:
+                barrier.wait(timeout=60)
+            except threading.BrokenBarrierError:
+                print("RealmGroup: start barrier broken, starting anyway")
+            return fn(item)
+        return self.run_parallel(call, items)
+
+    def create_stations(self, jobs_per_realm, window=32, debug=False):
+        """
+        :param jobs_per_realm: one Realm.create_stations() job list per realm, in realm order
+        """
+        self.run_parallel(lambda pair: pair[0].create_stations(pair[1], window=window, debug=debug),
+                          items=zip(self.realms, jobs_per_realm))
+
+    def new_counter_sampler(self, endp_names_per_realm, fields=("rx bytes", "rx drop %")):
+        """
+        :param endp_names_per_realm: one list of endpoint names per realm, in realm order
+        :return: GroupCounterSampler
+        """
+        samplers = [r.new_counter_sampler(names, fields=fields) for r, names in zip(self.realms, endp_names_per_realm)]
+        return GroupCounterSampler(self, samplers)
+
+# ~class
+
+
+class GroupCounterSampler:
+    """
+    Samples one EndpCounterSampler per manager in parallel and merges the
+    results into one CounterSample stamped with a single epoch. With more
+    than one manager, names are prefixed with the manager label so endpoints
+    of the same name on different systems stay apart.
+    """
+    def __init__(self, group, samplers):
+        self.group = group
+        self.samplers = list(samplers)
+        self.fields = self.samplers[0].fields if len(self.samplers) > 0 else ()
+        self.prefixes = [""] * len(self.samplers)
+        if len(self.samplers) > 1:
+            self.prefixes = [label + "/" for label in group.labels]
+
+    def sample(self):
+        """
+        :return: merged CounterSample
+        """
+        merged = CounterSample(self.fields, epoch=time.time())
+        samples = self.group.run_parallel(lambda sampler: sampler.sample(), items=self.samplers)
+        for prefix, sample in zip(self.prefixes, samples):
+            merged.requests += sample.requests
+            for field, changes in sample.changed.items():
+                target = merged.changed[field]
+                for name, value in changes.items():
+                    target[prefix + name] = value
+            merged.missing.extend(prefix + name for name in sample.missing)
+        return merged
+
+    def values_map(self, field):
+        merged = {}
+        for prefix, sampler in zip(self.prefixes, self.samplers):
+            for name, value in sampler.values_map(field).items():
+                merged[prefix + name] = value
+        return merged
+
+# ~class
+
+# ~realm_group
@@ -4,14 +4,14 @@ import sys
 import os
 
 import argparse
+import csv
+import math
+import random
 #import time
 #import datetime
 #import subprocess
 #import re
-#import csv
-#import time
 #import operator
-import pandas as pd
 #import matplotlib.pyplot as plt
 #import numpy as np
 
@@ -26,109 +26,145 @@ if sys.version_info[0] != 3:
 if 'py-json' not in sys.path:
     sys.path.append(os.path.join(os.path.abspath('..'), 'py-json'))
 
-class L3CSVParcer():
-    def __init__(self,csv_file):
-
 
-        # left this in for testing
-        '''csv_obj = open(csv_file, 'r')
-        csv_reader = csv.reader(csv_obj)
-        print(csv_reader)
+class RollingStats():
+    """
+    Count, mean, min and max of one endpoint column, plus a bounded reservoir
+    of values for percentile estimates, so memory does not grow with the file.
+    """
+    __slots__ = ("count", "total", "min", "max", "samples")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+        self.samples = []
+
+    def add(self, value, max_samples):
+        self.count += 1
+        self.total += value
+        if (self.min is None) or (value < self.min):
+            self.min = value
+        if (self.max is None) or (value > self.max):
+            self.max = value
+        if len(self.samples) < max_samples:
+            self.samples.append(value)
+        else:
+            index = random.randrange(self.count)
+            if index < max_samples:
+                self.samples[index] = value
+
+    def mean(self):
+        if self.count < 1:
+            return 0
+        return self.total / self.count
+
+    def percentiles(self, pcts):
+        if len(self.samples) < 1:
+            return [0 for _ in pcts]
+        ordered = sorted(self.samples)
+        return [ordered[max(int(math.ceil(pct / 100.0 * len(ordered))) - 1, 0)] for pct in pcts]
 
-        for row in csv_reader:
-            if row[1] == 'rx':
-                print(row)'''
 
-        include_summary = ['Time epoch','Time','Monitor','least','most','average']
+class L3CSVParcer():
+    """
+    Reads a longevity results csv once, row by row, and at the same time writes
+    results_summary_* (time, monitor and the least/most/average columns),
+    results_raw_* (time, monitor and the per-endpoint LT/MT columns) and
+    results_stats_* (per monitor and endpoint: count, mean, min, max, percentiles).
+    Columns are picked from the header once; rows are written chunk_rows at a time.
+    """
+    include_summary = ['Time epoch','Time','Monitor','least','most','average']
+    include_raw = ['Time epoch','Time','Monitor','LT','MT']
+    percentiles = (50, 90, 99)
+
+    def __init__(self, csv_file, chunk_rows=1000, max_samples=1000):
+        """
+        :param csv_file: longevity results csv
+        :param chunk_rows: rows buffered before each write
+        :param max_samples: values kept per endpoint and monitor for percentiles
+        """
         self.csv_file = csv_file
-        df_s = pd.read_csv(self.csv_file,header = 0, usecols = lambda column : any(substr in column for substr in include_summary))
+        self.chunk_rows = chunk_rows
+        self.max_samples = max_samples
+        self.stats = {}
+        self.rows = 0
 
         print('{}'.format(csv_file))
-        csv_file_summary = self.csv_file.replace('results_','results_summary_')
-
-        df_s.to_csv(csv_file_summary, index = False, header=True)
-
-        include_raw = ['Time epoch','Time','Monitor','LT','MT']
-        self.csv_file = csv_file
-        df_r = pd.read_csv(self.csv_file,header = 0, usecols = lambda column : any(substr in column for substr in include_raw))
-
-        csv_file_raw = self.csv_file.replace('results_','results_raw_')
-        df_r.to_csv(csv_file_raw, index = False, header=True)
-
-        '''df_rx_delta = df_r.loc[df['Monitor'] == 'rx_delta']
-
-        df_rx_delta.plot(x='Time epoch', y='average_rx_data')
-        plt.show()
-
-        total_cols = len(df.axes[0])
-
-
-        print(df.columns)
-
-        print(df.loc[df['Monitor'] == 'rx_delta'])
-        print(df.loc[df['Monitor'] == 'rx'])
-
-        print(df.loc[df['Monitor'] == 'rx_delta', df.columns != 'Time'])
-
-
-        df_rx_delta = df.loc[df['Monitor'] == 'rx_delta']
-
-        print(df_rx_delta.describe())
-
-        df_rx_delta.plot(x='Time epoch', y='average_rx_data')
-        plt.show()
-
-        df_rx_delta.plot(x='Time', y='average_rx_data')
-        plt.show()
-
-        df_rx_drop_pct = df.loc[df['Monitor'] == 'rx_drop_percent']
-        print(df_rx_drop_pct)
-        df_rx_delta.plot(x='Time epoch', y='rx_drop_percent')
-        plt.show()
-
-
-        df2 = df.filter(regex='LT-s')
-        print(df2)
-        #plt.plot(df2[0], df2[1]
-        #plt.show()
-
-        df2_mean = df2.mean().sort_values(ascending=False)
-
-        print(df2_mean)
-
-        df2_mean_no_outliers = df2_mean[df2_mean(df2_mean.quantile(.10), df2_mean.quantile(.90))]
-
-        print("no outliers")
-        print(df2_mean_no_outliers)
-
-        print("Top 10")
-        print(df2_mean.head(10))
-        print("Bottom 10")
-        print(df2_mean.tail(10))
-
-        print("mean others")
-
-
-
-        # set display format otherwise get scientific notation
-        pd.set_option('display.float_format', lambda x: '%.3f' % x)
-
-        df_mean = df_rx_delta.mean().sort_values()
-
-        #print(df_mean)
-
-        print(df_mean[0])
-
-
-
-
-        #df_uni_cast = [col for col in df_rx_delta if 'LT' in col]
-        #df_LT_rx_delta_mean = df_uni_cast.mean().sort_values()
-
-        #print(df_LT_rx_delta_mean)
-        x = np.linspace(0, 20, 100)
-        plt.plot(x, np.sin(x))
-        plt.show()'''
+        csv_file_summary = self.output_name('summary')
+        csv_file_raw = self.output_name('raw')
+        csv_file_stats = self.output_name('stats')
+
+        with open(self.csv_file, 'r', newline='') as csv_in, \
+                open(csv_file_summary, 'w', newline='') as summary_out, \
+                open(csv_file_raw, 'w', newline='') as raw_out:
+            reader = csv.reader(csv_in)
+            summary_writer = csv.writer(summary_out)
+            raw_writer = csv.writer(raw_out)
+            header = next(reader, None)
+            if header is None:
+                return
+            summary_columns = self.select_columns(header, self.include_summary)
+            raw_columns = self.select_columns(header, self.include_raw)
+            # endpoint columns get rolling stats per monitor
+            endp_columns = [i for i in raw_columns if header[i] not in self.include_raw]
+            monitor_column = header.index('Monitor') if 'Monitor' in header else None
+            summary_writer.writerow([header[i] for i in summary_columns])
+            raw_writer.writerow([header[i] for i in raw_columns])
+
+            summary_chunk = []
+            raw_chunk = []
+            for row in reader:
+                summary_chunk.append([row[i] if i < len(row) else '' for i in summary_columns])
+                raw_chunk.append([row[i] if i < len(row) else '' for i in raw_columns])
+                self.add_stats(header, row, monitor_column, endp_columns)
+                self.rows += 1
+                if len(raw_chunk) >= self.chunk_rows:
+                    summary_writer.writerows(summary_chunk)
+                    raw_writer.writerows(raw_chunk)
+                    summary_chunk = []
+                    raw_chunk = []
+            summary_writer.writerows(summary_chunk)
+            raw_writer.writerows(raw_chunk)
+
+        self.write_stats(csv_file_stats)
+
+    def output_name(self, kind):
+        # longevity_results_<time>.csv -> longevity_results_<kind>_<time>.csv, never the input file itself
+        name = self.csv_file.replace('results_','results_{}_'.format(kind))
+        if name == self.csv_file:
+            root, ext = os.path.splitext(self.csv_file)
+            name = '{}_{}{}'.format(root, kind, ext)
+        return name
+
+    @staticmethod
+    def select_columns(header, include):
+        return [i for i, column in enumerate(header) if any(substr in column for substr in include)]
+
+    def add_stats(self, header, row, monitor_column, endp_columns):
+        monitor = row[monitor_column] if (monitor_column is not None) and (monitor_column < len(row)) else ''
+        for i in endp_columns:
+            if i >= len(row):
+                break
+            try:
+                value = float(row[i])
+            except ValueError:
+                continue
+            key = (monitor, header[i])
+            stats = self.stats.get(key)
+            if stats is None:
+                stats = RollingStats()
+                self.stats[key] = stats
+            stats.add(value, self.max_samples)
+
+    def write_stats(self, csv_file_stats):
+        with open(csv_file_stats, 'w', newline='') as stats_out:
+            writer = csv.writer(stats_out)
+            writer.writerow(['Monitor','Endpoint','count','mean','min','max'] + ['p{}'.format(pct) for pct in self.percentiles])
+            for (monitor, endpoint), stats in self.stats.items():
+                writer.writerow([monitor, endpoint, stats.count, round(stats.mean(), 3), stats.min, stats.max]
+                                + stats.percentiles(self.percentiles))
 
 
 def main():
@@ -148,6 +184,8 @@ def main():
 
     parser.add_argument('-i','--infile', help="file of csv data", default='longevity_results_08_14_2020_14_37.csv')
     parser.add_argument('--debug', help='--debug:  Enable debugging',default=True)
+    parser.add_argument('--chunk_rows', help='--chunk_rows <rows> buffered before each write',type=int,default=1000)
+    parser.add_argument('--max_samples', help='--max_samples <values> kept per endpoint for percentiles',type=int,default=1000)
 
 
     args = parser.parse_args()
@@ -157,7 +195,7 @@ def main():
     if args.infile:
         csv_file_name = args.infile
 
-    L3CSVParcer(csv_file_name)
+    L3CSVParcer(csv_file_name, chunk_rows=args.chunk_rows, max_samples=args.max_samples)
 
 
 
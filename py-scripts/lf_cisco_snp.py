@@ -994,15 +994,18 @@ class L3VariableTime(LFCliBase):
             time.sleep(5)
 
     def build(self):
+        # create stations on every radio in parallel, then their connections
+        station_jobs = []
         index = 0
         for station_profile in self.station_profiles:
             station_profile.use_security(station_profile.security, station_profile.ssid, station_profile.ssid_pass)
             station_profile.set_number_template(station_profile.number_template)
-            print("Creating stations")
-
-            station_profile.create(radio=self.radio_name_list[index], sta_names_=self.station_lists[index], debug=self.debug, sleep_time=0)
+            station_jobs.append((station_profile, self.radio_name_list[index], self.station_lists[index]))
             index += 1
+        print("Creating stations")
+        self.local_realm.create_stations(station_jobs, debug=self.debug)
 
+        for station_profile in self.station_profiles:
             for etype in self.endp_types:
                 if etype == "mc_udp" or etype == "mc_udp6":
                     print("Creating Multicast connections for endpoint type: %s"%(etype))
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Benchmark LFRequest throughput against a local stub server, comparing one
+urlopen() connection per request with the shared keep-alive connection pool.
+
+    ./lf_request_pool_bench.py --requests 2000 --threads 4 --pool_size 4
+"""
+import sys
+import os
+if sys.version_info[0] != 3:
+    print("This script requires Python 3")
+    exit(1)
+
+if 'py-json' not in sys.path:
+    sys.path.append(os.path.join(os.path.abspath('..'), 'py-json'))
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from LANforge import LFRequest
+from LANforge import LFConnectionPool
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    # HTTP/1.1 so the server honors keep-alive
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def _reply(self, obj):
+        body = json.dumps(obj).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self._reply({"handler": "stub", "uri": self.path, "interface": {"alias": "sta0000", "ip": "0.0.0.0"}})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        self.rfile.read(length)
+        self._reply({"LAST": {"response": "OK"}})
+
+    def log_message(self, format, *args):
+        pass
+
+
+def run_requests(base_url, count, threads, use_pool):
+    per_thread = int(count / threads)
+
+    def worker():
+        for i in range(per_thread):
+            lf_r = LFRequest.LFRequest(base_url, "/cli-json/add_sta")
+            lf_r.use_pool = use_pool
+            lf_r.add_post_data({"shelf": 1, "resource": 1, "radio": "wiphy0", "sta_name": "sta%04d" % i})
+            lf_r.json_post(show_error=True)
+            lf_r = LFRequest.LFRequest(base_url, "/port/1/1/sta%04d" % i)
+            lf_r.use_pool = use_pool
+            lf_r.get_as_json()
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    started = time.perf_counter()
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    elapsed = time.perf_counter() - started
+    return (per_thread * threads * 2), elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LFRequest keep-alive pool benchmark against a local stub server")
+    parser.add_argument('--requests', help='number of add_sta+get pairs to send', type=int, default=1000)
+    parser.add_argument('--threads', help='number of client threads', type=int, default=1)
+    parser.add_argument('--pool_size', help='connections per manager in the pool', type=int, default=4)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    port = server.server_address[1]
+    base_url = "http://127.0.0.1:%d" % port
+    LFConnectionPool.set_pool_size("127.0.0.1", port, args.pool_size)
+
+    print("%-12s %10s %10s %12s" % ("transport", "requests", "seconds", "requests/s"))
+    for label, use_pool in (("urlopen", False), ("keep-alive", True)):
+        sent, elapsed = run_requests(base_url, args.requests, args.threads, use_pool)
+        print("%-12s %10d %10.3f %12.1f" % (label, sent, elapsed, sent / elapsed))
+
+    pool = LFConnectionPool.get_pool(base_url)
+    print("keep-alive pool opened %d connections for %d requests" % (pool.connections_opened, pool.requests_sent))
+    LFConnectionPool.close_all()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+
+if sys.version_info[0] != 3:
+    print("This script requires Python 3")
+    exit(1)
+
+if 'py-json' not in sys.path:
+    sys.path.append(os.path.join(os.path.abspath('..'), 'py-json'))
+
+import argparse
+import time
+from LANforge.columnar_store import ColumnarStore, TIME_FORMAT
+
+
+def parse_epoch(value):
+    # accepts seconds since 1970 or the longevity csv time format, like 08_14_2020_14_37_00
+    if value is None:
+        return None
+    if value.isdigit():
+        return int(value)
+    return int(time.mktime(time.strptime(value, TIME_FORMAT)))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog='lf_store_export.py',
+        formatter_class=argparse.RawTextHelpFormatter,
+        epilog='''\
+ Useful Information:
+    The store directory is written by test_l3_longevity.py --store_dir
+            ''',
+
+        description='''lf_store_export.py:
+    Export per-endpoint results kept in a columnar store to csv or xlsx,
+    optionally only some monitors or a time window.
+
+    python3 lf_store_export.py --store_dir longevity_store --csv longevity_rx.csv --monitor rx --monitor rx_delta
+    python3 lf_store_export.py --store_dir longevity_store --xlsx longevity.xlsx --start 08_14_2020_14_37_00 --end 08_14_2020_16_00_00
+        ''')
+
+    parser.add_argument('-s', '--store_dir', help="directory of the columnar store", required=True)
+    parser.add_argument('--csv', help="write rows to this csv file", default=None)
+    parser.add_argument('--xlsx', help="write one worksheet per monitor to this xlsx file", default=None)
+    parser.add_argument('-m', '--monitor', action='append', help="monitor to export, like rx, rx_delta, rx_drop_percent; default all", default=None)
+    parser.add_argument('--start', help="first time to export, epoch seconds or mm_dd_YYYY_HH_MM_SS", default=None)
+    parser.add_argument('--end', help="last time to export, epoch seconds or mm_dd_YYYY_HH_MM_SS", default=None)
+
+    args = parser.parse_args()
+
+    store = ColumnarStore.open(args.store_dir)
+    start_epoch = parse_epoch(args.start)
+    end_epoch = parse_epoch(args.end)
+    if (args.csv is None) and (args.xlsx is None):
+        for monitor, info in store.monitors.items():
+            rows = sum(segment["rows"] for segment in info["segments"])
+            print("%s: %d rows in %d segments" % (monitor, rows, len(info["segments"])))
+        print("%d endpoints" % len(store.names))
+        return
+    if args.csv is not None:
+        print("wrote %s" % store.to_csv(args.csv, monitors=args.monitor, start_epoch=start_epoch, end_epoch=end_epoch))
+    if args.xlsx is not None:
+        print("wrote %s" % store.to_excel(args.xlsx, monitors=args.monitor, start_epoch=start_epoch, end_epoch=end_epoch))
+
+
+if __name__ == "__main__":
+    main()
@@ -9,16 +9,22 @@ if sys.version_info[0] != 3:
 
 if 'py-json' not in sys.path:
     sys.path.append(os.path.join(os.path.abspath('..'), 'py-json'))
+# cisco_wifi_ctl.py
+if os.path.abspath('..') not in sys.path:
+    sys.path.append(os.path.abspath('..'))
 
 import argparse
 from LANforge.lfcli_base import LFCliBase
 from LANforge import LFUtils
+from LANforge.interval_metrics import IntervalMetrics
+from LANforge.columnar_store import ColumnarStore
+from LANforge.periodic_scheduler import PeriodicScheduler
 import realm
+from realm_group import RealmGroup, parse_manager
 import time
-import datetime
 import subprocess
-import re
 import csv
+import threading
 import random
 
 class L3VariableTime(LFCliBase):
@@ -31,6 +37,9 @@ class L3VariableTime(LFCliBase):
                  side_b_min_rate=56000, side_b_max_rate=0,
                  number_template="00", test_duration="256s",
                  polling_interval="60s",
+                 store_dir=None,
+                 controller_poll_interval=None,
+                 peers=None,
                  _exit_on_error=False,
                  _exit_on_fail=False):
         super().__init__(host, port, _debug=debug_on, _halt_on_error=_exit_on_error, _exit_on_fail=_exit_on_fail)
@@ -58,10 +67,32 @@ class L3VariableTime(LFCliBase):
         self.multicast_profile.name_prefix = "MLT-";
         self.station_profiles = []
         self.args = args
+        self.controller = None
+        self.controller_serial_state = None
         self.outfile = outfile
         self.csv_started = False
+        self.csv_endp_count = 0
         self.epoch_time = int(time.time())
+        # one array per poll on a fixed endpoint index; multicast tx endpoints are not compared
+        self.rx_metrics = IntervalMetrics(dtype="int64", exclude=("mtx",))
+        self.rx_drop_metrics = IntervalMetrics(dtype="float64", exclude=("mtx",))
+        # with a store, per-endpoint values go to columnar segments and the csv keeps only the summary
+        self.store = None
+        self.counter_sampler = None
+        if store_dir is not None:
+            self.store = ColumnarStore(store_dir)
+        self.csv_flush_sec = 60
+        self.controller_poll_interval_seconds = None
+        if controller_poll_interval is not None:
+            self.controller_poll_interval_seconds = self.local_realm.duration_time_to_seconds(controller_poll_interval)
+        self.sample_passes = 0
+        self.expected_sample_passes = 0
         self.debug = debug_on
+        # peers run the same stations and traffic on other managers; this test drives them
+        # and writes their results into its own csv
+        self.peers = list(peers) if peers is not None else []
+        self.tests = [self] + self.peers
+        self.group = RealmGroup(realms=[test.local_realm for test in self.tests], debug_=debug_on)
         
 
         # Some checking on the duration
@@ -74,6 +105,10 @@ class L3VariableTime(LFCliBase):
 
 
         # Full spread-sheet data
+        self.csv_file = None
+        self.csv_writer = None
+        # rows are written by the sampling job and flushed by the csv_flush job
+        self.csv_lock = threading.Lock()
         if self.outfile is not None:
             self.csv_file = open(self.outfile, "w") 
             self.csv_writer = csv.writer(self.csv_file, delimiter=",")
@@ -104,139 +139,116 @@ class L3VariableTime(LFCliBase):
         self.cx_profile.side_b_min_bps = side_b_min_rate
         self.cx_profile.side_b_max_bps = side_b_max_rate
 
+    def __our_endps(self):
+        our_endps = list(self.multicast_profile.get_mc_names())
+        our_endps.extend(self.cx_profile.created_endp.keys())
+        return our_endps
+
     def __get_rx_values(self):
-        endp_list = self.json_get("endp?fields=name,rx+bytes,rx+drop+%25", debug_=False)
-        endp_rx_drop_map = {}
-        endp_rx_map = {}
-        our_endps = {}
-        for e in self.multicast_profile.get_mc_names():
-            our_endps[e] = e;
-        for e in self.cx_profile.created_endp.keys():
-            our_endps[e] = e;
-        for endp_name in endp_list['endpoint']:
-            if endp_name != 'uri' and endp_name != 'handler':
-                for item, value in endp_name.items():
-                    if item in our_endps:
-                        for value_name, value_rx in value.items():
-                            if value_name == 'rx bytes':
-                                endp_rx_map[item] = value_rx
-                        for value_name, value_rx_drop in value.items():
-                            if value_name == 'rx drop %':
-                                endp_rx_drop_map[item] = value_rx_drop
-
-        return endp_rx_map, endp_rx_drop_map
+        """
+        Poll rx bytes and rx drop % of our endpoints only, on every manager at once.
+        With peers, endpoint names are prefixed with their manager, like 192.168.100.179:8080/LT-sta0001-A
+        :return: (rx bytes changes, rx drop % changes, endpoints not reported) since the last poll
+        """
+        if self.counter_sampler is None:
+            fields = ("rx bytes", "rx drop %")
+            if len(self.peers) > 0:
+                self.counter_sampler = self.group.new_counter_sampler([test.__our_endps() for test in self.tests],
+                                                                      fields=fields)
+            else:
+                self.counter_sampler = self.local_realm.new_counter_sampler(self.__our_endps(), fields=fields)
+        sample = self.counter_sampler.sample()
+        self.epoch_time = int(sample.epoch)
+        return sample.changed["rx bytes"], sample.changed["rx drop %"], sample.missing
 
     def time_stamp(self):
         return time.strftime('%m_%d_%Y_%H_%M_%S', time.localtime(self.epoch_time))
 
-    def __record_rx_dropped_percent(self,rx_drop_percent):
-
-        csv_rx_drop_percent_data = [self.epoch_time, self.time_stamp(),'rx_drop_percent']
-        for key in [key for key in rx_drop_percent if "mtx" in key]: del rx_drop_percent[key]
+    def __csv_summary_cells(self, metrics, values, present):
+        # 5 least, 5 most, then the average of the non-zero values
+        cells = []
+        for pair in self.csv_validate_list(metrics.bottom_k(values, 5, present), 5):
+            cells.append(str(pair).replace(',',';'))
+        for pair in self.csv_validate_list(metrics.top_k(values, 5, present), 5):
+            cells.append(str(pair).replace(',',';'))
+        cells.append(metrics.average_nonzero(values, present))
+        return cells
 
-        filtered_values = [v for _, v in rx_drop_percent.items() if v !=0]
-        average_rx_drop_percent = sum(filtered_values) / len(filtered_values) if len(filtered_values) != 0 else 0
+    def __record_rx_dropped_percent(self, rx_drop_percent, missing=()):
 
-        csv_performance_rx_drop_percent_values=sorted(rx_drop_percent.items(), key=lambda x: (x[1],x[0]), reverse=False)
-        csv_performance_rx_drop_percent_values=self.csv_validate_list(csv_performance_rx_drop_percent_values,5)
-        for i in range(5):
-            csv_rx_drop_percent_data.append(str(csv_performance_rx_drop_percent_values[i]).replace(',',';'))
-        for i in range(-1,-6,-1):
-            csv_rx_drop_percent_data.append(str(csv_performance_rx_drop_percent_values[i]).replace(',',';'))
-
-        csv_rx_drop_percent_data.append(average_rx_drop_percent)
-
-        for item, value in rx_drop_percent.items():
-            #print(item, "rx drop percent: ", rx_drop_percent[item])
-            csv_rx_drop_percent_data.append(rx_drop_percent[item])
+        csv_rx_drop_percent_data = [self.epoch_time, self.time_stamp(),'rx_drop_percent']
+        # keep drop columns in the same order as the rx columns
+        self.rx_drop_metrics.add_names(self.rx_metrics.names)
+        values = self.rx_drop_metrics.push_changes(rx_drop_percent, missing)
+        present = self.rx_drop_metrics.present
+
+        csv_rx_drop_percent_data += self.__csv_summary_cells(self.rx_drop_metrics, values, present)
+        if self.store is not None:
+            self.store.append('rx_drop_percent', self.epoch_time, values, names=self.rx_drop_metrics.names)
+        elif self.csv_started:
+            csv_rx_drop_percent_data += values[:self.csv_endp_count].tolist()
+        else:
+            csv_rx_drop_percent_data += self.rx_drop_metrics.row_values(values)
 
         self.csv_add_row(csv_rx_drop_percent_data,self.csv_writer,self.csv_file)
 
-    def __compare_vals(self, old_list, new_list):
-        passes = 0
-        expected_passes = 0
-        csv_performance_values = []
-        csv_rx_headers = []
-        csv_rx_delta_dict = {}
+    def __compare_vals(self, rx_changes, missing=()):
+        """
+        Push the latest rx bytes poll and compare it with the previous one.
+        :param rx_changes: rx bytes of the endpoints whose counter changed
+        :param missing: endpoints not reported this poll
+        :return: True if every endpoint received more data than at the last poll
+        """
+        metrics = self.rx_metrics
+        new_rx = metrics.push_changes(rx_changes, missing)
+        present = metrics.present
 
         # this may need to be a list as more monitoring takes place.
         csv_rx_row_data = [self.epoch_time, self.time_stamp(),'rx']
         csv_rx_delta_row_data = [self.epoch_time, self.time_stamp(),'rx_delta']
+        csv_rx_row_data += self.__csv_summary_cells(metrics, new_rx, present)
 
-        for key in [key for key in old_list if "mtx" in key]: del old_list[key]
-        for key in [key for key in new_list if "mtx" in key]: del new_list[key]
-
-        filtered_values = [v for _, v in new_list.items() if v !=0]
-        average_rx= sum(filtered_values) / len(filtered_values) if len(filtered_values) != 0 else 0
-
-        csv_performance_values=sorted(new_list.items(), key=lambda x: (x[1],x[0]), reverse=False)
-        csv_performance_values=self.csv_validate_list(csv_performance_values,5)
-        for i in range(5):
-            csv_rx_row_data.append(str(csv_performance_values[i]).replace(',',';'))
-        for i in range(-1,-6,-1):
-            csv_rx_row_data.append(str(csv_performance_values[i]).replace(',',';'))
-
-        csv_rx_row_data.append(average_rx)
-
-        if len(old_list) == len(new_list):
-            for item, value in old_list.items():
-                expected_passes +=1
-                if new_list[item] > old_list[item]:
-                    passes += 1
-                    #if self.debug: print(item, new_list[item], old_list[item], " Difference: ", new_list[item] - old_list[item])
-                    print(item, new_list[item], old_list[item], " Difference: ", new_list[item] - old_list[item])
-                else:
-                    print("Failed to increase rx data: ", item, new_list[item], old_list[item])
-                if not self.csv_started:
-                    csv_rx_headers.append(item)
-                csv_rx_delta_dict.update({item:(new_list[item] - old_list[item])})
-                
-
-            if not self.csv_started:
-                csv_header = self.csv_generate_column_headers()
-                csv_header += csv_rx_headers
-                print(csv_header)
-                self.csv_add_column_headers(csv_header)
-                self.csv_started = True
-
-            # need to generate list first to determine worst and best
-            filtered_values = [v for _, v in csv_rx_delta_dict.items() if v !=0]
-            average_rx_delta= sum(filtered_values) / len(filtered_values) if len(filtered_values) != 0 else 0
-
-            csv_performance_delta_values=sorted(csv_rx_delta_dict.items(), key=lambda x: (x[1],x[0]), reverse=False)
-            csv_performance_delta_values=self.csv_validate_list(csv_performance_delta_values,5)
-            for i in range(5):
-                csv_rx_delta_row_data.append(str(csv_performance_delta_values[i]).replace(',',';'))
-            for i in range(-1,-6,-1):
-                csv_rx_delta_row_data.append(str(csv_performance_delta_values[i]).replace(',',';'))
-
-            csv_rx_delta_row_data.append(average_rx_delta)
-            
-            for item, value in old_list.items():
-                expected_passes +=1
-                if new_list[item] > old_list[item]:
-                    passes += 1
-                    #if self.debug: print(item, new_list[item], old_list[item], " Difference: ", new_list[item] - old_list[item])
-                    print(item, new_list[item], old_list[item], " Difference: ", new_list[item] - old_list[item])
-                else:
-                    print("Failed to increase rx data: ", item, new_list[item], old_list[item])
-                if not self.csv_started:
-                    csv_rx_headers.append(item)
-                csv_rx_row_data.append(new_list[item])
-                csv_rx_delta_row_data.append(new_list[item] - old_list[item])
-
-            self.csv_add_row(csv_rx_row_data,self.csv_writer,self.csv_file)
-            self.csv_add_row(csv_rx_delta_row_data,self.csv_writer,self.csv_file)
+        if not metrics.same_endpoints():
+            print("Old-list length: %i  new: %i does not match in compare-vals."
+                  % (int(metrics.prev_present.sum()), int(present.sum())))
+            print("old-list:", metrics.row_names(metrics.prev_present))
+            print("new-list:", metrics.row_names(present))
+            return False
 
-            if passes == expected_passes:
-                return True
-            else:
-                return False
+        deltas = metrics.deltas()
+        increased = metrics.increased()
+        if self.debug:
+            for position in (present & increased).nonzero()[0]:
+                print(metrics.names[position], new_rx[position], metrics.prev_values[position],
+                      " Difference: ", deltas[position])
+        for position in (present & ~increased).nonzero()[0]:
+            print("Failed to increase rx data: ", metrics.names[position], new_rx[position],
+                  metrics.prev_values[position])
+
+        if not self.csv_started:
+            csv_header = self.csv_generate_column_headers()
+            if self.store is None:
+                csv_header += metrics.row_names(present)
+            print(csv_header)
+            self.csv_add_column_headers(csv_header)
+            self.csv_endp_count = len(metrics.names)
+            self.csv_started = True
+
+        csv_rx_delta_row_data += self.__csv_summary_cells(metrics, deltas, present)
+        if self.debug:
+            print("rx delta percentiles (50, 90, 99): %s" % metrics.percentiles(deltas, present=present))
+
+        if self.store is not None:
+            self.store.append('rx', self.epoch_time, new_rx, names=metrics.names)
+            self.store.append('rx_delta', self.epoch_time, deltas, names=metrics.names)
         else:
-            print("Old-list length: %i  new: %i does not match in compare-vals."%(len(old_list), len(new_list)))
-            print("old-list:",old_list)
-            print("new-list:",new_list)
-            return False
+            # endpoints keep their index positions, so columns stay aligned with the header
+            csv_rx_row_data += new_rx[:self.csv_endp_count].tolist()
+            csv_rx_delta_row_data += deltas[:self.csv_endp_count].tolist()
+        self.csv_add_row(csv_rx_row_data,self.csv_writer,self.csv_file)
+        self.csv_add_row(csv_rx_delta_row_data,self.csv_writer,self.csv_file)
+
+        return bool(increased[present].all())
 
     def verify_controller(self):
         if self.args == None:
@@ -245,517 +257,216 @@ class L3VariableTime(LFCliBase):
         if self.args.cisco_ctlr == None:
             return
 
+        # Find our station count
+        entry = self.controller_state(lambda state: state.ap(self.args.cisco_ap))
+        if entry == None:
+            print("WARNING:  Cisco Controller does not list AP %s"%(self.args.cisco_ap))
+        elif entry.clients == None:
+            #TODO 9800 series show ap summary does not report clients
+            print("AP: %s"%(entry))
+        else:
+            print("AP: %s"%(entry))
+            print("sta-count: %s"%(entry.clients))
+            if (entry.clients != int(self.total_stas)):
+                print("WARNING:  Cisco Controller reported %s stations, should be %s"%(entry.clients, self.total_stas))
+
+    def poll_controller(self, scheduler, print_fail=False):
+        # controller errors exit(1); on a scheduler worker that would only end the worker
         try:
-            print("scheme {} ctlr {} user {} passwd {} AP {} series {} band {} action {}".format(self.args.cisco_scheme,self.args.cisco_ctlr,self.args.cisco_user,
-                self.args.cisco_passwd, self.args.cisco_ap, self.args.cisco_series, self.args.cisco_band,"summary"))
-
-            ctl_output = subprocess.run(["../cisco_wifi_ctl.py", "--scheme", self.args.cisco_scheme, "-d", self.args.cisco_ctlr, "-u",
-                                       self.args.cisco_user, "-p", self.args.cisco_passwd,
-                                       "-a", self.args.cisco_ap,"--series", self.args.cisco_series,"--action", "summary"], capture_output=True)
-            pss = ctl_output.stdout.decode('utf-8', 'ignore')
-            print(pss)
+            self.verify_controller()
+        except SystemExit:
+            self._fail("FAIL: Could not query the controller", print_fail)
+            scheduler.stop()
+
+    def cisco_controller(self):
+        """
+        :return: CiscoController kept logged in for the whole test
+        """
+        if self.controller == None:
+            # cisco_wifi_ctl needs pexpect, only load it when a controller is in use
+            from cisco_wifi_ctl import CiscoController
+            self.controller = CiscoController.connect(self.args.cisco_ctlr, user=self.args.cisco_user, passwd=self.args.cisco_passwd,
+                                                      scheme=self.args.cisco_scheme, series=self.args.cisco_series,
+                                                      ap=self.args.cisco_ap, band=self.args.cisco_band,
+                                                      wlan=self.args.cisco_wlan, wlanID=self.args.cisco_wlanID)
+        return self.controller
+
+    def controller_action(self, action, value=None, capture_output=None):
+        """
+        Run one cisco_wifi_ctl.py action. Anything but a read drops the parsed state
+        controller_state() keeps, since the controller changed behind its back.
+        :param capture_output: defaults to --cap_ctl_out
+        :return: the controller's output when captured, else None
+        """
+        if capture_output == None:
+            capture_output = self.args.cap_ctl_out
+        print("scheme {} ctlr {} user {} passwd {} AP {} series {} band {} action {} value {}".format(self.args.cisco_scheme,self.args.cisco_ctlr,
+            self.args.cisco_user,self.args.cisco_passwd, self.args.cisco_ap, self.args.cisco_series,
+            self.args.cisco_band, action, value))
+        command = ["../cisco_wifi_ctl.py", "--scheme", self.args.cisco_scheme, "-d", self.args.cisco_ctlr, "-u",
+                   self.args.cisco_user, "-p", self.args.cisco_passwd,
+                   "-a", self.args.cisco_ap,"--series", self.args.cisco_series, "--band", self.args.cisco_band, "--action", action]
+        if value != None:
+            command += ["--value", str(value)]
+        if action == "create_wlan":
+            command += ["--wlan", self.args.cisco_wlan, "--wlanID", self.args.cisco_wlanID]
+        try:
+            ctl_output = subprocess.run(command, capture_output=capture_output, check=True)
         except subprocess.CalledProcessError as process_error:
-            print("Controller unable to commicate to AP or unable to communicate to controller error code: {} output {}"
-                 .format(process_error.returncode, process_error.output))
+            print("Controller unable to commicate to AP or unable to communicate to controller error code: {} output {}".
+                format(process_error.returncode, process_error.output))
             time.sleep(1)
             exit(1)
-    
 
-        # Find our station count
-        searchap = False
-        for line in pss.splitlines():
-            if (line.startswith("---------")):
-                searchap = True
-                continue
-            #TODO need to test with 9800 series to chelck the values
-            if (searchap):
-                pat = "%s\s+\S+\s+\S+\s+\S+\s+\S+.*  \S+\s+\S+\s+(\S+)\s+\["%(self.args.cisco_ap)
-                #print("AP line: %s"%(line))
-                m = re.search(pat, line)
-                if (m != None):
-                    sta_count = m.group(1)
-                    print("AP line: %s"%(line))
-                    print("sta-count: %s"%(sta_count))
-                    if (int(sta_count) != int(self.total_stas)):
-                        print("WARNING:  Cisco Controller reported %s stations, should be %s"%(sta_count, self.total_stas))
+        from cisco_wifi_ctl import READ_ACTIONS
+        if action not in READ_ACTIONS:
+            if self.controller != None:
+                self.controller.state.invalidate()
+            if self.controller_serial_state != None:
+                self.controller_serial_state.invalidate()
+        if not capture_output:
+            return None
+        pss = ctl_output.stdout.decode('utf-8', 'ignore')
+        print(pss)
+        return pss
+
+    def controller_state(self, read):
+        """
+        :param read: callable given the controller's ControllerState, which caches what it parsed
+                     from the controller for a few seconds
+        :return: what read returns
+        """
+        try:
+            if self.args.cisco_scheme == "serial":
+                # serial consoles are only handled by cisco_wifi_ctl.py itself
+                if self.controller_serial_state == None:
+                    from cisco_wifi_ctl import ControllerState
+                    self.controller_serial_state = ControllerState(lambda action: self.controller_action(action, capture_output=True),
+                                                                   series=self.args.cisco_series)
+                return read(self.controller_serial_state)
+            return read(self.cisco_controller().state)
+        except Exception as error:
+            print("Controller unable to commicate to AP or unable to communicate to controller error: {}".format(error))
+            time.sleep(1)
+            exit(1)
 
     #show summary (to get AP) 
     #./cisco_wifi_ctl.py --scheme ssh -d 172.19.36.168 -p <controller_pw> --port 23 --action summary --series 9800 --log stdout
     def controller_show_summary(self):
-        try:
-            print("scheme {} ctlr {} user {} passwd {} AP {} series {} band {} action {}".format(self.args.cisco_scheme,self.args.cisco_ctlr,self.args.cisco_user,
-                self.args.cisco_passwd, self.args.cisco_ap, self.args.cisco_series, self.args.cisco_band,"summary"))
-
-            ctl_output = subprocess.run(["../cisco_wifi_ctl.py", "--scheme", self.args.cisco_scheme, "-d", self.args.cisco_ctlr, "-u",
-                                    self.args.cisco_user, "-p", self.args.cisco_passwd,
-                                    "-a", self.args.cisco_ap,"--series", self.args.cisco_series, "--band", self.args.cisco_band, "--action", "summary"], 
-                                    capture_output=self.args.cap_ctl_out, check=True)
-            if self.args.cap_ctl_out:
-                pss = ctl_output.stdout.decode('utf-8', 'ignore')
-                print(pss)
-
-        except subprocess.CalledProcessError as process_error:
-                print("Controller unable to commicate to AP or unable to communicate to controller error code: {} output {}"
-                    .format(process_error.returncode, process_error.output))
-                time.sleep(1)
-                exit(1)
-
+        self.controller_action("summary")
 
     #show ap dot11 5ghz summary (band defaults to 5ghz) --band a
     #show ap dot11 24ghz summary use --band b for 2.4 ghz
     #./cisco_wifi_ctl.py --scheme ssh -d 172.19.36.168 -p <controller_pw> --port 23 --action advanced --series 9800 --log stdout
     def controller_show_ap_summary(self):
-        try:
-            print("scheme {} ctlr {} user {} passwd {} AP {} series {} band {} action {}".format(self.args.cisco_scheme,self.args.cisco_ctlr,self.args.cisco_user,
-                self.args.cisco_passwd, self.args.cisco_ap, self.args.cisco_series, self.args.cisco_band,"advanced"))
-
-            ctl_output = subprocess.run(["../cisco_wifi_ctl.py", "--scheme", self.args.cisco_scheme, "-d", self.args.cisco_ctlr, "-u",
-                                    self.args.cisco_user, "-p", self.args.cisco_passwd,
-                                    "-a", self.args.cisco_ap,"--series", self.args.cisco_series, "--band", self.args.cisco_band, "--action", "advanced"], 
-                                    capture_output=self.args.cap_ctl_out, check=True)
-
-            if self.args.cap_ctl_out:
-                pss = ctl_output.stdout.decode('utf-8', 'ignore')
-                print(pss)
-
-        except subprocess.CalledProcessError as process_error:
-            print("Controller unable to commicate to AP or unable to communicate to controller error code: {} output {}".
-                format(process_error.returncode, process_error.output))
-            time.sleep(1) 
-            exit(1)
+        self.controller_action("advanced")
 
     #show wlan summary
     #./cisco_wifi_ctl.py --scheme ssh -d 172.19.36.168 -p <controller_pw> --port 23 --action show_wlan_summary --series 9800 --log stdout
     def controller_show_wlan_summary(self):
-        try:
-            print("scheme {} ctlr {} user {} passwd {} AP {} series {} band {} action {}".format(self.args.cisco_scheme,self.args.cisco_ctlr,self.args.cisco_user,
-                self.args.cisco_passwd, self.args.cisco_ap, self.args.cisco_series, self.args.cisco_band,"show wlan summary"))
-
-            ctl_output = subprocess.run(["../cisco_wifi_ctl.py", "--scheme", self.args.cisco_scheme, "-d", self.args.cisco_ctlr, "-u",
-                                    self.args.cisco_user, "-p", self.args.cisco_passwd,
-                                    "-a", self.args.cisco_ap,"--series", self.args.cisco_series, "--band", self.args.cisco_band, "--action", "show_wlan_summary"], 
-                                    capture_output=self.args.cap_ctl_out, check=True)
-
-            if self.args.cap_ctl_out:
-                pss = ctl_output.stdout.decode('utf-8', 'ignore')
-                print(pss)
-
-        except subprocess.CalledProcessError as process_error:
-            print("Controller unable to commicate to AP or unable to communicate to controller error code: {} output {}".
-                format(process_error.returncode, process_error.output))
-            time.sleep(1) 
-            exit(1)
+        self.controller_action("show_wlan_summary")
 
     #disable AP
     #./cisco_wifi_ctl.py --scheme ssh -d 172.19.36.168 -p <controller_pw> --port 23 -a "9120-Chamber-1" --band a --action disable --series 9800
     def controller_disable_ap(self):
-        try:
-            print("scheme {} ctlr {} user {} passwd {} AP {} series {} band {} action {}".format(self.args.cisco_scheme,self.args.cisco_ctlr,self.args.cisco_user,
-                self.args.cisco_passwd, self.args.cisco_ap, self.args.cisco_series, self.args.cisco_band,"disable"))
-
-            ctl_output = subprocess.run(["../cisco_wifi_ctl.py", "--scheme", self.args.cisco_scheme, "-d", self.args.cisco_ctlr, "-u",
-                                    self.args.cisco_user, "-p", self.args.cisco_passwd,
-                                    "-a", self.args.cisco_ap,"--series", self.args.cisco_series, "--band", self.args.cisco_band, "--action", "disable"], 
-                                    capture_output=self.args.cap_ctl_out, check=True)
-
-            if self.args.cap_ctl_out:
-                pss = ctl_output.stdout.decode('utf-8', 'ignore')
-                print(pss)
-
-        except subprocess.CalledProcessError as process_error:
-            print("Controller unable to commicate to AP or unable to communicate to controller error code: {} output {}".
-                format(process_error.returncode, process_error.output))
-            time.sleep(1) 
-            exit(1)
-
+        self.controller_action("disable")
 
     #disable wlan
     #./cisco_wifi_ctl.py --scheme ssh -d 172.19.36.168 -p <controller_pw> --port 23 -a "9120-Chamber-1" --band a --action disable_wlan --series 9800
     def controller_disable_wlan(self):
-        try:
-            print("scheme {} ctlr {} user {} passwd {} AP {} series {} band {} action {}".format(self.args.cisco_scheme,self.args.cisco_ctlr,self.args.cisco_user,
-                self.args.cisco_passwd, self.args.cisco_ap, self.args.cisco_series, self.args.cisco_band,"disable_wlan"))
-
-            ctl_output = subprocess.run(["../cisco_wifi_ctl.py", "--scheme", self.args.cisco_scheme, "-d", self.args.cisco_ctlr, "-u",
-                                    self.args.cisco_user, "-p", self.args.cisco_passwd,
-                                    "-a", self.args.cisco_ap,"--series", self.args.cisco_series, "--band", self.args.cisco_band, "--action", "disable_wlan"], 
-                                    capture_output=self.args.cap_ctl_out, check=True)
-
-            if self.args.cap_ctl_out:
-                pss = ctl_output.stdout.decode('utf-8', 'ignore')
-                print(pss)
-
-        except subprocess.CalledProcessError as process_error:
-            print("Controller unable to commicate to AP or unable to communicate to controller error code: {} output {}".
-                format(process_error.returncode, process_error.output))
-            time.sleep(1) 
-            exit(1)
-
+        self.controller_action("disable_wlan")
 
     #disable network 5ghz
     #./cisco_wifi_ctl.py --scheme ssh -d 172.19.36.168 -p <controller_pw> --port 23 -a "9120-Chamber-1" --band a --action disable_network_5ghz --series 9800
     def controller_disable_network_5ghz(self):
-        try:
-            print("scheme {} ctlr {} user {} passwd {} AP {} series {} band {} action {}".format(self.args.cisco_scheme,self.args.cisco_ctlr,self.args.cisco_user,
-                self.args.cisco_passwd, self.args.cisco_ap, self.args.cisco_series, self.args.cisco_band,"disable_network_5ghz"))
-
-            ctl_output = subprocess.run(["../cisco_wifi_ctl.py", "--scheme", self.args.cisco_scheme, "-d", self.args.cisco_ctlr, "-u",
-                                    self.args.cisco_user, "-p", self.args.cisco_passwd,
-                                    "-a", self.args.cisco_ap,"--series", self.args.cisco_series, "--band", self.args.cisco_band, "--action", "disable_network_5ghz"], 
-                                    capture_output=self.args.cap_ctl_out, check=True)
-
-            if self.args.cap_ctl_out:
-                pss = ctl_output.stdout.decode('utf-8', 'ignore')
-                print(pss)
-
-        except subprocess.CalledProcessError as process_error:
-            print("Controller unable to commicate to AP or unable to communicate to controller error code: {} output {}".
-                format(process_error.returncode, process_error.output))
-            time.sleep(1) 
-            exit(1)
-
+        self.controller_action("disable_network_5ghz")
 
     #disable network 24ghz
     #./cisco_wifi_ctl.py --scheme ssh -d 172.19.36.168 -p <controller_pw> --port 23 -a "9120-Chamber-1" --band a --action disable_network_24ghz --series 9800
     def controller_disable_network_24ghz(self):
-        try:
-            print("scheme {} ctlr {} user {} passwd {} AP {} series {} band {} action {}".format(self.args.cisco_scheme,self.args.cisco_ctlr,self.args.cisco_user,
-                self.args.cisco_passwd, self.args.cisco_ap, self.args.cisco_series, self.args.cisco_band,"disable_network_24ghz"))
-
-            ctl_output = subprocess.run(["../cisco_wifi_ctl.py", "--scheme", self.args.cisco_scheme, "-d", self.args.cisco_ctlr, "-u",
-                                    self.args.cisco_user, "-p", self.args.cisco_passwd,
-                                    "-a", self.args.cisco_ap,"--series", self.args.cisco_series, "--band", self.args.cisco_band, "--action", "disable_network_24ghz"], 
-                                    capture_output=self.args.cap_ctl_out, check=True)
-
-            if self.args.cap_ctl_out:
-                pss = ctl_output.stdout.decode('utf-8', 'ignore')
-                print(pss)
-
-        except subprocess.CalledProcessError as process_error:
-            print("Controller unable to commicate to AP or unable to communicate to controller error code: {} output {}".
-                format(process_error.returncode, process_error.output))
-            time.sleep(1) 
-            exit(1)
-
+        self.controller_action("disable_network_24ghz")
 
     #set manual mode - Series 9800 must be set to manual mode
     #./cisco_wifi_ctl.py --scheme ssh -d 172.19.36.168 -p <controller_pw> --port 23 -a "9120-Chamber-1" --band a --action manual --series 9800
     # ap name <AP NAME> dot11 5ghz radio role manual client-serving
     def controller_role_manual(self):
-        try:
-            print("scheme {} ctlr {} user {} passwd {} AP {} series {} band {} action {}".format(self.args.cisco_scheme,self.args.cisco_ctlr,self.args.cisco_user,
-                self.args.cisco_passwd, self.args.cisco_ap, self.args.cisco_series, self.args.cisco_band,"manual"))
-
-            ctl_output = subprocess.run(["../cisco_wifi_ctl.py", "--scheme", self.args.cisco_scheme, "-d", self.args.cisco_ctlr, "-u",
-                                    self.args.cisco_user, "-p", self.args.cisco_passwd,
-                                    "-a", self.args.cisco_ap,"--series", self.args.cisco_series, "--band", self.args.cisco_band, "--action", "manual"], 
-                                    capture_output=self.args.cap_ctl_out, check=True)
-
-            if self.args.cap_ctl_out:
-                pss = ctl_output.stdout.decode('utf-8', 'ignore')
-                print(pss)
-
-        except subprocess.CalledProcessError as process_error:
-            print("Controller unable to commicate to AP or unable to communicate to controller error code: {} output {}".
-                format(process_error.returncode, process_error.output))
-            time.sleep(1) 
-            exit(1)
+        self.controller_action("manual")
 
     #set manual mode - Series 9800 must be set to auto mode
     #./cisco_wifi_ctl.py --scheme ssh -d 172.19.36.168 -p <controller_pw> --port 23 -a "9120-Chamber-1" --band a --action auto --series 9800
     # ap name <AP NAME> dot11 5ghz radio role manual client-serving
     def controller_role_auto(self):
-        try:
-            print("scheme {} ctlr {} user {} passwd {} AP {} series {} band {} action {}".format(self.args.cisco_scheme,self.args.cisco_ctlr,self.args.cisco_user,
-                self.args.cisco_passwd, self.args.cisco_ap, self.args.cisco_series, self.args.cisco_band,"auto"))
-
-            ctl_output = subprocess.run(["../cisco_wifi_ctl.py", "--scheme", self.args.cisco_scheme, "-d", self.args.cisco_ctlr, "-u",
-                                    self.args.cisco_user, "-p", self.args.cisco_passwd,
-                                    "-a", self.args.cisco_ap,"--series", self.args.cisco_series, "--band", self.args.cisco_band, "--action", "auto"], 
-                                    capture_output=self.args.cap_ctl_out, check=True)
-
-            if self.args.cap_ctl_out:
-                pss = ctl_output.stdout.decode('utf-8', 'ignore')
-                print(pss)
-
-        except subprocess.CalledProcessError as process_error:
-            print("Controller unable to commicate to AP or unable to communicate to controller error code: {} output {}".
-                format(process_error.returncode, process_error.output))
-            time.sleep(1) 
-            exit(1)
-
+        self.controller_action("auto")
 
     #test parameters summary (txPower 1-8)
     #./cisco_wifi_ctl.py --scheme ssh -d 172.19.36.168 -p <controller_pw> --port 23 -a "9120-Chamber-1" --band a --action txPower  --value 5 --series 9800
     def controller_set_tx_power(self):
-        try:
-            print("scheme {} ctlr {} user {} passwd {} AP {} series {} band {} action {} value {}".format(self.args.cisco_scheme,self.args.cisco_ctlr,
-                self.args.cisco_user,self.args.cisco_passwd, self.args.cisco_ap, self.args.cisco_series, 
-                self.args.cisco_band,"txPower", self.args.cisco_tx_power ))  # TODO fix txPower to tx_power in cisco_wifi_ctl.py
-            ctl_output = subprocess.run(["../cisco_wifi_ctl.py", "--scheme", self.args.cisco_scheme, "-d", self.args.cisco_ctlr, "-u",
-                                    self.args.cisco_user, "-p", self.args.cisco_passwd,
-                                    "-a", self.args.cisco_ap,"--series", self.args.cisco_series, "--band", self.args.cisco_band, 
-                                    "--action", "txPower","--value", self.args.cisco_tx_power], 
-                                    capture_output=self.args.cap_ctl_out, check=True)
-
-            if self.args.cap_ctl_out:
-                pss = ctl_output.stdout.decode('utf-8', 'ignore')
-                print(pss)
-        except subprocess.CalledProcessError as process_error:
-            print("Controller unable to commicate to AP or unable to communicate to controller error code: {} output {}".
-                format(process_error.returncode, process_error.output))
-            time.sleep(1) 
-            exit(1)
-
+        self.controller_action("txPower", self.args.cisco_tx_power)
 
     #set channel [36, 64, 100]
     #./cisco_wifi_ctl.py --scheme ssh -d 172.19.36.168 -p <controller_pw> --port 23 -a "9120-Chamber-1" --band a --action channel  --value 36 --series 9800
     # 9800 : ap name <AP> dot11 [5ghz | 24ghz] channel <channel>
     # 3504 : (Cisco Controller) >config 802.11a channel ap APA453.0E7B.CF9C  52
     def controller_set_channel(self):
-        try:
-            print("scheme {} ctlr {} user {} passwd {} AP {} series {} band {} action {} value {}".format(self.args.cisco_scheme,self.args.cisco_ctlr,
-                self.args.cisco_user,self.args.cisco_passwd, self.args.cisco_ap, self.args.cisco_series, 
-                self.args.cisco_band,"channel", self.args.cisco_channel ))
-            ctl_output = subprocess.run(["../cisco_wifi_ctl.py", "--scheme", self.args.cisco_scheme, "-d", self.args.cisco_ctlr, "-u",
-                                    self.args.cisco_user, "-p", self.args.cisco_passwd,
-                                    "-a", self.args.cisco_ap,"--series", self.args.cisco_series, "--band", self.args.cisco_band, 
-                                    "--action", "channel","--value", self.args.cisco_channel], 
-                                    capture_output=self.args.cap_ctl_out, check=True)
-
-            if self.args.cap_ctl_out:
-                pss = ctl_output.stdout.decode('utf-8', 'ignore')
-                print(pss)
-        except subprocess.CalledProcessError as process_error:
-            print("Controller unable to commicate to AP or unable to communicate to controller error code: {} output {}".
-                format(process_error.returncode, process_error.output))
-            time.sleep(1) 
-            exit(1)
-
+        self.controller_action("channel", self.args.cisco_channel)
 
     #set bandwidth [20 40 80 160]
     #./cisco_wifi_ctl.py --scheme ssh -d 172.19.36.168 -p <controller_pw> --port 23 -a "9120-Chamber-1" --band a --action bandwidth  --value 40 --series 9800
     def controller_set_chan_width(self):
-        try:
-            print("scheme {} ctlr {} user {} passwd {} AP {} series {} band {} action {} value {}".format(self.args.cisco_scheme,self.args.cisco_ctlr,
-                self.args.cisco_user,self.args.cisco_passwd, self.args.cisco_ap, self.args.cisco_series, 
-                self.args.cisco_band,"channel", self.args.cisco_chan_width ))
-            ctl_output = subprocess.run(["../cisco_wifi_ctl.py", "--scheme", self.args.cisco_scheme, "-d", self.args.cisco_ctlr, "-u",
-                                    self.args.cisco_user, "-p", self.args.cisco_passwd,
-                                    "-a", self.args.cisco_ap,"--series", self.args.cisco_series, "--band", self.args.cisco_band, 
-                                    "--action", "channel","--value", self.args.cisco_chan_width], 
-                                    capture_output=self.args.cap_ctl_out, check=True)
-
-            if self.args.cap_ctl_out:
-                pss = ctl_output.stdout.decode('utf-8', 'ignore')
-                print(pss)
-
-        except subprocess.CalledProcessError as process_error:
-            print("Controller unable to commicate to AP or unable to communicate to controller error code: {} output {}".
-                format(process_error.returncode, process_error.output))
-            time.sleep(1) 
-            exit(1)
-
+        self.controller_action("bandwidth", self.args.cisco_chan_width)
 
     #create wlan
     #./cisco_wifi_ctl.py --scheme ssh -d 172.19.36.168 -p <controller_pw> --port 23 -a "9120-Chamber-1" --band a --action create_wlan  --wlan "open-wlan"  --wlanID 1 --series 9800
     def controller_create_wlan(self):
-        try:
-            print("scheme {} ctlr {} user {} passwd {} AP {} series {} band {} action {} wlan {} wlanID".format(self.args.cisco_scheme,self.args.cisco_ctlr,
-                self.args.cisco_user,self.args.cisco_passwd, self.args.cisco_ap, self.args.cisco_series, 
-                self.args.cisco_band,"create_wlan", self.args.cisco_wlan, self.args.cisco_wlanID ))
-            ctl_output = subprocess.run(["../cisco_wifi_ctl.py", "--scheme", self.args.cisco_scheme, "-d", self.args.cisco_ctlr, "-u",
-                                    self.args.cisco_user, "-p", self.args.cisco_passwd,
-                                    "-a", self.args.cisco_ap,"--series", self.args.cisco_series, "--band", self.args.cisco_band, 
-                                    "--action", "create_wlan","--wlan", self.args.cisco_wlan, "--wlanID", self.args.cisco_wlanID], 
-                                    capture_output=self.args.cap_ctl_out, check=True)
-
-            if self.args.cap_ctl_out:
-                pss = ctl_output.stdout.decode('utf-8', 'ignore')
-                print(pss)
-
-        except subprocess.CalledProcessError as process_error:
-            print("Controller unable to commicate to AP or unable to communicate to controller error code: {} output {}".
-                format(process_error.returncode, process_error.output))
-            time.sleep(1) 
-            exit(1)
-
+        self.controller_action("create_wlan")
 
     #create wireless tag policy  --9800 series needs to have wireless tag policy set
     #./cisco_wifi_ctl.py --scheme ssh -d 172.19.36.168 -p <controller_pw> --port 23 -a "9120-Chamber-1" --band a --action wireless_tag_policy --series 9800
     def controller_set_wireless_tag_policy(self):
-        try:
-            print("scheme {} ctlr {} user {} passwd {} AP {} series {} band {} action".format(self.args.cisco_scheme,self.args.cisco_ctlr,
-                self.args.cisco_user,self.args.cisco_passwd, self.args.cisco_ap, self.args.cisco_series, 
-                self.args.cisco_band,"wireless_tag_policy" ))
-            ctl_output = subprocess.run(["../cisco_wifi_ctl.py", "--scheme", self.args.cisco_scheme, "-d", self.args.cisco_ctlr, "-u",
-                                    self.args.cisco_user, "-p", self.args.cisco_passwd,
-                                    "-a", self.args.cisco_ap,"--series", self.args.cisco_series, "--band", self.args.cisco_band, 
-                                    "--action", "wireless_tag_policy"], 
-                                    capture_output=self.args.cap_ctl_out, check=True)
-
-            if self.args.cap_ctl_out:
-                pss = ctl_output.stdout.decode('utf-8', 'ignore')
-                print(pss)
-        except subprocess.CalledProcessError as process_error:
-            print("Controller unable to commicate to AP or unable to communicate to controller error code: {} output {}".
-                format(process_error.returncode, process_error.output))
-            time.sleep(1) 
-            exit(1)
-
+        self.controller_action("wireless_tag_policy")
 
     #enable wlan
     #./cisco_wifi_ctl.py --scheme ssh -d 172.19.36.168 -p <controller_pw> --port 23 -a "9120-Chamber-1" --band a --action enable_wlan --series 9800
     def controller_enable_wlan(self):
-        try:
-            print("scheme {} ctlr {} user {} passwd {} AP {} series {} band {} action {}".format(self.args.cisco_scheme,self.args.cisco_ctlr,
-                self.args.cisco_user,self.args.cisco_passwd, self.args.cisco_ap, self.args.cisco_series, 
-                self.args.cisco_band,"enable_wlan"))
-            ctl_output = subprocess.run(["../cisco_wifi_ctl.py", "--scheme", self.args.cisco_scheme, "-d", self.args.cisco_ctlr, "-u",
-                                    self.args.cisco_user, "-p", self.args.cisco_passwd,
-                                    "-a", self.args.cisco_ap,"--series", self.args.cisco_series, "--band", self.args.cisco_band, 
-                                    "--action", "enable_wlan"], 
-                                    capture_output=self.args.cap_ctl_out, check=True)
-
-            if self.args.cap_ctl_out:
-                pss = ctl_output.stdout.decode('utf-8', 'ignore')
-                print(pss)
-        except subprocess.CalledProcessError as process_error:
-            print("Controller unable to commicate to AP or unable to communicate to controller error code: {} output {}".
-                format(process_error.returncode, process_error.output))
-            time.sleep(1) 
-            exit(1)
-
+        self.controller_action("enable_wlan")
 
     #enable 5ghz
     #./cisco_wifi_ctl.py --scheme ssh -d 172.19.36.168 -p <controller_pw> --port 23 -a "9120-Chamber-1" --band a --action enable_network_5ghz --series 9800
     def controller_enable_network_5ghz(self):
-        try:
-            print("scheme {} ctlr {} user {} passwd {} AP {} series {} band {} action {}".format(self.args.cisco_scheme,self.args.cisco_ctlr,
-                self.args.cisco_user,self.args.cisco_passwd, self.args.cisco_ap, self.args.cisco_series, 
-                self.args.cisco_band,"enable_network_5ghz"))
-            ctl_output = subprocess.run(["../cisco_wifi_ctl.py", "--scheme", self.args.cisco_scheme, "-d", self.args.cisco_ctlr, "-u",
-                                    self.args.cisco_user, "-p", self.args.cisco_passwd,
-                                    "-a", self.args.cisco_ap,"--series", self.args.cisco_series, "--band", self.args.cisco_band, 
-                                    "--action", "enable_network_5ghz"], 
-                                    capture_output=self.args.cap_ctl_out, check=True)
-
-            if self.args.cap_ctl_out:
-                pss = ctl_output.stdout.decode('utf-8', 'ignore')
-                print(pss)
-        except subprocess.CalledProcessError as process_error:
-            print("Controller unable to commicate to AP or unable to communicate to controller error code: {} output {}".
-                format(process_error.returncode, process_error.output))
-            time.sleep(1) 
-            exit(1)
+        self.controller_action("enable_network_5ghz")
 
     #enable 24ghz
     #./cisco_wifi_ctl.py --scheme ssh -d 172.19.36.168 -p <controller_pw> --port 23 -a "9120-Chamber-1" --band a --action enable_network_24ghz --series 9800
     def controller_enable_network_24ghz(self):
-        try:
-            print("scheme {} ctlr {} user {} passwd {} AP {} series {} band {} action {}".format(self.args.cisco_scheme,self.args.cisco_ctlr,
-                self.args.cisco_user,self.args.cisco_passwd, self.args.cisco_ap, self.args.cisco_series, 
-                self.args.cisco_band,"enable_network_24ghz"))
-            ctl_output = subprocess.run(["../cisco_wifi_ctl.py", "--scheme", self.args.cisco_scheme, "-d", self.args.cisco_ctlr, "-u",
-                                    self.args.cisco_user, "-p", self.args.cisco_passwd,
-                                    "-a", self.args.cisco_ap,"--series", self.args.cisco_series, "--band", self.args.cisco_band, 
-                                    "--action", "enable_network_24ghz"], 
-                                    capture_output=self.args.cap_ctl_out, check=True)
-
-            if self.args.cap_ctl_out:
-                pss = ctl_output.stdout.decode('utf-8', 'ignore')
-                print(pss)
-        except subprocess.CalledProcessError as process_error:
-            print("Controller unable to commicate to AP or unable to communicate to controller error code: {} output {}".
-                format(process_error.returncode, process_error.output))
-            time.sleep(1) 
-            exit(1)
-
+        self.controller_action("enable_network_24ghz")
 
     #enable (band a)
     #./cisco_wifi_ctl.py --scheme ssh -d 172.19.36.168 -p <controller_pw> --port 23 -a "9120-Chamber-1" --band a --action enable --series 9800
     def controller_enable_ap(self):
-        try:
-            print("scheme {} ctlr {} user {} passwd {} AP {} series {} band {} action {}".format(self.args.cisco_scheme,self.args.cisco_ctlr,
-                self.args.cisco_user,self.args.cisco_passwd, self.args.cisco_ap, self.args.cisco_series, 
-                self.args.cisco_band,"enable"))
-            ctl_output = subprocess.run(["../cisco_wifi_ctl.py", "--scheme", self.args.cisco_scheme, "-d", self.args.cisco_ctlr, "-u",
-                                    self.args.cisco_user, "-p", self.args.cisco_passwd,
-                                    "-a", self.args.cisco_ap,"--series", self.args.cisco_series, "--band", self.args.cisco_band, 
-                                    "--action", "enable"], 
-                                    capture_output=self.args.cap_ctl_out, check=True)
-
-            if self.args.cap_ctl_out:
-                pss = ctl_output.stdout.decode('utf-8', 'ignore')
-                print(pss)
-        except subprocess.CalledProcessError as process_error:
-            print("Controller unable to commicate to AP or unable to communicate to controller error code: {} output {}".
-                format(process_error.returncode, process_error.output))
-            time.sleep(1) 
-            exit(1)
-
+        self.controller_action("enable")
 
     #advanced (showes summary)
     #./cisco_wifi_ctl.py --scheme ssh -d 172.19.36.168 -p <controller_pw> --port 23 -a "9120-Chamber-1" --band a --action advanced --series 9800
     def controller_show_ap_channel(self):
-        advanced = subprocess.run(["../cisco_wifi_ctl.py", "--scheme", self.args.cisco_scheme, "-d", self.args.cisco_ctlr, "-u",
-                                   self.args.cisco_user, "-p", self.args.cisco_passwd,
-                                   "-a", self.args.cisco_ap,"--series", self.args.cisco_series, "--action", "ap_channel"], capture_output=True)
-
-        pss = advanced.stdout.decode('utf-8', 'ignore')
-        print(pss)
-
-        if self.args.cisco_series == "9800":
-            for line in pss.splitlines():
-                search_str = self.args.cisco_ap
-                print("line {}".format(line))
-                element_list = line.lstrip().split()
-                print("element_list {}".format(element_list))
-                if (line.lstrip().startswith(search_str)):
-                    print("line {}".format(line))
-                    element_list = line.lstrip().split()
-                    print("element_list {}".format(element_list))
-                    # AP Name (0) mac (1) slot (2) Admin State [enable/disable] (3) Oper State [Up/Down] (4) Width (5) Txpwr (6,7) channel (8) mode (9)
-                    print("ap: {} slof {} channel {}  chan_width {}".format(element_list[0],element_list[2],element_list[8],element_list[5]))
-                    if (str(self.args.cisco_channel) in str(element_list[8])) and (str(self.args.cisco_chan_width) in str(element_list[5])):
-                        print("ap {} configuration successful: channel {} in expected {}  chan_width {} in expected {}"
-                        .format(element_list[0],self.args.cisco_channel,element_list[8],self.args.cisco_chan_width,element_list[5])) 
-                    else:
-                        print("WARNING ap {} configuration: channel {} in expected {}  chan_width {} in expected {}"
-                        .format(element_list[0],self.args.cisco_channel,element_list[8],self.args.cisco_chan_width,element_list[5])) 
-                    break
+        radio = self.controller_state(lambda state: state.radio(self.args.cisco_ap))
+        if radio == None:
+            print("WARNING ap {} not found in the controller's 802.11{} summary".format(self.args.cisco_ap, self.args.cisco_band))
         else:
-            print("checking for 802.11{}".format(self.args.cisco_band))
-
-            for line in pss.splitlines():
-                #print("line {}".format(line))
-                search_str = "802.11{}".format(self.args.cisco_band)
-                if (line.lstrip().startswith(search_str)):
-                    print("line {}".format(line))
-                    element_list = line.lstrip().split()
-                    print("element_list {}".format(element_list))
-                    print("ap: {} channel {}  chan_width {}".format(self.args.cisco_ap,element_list[4],element_list[5]))
-                    if (str(self.args.cisco_channel) in str(element_list[4])) and (str(self.args.cisco_chan_width) in str(element_list[5])):
-                        print("ap configuration successful: channel {} in expected {}  chan_width {} in expected {}"
-                        .format(self.args.cisco_channel,element_list[4],self.args.cisco_chan_width,element_list[5])) 
-                    else:
-                        print("AP WARNING: channel {} expected {}  chan_width {} expected {}"
-                        .format(element_list[4],self.cisco_channel,element_list[5],self.args.cisco_chan_width)) 
-                    break
-        
+            print("ap: {} slot {} channel {}  chan_width {}".format(radio.ap, radio.slot, radio.channels, radio.width))
+            if (str(self.args.cisco_channel) in [str(channel) for channel in radio.channels]) and (str(self.args.cisco_chan_width) == str(radio.width)):
+                print("ap {} configuration successful: channel {} in expected {}  chan_width {} in expected {}"
+                .format(radio.ap,self.args.cisco_channel,radio.channels,self.args.cisco_chan_width,radio.width))
+            else:
+                print("WARNING ap {} configuration: channel {} in expected {}  chan_width {} in expected {}"
+                .format(radio.ap,self.args.cisco_channel,radio.channels,self.args.cisco_chan_width,radio.width))
+
         print("configure ap {} channel {} chan_width {}".format(self.args.cisco_ap,self.args.cisco_channel,self.args.cisco_chan_width))
         # Verify channel and channel width. 
 
     # for testing perposes set channel back to 36
     def controller_set_channel_ap_36(self):
         #(Cisco Controller) >config 802.11a channel ap APA453.0E7B.CF9C  36
-        cisco_channel_36 = "36"
-        advanced = subprocess.run(["../cisco_wifi_ctl.py", "--scheme", self.args.cisco_scheme, "-d", self.args.cisco_ctlr, "-u",
-                                   self.args.cisco_user, "-p", self.args.cisco_passwd,
-                                   "-a", self.args.cisco_ap,"--series", self.args.cisco_series, "--action", "channel","--value",cisco_channel_36], capture_output=True)
-
-        pss = advanced.stdout.decode('utf-8', 'ignore')
-        print(pss)      
+        self.controller_action("channel", "36")
 
     def verify_cac_on_ap(self):
         pass
@@ -864,7 +575,18 @@ class L3VariableTime(LFCliBase):
                         print("reset on radio {} station: {}".format(station_profile.add_sta_data['radio'],station_profile.station_names[port_to_reset]))
                         self.local_realm.reset_port(station_profile.station_names[port_to_reset])
 
+    def __collect_peer_results(self):
+        # pass/fail results of peers count as this test's results
+        for peer in self.peers:
+            for result in peer.test_results:
+                self.test_results.append("%s %s" % (result, peer.host) if result.startswith("FAIL") else result)
+            peer.test_results = []
+
     def pre_cleanup(self):
+        self.group.run_parallel(lambda test: test.__pre_cleanup(), items=self.tests)
+        self.total_stas = sum(test.total_stas for test in self.tests)
+
+    def __pre_cleanup(self):
         self.cx_profile.cleanup_prefix()
         self.multicast_profile.cleanup_prefix()
         self.total_stas = 0
@@ -890,15 +612,22 @@ class L3VariableTime(LFCliBase):
     def build(self):
         self.controller_channel_chan_width_config()
         self.dfs()
+        self.group.run_parallel(lambda test: test.__build(), items=self.tests)
+        self.__collect_peer_results()
+
+    def __build(self):
+        # create stations on every radio in parallel, then their connections
+        station_jobs = []
         index = 0
         for station_profile in self.station_profiles:
             station_profile.use_security(station_profile.security, station_profile.ssid, station_profile.ssid_pass)
             station_profile.set_number_template(station_profile.number_template)
-            print("Creating stations")
-
-            station_profile.create(radio=self.radio_name_list[index], sta_names_=self.station_lists[index], debug=self.debug, sleep_time=0)
+            station_jobs.append((station_profile, self.radio_name_list[index], self.station_lists[index]))
             index += 1
+        print("Creating stations")
+        self.local_realm.create_stations(station_jobs, debug=self.debug)
 
+        for station_profile in self.station_profiles:
             for etype in self.endp_types:
                 if etype == "mc_udp" or etype == "mc_udp6":
                     print("Creating Multicast connections for endpoint type: %s"%(etype))
@@ -911,7 +640,46 @@ class L3VariableTime(LFCliBase):
         self._pass("PASS: Stations build finished")        
         
     def start(self, print_pass=False, print_fail=False):
-        print("Bringing up stations")
+        self.group.run_parallel(lambda test: test.__bring_up(), items=self.tests)
+
+        self.verify_controller()
+        # traffic starts on every manager at the same moment
+        self.group.start_together(lambda test: test.__start_traffic(), items=self.tests)
+
+        print("Getting initial values.")
+        old_rx_values, rx_drop_percent, missing = self.__get_rx_values()
+        self.rx_metrics.push_changes(old_rx_values, missing)
+        self.rx_drop_metrics.push_changes(rx_drop_percent, missing)
+
+        duration_sec = self.local_realm.duration_time_to_seconds(self.test_duration)
+
+        print("Monitoring throughput for duration: %s"%(self.test_duration))
+
+        # each job runs on its own thread and period, so a slow csv flush or controller
+        # query does not delay the counter samples
+        self.sample_passes = 0
+        self.expected_sample_passes = 0
+        scheduler = PeriodicScheduler(debug=self.debug)
+        scheduler.add("sample_counters", self.polling_interval_seconds,
+                      lambda: self.sample_counters(print_fail))
+        for test in self.tests:
+            scheduler.add("reset_port_check %s" % test.host, 1, test.reset_port_check)
+        scheduler.add("csv_flush", self.csv_flush_sec, self.csv_flush, jitter_sec=self.csv_flush_sec / 10)
+        if (self.controller_poll_interval_seconds is not None) and (self.args is not None) \
+                and (self.args.cisco_ctlr is not None):
+            scheduler.add("verify_controller", self.controller_poll_interval_seconds,
+                          lambda: self.poll_controller(scheduler, print_fail),
+                          jitter_sec=self.controller_poll_interval_seconds / 10)
+        scheduler.run(duration_sec=duration_sec)
+        if self.debug:
+            for task in scheduler.tasks:
+                print(task)
+
+        if self.sample_passes == self.expected_sample_passes:
+            self._pass("PASS: All tests passed", print_pass)
+
+    def __bring_up(self):
+        print("Bringing up stations on %s" % self.host)
         self.local_realm.admin_up(self.side_b) 
         for station_profile in self.station_profiles:
             for sta in station_profile.station_names:
@@ -928,7 +696,7 @@ class L3VariableTime(LFCliBase):
         else:
             print("print failed to get IP's")
 
-        self.verify_controller()
+    def __start_traffic(self):
         print("Starting multicast traffic (if any configured)")
         self.multicast_profile.start_mc(debug_=self.debug)
         self.multicast_profile.refresh_mc(debug_=self.debug)
@@ -936,43 +704,29 @@ class L3VariableTime(LFCliBase):
         self.cx_profile.start_cx()
         self.cx_profile.refresh_cx()
 
-        cur_time = datetime.datetime.now()
-        print("Getting initial values.")
-        old_rx_values, rx_drop_percent = self.__get_rx_values()
-
-        end_time = self.local_realm.parse_time(self.test_duration) + cur_time
-
-        print("Monitoring throughput for duration: %s"%(self.test_duration))
-
-        passes = 0
-        expected_passes = 0
-        while cur_time < end_time:
-            #interval_time = cur_time + datetime.timedelta(seconds=5)
-            interval_time = cur_time + datetime.timedelta(seconds=self.polling_interval_seconds)
-            #print("polling_interval_seconds {}".format(self.polling_interval_seconds))
-            while cur_time < interval_time:
-                cur_time = datetime.datetime.now()
-                self.reset_port_check()
-                time.sleep(1)
-            
-            self.epoch_time = int(time.time())
-            new_rx_values, rx_drop_percent = self.__get_rx_values()
-
-            expected_passes += 1
-            if self.__compare_vals(old_rx_values, new_rx_values):
-                passes += 1
-            else:
-                self._fail("FAIL: Not all stations increased traffic", print_fail)
-            old_rx_values = new_rx_values
-
-            self.__record_rx_dropped_percent(rx_drop_percent)
+    def sample_counters(self, print_fail=False):
+        # counted before sampling, so a sample that raises cannot leave the totals equal
+        self.expected_sample_passes += 1
+        try:
+            new_rx_values, rx_drop_percent, missing = self.__get_rx_values()
+        except Exception as x:
+            self._fail("FAIL: Could not sample endpoint counters: %s" % x, print_fail)
+            return
 
-            cur_time = datetime.datetime.now()
+        if self.__compare_vals(new_rx_values, missing):
+            self.sample_passes += 1
+        else:
+            self._fail("FAIL: Not all stations increased traffic", print_fail)
 
-        if passes == expected_passes:
-            self._pass("PASS: All tests passed", print_pass)
+        self.__record_rx_dropped_percent(rx_drop_percent, missing)
 
     def stop(self):
+        self.csv_flush()
+        if self.store is not None:
+            self.store.close()
+        self.group.run_parallel(lambda test: test.__stop(), items=self.tests)
+
+    def __stop(self):
         self.cx_profile.stop_cx()
         self.multicast_profile.stop_mc()
         for station_list in self.station_lists:
@@ -980,6 +734,9 @@ class L3VariableTime(LFCliBase):
                 self.local_realm.admin_down(station_name)
 
     def cleanup(self):
+        self.group.run_parallel(lambda test: test.__cleanup(), items=self.tests)
+
+    def __cleanup(self):
         self.cx_profile.cleanup()
         self.multicast_profile.cleanup()
         for station_profile in self.station_profiles:
@@ -996,8 +753,9 @@ class L3VariableTime(LFCliBase):
 
     def csv_add_column_headers(self,headers):
         if self.csv_file is not None:
-            self.csv_writer.writerow(headers)
-            self.csv_file.flush()
+            with self.csv_lock:
+                self.csv_writer.writerow(headers)
+                self.csv_file.flush()
 
     def csv_validate_list(self, csv_list, length):
         if len(csv_list) < length:
@@ -1006,8 +764,14 @@ class L3VariableTime(LFCliBase):
 
     def csv_add_row(self,row,writer,csv_file):
         if self.csv_file is not None:
-            writer.writerow(row)
-            csv_file.flush()
+            with self.csv_lock:
+                writer.writerow(row)
+
+    # rows are buffered; start() flushes every csv_flush_sec
+    def csv_flush(self):
+        if self.csv_file is not None:
+            with self.csv_lock:
+                self.csv_file.flush()
 
 def valid_endp_types(_endp_type):
     etypes = _endp_type.split()
@@ -1092,6 +856,8 @@ BK, BE, VI, VO:  Optional wifi related Tos Settings.  Or, use your preferred num
 --cisco_band <a | b | abgn>',default="a",choices=["a", "b", "abgn"]
 
 --mgr <hostname for where LANforge GUI is running>',default='localhost'
+      several managers may be given comma separated, host[:port],host[:port]; each one gets the same
+      radios, stations and traffic, and the results of all of them go to one csv
 -d  / --test_duration <how long to run>  example --time 5d (5 days) default: 3m options: number followed by d, h, m or s',default='3m'
 --tos:  Support different ToS settings: BK | BE | VI | VO | numeric',default="BE"
 --debug:  Enable debugging',default=False
@@ -1163,7 +929,7 @@ python3 test_l3_longevity.py --cisco_ctlr 192.168.100.112 --cisco_dfs True --mgr
     parser.add_argument('--amount_ports_to_reset', help='--amount_ports_to_reset \"<min amount ports> <max amount ports>\" ', default=None)
     parser.add_argument('--port_reset_seconds', help='--ports_reset_seconds \"<min seconds> <max seconds>\" ', default="10 30")
 
-    parser.add_argument('--mgr', help='--mgr <hostname for where LANforge GUI is running>',default='localhost')
+    parser.add_argument('--mgr', help='--mgr <hostname for where LANforge GUI is running>, or a comma separated list host[:port],host[:port] to run on several managers at once',default='localhost')
     parser.add_argument('-d','--test_duration', help='--test_duration <how long to run>  example --time 5d (5 days) default: 3m options: number followed by d, h, m or s',default='3m')
     parser.add_argument('--tos', help='--tos:  Support different ToS settings: BK | BE | VI | VO | numeric',default="BE")
     parser.add_argument('--debug', help='--debug flag present debug on  enable debugging',action='store_true')
@@ -1172,6 +938,8 @@ python3 test_l3_longevity.py --cisco_ctlr 192.168.100.112 --cisco_dfs True --mgr
     parser.add_argument('-u', '--upstream_port', help='--upstream_port <cross connect upstream_port> example: --upstream_port eth1',default='eth1')
     parser.add_argument('-o','--csv_outfile', help="--csv_outfile <Output file for csv data>", default='longevity_results')
     parser.add_argument('--polling_interval', help="--polling_interval <seconds>", default='60s')
+    parser.add_argument('--controller_poll_interval', help="--controller_poll_interval <duration> re-check the station count on the cisco controller this often, example 5m; default: only at start", default=None)
+    parser.add_argument('--store_dir', help="--store_dir <directory> keep per-endpoint values as .npy segments there, csv gets only the summary columns. Export with lf_store_export.py", default=None)
     #parser.add_argument('-c','--csv_output', help="Generate csv output", default=False) 
 
     parser.add_argument('-r','--radio', action='append', nargs=1, help='--radio  \
@@ -1193,8 +961,10 @@ python3 test_l3_longevity.py --cisco_ctlr 192.168.100.112 --cisco_dfs True --mgr
     if args.endp_type:
         endp_types = args.endp_type
 
+    managers = []
     if args.mgr:
-        lfjson_host = args.mgr
+        managers = [parse_manager(mgr, lfjson_port) for mgr in args.mgr.split(',') if mgr.strip() != '']
+        lfjson_host, lfjson_port = managers[0]
 
     if args.upstream_port:
         side_b = args.upstream_port
@@ -1271,30 +1041,42 @@ python3 test_l3_longevity.py --cisco_ctlr 192.168.100.112 --cisco_dfs True --mgr
 
     #print("endp-types: %s"%(endp_types))
 
+    test_kwargs = dict(
+                        args=args,
+                        number_template="00", 
+                        station_lists= station_lists,
+                        name_prefix="LT-",
+                        endp_types=endp_types,
+                        tos=args.tos,
+                        side_b=side_b,
+                        radio_name_list=radio_name_list,
+                        number_of_stations_per_radio_list=number_of_stations_per_radio_list,
+                        ssid_list=ssid_list,
+                        ssid_password_list=ssid_password_list,
+                        ssid_security_list=ssid_security_list, 
+                        test_duration=test_duration,
+                        polling_interval= polling_interval,
+                        reset_port_enable_list=reset_port_enable_list,
+                        reset_port_time_min_list=reset_port_time_min_list,
+                        reset_port_time_max_list=reset_port_time_max_list,
+                        side_a_min_rate=256000, 
+                        side_b_min_rate=256000, 
+                        debug_on=debug_on)
+
+    # the first manager writes the results, the others run as its peers
+    peers = []
+    for (peer_host, peer_port) in managers[1:]:
+        print("peer manager: {}:{}".format(peer_host, peer_port))
+        peers.append(L3VariableTime(peer_host, peer_port, outfile=None, **test_kwargs))
+
     ip_var_test = L3VariableTime(
                                     lfjson_host,
                                     lfjson_port,
-                                    args=args,
-                                    number_template="00", 
-                                    station_lists= station_lists,
-                                    name_prefix="LT-",
-                                    endp_types=endp_types,
-                                    tos=args.tos,
-                                    side_b=side_b,
-                                    radio_name_list=radio_name_list,
-                                    number_of_stations_per_radio_list=number_of_stations_per_radio_list,
-                                    ssid_list=ssid_list,
-                                    ssid_password_list=ssid_password_list,
-                                    ssid_security_list=ssid_security_list, 
-                                    test_duration=test_duration,
-                                    polling_interval= polling_interval,
-                                    reset_port_enable_list=reset_port_enable_list,
-                                    reset_port_time_min_list=reset_port_time_min_list,
-                                    reset_port_time_max_list=reset_port_time_max_list,
-                                    side_a_min_rate=256000, 
-                                    side_b_min_rate=256000, 
-                                    debug_on=debug_on, 
-                                    outfile=csv_outfile)
+                                    outfile=csv_outfile,
+                                    store_dir=args.store_dir,
+                                    controller_poll_interval=args.controller_poll_interval,
+                                    peers=peers,
+                                    **test_kwargs)
 
     ip_var_test.pre_cleanup()
 
@@ -1314,7 +1096,7 @@ python3 test_l3_longevity.py --cisco_ctlr 192.168.100.112 --cisco_dfs True --mgr
         pss = sub_output.stdout.decode('utf-8', 'ignore')
         print(pss)
     except Exception as e:
-        print("Exception: {} failed creating summary and raw for {}, are all packages installed , pandas?".format(e,csv_outfile))
+        print("Exception: {} failed creating summary and raw for {}".format(e,csv_outfile))
 
     print("Pausing 30 seconds after run for manual inspection before we clean up.")
     time.sleep(30)
@@ -5,11 +5,698 @@ This Script has three classes :
           2. n11_calculator : It will take all the user input of 802.11n station,calculate Intermediate values and Theoretical values.
           3. ac11_calculator : It will take all the user input of 802.11ac station,calculate Intermediate values and Theoretical values.
 All classes have different functions: input_parameter() that calculates intermediate values and generate theroretical data
+and calculate(stations) that returns them as a CapacityResult instead of printing them.
+
+capacity() gives the same CapacityResult for a configuration given by keyword, e.g. for a throughput
+test to compare what it measures against:
+
+    from wlan_capacity_calculator import capacity
+    expected = capacity("11ac", stations=10, Data_Voice_MCS=7, spatial=2).ip_throughput_per_client_mbps
+
+The PHY tables below are built once at import, and the calculations behind
+input_parameter() are memoized on their inputs, so evaluating many
+configurations (or the same one repeatedly) only pays for each distinct
+configuration once.
+
+sweep() (--sweep on the command line) evaluates whole grids of configurations with numpy
+and write_sweep() writes them as a csv or json table.
 
 '''
 
 import argparse
+import csv
+import functools
 import json
+import logging
+import sys
+
+import numpy as np
+
+# *********************************************Auxilliary  Data***********************************************
+
+# Number of clients the Theoretical values are calculated for
+CLIENT_COUNTS = (1, 2, 5, 10, 20, 50, 100)
+# Upper bounds of the voice call ranges, one per entry of CLIENT_COUNTS but the last
+VOICE_CALL_RANGES = (1, 2, 5, 10, 20, 50)
+MEMO_SIZE = 4096
+
+# Encryption header bytes, first match wins; anything else (CCMP) is 16
+ENCRYPT_HDR = (("None", 0), ("WEP", 8), ("TKIP", 20))
+ENCRYPT_HDR_DEFAULT = 16
+
+# Codec: (IP packet size, frame rate, Maximum Theoretical R-value), first match wins
+CODECS = (("G.711", 200, 100, 85.9), ("G.723", 60, 67, 72.9), ("G.729", 60, 100, 81.7))
+CODEC_DEFAULT = (0, 0, 93.2)
+
+CCK_BASIC_RATES = ("1", "2", "5.5", "11")
+OFDM_BASIC_RATES = ("6", "9", "12", "18", "24", "36", "48", "54")
+
+# 802.11a/b/g
+# PHY Bit Rate (integer part) -> rate used for the data frames, below 5 the rate itself, from 12 up 54 otherwise
+ABG_PHY_RATES = {5: 5.5, 6: 6, 9: 9, 11: 11, 12: 12, 18: 18, 24: 24, 36: 36, 48: 48}
+# PHY Bit Rates (integer part) sent with CCK/DSSS
+ABG_CCK_RATES = (1, 2, 5, 11)
+ABG_CCK_CONTROL_RATES = (1, 2, 5.5, 11)
+# Usable Basic Rates: (Basic Rate Set entry, lowest data rate it is usable with, control rate)
+ABG_BASIC_RATES = (("1", 1, 1), ("2", 2, 2), ("5.5", 5, 5.5), ("11", 11, 11), ("6", 6, 6), ("9", 9, 9),
+                   ("12", 12, 12), ("18", 18, 18), ("24", 24, 24), ("36", 36, 36), ("48", 48, 48),
+                   ("54", 54, 54))
+# Usable Mandatory Rates: (lowest data rate, control rate), CCK for PHY rates up to 11, OFDM from 6
+ABG_MANDATORY_CCK = ((1, 1), (2, 2), (5, 5.5), (11, 11))
+ABG_MANDATORY_OFDM = ((6, 6), (9, 6), (12, 12), (18, 12), (24, 24), (36, 24), (48, 24), (54, 24))
+
+# 802.11n/ac
+HT_SIFS = 16.00
+HT_DIFS = 34.00
+HT_SLOT_TIME = 9.00
+HT_TSYMBOL_CONTROL = 4.00
+# Control frame rate when the Non-HT Reference Rate reaches it: (rate, rate used when no OFDM basic rate is set)
+HT_CONTROL_RATES = ((6, 6), (9, 6), (12, 12), (18, 12), (24, 24), (36, 24), (48, 24), (54, 24))
+# Ttxframe (Ack) and Ttxframe (Compressed BlockAck) by PHY Bit Rate of Control Frames
+HT_ACK_USEC = {rate: int((22 + 14 * 8 + rate * 4 - 1) / (rate * 4)) * 4 + 20 for rate, _ in HT_CONTROL_RATES}
+HT_BLOCKACK_USEC = {rate: int((22 + 32 * 8 + rate * 4 - 1) / (rate * 4)) * 4 + 20 for rate, _ in HT_CONTROL_RATES}
+# RTS/CTS and CTS-to-self Handshake Overhead, 20 MHz and wider
+HT_RTS_CTS_USEC_20 = 2 * 20 + 4 * int((22 + (20 + 14) * 8 + 24 * 4 - 1) / (24 * 4)) + 2 * HT_SIFS
+HT_RTS_CTS_USEC_WIDE = 2 * 20 + int((22 + (20 + 14) * 8 + 24 - 1) / 24) * HT_TSYMBOL_CONTROL + 2 * HT_SIFS
+HT_CTS_SELF_USEC_20 = 20 + 4 * int((22 + 14 * 8 + 24 * 4 - 1) / (24 * 4)) + HT_SIFS
+HT_CTS_SELF_USEC_WIDE = 20 + int((22 + 14 * 8 + 24 - 1) / 24) * HT_TSYMBOL_CONTROL + HT_SIFS
+
+# 802.11n, indexed by MCS 0-31 (Ndbps by MCS % 8, HT-LTFs by MCS / 8)
+N11_NON_HT_REF = (6, 12, 18, 24, 36, 48, 54, 54) * 4
+N11_BANDWIDTHS = ("20", "40")
+N11_HT_LTFS = (0, 1, 3, 3)
+N11_NDBPS = {"20": (26, 52, 78, 104, 156, 208, 234, 260),
+             "40": (54, 108, 162, 216, 324, 432, 486, 540)}
+N11_NES = (1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 2, 2, 2, 1, 1, 1, 1, 2, 2, 2, 2)
+
+# 802.11ac, indexed by MCS 0-9; Nes by spatial streams, then bandwidth * 10 + MCS
+AC11_NON_HT_REF = (6, 12, 18, 24, 36, 48, 54, 54, 54, 54)
+AC11_HT_LTFS = (1, 2, 4, 4)
+AC11_BANDWIDTHS = ("20", "40", "80")
+AC11_NDBPS = {"20": (26, 52, 78, 104, 156, 208, 234, 260, 312, 1040),
+              "40": (54, 108, 162, 216, 324, 432, 486, 540, 648, 720),
+              "80": (117, 234, 351, 468, 702, 936, 1053, 1170, 1404, 1560)}
+AC11_NES = {1: (1,) * 30,
+            2: (1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 2, 2, 2, 1, 1, 1, 2, 2, 2),
+            3: (1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 2, 2, 2, 1, 2, 2, 2, 2, 3),
+            4: (1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 2, 2, 1, 1, 1, 1, 2, 2, 2, 3, 3, 3)}
+AC11_CODEC_IP_PACKET_SIZE = 200
+AC11_CODEC_FRAME_RATE = 100
+AC11_R_VALUE = 85.9
+
+
+def _rate_set(rates):
+    """
+    Basic rate sets come in as lists from argparse; memoized functions need them hashable.
+    """
+    if isinstance(rates, (list, set)):
+        return tuple(rates)
+    return rates
+
+
+def _encrypt_hdr(encryption):
+    for name, hdr in ENCRYPT_HDR:
+        if name in encryption:
+            return hdr
+    return ENCRYPT_HDR_DEFAULT
+
+
+def _codec(codec_type):
+    """
+    :return: (IP packet size, frame rate, Maximum Theoretical R-value)
+    """
+    for name, size, frame_rate, r_value in CODECS:
+        if name in codec_type:
+            return size, frame_rate, r_value
+    return CODEC_DEFAULT
+
+
+def _yes_no(value, what):
+    if "Yes" in value:
+        return True
+    if "No" in value:
+        return False
+    raise ValueError("%s must be Yes or No, given %s" % (what, value))
+
+
+def _no_yes(value, what):
+    """
+    Like _yes_no, but "No" wins when both appear
+    """
+    if "No" in value:
+        return False
+    if "Yes" in value:
+        return True
+    raise ValueError("%s must be Yes or No, given %s" % (what, value))
+
+
+def _estimated_mos(r_value):
+    if r_value < 0:
+        return 1
+    if r_value > 100:
+        return 4.5
+    return 1 + 0.035 * r_value + r_value * (r_value - 60) * (100 - r_value) * 7 * 0.000001
+
+
+def _voice_call_client(voice_calls):
+    """
+    :return: index into CLIENT_COUNTS of the client count used for the voice call capacity
+    """
+    for index, upper in enumerate(VOICE_CALL_RANGES):
+        if voice_calls <= upper:
+            return index
+    return len(VOICE_CALL_RANGES)
+
+
+class CapacityResult:
+    """
+    Theoretical values of one station configuration, as numbers, for a given number of stations
+    sharing the medium. Values that do not apply are None: goodput_mbps for 802.11a/b/g,
+    ip_throughput_mbps when the frame is too small for an IP packet, and the voice values for Data traffic.
+    Results are memoized and shared by every caller, so they are read-only.
+
+        expected = capacity("11ac", stations=10, Data_Voice_MCS=7, spatial=2).ip_throughput_per_client_mbps
+    """
+    __slots__ = ("station", "stations", "packet_interval_usec", "frame_rate_fps", "mpdu_rate_fps", "msdu_rate_fps",
+                 "mac_throughput_mbps", "goodput_mbps", "per_client_mbps", "offered_load_mbps",
+                 "ip_throughput_mbps", "r_value", "mos_score", "max_voice_calls")
+
+    def __init__(self, station, stations, packet_interval_usec, frame_rate_fps, mpdu_rate_fps, msdu_rate_fps,
+                 mac_throughput_mbps, per_client_mbps, goodput_mbps=None, offered_load_mbps=None,
+                 ip_throughput_mbps=None, r_value=None, mos_score=None, max_voice_calls=None):
+        values = dict(station=station, stations=stations, packet_interval_usec=packet_interval_usec,
+                      frame_rate_fps=frame_rate_fps, mpdu_rate_fps=mpdu_rate_fps, msdu_rate_fps=msdu_rate_fps,
+                      mac_throughput_mbps=mac_throughput_mbps, goodput_mbps=goodput_mbps,
+                      per_client_mbps=per_client_mbps, offered_load_mbps=offered_load_mbps,
+                      ip_throughput_mbps=ip_throughput_mbps, r_value=r_value, mos_score=mos_score,
+                      max_voice_calls=max_voice_calls)
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        # the cores are memoized and hand the same result to every caller
+        raise AttributeError("CapacityResult is read-only, cannot set %s" % name)
+
+    def __repr__(self):
+        return "CapacityResult(%s stations=%s ip_throughput_mbps=%s)" % (self.station, self.stations,
+                                                                         self.ip_throughput_mbps)
+
+    @property
+    def ip_throughput_per_client_mbps(self):
+        if self.ip_throughput_mbps is None:
+            return None
+        return self.ip_throughput_mbps / self.stations
+
+    def as_dict(self):
+        result = {name: getattr(self, name) for name in self.__slots__}
+        result["ip_throughput_per_client_mbps"] = self.ip_throughput_per_client_mbps
+        return result
+
+    def output(self):
+        """
+        :return: Theoretical Maximum Offered Load as printed by the calculators
+        """
+        ip_throughput = "N/A" if self.ip_throughput_mbps is None else format(self.ip_throughput_mbps, '.3f')
+        if self.station == "11abg":
+            return {'Packet Interval(usec)': format(self.packet_interval_usec, '.2f'),
+                    'Max Frame Rate(fps)': round(self.frame_rate_fps),
+                    'Max. Offered Load (802.11)(Mb/s)': format(self.mac_throughput_mbps, '.3f'),
+                    'Offered Load Per 802.11 Client(Mb/s)': format(self.per_client_mbps, '.3f'),
+                    'Offered Load (802.3 Side)(Mb/s)': format(self.offered_load_mbps, '.3f'),
+                    'IP Throughput (802.11 -> 802.3)(Mb/s)': ip_throughput}
+        offered_load = "N/A" if self.offered_load_mbps is None else format(self.offered_load_mbps, '.3f')
+        return {'MAC PPDU Interval(usec)': format(self.packet_interval_usec, '.2f'),
+                'Max PPDU Rate(fps)': format(self.frame_rate_fps, '.2f'),
+                'Max MAC MPDU Rate': round(self.mpdu_rate_fps),
+                'Max MAC MSDU Rate': round(self.msdu_rate_fps),
+                'Max. 802.11 MAC Frame Data Rate(Mb/s)': format(self.mac_throughput_mbps, '.3f'),
+                'Max. 802.11 MAC Payload Goodput(Mb/s)': format(self.goodput_mbps, '.3f'),
+                'MAC Goodput Per 802.11 Client(Mb/s)': format(self.per_client_mbps, '.3f'),
+                'Offered Load (802.3 Side)(Mb/s)': offered_load,
+                'IP Goodput (802.11 -> 802.3)(Mb/s)': ip_throughput}
+
+    def voice(self):
+        """
+        :return: Theoretical Voice Call Capacity as printed by the calculators
+        """
+        if self.r_value is None:
+            return {'Maximum Theoretical R-value': "N/A",
+                    'Estimated MOS Score': "N/A",
+                    'Maximum Bidirectional Voice Calls(calls)': "N/A"}
+        mos_score = self.mos_score
+        if 0 <= self.r_value <= 100:
+            mos_score = round(mos_score, 2) if self.station == "11abg" else format(mos_score, '.2f')
+        return {'Maximum Theoretical R-value': self.r_value,
+                'Estimated MOS Score': mos_score,
+                'Maximum Bidirectional Voice Calls(calls)': self.max_voice_calls}
+
+
+def _abg_phy_rate(PHY_Bit_Rate):
+    """
+    :return: (integer part of the PHY Bit Rate, rate used for the data frames)
+    """
+    PHY_Bit_Rate_int = int(float(PHY_Bit_Rate))
+    if PHY_Bit_Rate_int < 5:
+        return PHY_Bit_Rate_int, PHY_Bit_Rate_int
+    if PHY_Bit_Rate_int in ABG_PHY_RATES:
+        return PHY_Bit_Rate_int, ABG_PHY_RATES[PHY_Bit_Rate_int]
+    if PHY_Bit_Rate_int >= 12:
+        return PHY_Bit_Rate_int, 54
+    raise ValueError("unsupported 802.11a/b/g PHY Bit Rate: %s" % PHY_Bit_Rate)
+
+
+def _abg_cwmin(cck, Basic_Rate_Set):
+    """
+    CWmin (leave alone for default)
+    """
+    if cck or (any(rate in Basic_Rate_Set for rate in CCK_BASIC_RATES)
+               and not any(rate in Basic_Rate_Set for rate in OFDM_BASIC_RATES)):
+        return 31
+    return 15
+
+
+def _abg_control_rate(PHY_Bit_Rate_int, yellow_cell, Basic_Rate_Set):
+    """
+    PHY Bit Rate of Control Frames of 802.11a/b/g: the best usable basic rate, or the
+    best usable mandatory rate when no basic rates are set
+    """
+    if len(Basic_Rate_Set) != 0:
+        return max([rate if (name in Basic_Rate_Set and yellow_cell >= lowest) else 0
+                    for name, lowest, rate in ABG_BASIC_RATES] + [1 if PHY_Bit_Rate_int in ABG_CCK_RATES else 6])
+    mandatory = [0]
+    if PHY_Bit_Rate_int <= 11:
+        mandatory += [rate for lowest, rate in ABG_MANDATORY_CCK if yellow_cell >= lowest]
+    if PHY_Bit_Rate_int >= 6:
+        mandatory += [rate for lowest, rate in ABG_MANDATORY_OFDM if yellow_cell >= lowest]
+    return max(mandatory)
+
+
+def _mcs(Data_Voice_MCS, count):
+    Data_Voice_MCS_int = int(Data_Voice_MCS)
+    if not 0 <= Data_Voice_MCS_int < count:
+        raise ValueError("Data/Voice MCS must be 0 to %d, given %s" % (count - 1, Data_Voice_MCS))
+    return Data_Voice_MCS_int
+
+
+def _bandwidth(Channel_Bandwidth, bandwidths):
+    """
+    :return: the first of bandwidths found in Channel_Bandwidth
+    """
+    for bandwidth in bandwidths:
+        if bandwidth in Channel_Bandwidth:
+            return bandwidth
+    raise ValueError("Channel Bandwidth must be one of %s, given %s" % (", ".join(bandwidths), Channel_Bandwidth))
+
+
+def _plcp_config(PLCP):
+    if "Mixed" in PLCP:
+        return 1
+    if "Greenfield" in PLCP:
+        return 2
+    raise ValueError("PLCP Configuration must be Mixed or Greenfield, given %s" % PLCP)
+
+
+def _ac11_spatial(spatial):
+    spatial_int = int(spatial)
+    if spatial_int not in AC11_NES:
+        raise ValueError("802.11ac Spatial Streams must be 1 to 4, given %s" % spatial)
+    return spatial_int
+
+
+def _ht_control_rate(non_ht_value, basic_rates):
+    """
+    PHY Bit Rate of Control Frames of 802.11n/ac
+    """
+    no_ofdm_basic = not any(rate in basic_rates for rate in OFDM_BASIC_RATES)
+    allowed = 6
+    for rate, fallback in HT_CONTROL_RATES:
+        if non_ht_value < rate:
+            break
+        if str(rate) in basic_rates:
+            allowed = max(allowed, rate)
+        elif no_ofdm_basic:
+            allowed = max(allowed, fallback)
+    return allowed
+
+
+def _ht_msdu_rates(mac_ppdu_usec, mac_frames_per_a_mpdu, ip_packets_msdu):
+    """
+    :return: (Max PPDU Rate, Max MAC MPDU Rate, Max MAC MSDU Rate) lists, one entry per MAC PPDU Interval
+    """
+    ppdu_rates = [1000000 / interval for interval in mac_ppdu_usec]
+    mpdu_rates = ppdu_rates
+    if mac_frames_per_a_mpdu > 0:
+        mpdu_rates = [mac_frames_per_a_mpdu * rate for rate in ppdu_rates]
+    msdu_rates = mpdu_rates
+    if ip_packets_msdu > 0:
+        msdu_rates = [ip_packets_msdu * rate for rate in mpdu_rates]
+    return ppdu_rates, mpdu_rates, msdu_rates
+
+
+def _guard_interval_400(Guard_Interval_value):
+    if "400" in Guard_Interval_value:
+        return True
+    if "800" in Guard_Interval_value:
+        return False
+    raise ValueError("Guard Interval must be 400 or 800, given %s" % Guard_Interval_value)
+
+
+def _ht_mac_ppdu_interval(rts_cts_usec, cts_self_usec, ttxframe, control_rate, mac_frames_per_a_mpdu, mean_backoff,
+                          client_counts):
+    """
+    :return: MAC PPDU Interval for each of client_counts
+    """
+    # c34 Ack Response Overhead and c35 BlockAck Response Overhead
+    if mac_frames_per_a_mpdu != 0:
+        ack_usec = 0
+        blockack_usec = HT_SIFS + HT_BLOCKACK_USEC[control_rate]
+    else:
+        ack_usec = HT_SIFS + HT_ACK_USEC[control_rate]
+        blockack_usec = 0
+    return [rts_cts_usec + cts_self_usec + ttxframe + ack_usec + blockack_usec + HT_DIFS + (mean_backoff / clients)
+            for clients in client_counts]
+
+
+def _ht_theoretical(station, stations, traffic_type, mac_ppdu_usec, mac_frames_per_a_mpdu, ip_packets_msdu,
+                    mac_mpdu_size, msdu, ethernet_value, ip_packet_value, codec_frame_rate, r_value):
+    """
+    Theoretical values shared by 802.11n and 802.11ac once the MAC PPDU Interval is known.
+    :param mac_ppdu_usec: MAC PPDU Interval for each of CLIENT_COUNTS followed by the one for stations
+    :return: CapacityResult
+    """
+    ppdu_rates, mpdu_rates, msdu_rates = _ht_msdu_rates(mac_ppdu_usec, mac_frames_per_a_mpdu, ip_packets_msdu)
+    goodput = msdu * 8 * msdu_rates[-1] / 1000000
+    optional = {}
+    if ethernet_value != "N/A":
+        optional["offered_load_mbps"] = msdu_rates[-1] * ethernet_value * 8 / 1000000
+    if ip_packet_value != "N/A":
+        optional["ip_throughput_mbps"] = msdu_rates[-1] * ip_packet_value * 8 / 1000000
+
+    if "Data" not in traffic_type:
+        optional["r_value"] = r_value
+        optional["mos_score"] = _estimated_mos(r_value)
+        # Voice_Call_Range; an unknown codec has no frame rate and so no call capacity
+        voice_call_range = round(ppdu_rates[0] / codec_frame_rate)
+        client = _voice_call_client(voice_call_range)
+        optional["max_voice_calls"] = round(msdu_rates[client] / codec_frame_rate, 2)
+    return CapacityResult(station, stations,
+                          packet_interval_usec=mac_ppdu_usec[-1],
+                          frame_rate_fps=ppdu_rates[-1],
+                          mpdu_rate_fps=mpdu_rates[-1],
+                          msdu_rate_fps=msdu_rates[-1],
+                          mac_throughput_mbps=mpdu_rates[-1] * mac_mpdu_size * 8 / 1000000,
+                          goodput_mbps=goodput,
+                          per_client_mbps=goodput / stations,
+                          **optional)
+
+
+def _ht_ip_ethernet(msdu):
+    """
+    :return: (IP Packet, Ethernet MAC Frame) sizes, "N/A" when the MSDU is too small for an IP packet
+    """
+    if (msdu - 8) < 20:
+        return "N/A", "N/A"
+    ip_packet_value = msdu - 8
+    return ip_packet_value, max(ip_packet_value + 18, 64)
+
+
+def _print_theoretical(title, result):
+    print("\n" + "******************Station : %s*****************************" % title + "\n")
+    print("Theoretical Maximum Offered Load" + "\n")
+    print("1 Client:")
+    print(json.dumps(result.output(), indent=4))
+    print("\n" + "Theroretical Voice Call Capacity" + "\n")
+    print(json.dumps(result.voice(), indent=4))
+
+
+@functools.lru_cache(maxsize=MEMO_SIZE)
+def _abg11_theoretical(Traffic_Type, PHY_Bit_Rate, Encryption, QoS, MAC_Frame_802_11, Basic_Rate_Set, Preamble,
+                       slot_name, Codec_Type, RTS_CTS_Handshake, CTS_to_self, stations=1):
+    """
+    :return: CapacityResult of an 802.11a/b/g station
+    """
+    PHY_Bit_Rate_int, yellow_cell = _abg_phy_rate(PHY_Bit_Rate)
+    cck = PHY_Bit_Rate_int in ABG_CCK_RATES
+
+    # (IP Packet)
+    Enc_value = _encrypt_hdr(Encryption)
+    Qos_value = 2 if "Yes" in QoS else 0
+    ip_packet = int(int(MAC_Frame_802_11) - 36 - float(Enc_value) - float(Qos_value))
+
+    # (Ethernet MAC Frame)
+    encrpt = float(MAC_Frame_802_11) - 24 - 8 + 14 - float(Enc_value) - float(Qos_value)
+    Ethernet_MAC_Frame_int = max(encrpt, 64)
+
+    CWmin_str = _abg_cwmin(cck, Basic_Rate_Set)
+
+    # MAC MPDU Size
+    Codec_IP_Packet_Size, Codec_Frame_rate, R_value = _codec(Codec_Type)
+    if "Data" in Traffic_Type:
+        MAC_MPDU_Size = int(MAC_Frame_802_11)
+    else:
+        MAC_MPDU_Size = Codec_IP_Packet_Size + 28 + Enc_value + Qos_value + 8
+
+    PHY_Bit = _abg_control_rate(PHY_Bit_Rate_int, yellow_cell, Basic_Rate_Set)
+    cck_control = PHY_Bit in ABG_CCK_CONTROL_RATES
+
+    # Ttxframe (ACK)
+    Preamble_1 = float(96) if "Short" in Preamble else float(192)
+    if cck_control:
+        Ttxframe = (14 * 8) / PHY_Bit + Preamble_1
+    else:
+        Ttxframe = int((14 * 8 + 22 + PHY_Bit * 4 - 1) / (PHY_Bit * 4)) * 4 + 20
+
+    # RTS/CTS Handshake Overhead
+    SIFS_value = float(10) if cck else float(16)
+    if not _no_yes(RTS_CTS_Handshake, "RTS/CTS Handshake"):
+        RTS_CTS_Handshake_Overhead = 0
+    else:
+        if cck_control:
+            RTS_CTS = ((20 + 14) * 8) / PHY_Bit + Preamble_1
+        else:
+            RTS_CTS = int(((20 + 14) * 8 + 22 + PHY_Bit * 4 - 1) / (PHY_Bit * 4)) * 4 + 2 * 20
+        RTS_CTS_Handshake_Overhead = RTS_CTS + (2 * SIFS_value)
+
+    # c22 CTS-to-self Handshake Overhead
+    if ("No" in CTS_to_self) or ("Yes" in RTS_CTS_Handshake):
+        CTS_to_self_Handshake = 0
+    elif cck_control:
+        CTS_to_self_Handshake = (14 * 8) / PHY_Bit + Preamble_1 + SIFS_value
+    else:
+        CTS_to_self_Handshake = int((14 * 8 + 22 + PHY_Bit * 4 - 1) / (PHY_Bit * 4)) * 4 + 20 + SIFS_value
+
+    # DIFS and MeanBackoff
+    if (not cck) and ("Short" in slot_name):
+        DIFS_value = 34
+        MeanBackoff_value = float(CWmin_str * 9 / 2)
+    else:
+        DIFS_value = 50
+        MeanBackoff_value = float(CWmin_str * 20 / 2)
+
+    # Nbits, bits in MAC frame; Tmac, time for MAC frame and Tplcp, time for MAC PLCP
+    Nbits_value = MAC_MPDU_Size * 8
+    if cck:
+        Tmac_value = Nbits_value / yellow_cell
+        Tplcp = float(96) if "Short" in Preamble else float(192)
+    else:
+        Ndbps_value = yellow_cell * 4
+        Tmac_value = int((Nbits_value + 22 + Ndbps_value) / Ndbps_value) * 4
+        Tplcp = float(20)
+    Ttxframe_data = Tmac_value + Tplcp
+
+    # Packet Interval and Max Frame Rate for each client count, then for stations
+    Client = [Ttxframe_data + SIFS_value + Ttxframe + DIFS_value + RTS_CTS_Handshake_Overhead +
+              CTS_to_self_Handshake + MeanBackoff_value / clients for clients in CLIENT_COUNTS + (stations,)]
+    Max_Frame_Rate = [1000000 / interval for interval in Client]
+
+    Max_Offered_Load = Max_Frame_Rate[-1] * Nbits_value / 1000000
+    optional = {}
+    if ip_packet >= 20:
+        optional["ip_throughput_mbps"] = Max_Frame_Rate[-1] * ip_packet * 8 / 1000000
+
+    # Theoretical Voice Call Capacity
+    if "Data" not in Traffic_Type:
+        optional["r_value"] = R_value
+        optional["mos_score"] = _estimated_mos(R_value)
+        client = _voice_call_client(round(Max_Frame_Rate[0] / Codec_Frame_rate))
+        optional["max_voice_calls"] = round(round(Max_Frame_Rate[client]) / Codec_Frame_rate, 2)
+    return CapacityResult("11abg", stations,
+                          packet_interval_usec=Client[-1],
+                          frame_rate_fps=Max_Frame_Rate[-1],
+                          mpdu_rate_fps=Max_Frame_Rate[-1],
+                          msdu_rate_fps=Max_Frame_Rate[-1],
+                          mac_throughput_mbps=Max_Offered_Load,
+                          per_client_mbps=Max_Offered_Load / stations,
+                          offered_load_mbps=Max_Frame_Rate[-1] * Ethernet_MAC_Frame_int * 8 / 1000000,
+                          **optional)
+
+
+@functools.lru_cache(maxsize=MEMO_SIZE)
+def _n11_theoretical(Traffic_Type, Data_Voice_MCS, Channel_Bandwidth, Guard_Interval_value, Highest_Basic_str,
+                     Encryption, QoS, IP_Packets_MSDU_str, MAC_Frames_per_A_MPDU_str, BSS_Basic_Rate,
+                     MAC_MPDU_Size_Data_Traffic, Codec_Type_Voice_Traffic, PLCP, CWmin, RTS_CTS_Handshake,
+                     CTS_to_self_protection, stations=1):
+    """
+    :return: CapacityResult of an 802.11n station
+    """
+    Data_Voice_MCS_int = _mcs(Data_Voice_MCS, len(N11_NON_HT_REF))
+    IP_Packets_MSDU = int(IP_Packets_MSDU_str)
+    MAC_Frames_per_A_MPDU = int(MAC_Frames_per_A_MPDU_str)
+    Ndbps = N11_NDBPS[_bandwidth(Channel_Bandwidth, N11_BANDWIDTHS)]
+
+    # g24 QoS Hdr and g23 Encrypt Hdr
+    QoS_Hdr = 2 if (_yes_no(QoS, "QoS") or (IP_Packets_MSDU > 1)) else 0
+    Encrypt_Hdr = _encrypt_hdr(Encryption)
+    Codec_IP_Packet_Size, Codec_Frame_Rate, R_value = _codec(Codec_Type_Voice_Traffic)
+
+    # c17  MAC MPDU Size
+    if "Data" in Traffic_Type:
+        MAC_MPDU_Size = int(MAC_MPDU_Size_Data_Traffic)
+    elif IP_Packets_MSDU == 0:
+        MAC_MPDU_Size = Codec_IP_Packet_Size + 28 + QoS_Hdr + Encrypt_Hdr + 8
+    else:
+        MAC_MPDU_Size = int((Codec_IP_Packet_Size + 28 + QoS_Hdr + Encrypt_Hdr + 8 + IP_Packets_MSDU * (14 + 3))
+                            / IP_Packets_MSDU)
+
+    # MSDU Size
+    if IP_Packets_MSDU == 0:
+        MSDU_final = MAC_MPDU_Size - 28 - QoS_Hdr - Encrypt_Hdr
+    else:
+        MSDU_final = (MAC_MPDU_Size - 28 - QoS_Hdr - Encrypt_Hdr - IP_Packets_MSDU * (14 + 3)) / IP_Packets_MSDU
+    MSDU = int(MSDU_final)
+    if MSDU_final < 0 and len(str(MSDU_final).split(".")[0]) > 2:
+        MSDU -= 1
+    IP_Packet_value, Ethernet_value = _ht_ip_ethernet(MSDU)
+
+    # c20 Tppdu_fixed (HT Data Frames)
+    HT_LTFs = N11_HT_LTFS[Data_Voice_MCS_int // 8]
+    PLCP_Configuration_int = _plcp_config(PLCP)
+    if PLCP_Configuration_int == 1:
+        Tppdu_fixed_Data_Frame = float(36 + 4 * HT_LTFs)
+    else:
+        Tppdu_fixed_Data_Frame = float(24 + 4 * HT_LTFs)
+
+    PHY_Bit_Rate_of_Control_Frames = _ht_control_rate(N11_NON_HT_REF[Data_Voice_MCS_int], BSS_Basic_Rate)
+    data_bits = Ndbps[Data_Voice_MCS_int % 8] * (Data_Voice_MCS_int // 8 + 1)
+
+    # g22 A-MPDU Pad and c26 Nbits, Bits per MAC PPDU
+    if MAC_Frames_per_A_MPDU == 0:
+        Nbits_Bits_per_MAC_PPDU = MAC_MPDU_Size * 8
+    else:
+        MPDU_Pad = (4 - MAC_MPDU_Size % 4) % 4
+        Nbits_Bits_per_MAC_PPDU = ((MAC_MPDU_Size + 4) * MAC_Frames_per_A_MPDU
+                                   + MPDU_Pad * (MAC_Frames_per_A_MPDU - 1)) * 8
+
+    # c27 Tsymbol(Data), Data Symbol Period
+    short_gi = _guard_interval_400(Guard_Interval_value)
+    if short_gi and ((Data_Voice_MCS_int > 7 and PLCP_Configuration_int == 2) or PLCP_Configuration_int == 1):
+        Tsymbol_Data_Symbol_Period = 3.60
+    else:
+        Tsymbol_Data_Symbol_Period = 4
+
+    # Ttxframe (DATA)
+    if "40" in Channel_Bandwidth:
+        offset = 6 * N11_NES[Data_Voice_MCS_int]
+    else:
+        offset = 6
+    Ttxframe = float(format(Tppdu_fixed_Data_Frame + int((16 + offset + Nbits_Bits_per_MAC_PPDU + data_bits - 1)
+                                                         / data_bits) * Tsymbol_Data_Symbol_Period, '.2f'))
+
+    # c32 RTS/CTS and c33 CTS-to-self Handshake Overhead
+    CTS_to_self_Handshake_Overhead = 0
+    if "Yes" in RTS_CTS_Handshake:
+        RTS_CTS_Handshake_Overhead = HT_RTS_CTS_USEC_20 if "20" in Channel_Bandwidth else HT_RTS_CTS_USEC_WIDE
+    else:
+        RTS_CTS_Handshake_Overhead = 0
+        if "Yes" in CTS_to_self_protection:
+            CTS_to_self_Handshake_Overhead = (HT_CTS_SELF_USEC_20 if "20" in Channel_Bandwidth
+                                              else HT_CTS_SELF_USEC_WIDE)
+
+    MAC_PPDU_Interval = _ht_mac_ppdu_interval(RTS_CTS_Handshake_Overhead, CTS_to_self_Handshake_Overhead, Ttxframe,
+                                              PHY_Bit_Rate_of_Control_Frames, MAC_Frames_per_A_MPDU,
+                                              int(CWmin) * HT_SLOT_TIME / 2, CLIENT_COUNTS + (stations,))
+    return _ht_theoretical("11n", stations, Traffic_Type, MAC_PPDU_Interval, MAC_Frames_per_A_MPDU, IP_Packets_MSDU,
+                           MAC_MPDU_Size, MSDU, Ethernet_value, IP_Packet_value, Codec_Frame_Rate, R_value)
+
+
+@functools.lru_cache(maxsize=MEMO_SIZE)
+def _ac11_theoretical(Traffic_Type, Data_Voice_MCS, spatial, Channel_Bandwidth, Guard_Interval_value,
+                      Highest_Basic_str, Encryption, QoS, IP_Packets_MSDU_str, MAC_Frames_per_A_MPDU_str,
+                      BSS_Basic_Rate, MAC_MPDU_Size_Data_Traffic, Codec_Type_Voice_Traffic, CWmin, RTS_CTS,
+                      stations=1):
+    """
+    :return: CapacityResult of an 802.11ac station
+    """
+    Data_Voice_MCS_int = _mcs(Data_Voice_MCS, len(AC11_NON_HT_REF))
+    spatial_int = _ac11_spatial(spatial)
+    bandwidth = _bandwidth(Channel_Bandwidth, AC11_BANDWIDTHS)
+    IP_Packets_MSDU = int(IP_Packets_MSDU_str)
+    MAC_Frames_per_A_MPDU = int(MAC_Frames_per_A_MPDU_str)
+
+    # 11ac has no PLCP option of its own, the Codec Type carries it
+    plcp = _plcp_config(Codec_Type_Voice_Traffic)
+    # RTS/CTS handshake is not offered, RTS_CTS selects CTS-to-self protection
+    CTS_to_self_protection = _no_yes(RTS_CTS, "RTS/CTS Handshake and CTS-to-self")
+
+    # g24 QoS Hdr and g23 Encrypt Hdr
+    QoS_Hdr = 2 if (_yes_no(QoS, "QoS") or (IP_Packets_MSDU > 1)) else 0
+    Encrypt_Hdr = _encrypt_hdr(Encryption)
+
+    # c18 MAC MPDU Size
+    if "Data" in Traffic_Type:
+        MAC_MPDU_Size = int(MAC_MPDU_Size_Data_Traffic)
+    elif IP_Packets_MSDU == 0:
+        MAC_MPDU_Size = AC11_CODEC_IP_PACKET_SIZE + 28 + QoS_Hdr + Encrypt_Hdr + 8
+    else:
+        MAC_MPDU_Size = int((AC11_CODEC_IP_PACKET_SIZE + 28 + QoS_Hdr + Encrypt_Hdr + 8 + IP_Packets_MSDU * (14 + 3))
+                            / IP_Packets_MSDU)
+
+    # MSDU Size
+    if IP_Packets_MSDU == 0:
+        MSDU = MAC_MPDU_Size - 28 - QoS_Hdr - Encrypt_Hdr
+    else:
+        MSDU = int((MAC_MPDU_Size - 28 - QoS_Hdr - Encrypt_Hdr - IP_Packets_MSDU * (14 + 3)) / IP_Packets_MSDU)
+    if MSDU < 0:
+        MSDU -= 1
+    IP_Packet_value, Ethernet_value = _ht_ip_ethernet(MSDU)
+
+    # Tppdu_fixed (VHT Data Frames) and Ndbps, data bits per symbol (Data)
+    Tppdu_fixed = 36 + AC11_HT_LTFS[spatial_int - 1] * 4
+    Ndbps_bits_per_symbol_Data = AC11_NDBPS[bandwidth][Data_Voice_MCS_int] * spatial_int
+
+    # c27 Tsymbol(Data), Data Symbol Period
+    short_gi = _guard_interval_400(Guard_Interval_value)
+    if short_gi and ((Data_Voice_MCS_int > 7 and plcp == 2) or plcp == 1):
+        Tsymbol_Data_Symbol_Period = 3.60
+    else:
+        Tsymbol_Data_Symbol_Period = 4
+
+    PHY_Bit_Rate_of_Control_Frames = _ht_control_rate(AC11_NON_HT_REF[Data_Voice_MCS_int], BSS_Basic_Rate)
+
+    # A-MPDU Pad and Nbits, Bits per MAC PPDU
+    if MAC_Frames_per_A_MPDU == 0:
+        Nbits_Bits_per_MAC_PPDU = MAC_MPDU_Size * 8
+    else:
+        MPDU_Pad = (4 - MAC_MPDU_Size % 4) % 4
+        Nbits_Bits_per_MAC_PPDU = ((MAC_MPDU_Size + 4) * MAC_Frames_per_A_MPDU
+                                   + MPDU_Pad * (MAC_Frames_per_A_MPDU - 1)) * 8
+
+    # Nes, Number of BCC encoders and Ttxframe (DATA)
+    Nes = AC11_NES[spatial_int][AC11_BANDWIDTHS.index(bandwidth) * 10 + Data_Voice_MCS_int]
+    Ttxframe = Tppdu_fixed + int((16 + 6 * Nes + Nbits_Bits_per_MAC_PPDU + Ndbps_bits_per_symbol_Data - 1)
+                                 / Ndbps_bits_per_symbol_Data) * Tsymbol_Data_Symbol_Period
+
+    # c36 CTS-to-self Handshake Overhead
+    if CTS_to_self_protection:
+        CTS_to_self_Handshake_Overhead = HT_CTS_SELF_USEC_20 if "20" in Channel_Bandwidth else HT_CTS_SELF_USEC_WIDE
+    else:
+        CTS_to_self_Handshake_Overhead = 0
+
+    MAC_PPDU_Interval = _ht_mac_ppdu_interval(0, CTS_to_self_Handshake_Overhead, Ttxframe,
+                                              PHY_Bit_Rate_of_Control_Frames, MAC_Frames_per_A_MPDU,
+                                              int(CWmin) * HT_SLOT_TIME / 2, CLIENT_COUNTS + (stations,))
+    return _ht_theoretical("11ac", stations, Traffic_Type, MAC_PPDU_Interval, MAC_Frames_per_A_MPDU, IP_Packets_MSDU,
+                           MAC_MPDU_Size, MSDU, Ethernet_value, IP_Packet_value, AC11_CODEC_FRAME_RATE, AC11_R_VALUE)
 
 
 # Class to take all user input (802.11a/b/g Standard)
@@ -33,559 +720,18 @@ class abg11_calculator:
 
     # This function is for calculate intermediate values and Theoretical values
 
-    def input_parameter(self):
-
-        PHY_Bit_Rate_float = float(self.PHY_Bit_Rate)
-        PHY_Bit_Rate_int = int(PHY_Bit_Rate_float)
-        if PHY_Bit_Rate_int < 12:
-            if PHY_Bit_Rate_int < 5:
-                yellow_cell = PHY_Bit_Rate_int
-            else:
-                if PHY_Bit_Rate_int == 5:
-                    yellow_cell = 5.5
-                else:
-                    if PHY_Bit_Rate_int == 11:
-                        yellow_cell = 11
-                    else:
-                        if PHY_Bit_Rate_int == 6:
-                            yellow_cell = 6
-                        else:
-                            if PHY_Bit_Rate_int == 9:
-                                yellow_cell = 9
-        else:
-            if PHY_Bit_Rate_int == 12:
-                yellow_cell = 12
-            else:
-                if PHY_Bit_Rate_int == 18:
-                    yellow_cell = 18
-                else:
-                    if PHY_Bit_Rate_int == 24:
-                        yellow_cell = 24
-                    else:
-                        if PHY_Bit_Rate_int == 36:
-                            yellow_cell = 36
-                        else:
-                            if PHY_Bit_Rate_int == 48:
-                                yellow_cell = 48
-                            else:
-                                yellow_cell = 54
-
-        # (IP Packet)
-
-        if "None" in self.Encryption:
-            Enc_value = 0
-        else:
-            if "WEP" in self.Encryption:
-                Enc_value = 8
-            else:
-                if "TKIP" in self.Encryption:
-                    Enc_value = 20
-                else:
-                    Enc_value = 16
-        if "Yes" in self.QoS:
-            Qos_value = 2
-        else:
-            Qos_value = 0
-        ip_packet_1 = int(self.MAC_Frame_802_11) - 36 - float(Enc_value) - float(Qos_value)
-        ip_packet = int(ip_packet_1)
-        if ip_packet < 20:
-            get_ip_packet = "N/A"
-            ip = 0
-        else:
-            get_ip_packet = ip_packet
-            ip = 1
-
-        # (Ethernet MAC Frame)
-
-        encrpt = float(self.MAC_Frame_802_11) - 24 - 8 + 14 - float(Enc_value) - float(Qos_value)
-        Ethernet_MAC_Frame_int = max(encrpt, 64)
-        Ethernet_value = int(Ethernet_MAC_Frame_int)
-        get_ethernet = Ethernet_value
-
-        # Usable Basic Rates
-
-        if "1" in self.Basic_Rate_Set:
-            if "1" in self.Basic_Rate_Set and yellow_cell >= 1:
-                Usable_Basic_Rates_1 = 1
-            else:
-                Usable_Basic_Rates_1 = 0
-        else:
-            Usable_Basic_Rates_1 = 0
-
-        if "2" in self.Basic_Rate_Set:
-            if "2" in self.Basic_Rate_Set and yellow_cell >= 2:
-                Usable_Basic_Rates_2 = 2
-            else:
-                Usable_Basic_Rates_2 = 0
-        else:
-            Usable_Basic_Rates_2 = 0
-
-        if "5.5" in self.Basic_Rate_Set:
-            if "5.5" in self.Basic_Rate_Set and yellow_cell >= 5:
-                Usable_Basic_Rates_5 = 5.5
-            else:
-                Usable_Basic_Rates_5 = 0
-        else:
-            Usable_Basic_Rates_5 = 0
-
-        if "11" in self.Basic_Rate_Set:
-            if "11" in self.Basic_Rate_Set and yellow_cell >= 11:
-                Usable_Basic_Rates_11 = 11
-            else:
-                Usable_Basic_Rates_11 = 0
-        else:
-            Usable_Basic_Rates_11 = 0
-
-        if "6" in self.Basic_Rate_Set:
-            if "6" in self.Basic_Rate_Set and yellow_cell >= 6:
-                Usable_Basic_Rates_6 = 6
-            else:
-                Usable_Basic_Rates_6 = 0
-        else:
-            Usable_Basic_Rates_6 = 0
-
-        if "9" in self.Basic_Rate_Set:
-            if "9" in self.Basic_Rate_Set and yellow_cell >= 9:
-                Usable_Basic_Rates_9 = 9
-            else:
-                Usable_Basic_Rates_9 = 0
-        else:
-            Usable_Basic_Rates_9 = 0
-
-        if "12" in self.Basic_Rate_Set:
-            if "12" in self.Basic_Rate_Set and yellow_cell >= 12:
-                Usable_Basic_Rates_12 = 12
-            else:
-                Usable_Basic_Rates_12 = 0
-        else:
-            Usable_Basic_Rates_12 = 0
-
-        if "18" in self.Basic_Rate_Set:
-            if "18" in self.Basic_Rate_Set and yellow_cell >= 18:
-                Usable_Basic_Rates_18 = 18
-            else:
-                Usable_Basic_Rates_18 = 0
-        else:
-            Usable_Basic_Rates_18 = 0
-
-        if "24" in self.Basic_Rate_Set:
-            if "24" in self.Basic_Rate_Set and yellow_cell >= 24:
-                Usable_Basic_Rates_24 = 24
-            else:
-                Usable_Basic_Rates_24 = 0
-        else:
-            Usable_Basic_Rates_24 = 0
-
-        if "36" in self.Basic_Rate_Set:
-            if "36" in self.Basic_Rate_Set and yellow_cell >= 36:
-                Usable_Basic_Rates_36 = 36
-            else:
-                Usable_Basic_Rates_36 = 0
-        else:
-            Usable_Basic_Rates_36 = 0
-
-        if "48" in self.Basic_Rate_Set:
-            if "48" in self.Basic_Rate_Set and yellow_cell >= 48:
-                Usable_Basic_Rates_48 = 48
-            else:
-                Usable_Basic_Rates_48 = 0
-        else:
-            Usable_Basic_Rates_48 = 0
-
-        if "54" in self.Basic_Rate_Set:
-            if "54" in self.Basic_Rate_Set and yellow_cell >= 54:
-                Usable_Basic_Rates_54 = 54
-            else:
-                Usable_Basic_Rates_54 = 0
-        else:
-            Usable_Basic_Rates_54 = 0
+    def calculate(self, stations=1):
+        """
+        :return: CapacityResult for this many stations
+        """
+        return _abg11_theoretical(self.Traffic_Type, self.PHY_Bit_Rate, self.Encryption, self.QoS,
+                                  self.MAC_Frame_802_11, _rate_set(self.Basic_Rate_Set), self.Preamble, self.slot_name,
+                                  self.Codec_Type, self.RTS_CTS_Handshake, self.CTS_to_self, stations)
 
-        # Usable Mandatory Rates
-
-        if (PHY_Bit_Rate_int <= 11) and yellow_cell >= 1:
-            Mandatory_1 = 1
-        else:
-            Mandatory_1 = 0
-        if (PHY_Bit_Rate_int <= 11) and yellow_cell >= 2:
-            Mandatory_2 = 2
-        else:
-            Mandatory_2 = 0
-        if (PHY_Bit_Rate_int <= 11) and yellow_cell >= 5:
-            Mandatory_5 = 5.5
-        else:
-            Mandatory_5 = 0
-        if (PHY_Bit_Rate_int <= 11) and yellow_cell >= 11:
-            Mandatory_11 = 11
-        else:
-            Mandatory_11 = 0
-        if (PHY_Bit_Rate_int >= 6) and yellow_cell >= 6:
-            Mandatory_6 = 6
-        else:
-            Mandatory_6 = 0
-        if (PHY_Bit_Rate_int >= 6) and yellow_cell >= 9:
-            Mandatory_9 = 6
-        else:
-            Mandatory_9 = 0
-        if (PHY_Bit_Rate_int >= 6) and yellow_cell >= 12:
-            Mandatory_12 = 12
-        else:
-            Mandatory_12 = 0
-        if (PHY_Bit_Rate_int >= 6) and yellow_cell >= 18:
-            Mandatory_18 = 12
-        else:
-            Mandatory_18 = 0
-        if (PHY_Bit_Rate_int >= 6) and yellow_cell >= 24:
-            Mandatory_24 = 24
-        else:
-            Mandatory_24 = 0
-        if (PHY_Bit_Rate_int >= 6) and yellow_cell >= 36:
-            Mandatory_36 = 24
-        else:
-            Mandatory_36 = 0
-        if (PHY_Bit_Rate_int >= 6) and yellow_cell >= 48:
-            Mandatory_48 = 24
-        else:
-            Mandatory_48 = 0
-        if (PHY_Bit_Rate_int >= 6) and yellow_cell >= 54:
-            Mandatory_54 = 24
-        else:
-            Mandatory_54 = 0
-
-        # CWmin_str (leave alone for default)
-
-        if (PHY_Bit_Rate_int == 1 or PHY_Bit_Rate_int == 2 or PHY_Bit_Rate_int == 5 or PHY_Bit_Rate_int == 11):
-            CWmin_str = 31
-        else:
-            if (
-                    "1" in self.Basic_Rate_Set or "2" in self.Basic_Rate_Set or "5.5" in self.Basic_Rate_Set or "11" in self.Basic_Rate_Set) \
-                    and (not ("6" in self.Basic_Rate_Set or "9" in self.Basic_Rate_Set or "12" in self.Basic_Rate_Set or
-                              "18" in self.Basic_Rate_Set or "24" in self.Basic_Rate_Set or "36" in self.Basic_Rate_Set or "48" in self.Basic_Rate_Set or "54" in self.Basic_Rate_Set)):
-                CWmin_str = 31
-            else:
-                CWmin_str = 15
-
-        # MAC MPDU Size
-
-        if "G.711" in self.Codec_Type:
-            Codec_IP_Packet_Size = 200
-            Codec_Frame_rate = 100
-        else:
-            if "G.723" in self.Codec_Type:
-                Codec_IP_Packet_Size = 60
-                Codec_Frame_rate = 67
-            elif "G.729" in self.Codec_Type:
-                Codec_IP_Packet_Size = 60
-                Codec_Frame_rate = 100
-            else:
-                Codec_IP_Packet_Size = 0
-                Codec_Frame_rate = 0
-
-        if "Data" in self.Traffic_Type:
-            MAC_MPDU_Size = int(self.MAC_Frame_802_11)
-        else:
-            if "None" in self.Encryption:
-                result = Codec_IP_Packet_Size + 28 + 0
-            elif "WEP" in self.Encryption:
-                result = Codec_IP_Packet_Size + 28 + 8
-            elif "TKIP" in self.Encryption:
-                result = Codec_IP_Packet_Size + 28 + 20
-            else:
-                result = Codec_IP_Packet_Size + 28 + 16
-            if "Yes" in self.QoS:
-                final_result = result + 2
-            else:
-                final_result = result + 0
-
-            MAC_MPDU_Size = final_result + 8
-
-        # PHY Bit Rate of Control Frames
-
-        if (PHY_Bit_Rate_int == 1 or PHY_Bit_Rate_int == 2 or PHY_Bit_Rate_int == 5 or PHY_Bit_Rate_int == 11):
-            data = 1
-        else:
-            data = 6
-
-        if len(self.Basic_Rate_Set) == 0:
-            present_BasicRate = 0
-        else:
-            present_BasicRate = 1
-
-        if present_BasicRate == 1:
-            PHY_Bit = max(Usable_Basic_Rates_1, Usable_Basic_Rates_2, Usable_Basic_Rates_5,
-                          Usable_Basic_Rates_11, Usable_Basic_Rates_6,
-                          Usable_Basic_Rates_9, Usable_Basic_Rates_12, Usable_Basic_Rates_18,
-                          Usable_Basic_Rates_24, Usable_Basic_Rates_36, Usable_Basic_Rates_48,
-                          Usable_Basic_Rates_54, data)
-
-
-        else:
-            PHY_Bit = max(Mandatory_1, Mandatory_2, Mandatory_5, Mandatory_11, Mandatory_6, Mandatory_9,
-                          Mandatory_12, Mandatory_18, Mandatory_24, Mandatory_36, Mandatory_48, Mandatory_54)
-
-        # Ttxframe (ACK)
-
-        if "Short" in self.Preamble:
-            Preamble_1 = float(96)
-        else:
-            Preamble_1 = float(192)
-
-        if (PHY_Bit == 1) or (PHY_Bit == 2) or (PHY_Bit == 5.5) or (PHY_Bit == 11):
-            Ttxframe = (14 * 8) / PHY_Bit + (Preamble_1)
-
-            Ttxframe_new = format(Ttxframe, '.2f')
-        else:
-            Ttxframe = int((14 * 8 + 22 + PHY_Bit * 4 - 1) / (PHY_Bit * 4)) * 4 + 20
-            Ttxframe_new = format(Ttxframe, '.2f')
-
-        # RTS/CTS Handshake Overhead
-
-        if (PHY_Bit_Rate_int == 1 or PHY_Bit_Rate_int == 2 or PHY_Bit_Rate_int == 5 or PHY_Bit_Rate_int == 11):
-            SIFS_value = float(10)
-        else:
-            SIFS_value = float(16)
-
-        if "No" in self.RTS_CTS_Handshake:
-            RTS_CTS_Handshake_Overhead = 0
-
-        elif "Yes" in self.RTS_CTS_Handshake:
-            if (PHY_Bit == 1) or (PHY_Bit == 2) or (PHY_Bit == 5.5) or (PHY_Bit == 11):
-                RTS_CTS_Handshake = ((20 + 14) * 8) / PHY_Bit + (Preamble_1)
-
-            else:
-                RTS_CTS_Handshake = int(((20 + 14) * 8 + 22 + PHY_Bit * 4 - 1) / (PHY_Bit * 4)) * 4 + 2 * 20
-
-            RTS_CTS_Handshake_Overhead = RTS_CTS_Handshake + (2 * SIFS_value)
-
-        # c22 CTS-to-self Handshake Overhead
-
-        if ("Yes" in self.CTS_to_self) and ("Yes" in self.RTS_CTS_Handshake):
-            CTS_to_self_Handshake = 0
-        else:
-            if ("No" in self.CTS_to_self) or ("Yes" in self.RTS_CTS_Handshake):
-                CTS_to_self_Handshake = 0
-            else:
-                if (PHY_Bit == 1) or (PHY_Bit == 2) or (PHY_Bit == 5.5) or (PHY_Bit == 11):
-                    CTS_to_self_Handshake = (14 * 8) / PHY_Bit + (Preamble_1) + SIFS_value
-                else:
-                    CTS_to_self_Handshake = int(
-                        (14 * 8 + 22 + PHY_Bit * 4 - 1) / (PHY_Bit * 4)) * 4 + 20 + SIFS_value
-
-        # DIFS calulation
-
-        if (PHY_Bit_Rate_int == 1 or PHY_Bit_Rate_int == 2 or PHY_Bit_Rate_int == 5 or PHY_Bit_Rate_int == 11):
-            DIFS_value = 50
-        elif ("Short" in self.slot_name):
-            DIFS_value = 34
-        else:
-            DIFS_value = 50
-
-        # MeanBackoff calculation
-
-        if (PHY_Bit_Rate_int == 1 or PHY_Bit_Rate_int == 2 or PHY_Bit_Rate_int == 5 or PHY_Bit_Rate_int == 11):
-            c4 = (CWmin_str * 20 / 2)
-            MeanBackoff_value = float(c4)
-        elif ("Short" in self.slot_name):
-            d2 = (CWmin_str * 9 / 2)
-            MeanBackoff_value = float(d2)
-        else:
-            d3 = (CWmin_str * 20 / 2)
-            MeanBackoff_value = float(d3)
-
-        # c27 Ndbps, MAC data bits per symbol
-        Ndbps_value = yellow_cell * 4
-
-        # Nbits, bits in MAC frame
-        Nbits_value = (MAC_MPDU_Size * 8)
-
-        # Tmac, time for MAC frame and  Tplcp, time for MAC PLCP
-        if (PHY_Bit_Rate_int == 1 or PHY_Bit_Rate_int == 2 or PHY_Bit_Rate_int == 5 or PHY_Bit_Rate_int == 11):
-            Tmac_value = Nbits_value / yellow_cell
-            if "Short" in self.Preamble:
-                Tplcp = float(96)
-            else:
-                Tplcp = float(192)
-        else:
-            Tmac_value = int((Nbits_value + 22 + Ndbps_value) / Ndbps_value) * 4
-            Tplcp = float(20)
-
-        # Ttxframe (DATA)
-
-        Ttxframe_data = Tmac_value + Tplcp
-
-        Client_1 = Ttxframe_data + SIFS_value + Ttxframe + DIFS_value + RTS_CTS_Handshake_Overhead + CTS_to_self_Handshake + MeanBackoff_value
-        Client_2 = Ttxframe_data + SIFS_value + Ttxframe + DIFS_value + RTS_CTS_Handshake_Overhead + CTS_to_self_Handshake + MeanBackoff_value / 2
-        Client_3 = Ttxframe_data + SIFS_value + Ttxframe + DIFS_value + RTS_CTS_Handshake_Overhead + CTS_to_self_Handshake + MeanBackoff_value / 5
-        Client_4 = Ttxframe_data + SIFS_value + Ttxframe + DIFS_value + RTS_CTS_Handshake_Overhead + CTS_to_self_Handshake + MeanBackoff_value / 10
-        Client_5 = Ttxframe_data + SIFS_value + Ttxframe + DIFS_value + RTS_CTS_Handshake_Overhead + CTS_to_self_Handshake + MeanBackoff_value / 20
-        Client_6 = Ttxframe_data + SIFS_value + Ttxframe + DIFS_value + RTS_CTS_Handshake_Overhead + CTS_to_self_Handshake + MeanBackoff_value / 50
-        Client_7 = Ttxframe_data + SIFS_value + Ttxframe + DIFS_value + RTS_CTS_Handshake_Overhead + CTS_to_self_Handshake + MeanBackoff_value / 100
-        Client_1_new = format(Client_1, '.2f')
-        Client_2_new = format(Client_2, '.4f')
-        Client_3_new = format(Client_3, '.4f')
-        Client_4_new = format(Client_4, '.4f')
-        Client_5_new = format(Client_5, '.4f')
-        Client_6_new = format(Client_6, '.4f')
-        Client_7_new = round(Client_7)
-
-        # Max Frame Rate
-
-        Max_Frame_Rate_C1 = 1000000 / Client_1
-        Max_Frame_Rate_C1_round = round(Max_Frame_Rate_C1)
-        Max_Frame_Rate_C2 = 1000000 / Client_2
-        Max_Frame_Rate_C2_round = round(Max_Frame_Rate_C2)
-        Max_Frame_Rate_C3 = 1000000 / Client_3
-        Max_Frame_Rate_C3_round = round(Max_Frame_Rate_C3)
-        Max_Frame_Rate_C4 = 1000000 / Client_4
-        Max_Frame_Rate_C4_round = round(Max_Frame_Rate_C4)
-        Max_Frame_Rate_C5 = 1000000 / Client_5
-        Max_Frame_Rate_C5_round = round(Max_Frame_Rate_C5)
-        Max_Frame_Rate_C6 = 1000000 / Client_6
-        Max_Frame_Rate_C6_round = round(Max_Frame_Rate_C6)
-        Max_Frame_Rate_C7 = 1000000 / Client_7
-        Max_Frame_Rate_C7_round = round(Max_Frame_Rate_C7)
-
-        # Max. Offered Load (802.11)
-
-        Max_Offered_Load_C1 = Max_Frame_Rate_C1 * Nbits_value / 1000000
-        Max_Offered_Load_C1_new = format(Max_Offered_Load_C1, '.3f')
-        Max_Offered_Load_C2 = Max_Frame_Rate_C2 * Nbits_value / 1000000
-        Max_Offered_Load_C2_new = format(Max_Offered_Load_C2, '.3f')
-        Max_Offered_Load_C3 = Max_Frame_Rate_C3 * Nbits_value / 1000000
-        Max_Offered_Load_C3_new = format(Max_Offered_Load_C3, '.3f')
-        Max_Offered_Load_C4 = Max_Frame_Rate_C4 * Nbits_value / 1000000
-        Max_Offered_Load_C4_new = format(Max_Offered_Load_C4, '.3f')
-        Max_Offered_Load_C5 = Max_Frame_Rate_C5 * Nbits_value / 1000000
-        Max_Offered_Load_C5_new = format(Max_Offered_Load_C5, '.3f')
-        Max_Offered_Load_C6 = Max_Frame_Rate_C6 * Nbits_value / 1000000
-        Max_Offered_Load_C6_new = format(Max_Offered_Load_C6, '.3f')
-        Max_Offered_Load_C7 = Max_Frame_Rate_C7 * Nbits_value / 1000000
-        Max_Offered_Load_C7_new = format(Max_Offered_Load_C7, '.3f')
-
-        # Offered Load Per 802.11 Client
-
-        Offered_Load_Per_Client1 = Max_Offered_Load_C1 / 1
-        Offered_Load_Per_Client1_new = format(Offered_Load_Per_Client1, '.3f')
-        Offered_Load_Per_Client2 = Max_Offered_Load_C2 / 2
-        Offered_Load_Per_Client2_new = format(Offered_Load_Per_Client2, '.3f')
-        Offered_Load_Per_Client3 = Max_Offered_Load_C3 / 5
-        Offered_Load_Per_Client3_new = format(Offered_Load_Per_Client3, '.3f')
-        Offered_Load_Per_Client4 = Max_Offered_Load_C4 / 10
-        Offered_Load_Per_Client4_new = format(Offered_Load_Per_Client4, '.3f')
-        Offered_Load_Per_Client5 = Max_Offered_Load_C5 / 20
-        Offered_Load_Per_Client5_new = format(Offered_Load_Per_Client5, '.3f')
-        Offered_Load_Per_Client6 = Max_Offered_Load_C6 / 50
-        Offered_Load_Per_Client6_new = format(Offered_Load_Per_Client6, '.3f')
-        Offered_Load_Per_Client7 = Max_Offered_Load_C7 / 100
-        Offered_Load_Per_Client7_new = format(Offered_Load_Per_Client7, '.3f')
-
-        # Offered Load (802.3 Side)
-
-        Offered_Load_C1 = Max_Frame_Rate_C1 * Ethernet_MAC_Frame_int * 8 / 1000000
-        Offered_Load_C1_new = format(Offered_Load_C1, '.3f')
-        Offered_Load_C2 = Max_Frame_Rate_C2 * Ethernet_MAC_Frame_int * 8 / 1000000
-        Offered_Load_C2_new = format(Offered_Load_C2, '.3f')
-        Offered_Load_C3 = Max_Frame_Rate_C3 * Ethernet_MAC_Frame_int * 8 / 1000000
-        Offered_Load_C3_new = format(Offered_Load_C3, '.3f')
-        Offered_Load_C4 = Max_Frame_Rate_C4 * Ethernet_MAC_Frame_int * 8 / 1000000
-        Offered_Load_C4_new = format(Offered_Load_C4, '.3f')
-        Offered_Load_C5 = Max_Frame_Rate_C5 * Ethernet_MAC_Frame_int * 8 / 1000000
-        Offered_Load_C5_new = format(Offered_Load_C5, '.3f')
-        Offered_Load_C6 = Max_Frame_Rate_C6 * Ethernet_MAC_Frame_int * 8 / 1000000
-        Offered_Load_C6_new = format(Offered_Load_C6, '.3f')
-        Offered_Load_C7 = Max_Frame_Rate_C7 * Ethernet_MAC_Frame_int * 8 / 1000000
-        Offered_Load_C7_new = format(Offered_Load_C7, '.3f')
-
-        # IP Throughput (802.11 -> 802.3)
-
-        if ip == 1:
-            IP_Throughput_C1 = Max_Frame_Rate_C1 * ip_packet * 8 / 1000000
-            IP_Throughput_C1_new = format(IP_Throughput_C1, '.3f')
-            IP_Throughput_C2 = Max_Frame_Rate_C2 * ip_packet * 8 / 1000000
-            IP_Throughput_C2_new = format(IP_Throughput_C2, '.3f')
-            IP_Throughput_C3 = Max_Frame_Rate_C3 * ip_packet * 8 / 1000000
-            IP_Throughput_C3_new = format(IP_Throughput_C3, '.3f')
-            IP_Throughput_C4 = Max_Frame_Rate_C4 * ip_packet * 8 / 1000000
-            IP_Throughput_C4_new = format(IP_Throughput_C4, '.3f')
-            IP_Throughput_C5 = Max_Frame_Rate_C5 * ip_packet * 8 / 1000000
-            IP_Throughput_C5_new = format(IP_Throughput_C5, '.3f')
-            IP_Throughput_C6 = Max_Frame_Rate_C6 * ip_packet * 8 / 1000000
-            IP_Throughput_C6_new = format(IP_Throughput_C6, '.3f')
-            IP_Throughput_C7 = Max_Frame_Rate_C7 * ip_packet * 8 / 1000000
-            IP_Throughput_C7_new = format(IP_Throughput_C7, '.3f')
-        else:
-            IP_Throughput_C1_new = "N/A"
-            IP_Throughput_C2_new = "N/A"
-            IP_Throughput_C3_new = "N/A"
-            IP_Throughput_C4_new = "N/A"
-            IP_Throughput_C5_new = "N/A"
-            IP_Throughput_C6_new = "N/A"
-            IP_Throughput_C7_new = "N/A"
-
-        print("\n" + "******************Station : 11abgCalculator*****************************" + "\n")
-        print("Theoretical Maximum Offered Load" + "\n")
-        print("1 Client:")
-        All_theoretical_output = {'Packet Interval(usec)': Client_1_new, 'Max Frame Rate(fps)': Max_Frame_Rate_C1_round,
-                                  'Max. Offered Load (802.11)(Mb/s)': Max_Offered_Load_C1_new,
-                                  'Offered Load Per 802.11 Client(Mb/s)': Offered_Load_Per_Client1_new,
-                                  'Offered Load (802.3 Side)(Mb/s)': Offered_Load_C1_new,
-                                  'IP Throughput (802.11 -> 802.3)(Mb/s)': IP_Throughput_C1_new}
-        print(json.dumps(All_theoretical_output, indent=4))
-
-        Voice_Call = Max_Frame_Rate_C1 / Codec_Frame_rate
-        Voice_Call_value = round(Voice_Call)
-
-        if "Data" in self.Traffic_Type:
-            Maximum_Theoretical_R_value = "N/A"
-        else:
-            if "G.711" in self.Codec_Type:
-                Maximum_Theoretical_R_value = 85.9
-            else:
-                if "G.723" in self.Codec_Type:
-                    Maximum_Theoretical_R_value = 72.9
-                else:
-                    if "G.729" in self.Codec_Type:
-                        Maximum_Theoretical_R_value = 81.7
-                    else:
-                        Maximum_Theoretical_R_value = 93.2
-
-        if "Data" in self.Traffic_Type:
-            Estimated_MOS_Score = "N/A"
-            Maximum_Bidirectional = "N/A"
-        else:
-            if (Voice_Call_value <= 1):
-                Maximum_Bidirectional_Voice_Calls = Max_Frame_Rate_C1_round / Codec_Frame_rate
-            elif (Voice_Call_value <= 2):
-                Maximum_Bidirectional_Voice_Calls = Max_Frame_Rate_C2_round / Codec_Frame_rate
-            elif (Voice_Call_value <= 5):
-                Maximum_Bidirectional_Voice_Calls = Max_Frame_Rate_C3_round / Codec_Frame_rate
-
-            elif (Voice_Call_value <= 10):
-                Maximum_Bidirectional_Voice_Calls = Max_Frame_Rate_C4_round / Codec_Frame_rate
-            elif (Voice_Call_value <= 20):
-                Maximum_Bidirectional_Voice_Calls = Max_Frame_Rate_C5_round / Codec_Frame_rate
-            elif (Voice_Call_value <= 50):
-                Maximum_Bidirectional_Voice_Calls = Max_Frame_Rate_C6_round / Codec_Frame_rate
-            else:
-                Maximum_Bidirectional_Voice_Calls = Max_Frame_Rate_C7_round / Codec_Frame_rate
-            Maximum_Bidirectional = round(Maximum_Bidirectional_Voice_Calls, 2)
-            if Maximum_Theoretical_R_value < 0:
-                Estimated_MOS_Score = 1
-            else:
-                if Maximum_Theoretical_R_value > 100:
-                    Estimated_MOS_Score = 4.5
-
-                else:
-                    Estimated_MOS_Score_1 = 1 + 0.035 * Maximum_Theoretical_R_value + Maximum_Theoretical_R_value * (
-                                Maximum_Theoretical_R_value - 60) * (
-                                                    100 - Maximum_Theoretical_R_value) * 7 * 0.000001
-                    Estimated_MOS_Score = round(Estimated_MOS_Score_1, 2)
-
-        print("\n" + "Theroretical Voice Call Capacity" + "\n")
-
-        All_theoretical_voice = {'Maximum Theoretical R-value': Maximum_Theoretical_R_value,
-                                 'Estimated MOS Score': Estimated_MOS_Score,
-                                 'Maximum Bidirectional Voice Calls(calls)': Maximum_Bidirectional}
-        print(json.dumps(All_theoretical_voice, indent=4))
+    def input_parameter(self):
+        result = self.calculate()
+        _print_theoretical("11abgCalculator", result)
+        return result
 
 
 ##Class to take all user input (802.11n Standard)
@@ -615,790 +761,21 @@ class n11_calculator():
 
     # This function is for calculate intermediate values and Theoretical values
 
-    def input_parameter(self):
-
-        global HT_data_temp
-        global temp_value
-        SIFS = 16.00
-        DIFS = 34.00
-        Slot_Time = 9.00
-        Tsymbol_Control = 4.00
-        # *********************************************Auxilliary  Data***********************************************
-        Non_HT_Ref = ['6', '12', '18', '24', '36', '48', '54', '54', '6', '12', '18', '24', '36', '48', '54', '54', '6',
-                      '12', '18', '24', '36', '48', '54', '54', '6', '12', '18', '24', '36', '48', '54', '54']
-        HT_LTFs = ['0', '1', '3', '3']
-        Ndbps_20MHz = ['26', '52', '78', '104', '156', '208', '234', '260']
-        Ndbps_40MHz = ['54', '108', '162', '216', '324', '432', '486', '540']
-        Nes = ['1', '1', '1', '1', '1', '1', '1', '1', '1', '1', '1', '1', '1', '1', '1', '1', '1', '1', '1', '1', '1',
-               '2', '2', '2', '1', '1', '1', '1', '2', '2', '2', '2', ]
-
-        Data_Voice_MCS_int = int(self.Data_Voice_MCS)
-        IP_Packets_MSDU = int(self.IP_Packets_MSDU_str)
-        IP_Packets_MSDU_loc = IP_Packets_MSDU + 1
-        Highest_Basic = int(self.Highest_Basic_str)
-
-        i = 0
-        while True:
-            if Data_Voice_MCS_int == i:
-                Non_HT = Non_HT_Ref[i]
-                break
-            i = i + 1
-
-        Non_HT_value = int(Non_HT)
-
-        if Non_HT_value >= 6:
-            if "6" in self.BSS_Basic_Rate:
-                Allowed_control6 = 6
-            else:
-                if (not (
-                        "6" in self.BSS_Basic_Rate or "9" in self.BSS_Basic_Rate or "12" in self.BSS_Basic_Rate or "18" in self.BSS_Basic_Rate or
-                        "24" in self.BSS_Basic_Rate or "36" in self.BSS_Basic_Rate or "48" in self.BSS_Basic_Rate or "54" in self.BSS_Basic_Rate)):
-                    Allowed_control6 = 6
-                else:
-                    Allowed_control6 = 0
-        else:
-            Allowed_control6 = 0
-
-        if Non_HT_value >= 9:
-            if "9" in self.BSS_Basic_Rate:
-                Allowed_control9 = 9
-            else:
-                if (not (
-                        "6" in self.BSS_Basic_Rate or "9" in self.BSS_Basic_Rate or "12" in self.BSS_Basic_Rate or "18" in self.BSS_Basic_Rate or
-                        "24" in self.BSS_Basic_Rate or "36" in self.BSS_Basic_Rate or "48" in self.BSS_Basic_Rate or "54" in self.BSS_Basic_Rate)):
-                    Allowed_control9 = 6
-                else:
-                    Allowed_control9 = 0
-        else:
-            Allowed_control9 = 0
-
-        if Non_HT_value >= 12:
-            if "12" in self.BSS_Basic_Rate:
-                Allowed_control12 = 12
-            else:
-                if (not (
-                        "6" in self.BSS_Basic_Rate or "9" in self.BSS_Basic_Rate or "12" in self.BSS_Basic_Rate or "18" in self.BSS_Basic_Rate or
-                        "24" in self.BSS_Basic_Rate or "36" in self.BSS_Basic_Rate or "48" in self.BSS_Basic_Rate or "54" in self.BSS_Basic_Rate)):
-                    Allowed_control12 = 12
-                else:
-                    Allowed_control12 = 0
-        else:
-            Allowed_control12 = 0
-
-        if Non_HT_value >= 18:
-            if "18" in self.BSS_Basic_Rate:
-                Allowed_control18 = 18
-            else:
-                if (not (
-                        "6" in self.BSS_Basic_Rate or "9" in self.BSS_Basic_Rate or "12" in self.BSS_Basic_Rate or "18" in self.BSS_Basic_Rate or
-                        "24" in self.BSS_Basic_Rate or "36" in self.BSS_Basic_Rate or "48" in self.BSS_Basic_Rate or "54" in self.BSS_Basic_Rate)):
-                    Allowed_control18 = 12
-                else:
-                    Allowed_control18 = 0
-        else:
-            Allowed_control18 = 0
-
-        if Non_HT_value >= 24:
-            if "24" in self.BSS_Basic_Rate:
-                Allowed_control24 = 24
-            else:
-                if (not (
-                        "6" in self.BSS_Basic_Rate or "9" in self.BSS_Basic_Rate or "12" in self.BSS_Basic_Rate or "18" in self.BSS_Basic_Rate or
-                        "24" in self.BSS_Basic_Rate or "36" in self.BSS_Basic_Rate or "48" in self.BSS_Basic_Rate or "54" in self.BSS_Basic_Rate)):
-                    Allowed_control24 = 24
-                else:
-                    Allowed_control24 = 0
-        else:
-            Allowed_control24 = 0
-
-        if Non_HT_value >= 36:
-            if "36" in self.BSS_Basic_Rate:
-                Allowed_control36 = 36
-            else:
-                if (not (
-                        "6" in self.BSS_Basic_Rate or "9" in self.BSS_Basic_Rate or "12" in self.BSS_Basic_Rate or "18" in self.BSS_Basic_Rate or
-                        "24" in self.BSS_Basic_Rate or "36" in self.BSS_Basic_Rate or "48" in self.BSS_Basic_Rate or "54" in self.BSS_Basic_Rate)):
-                    Allowed_control36 = 24
-                else:
-                    Allowed_control36 = 0
-        else:
-            Allowed_control36 = 0
-
-        if Non_HT_value >= 48:
-            if "48" in self.BSS_Basic_Rate:
-                Allowed_control48 = 48
-            else:
-                if (not (
-                        "6" in self.BSS_Basic_Rate or "9" in self.BSS_Basic_Rate or "12" in self.BSS_Basic_Rate or "18" in self.BSS_Basic_Rate or
-                        "24" in self.BSS_Basic_Rate or "36" in self.BSS_Basic_Rate or "48" in self.BSS_Basic_Rate or "54" in self.BSS_Basic_Rate)):
-                    Allowed_control48 = 24
-                else:
-                    Allowed_control48 = 0
-        else:
-            Allowed_control48 = 0
-
-        if Non_HT_value >= 54:
-            if "54" in self.BSS_Basic_Rate:
-                Allowed_control54 = 54
-            else:
-                if (not (
-                        "6" in self.BSS_Basic_Rate or "9" in self.BSS_Basic_Rate or "12" in self.BSS_Basic_Rate or "18" in self.BSS_Basic_Rate or
-                        "24" in self.BSS_Basic_Rate or "36" in self.BSS_Basic_Rate or "48" in self.BSS_Basic_Rate or "54" in self.BSS_Basic_Rate)):
-                    Allowed_control54 = 24
-                else:
-                    Allowed_control54 = 0
-        else:
-            Allowed_control54 = 0
-
-        # g24 QoS Hdr
-        if "Yes" in self.QoS:
-            QoS_1 = 1
-        elif "No" in self.QoS:
-            QoS_1 = 0
-        if (QoS_1 == 1) or (IP_Packets_MSDU > 1):
-            QoS_Hdr = 2
-        else:
-            QoS_Hdr = 0
-
-        # g23 Encrypt Hdr
-
-        if "None" in self.Encryption:
-            Encrypt_Hdr = 0
-        else:
-            if "WEP" in self.Encryption:
-                Encrypt_Hdr = 8
-            elif "TKIP" in self.Encryption:
-                Encrypt_Hdr = 20
-            else:
-                Encrypt_Hdr = 16
-        # c36 Codec IP Packet Size
-
-        if "G.711" in self.Codec_Type_Voice_Traffic:
-            Codec_IP_Packet_Size = 200
-            Codec_Frame_Rate = 100
-
-        else:
-            if "G.723" in self.Codec_Type_Voice_Traffic:
-                Codec_IP_Packet_Size = 60
-                Codec_Frame_Rate = 67
-
-            else:
-                if "G.729" in self.Codec_Type_Voice_Traffic:
-                    Codec_IP_Packet_Size = 60
-                    Codec_Frame_Rate = 100
-
-                else:
-                    Codec_IP_Packet_Size = 0
-                    Codec_Frame_Rate = 0
-
-        # c17  MAC MPDU Size
-
-        if "Data" in self.Traffic_Type:
-            MAC_MPDU_Size = int(self.MAC_MPDU_Size_Data_Traffic)
-
-        else:
-            if ((IP_Packets_MSDU == 0)):
-                MAC_MPDU_Size = (Codec_IP_Packet_Size + 28 + QoS_Hdr + Encrypt_Hdr + 8)
-
-            else:
-                MAC_MPDU_Size_1 = (Codec_IP_Packet_Size + 28 + QoS_Hdr + Encrypt_Hdr + 8 + (IP_Packets_MSDU_loc - 1) * (
-                        14 + 3))
-                MAC_MPDU_Size = int(MAC_MPDU_Size_1 / (IP_Packets_MSDU_loc - 1))
-
-        # MSDU Size
-
-        if IP_Packets_MSDU == 0:
-            MSDU_final = MAC_MPDU_Size - 28 - QoS_Hdr - Encrypt_Hdr
-
-
-        else:
-            MSDU_1 = (MAC_MPDU_Size - 28 - QoS_Hdr - Encrypt_Hdr - (IP_Packets_MSDU) * (14 + 3))
-            MSDU_final = MSDU_1 / IP_Packets_MSDU
-
-        if MSDU_final < 0:
-            msdu_str = str(MSDU_final)
-            x = msdu_str.split(".")
-            sec = len(x[0])
-            if sec > 2:
-                MSDU = int(MSDU_final) - 1
-            else:
-                MSDU = int(MSDU_final)
-        else:
-            MSDU = int(MSDU_final)
-
-        if (MSDU - 8) < 20:
-            IP_Packet_value = "N/A"
-            ip_value = 0
-        else:
-            IP_Packet_value = MSDU - 8
-            ip_value = 1
-
-        if ip_value == 0:
-            Ethernet_value = "N/A"
-            eth_value = 0
-        else:
-            ip_1 = int(IP_Packet_value)
-            Ethernet_value = max(ip_1 + 18, 64)
-            eth_value = 1
-
-        # HT-LTFs
-
-        temp_value = int(Data_Voice_MCS_int / 8)
-
-        def HT_value_func():
-            if temp_value == 0:
-                HT_data_temp = HT_LTFs[0]
-            elif temp_value == 1:
-                HT_data_temp = HT_LTFs[1]
-            elif temp_value == 2:
-                HT_data_temp = HT_LTFs[2]
-            elif temp_value == 3:
-                HT_data_temp = HT_LTFs[3]
-            return HT_data_temp
-
-        HT_data = HT_value_func()
-        HT_data_1 = int(HT_data)
-
-        # c20 Tppdu_fixed (HT Data Frames)
-
-        if "Mixed" in self.PLCP:
-            Tppdu_fixed_Data_Frame = float(36 + 4 * HT_data_1)
-            PLCP_Configuration_int = 1
-        elif "Greenfield" in self.PLCP:
-            Tppdu_fixed_Data_Frame = float(24 + 4 * HT_data_1)
-            PLCP_Configuration_int = 2
-
-        # c21 Tppdu_fixed (HT Control Frames)
-
-        Data_min = min(Data_Voice_MCS_int, Highest_Basic)
-        temp_value = int(Data_min / 8) + 1
-        HT_data_temp_1 = HT_value_func()
-        HT_data_2 = int(HT_data_temp_1)
-
-        if "Mixed" in self.PLCP:
-            Tppdu_fixed_Control_Frames = float(36 + 4 * HT_data_2)
-
-        elif "Greenfield" in self.PLCP:
-            Tppdu_fixed_Control_Frames = float(24 + 4 * HT_data_2)
-
-        # Non-HT Reference Rate
-        # Offset calculation
-
-        i = 0
-        while True:
-            if Data_Voice_MCS_int == i:
-                Non_HT = Non_HT_Ref[i]
-                Nes_data = Nes[i]
-                break
-            i = i + 1
-
-        # PHY Bit Rate of Control Frames
-
-        PHY_Bit_Rate_of_Control_Frames = max(Allowed_control6, Allowed_control9,
-                                             Allowed_control12, Allowed_control18,
-                                             Allowed_control24, Allowed_control36,
-                                             Allowed_control48, Allowed_control54, 6)
-
-        # Ndbps, data bits per symbol (Data)
-
-        def Ndbps_fun():
-            if Data_Voice_MCS_int == 0 or Data_Voice_MCS_int == 8 or Data_Voice_MCS_int == 16 or Data_Voice_MCS_int == 24:
-                Ndbps_20 = Ndbps_20MHz[0]
-                Ndbps_40 = Ndbps_40MHz[0]
-            elif Data_Voice_MCS_int == 1 or Data_Voice_MCS_int == 9 or Data_Voice_MCS_int == 17 or Data_Voice_MCS_int == 25:
-                Ndbps_20 = Ndbps_20MHz[1]
-                Ndbps_40 = Ndbps_40MHz[1]
-            elif Data_Voice_MCS_int == 2 or Data_Voice_MCS_int == 10 or Data_Voice_MCS_int == 18 or Data_Voice_MCS_int == 26:
-                Ndbps_20 = Ndbps_20MHz[2]
-                Ndbps_40 = Ndbps_40MHz[2]
-
-            elif Data_Voice_MCS_int == 3 or Data_Voice_MCS_int == 11 or Data_Voice_MCS_int == 19 or Data_Voice_MCS_int == 27:
-                Ndbps_20 = Ndbps_20MHz[3]
-                Ndbps_40 = Ndbps_40MHz[3]
-            elif Data_Voice_MCS_int == 4 or Data_Voice_MCS_int == 12 or Data_Voice_MCS_int == 20 or Data_Voice_MCS_int == 28:
-                Ndbps_20 = Ndbps_20MHz[4]
-                Ndbps_40 = Ndbps_40MHz[4]
-            elif Data_Voice_MCS_int == 5 or Data_Voice_MCS_int == 13 or Data_Voice_MCS_int == 21 or Data_Voice_MCS_int == 29:
-                Ndbps_20 = Ndbps_20MHz[5]
-                Ndbps_40 = Ndbps_40MHz[5]
-            elif Data_Voice_MCS_int == 6 or Data_Voice_MCS_int == 14 or Data_Voice_MCS_int == 22 or Data_Voice_MCS_int == 30:
-                Ndbps_20 = Ndbps_20MHz[6]
-                Ndbps_40 = Ndbps_40MHz[6]
-            elif Data_Voice_MCS_int == 7 or Data_Voice_MCS_int == 15 or Data_Voice_MCS_int == 23 or Data_Voice_MCS_int == 31:
-                Ndbps_20 = Ndbps_20MHz[7]
-                Ndbps_40 = Ndbps_40MHz[7]
-            Ndbps_20_int = int(Ndbps_20)
-            Ndbps_40_int = int(Ndbps_40)
-            return Ndbps_20_int, Ndbps_40_int
-
-        if "20" in self.Channel_Bandwidth:
-
-            if Data_Voice_MCS_int >= 0 and Data_Voice_MCS_int < 8:
-                Ndbps_20_int, Ndbps_40_int = Ndbps_fun()
-                data_bits = Ndbps_20_int * 1
-            if Data_Voice_MCS_int >= 8 and Data_Voice_MCS_int < 16:
-                Ndbps_20_int, Ndbps_40_int = Ndbps_fun()
-                data_bits = Ndbps_20_int * 2
-            if Data_Voice_MCS_int >= 16 and Data_Voice_MCS_int < 24:
-                Ndbps_20_int, Ndbps_40_int = Ndbps_fun()
-                data_bits = Ndbps_20_int * 3
-            if Data_Voice_MCS_int >= 24 and Data_Voice_MCS_int < 32:
-                Ndbps_20_int, Ndbps_40_int = Ndbps_fun()
-                data_bits = Ndbps_20_int * 4
-
-
-        elif "40" in self.Channel_Bandwidth:
-
-            if Data_Voice_MCS_int >= 0 and Data_Voice_MCS_int < 8:
-                Ndbps_20_int, Ndbps_40_int = Ndbps_fun()
-                data_bits = Ndbps_40_int * 1
-            if Data_Voice_MCS_int >= 8 and Data_Voice_MCS_int < 16:
-                Ndbps_20_int, Ndbps_40_int = Ndbps_fun()
-                data_bits = Ndbps_40_int * 2
-            if Data_Voice_MCS_int >= 16 and Data_Voice_MCS_int < 24:
-                Ndbps_20_int, Ndbps_40_int = Ndbps_fun()
-                data_bits = Ndbps_40_int * 3
-            if Data_Voice_MCS_int >= 24 and Data_Voice_MCS_int < 32:
-                Ndbps_20_int, Ndbps_40_int = Ndbps_fun()
-                data_bits = Ndbps_40_int * 4
-
-        # Ndbps, data bits per symbol (Control)
-
-        if PHY_Bit_Rate_of_Control_Frames < 7:
-            if PHY_Bit_Rate_of_Control_Frames < 3:
-                PHY = PHY_Bit_Rate_of_Control_Frames
-            else:
-                if PHY_Bit_Rate_of_Control_Frames == 3:
-                    PHY = 5.5
-                else:
-                    if PHY_Bit_Rate_of_Control_Frames == 4:
-                        PHY = 11
-                    else:
-                        if PHY_Bit_Rate_of_Control_Frames == 5:
-                            PHY = 6
-                        else:
-                            if PHY_Bit_Rate_of_Control_Frames == 6:
-                                PHY = 9
-        else:
-            if PHY_Bit_Rate_of_Control_Frames == 8:
-                PHY = 18
-            else:
-                if PHY_Bit_Rate_of_Control_Frames == 9:
-                    PHY = 24
-                else:
-                    if PHY_Bit_Rate_of_Control_Frames == 10:
-                        PHY = 36
-                    else:
-                        if PHY_Bit_Rate_of_Control_Frames == 11:
-                            PHY = 48
-                        else:
-                            PHY = 54
-        Ndbps_data_bits_per_symbol_Control = PHY * 4
-        MAC_Frames_per_A_MPDU = int(self.MAC_Frames_per_A_MPDU_str)
-
-        # g22 A-MPDU Pad
-
-        if ((MAC_Frames_per_A_MPDU == 0)):
-            MPDU_Pad = int(0)
-
-        else:
-            x = int((MAC_MPDU_Size % 4))
-            y = int((4 - x))
-            MPDU_Pad = int((y % 4))
-
-        # c26 Nbits, Bits per MAC PPDU
-
-        MAC_Frames_per_A_MPDU_loc = MAC_Frames_per_A_MPDU + 1
-        if (MAC_Frames_per_A_MPDU == 0):
-            Nbits_Bits_per_MAC_PPDU = MAC_MPDU_Size * 8
-
-        else:
-            Nbits_Bits_per_MAC_PPDU = ((MAC_MPDU_Size + 4) * (MAC_Frames_per_A_MPDU_loc - 1) + MPDU_Pad * (
-                    MAC_Frames_per_A_MPDU_loc - 2)) * 8
-
-        # c27 Tsymbol(Data), Data Symbol Period
-
-        if "400" in self.Guard_Interval_value:
-            Guard_Interval_1 = 1
-        elif "800" in self.Guard_Interval_value:
-            Guard_Interval_1 = 0
-        calculation = (((Data_Voice_MCS_int > 7 and PLCP_Configuration_int == 2) or PLCP_Configuration_int == 1))
-        if (Guard_Interval_1 == 1) and calculation:
-            Tsymbol_Data_Symbol_Period = 3.60
-
-        else:
-            Tsymbol_Data_Symbol_Period = 4
-
-        Nes_data_int = int(Nes_data)
-
-        # Ttxframe (DATA)
-
-        if "40" in self.Channel_Bandwidth:
-            offset = 6 * Nes_data_int
-        else:
-            offset = 6
-
-        Ttxframe_1 = Tppdu_fixed_Data_Frame + int(
-            (16 + offset + Nbits_Bits_per_MAC_PPDU + data_bits - 1) / data_bits) * Tsymbol_Data_Symbol_Period
-        Ttxframe_2 = format(Ttxframe_1, '.2f')
-        Ttxframe = float(Ttxframe_2)
-
-        # c30 Ttxframe (Ack)
-
-        Ttxframe_Ack = int(
-            (22 + 14 * 8 + PHY_Bit_Rate_of_Control_Frames * 4 - 1) / (PHY_Bit_Rate_of_Control_Frames * 4)) * 4 + 20
-
-        # c31 Ttxframe (Compressed BlockAck)
-
-        Ttxframe_Compressed_BlockAck = int(
-            (22 + 32 * 8 + PHY_Bit_Rate_of_Control_Frames * 4 - 1) / (PHY_Bit_Rate_of_Control_Frames * 4)) * 4 + 20
-
-        # g20 Use BlockAck
-        if (MAC_Frames_per_A_MPDU == 0):
-            Use_BlockAck = False
-
-        else:
-            Use_BlockAck = True
-
-        # c34 Ack Response Overhead
-        if Use_BlockAck:
-            Ack_Response_Overhead = 0
-
-        else:
-            Ack_Response_Overhead = SIFS + Ttxframe_Ack
-
-        # c35 BlockAck Response Overhead
-
-        if Use_BlockAck:
-            BlockAck_Response_Overhead = SIFS + Ttxframe_Compressed_BlockAck
-
-        else:
-            BlockAck_Response_Overhead = 0
-        CWmin_leave_alone_for_default = int(self.CWmin)
-        MeanBackoff = CWmin_leave_alone_for_default * Slot_Time / 2
-
-        # c32 RTS/CTS Handshake Overhead
-
-        if "Yes" in self.RTS_CTS_Handshake:
-            if "20" in self.Channel_Bandwidth:
-                RTS_CTS_Handshake_Overhead = 2 * 20 + 4 * int((22 + (20 + 14) * 8 + 24 * 4 - 1) / (24 * 4)) + 2 * SIFS
-
-            else:
-                RTS_CTS_Handshake_Overhead = 2 * 20 + int(
-                    (22 + (20 + 14) * 8 + 24 - 1) / 24) * Tsymbol_Control + 2 * SIFS
-
-        else:
-            RTS_CTS_Handshake_Overhead = 0
-
-        # c33CTS-to-self Handshake Overhead
-
-        if "Yes" in self.RTS_CTS_Handshake:
-            CTS_to_self_Handshake_Overhead = 0
-
-        else:
-            if "Yes" in self.CTS_to_self_protection:
-                if "20" in self.Channel_Bandwidth:
-                    CTS_to_self_Handshake_Overhead = 20 + 4 * int((22 + 14 * 8 + 24 * 4 - 1) / (24 * 4)) + SIFS
-
-                else:
-                    CTS_to_self_Handshake_Overhead = 20 + int((22 + 14 * 8 + 24 - 1) / 24) * Tsymbol_Control + SIFS
-
-            else:
-                CTS_to_self_Handshake_Overhead = 0
-
-        # MAC PPDU Interval
-
-        # MeanBackoff
-
-        MAC_PPDU_Interval_1 = RTS_CTS_Handshake_Overhead + CTS_to_self_Handshake_Overhead + Ttxframe + Ack_Response_Overhead + BlockAck_Response_Overhead + DIFS + (
-                MeanBackoff / 1)
-        Client_1_new = format(MAC_PPDU_Interval_1, '.2f')
-        MAC_PPDU_Interval_2 = RTS_CTS_Handshake_Overhead + CTS_to_self_Handshake_Overhead + Ttxframe + Ack_Response_Overhead + BlockAck_Response_Overhead + DIFS + (
-                MeanBackoff / 2)
-        Client_2_new = format(MAC_PPDU_Interval_2, '.2f')
-        MAC_PPDU_Interval_3 = RTS_CTS_Handshake_Overhead + CTS_to_self_Handshake_Overhead + Ttxframe + Ack_Response_Overhead + BlockAck_Response_Overhead + DIFS + (
-                MeanBackoff / 5)
-        Client_3_new = format(MAC_PPDU_Interval_3, '.2f')
-        MAC_PPDU_Interval_4 = RTS_CTS_Handshake_Overhead + CTS_to_self_Handshake_Overhead + Ttxframe + Ack_Response_Overhead + BlockAck_Response_Overhead + DIFS + (
-                MeanBackoff / 10)
-        Client_4_new = format(MAC_PPDU_Interval_4, '.2f')
-        MAC_PPDU_Interval_5 = RTS_CTS_Handshake_Overhead + CTS_to_self_Handshake_Overhead + Ttxframe + Ack_Response_Overhead + BlockAck_Response_Overhead + DIFS + (
-                MeanBackoff / 20)
-        Client_5_new = format(MAC_PPDU_Interval_5, '.2f')
-        MAC_PPDU_Interval_6 = RTS_CTS_Handshake_Overhead + CTS_to_self_Handshake_Overhead + Ttxframe + Ack_Response_Overhead + BlockAck_Response_Overhead + DIFS + (
-                MeanBackoff / 50)
-        Client_6_new = format(MAC_PPDU_Interval_6, '.2f')
-        MAC_PPDU_Interval_7 = RTS_CTS_Handshake_Overhead + CTS_to_self_Handshake_Overhead + Ttxframe + Ack_Response_Overhead + BlockAck_Response_Overhead + DIFS + (
-                MeanBackoff / 100)
-        Client_7_new = format(MAC_PPDU_Interval_7, '.3f')
-
-        # Max PPDU Rate
-
-        Max_PPDU_Rate_1 = 1000000 / MAC_PPDU_Interval_1
-        Client_8_new = format(Max_PPDU_Rate_1, '.2f')
-        Max_PPDU_Rate_2 = 1000000 / MAC_PPDU_Interval_2
-        Client_9_new = format(Max_PPDU_Rate_2, '.2f')
-        Max_PPDU_Rate_3 = 1000000 / MAC_PPDU_Interval_3
-        Client_10_new = format(Max_PPDU_Rate_3, '.2f')
-        Max_PPDU_Rate_4 = 1000000 / MAC_PPDU_Interval_4
-        Client_11_new = format(Max_PPDU_Rate_4, '.2f')
-        Max_PPDU_Rate_5 = 1000000 / MAC_PPDU_Interval_5
-        Client_12_new = format(Max_PPDU_Rate_5, '.2f')
-        Max_PPDU_Rate_6 = 1000000 / MAC_PPDU_Interval_6
-        Client_13_new = format(Max_PPDU_Rate_6, '.2f')
-        Max_PPDU_Rate_7 = 1000000 / MAC_PPDU_Interval_7
-        Client_14_new = format(Max_PPDU_Rate_7, '.2f')
-
-        # c44 Max_MAC_MPDU_Rate_1
-        if (MAC_Frames_per_A_MPDU > 0):
-            Max_MAC_MPDU_Rate_1 = (MAC_Frames_per_A_MPDU) * Max_PPDU_Rate_1
-            Max_MAC_MPDU_Rate_2 = (MAC_Frames_per_A_MPDU) * Max_PPDU_Rate_2
-            Max_MAC_MPDU_Rate_3 = (MAC_Frames_per_A_MPDU) * Max_PPDU_Rate_3
-            Max_MAC_MPDU_Rate_4 = (MAC_Frames_per_A_MPDU) * Max_PPDU_Rate_4
-            Max_MAC_MPDU_Rate_5 = (MAC_Frames_per_A_MPDU) * Max_PPDU_Rate_5
-            Max_MAC_MPDU_Rate_6 = (MAC_Frames_per_A_MPDU) * Max_PPDU_Rate_6
-            Max_MAC_MPDU_Rate_7 = (MAC_Frames_per_A_MPDU) * Max_PPDU_Rate_7
-        else:
-            Max_MAC_MPDU_Rate_1 = Max_PPDU_Rate_1
-            Max_MAC_MPDU_Rate_2 = Max_PPDU_Rate_2
-            Max_MAC_MPDU_Rate_3 = Max_PPDU_Rate_3
-            Max_MAC_MPDU_Rate_4 = Max_PPDU_Rate_4
-            Max_MAC_MPDU_Rate_5 = Max_PPDU_Rate_5
-            Max_MAC_MPDU_Rate_6 = Max_PPDU_Rate_6
-            Max_MAC_MPDU_Rate_7 = Max_PPDU_Rate_7
-
-        Client_15_new = round(Max_MAC_MPDU_Rate_1)
-        Client_16_new = round(Max_MAC_MPDU_Rate_2)
-        Client_17_new = round(Max_MAC_MPDU_Rate_3)
-        Client_18_new = round(Max_MAC_MPDU_Rate_4)
-        Client_19_new = round(Max_MAC_MPDU_Rate_5)
-        Client_20_new = round(Max_MAC_MPDU_Rate_6)
-        Client_21_new = round(Max_MAC_MPDU_Rate_7)
-
-        # Max MAC MSDU Rate
-
-        if (IP_Packets_MSDU > 0):
-            Max_MAC_MSDU_Rate_1 = (IP_Packets_MSDU) * Max_MAC_MPDU_Rate_1
-            Max_MAC_MSDU_Rate_2 = (IP_Packets_MSDU) * Max_MAC_MPDU_Rate_2
-            Max_MAC_MSDU_Rate_3 = (IP_Packets_MSDU) * Max_MAC_MPDU_Rate_3
-            Max_MAC_MSDU_Rate_4 = (IP_Packets_MSDU) * Max_MAC_MPDU_Rate_4
-            Max_MAC_MSDU_Rate_5 = (IP_Packets_MSDU) * Max_MAC_MPDU_Rate_5
-            Max_MAC_MSDU_Rate_6 = (IP_Packets_MSDU) * Max_MAC_MPDU_Rate_6
-            Max_MAC_MSDU_Rate_7 = (IP_Packets_MSDU) * Max_MAC_MPDU_Rate_7
-
-        else:
-            Max_MAC_MSDU_Rate_1 = Max_MAC_MPDU_Rate_1
-            Max_MAC_MSDU_Rate_2 = Max_MAC_MPDU_Rate_2
-            Max_MAC_MSDU_Rate_3 = Max_MAC_MPDU_Rate_3
-            Max_MAC_MSDU_Rate_4 = Max_MAC_MPDU_Rate_4
-            Max_MAC_MSDU_Rate_5 = Max_MAC_MPDU_Rate_5
-            Max_MAC_MSDU_Rate_6 = Max_MAC_MPDU_Rate_6
-            Max_MAC_MSDU_Rate_7 = Max_MAC_MPDU_Rate_7
-
-        Client_22_new = round(Max_MAC_MSDU_Rate_1)
-        Client_23_new = round(Max_MAC_MSDU_Rate_2)
-        Client_24_new = round(Max_MAC_MSDU_Rate_3)
-        Client_25_new = round(Max_MAC_MSDU_Rate_4)
-        Client_26_new = round(Max_MAC_MSDU_Rate_5)
-        Client_27_new = round(Max_MAC_MSDU_Rate_6)
-        Client_28_new = round(Max_MAC_MSDU_Rate_7)
-
-        # Max. 802.11 MAC Frame Data Rate
-        Max_802_11_MAC_Frame_Data_Rate_1 = Max_MAC_MPDU_Rate_1 * MAC_MPDU_Size * 8 / 1000000
-        Max_802_11_MAC_Frame_Data_Rate_2 = Max_MAC_MPDU_Rate_2 * MAC_MPDU_Size * 8 / 1000000
-        Max_802_11_MAC_Frame_Data_Rate_3 = Max_MAC_MPDU_Rate_3 * MAC_MPDU_Size * 8 / 1000000
-        Max_802_11_MAC_Frame_Data_Rate_4 = Max_MAC_MPDU_Rate_4 * MAC_MPDU_Size * 8 / 1000000
-        Max_802_11_MAC_Frame_Data_Rate_5 = Max_MAC_MPDU_Rate_5 * MAC_MPDU_Size * 8 / 1000000
-        Max_802_11_MAC_Frame_Data_Rate_6 = Max_MAC_MPDU_Rate_6 * MAC_MPDU_Size * 8 / 1000000
-        Max_802_11_MAC_Frame_Data_Rate_7 = Max_MAC_MPDU_Rate_7 * MAC_MPDU_Size * 8 / 1000000
-
-        Client_29_new = format(Max_802_11_MAC_Frame_Data_Rate_1, '.3f')
-        Client_30_new = format(Max_802_11_MAC_Frame_Data_Rate_2, '.3f')
-        Client_31_new = format(Max_802_11_MAC_Frame_Data_Rate_3, '.3f')
-        Client_32_new = format(Max_802_11_MAC_Frame_Data_Rate_4, '.3f')
-        Client_33_new = format(Max_802_11_MAC_Frame_Data_Rate_5, '.3f')
-        Client_34_new = format(Max_802_11_MAC_Frame_Data_Rate_6, '.3f')
-        Client_35_new = format(Max_802_11_MAC_Frame_Data_Rate_7, '.3f')
-
-        # Max. 802.11 MAC Payload Goodput
-
-        Max_802_11_MAC_Payload_Goodput_1 = MSDU * 8 * Max_MAC_MSDU_Rate_1 / 1000000
-        Max_802_11_MAC_Payload_Goodput_2 = MSDU * 8 * Max_MAC_MSDU_Rate_2 / 1000000
-        Max_802_11_MAC_Payload_Goodput_3 = MSDU * 8 * Max_MAC_MSDU_Rate_3 / 1000000
-        Max_802_11_MAC_Payload_Goodput_4 = MSDU * 8 * Max_MAC_MSDU_Rate_4 / 1000000
-        Max_802_11_MAC_Payload_Goodput_5 = MSDU * 8 * Max_MAC_MSDU_Rate_5 / 1000000
-        Max_802_11_MAC_Payload_Goodput_6 = MSDU * 8 * Max_MAC_MSDU_Rate_6 / 1000000
-        Max_802_11_MAC_Payload_Goodput_7 = MSDU * 8 * Max_MAC_MSDU_Rate_7 / 1000000
-
-        Client_36_new = format(Max_802_11_MAC_Payload_Goodput_1, '.3f')
-        Client_37_new = format(Max_802_11_MAC_Payload_Goodput_2, '.3f')
-        Client_38_new = format(Max_802_11_MAC_Payload_Goodput_3, '.3f')
-        Client_39_new = format(Max_802_11_MAC_Payload_Goodput_4, '.3f')
-        Client_40_new = format(Max_802_11_MAC_Payload_Goodput_5, '.3f')
-        Client_41_new = format(Max_802_11_MAC_Payload_Goodput_6, '.3f')
-        Client_42_new = format(Max_802_11_MAC_Payload_Goodput_7, '.3f')
-
-        # MAC Goodput Per 802.11 Client
-
-        MAC_Goodput_Per_802_11_Client_1 = Max_802_11_MAC_Payload_Goodput_1 / 1
-        MAC_Goodput_Per_802_11_Client_2 = Max_802_11_MAC_Payload_Goodput_2 / 2
-        MAC_Goodput_Per_802_11_Client_3 = Max_802_11_MAC_Payload_Goodput_3 / 5
-        MAC_Goodput_Per_802_11_Client_4 = Max_802_11_MAC_Payload_Goodput_4 / 10
-        MAC_Goodput_Per_802_11_Client_5 = Max_802_11_MAC_Payload_Goodput_5 / 20
-        MAC_Goodput_Per_802_11_Client_6 = Max_802_11_MAC_Payload_Goodput_6 / 50
-        MAC_Goodput_Per_802_11_Client_7 = Max_802_11_MAC_Payload_Goodput_7 / 100
-
-        Client_43_new = format(MAC_Goodput_Per_802_11_Client_1, '.3f')
-        Client_44_new = format(MAC_Goodput_Per_802_11_Client_2, '.3f')
-        Client_45_new = format(MAC_Goodput_Per_802_11_Client_3, '.3f')
-        Client_46_new = format(MAC_Goodput_Per_802_11_Client_4, '.3f')
-        Client_47_new = format(MAC_Goodput_Per_802_11_Client_5, '.3f')
-        Client_48_new = format(MAC_Goodput_Per_802_11_Client_6, '.3f')
-        Client_49_new = format(MAC_Goodput_Per_802_11_Client_7, '.3f')
-
-        # Offered Load (802.3 Side)
-
-        # c49
-        if eth_value != 0:
-
-            Offered_Load_8023_Side_1 = Max_MAC_MSDU_Rate_1 * Ethernet_value * 8 / 1000000
-            Offered_Load_8023_Side_2 = Max_MAC_MSDU_Rate_2 * Ethernet_value * 8 / 1000000
-            Offered_Load_8023_Side_3 = Max_MAC_MSDU_Rate_3 * Ethernet_value * 8 / 1000000
-            Offered_Load_8023_Side_4 = Max_MAC_MSDU_Rate_4 * Ethernet_value * 8 / 1000000
-            Offered_Load_8023_Side_5 = Max_MAC_MSDU_Rate_5 * Ethernet_value * 8 / 1000000
-            Offered_Load_8023_Side_6 = Max_MAC_MSDU_Rate_6 * Ethernet_value * 8 / 1000000
-            Offered_Load_8023_Side_7 = Max_MAC_MSDU_Rate_7 * Ethernet_value * 8 / 1000000
-            Client_50_new = format(Offered_Load_8023_Side_1, '.3f')
-            Client_51_new = format(Offered_Load_8023_Side_2, '.3f')
-            Client_52_new = format(Offered_Load_8023_Side_3, '.3f')
-            Client_53_new = format(Offered_Load_8023_Side_4, '.3f')
-            Client_54_new = format(Offered_Load_8023_Side_5, '.3f')
-            Client_55_new = format(Offered_Load_8023_Side_6, '.3f')
-            Client_56_new = format(Offered_Load_8023_Side_7, '.3f')
-
-        else:
-            Client_50_new = "N/A"
-            Client_51_new = "N/A"
-            Client_52_new = "N/A"
-            Client_53_new = "N/A"
-            Client_54_new = "N/A"
-            Client_55_new = "N/A"
-            Client_56_new = "N/A"
-
-        IP_Packet_value_str = str(IP_Packet_value)
-        if "N/A" not in IP_Packet_value_str:
-            IP_Goodput_802_11_8023_1 = Max_MAC_MSDU_Rate_1 * ip_1 * 8 / 1000000
-            IP_Goodput_802_11_8023_2 = Max_MAC_MSDU_Rate_2 * ip_1 * 8 / 1000000
-            IP_Goodput_802_11_8023_3 = Max_MAC_MSDU_Rate_3 * ip_1 * 8 / 1000000
-            IP_Goodput_802_11_8023_4 = Max_MAC_MSDU_Rate_4 * ip_1 * 8 / 1000000
-            IP_Goodput_802_11_8023_5 = Max_MAC_MSDU_Rate_5 * ip_1 * 8 / 1000000
-            IP_Goodput_802_11_8023_6 = Max_MAC_MSDU_Rate_6 * ip_1 * 8 / 1000000
-            IP_Goodput_802_11_8023_7 = Max_MAC_MSDU_Rate_7 * ip_1 * 8 / 1000000
-            Client_57_new = format(IP_Goodput_802_11_8023_1, '.3f')
-            Client_58_new = format(IP_Goodput_802_11_8023_2, '.3f')
-            Client_59_new = format(IP_Goodput_802_11_8023_3, '.3f')
-            Client_60_new = format(IP_Goodput_802_11_8023_4, '.3f')
-            Client_61_new = format(IP_Goodput_802_11_8023_5, '.3f')
-            Client_62_new = format(IP_Goodput_802_11_8023_6, '.3f')
-            Client_63_new = format(IP_Goodput_802_11_8023_7, '.3f')
-
-        else:
-            Client_57_new = "N/A"
-            Client_58_new = "N/A"
-            Client_59_new = "N/A"
-            Client_60_new = "N/A"
-            Client_61_new = "N/A"
-            Client_62_new = "N/A"
-            Client_63_new = "N/A"
-
-        # Theoretical Voice Call Capacity
-
-        # c53
-        if "Data" in self.Traffic_Type:
-            Maximum_Theoretical_R_value = "N/A"
-            Estimated_MOS_Score = "N/A"
-        else:
-            if "G.711" in self.Codec_Type_Voice_Traffic:
-                Maximum_Theoretical_R_value = 85.9
-            else:
-                if "G.723" in self.Codec_Type_Voice_Traffic:
-                    Maximum_Theoretical_R_value = 72.9
-                else:
-                    if "G.729" in self.Codec_Type_Voice_Traffic:
-                        Maximum_Theoretical_R_value = 81.7
-                    else:
-                        Maximum_Theoretical_R_value = 93.2
-
-            if Maximum_Theoretical_R_value < 0:
-                Estimated_MOS_Score = 1
-            else:
-                if Maximum_Theoretical_R_value > 100:
-                    Estimated_MOS_Score = 4.5
-                else:
-                    Estimated_MOS_Score_1 = (
-                            1 + 0.035 * Maximum_Theoretical_R_value + Maximum_Theoretical_R_value * (
-                            Maximum_Theoretical_R_value - 60) * (
-                                    100 - Maximum_Theoretical_R_value) * 7 * 0.000001)
-                    Estimated_MOS_Score = format(Estimated_MOS_Score_1, '.2f')
-
-        # Voice_Call_Range
-        try:
-            Voice_Call_Range = round(Max_PPDU_Rate_1 / Codec_Frame_Rate)
-
-            # c55 Maximum Bidirectional Voice Calls
-            if Voice_Call_Range <= 1:
-                Maximum_Bidirectional = Max_MAC_MSDU_Rate_1 / Codec_Frame_Rate
-
-            else:
-                if Voice_Call_Range <= 2:
-                    Maximum_Bidirectional = Max_MAC_MSDU_Rate_2 / Codec_Frame_Rate
-
-                else:
-                    if Voice_Call_Range <= 5:
-                        Maximum_Bidirectional = Max_MAC_MSDU_Rate_3 / Codec_Frame_Rate
-
-                    else:
-                        if Voice_Call_Range <= 10:
-                            Maximum_Bidirectional = Max_MAC_MSDU_Rate_4 / Codec_Frame_Rate
-
-                        else:
-                            if Voice_Call_Range <= 20:
-                                Maximum_Bidirectional = Max_MAC_MSDU_Rate_5 / Codec_Frame_Rate
-
-                            else:
-                                if Voice_Call_Range <= 50:
-                                    Maximum_Bidirectional = Max_MAC_MSDU_Rate_6 / Codec_Frame_Rate
-
-                                else:
-
-                                    Maximum_Bidirectional = Max_MAC_MSDU_Rate_7 / Codec_Frame_Rate
-        except ZeroDivisionError:
-            pass
-
-        if "Data" in self.Traffic_Type:
-            Maximum_Bidirectional_Voice_Calls = "N/A"
-        else:
-            Maximum_Bidirectional_Voice_Calls = round(Maximum_Bidirectional, 2)
+    def calculate(self, stations=1):
+        """
+        :return: CapacityResult for this many stations
+        """
+        return _n11_theoretical(self.Traffic_Type, self.Data_Voice_MCS, self.Channel_Bandwidth,
+                                self.Guard_Interval_value, self.Highest_Basic_str, self.Encryption, self.QoS,
+                                self.IP_Packets_MSDU_str, self.MAC_Frames_per_A_MPDU_str,
+                                _rate_set(self.BSS_Basic_Rate), self.MAC_MPDU_Size_Data_Traffic,
+                                self.Codec_Type_Voice_Traffic, self.PLCP, self.CWmin, self.RTS_CTS_Handshake,
+                                self.CTS_to_self_protection, stations)
 
-        print("\n" + "******************Station : 11nCalculator*****************************" + "\n")
-        print("Theoretical Maximum Offered Load" + "\n")
-        print("1 Client:")
-        All_theoretical_output = {'MAC PPDU Interval(usec)': Client_1_new, 'Max PPDU Rate(fps)': Client_8_new,
-                                  'Max MAC MPDU Rate': Client_15_new,
-                                  'Max MAC MSDU Rate': Client_22_new,
-                                  'Max. 802.11 MAC Frame Data Rate(Mb/s)': Client_29_new,
-                                  'Max. 802.11 MAC Payload Goodput(Mb/s)': Client_36_new,
-                                  'MAC Goodput Per 802.11 Client(Mb/s)': Client_43_new,
-                                  'Offered Load (802.3 Side)(Mb/s)': Client_50_new,
-                                  'IP Goodput (802.11 -> 802.3)(Mb/s)': Client_57_new}
-        print(json.dumps(All_theoretical_output, indent=4))
-
-        print("\n" + "Theroretical Voice Call Capacity" + "\n")
-
-        All_theoretical_voice = {'Maximum Theoretical R-value': Maximum_Theoretical_R_value,
-                                 'Estimated MOS Score': Estimated_MOS_Score,
-                                 'Maximum Bidirectional Voice Calls(calls)': Maximum_Bidirectional_Voice_Calls}
-        print(json.dumps(All_theoretical_voice, indent=4))
+    def input_parameter(self):
+        result = self.calculate()
+        _print_theoretical("11nCalculator", result)
+        return result
 
 
 ##Class to take all user input (802.11ac Standard)
@@ -1427,728 +804,441 @@ class ac11_calculator():
 
     # This function is for calculate intermediate values and Theoretical values
 
-    def input_parameter(self):
-
-        SIFS = 16.00
-        DIFS = 34.00
-        Slot_Time = 9.00
-        Tsymbol_control_Symbol_Period = 4.00
-        Codec_IP_Packet_Size = 200
-        Codec_Frame_Rate = 100
-        # ********************Auxilliary data****************************
-
-        HT_LTFs = ['1', '2', '4', '4']
-        Ndbps_20MHz = ['26', '52', '78', '104', '156', '208', '234', '260', '312', '1040']
-        Ndbps_40MHz = ['54', '108', '162', '216', '324', '432', '486', '540', '648', '720']
-        Ndbps_80MHz = ['117', '234', '351', '468', '702', '936', '1053', '1170', '1404', '1560']
-        Non_HT_Ref = ['6', '12', '18', '24', '36', '48', '54', '54', '54', '54']
-        Nes1 = ['1', '1', '1', '1', '1', '1', '1', '1', '1', '1', '1', '1', '1', '1', '1', '1', '1', '1', '1', '1', '1',
-                '1', '1', '1', '1', '1', '1', '1', '1', '1']
-        Nes2 = ['1', '1', '1', '1', '1', '1', '1', '1', '1', '1', '1', '1', '1', '1', '1', '1', '1', '1', '1', '1', '1',
-                '2', '2', '2', '1', '1', '1', '2', '2', '2']
-        Nes3 = ['1', '1', '1', '1', '1', '1', '1', '1', '1', '1', '1', '1', '1', '1', '1', '1', '1', '1', '1', '1', '1',
-                '2', '2', '2', '1', '2', '2', '2', '2', '3']
-        Nes4 = ['1', '1', '1', '1', '1', '1', '1', '1', '1', '1', '1', '1', '1', '1', '1', '1', '1', '1', '2', '2', '1',
-                '1', '1', '1', '2', '2', '2', '3', '3', '3']
-
-        Data_Voice_MCS_int = int(self.Data_Voice_MCS)
-        CWmin_leave_alone_for_default = int(self.CWmin)
-        spatial_int = int(self.spatial)
-        MAC_Frames_per_A_MPDU = int(self.MAC_Frames_per_A_MPDU_str)
-
-        i = 0
-        while True:
-            if Data_Voice_MCS_int == i:
-                Non_HT = Non_HT_Ref[i]
-                break
-            i = i + 1
-
-        Non_HT_value = int(Non_HT)
-
-        if Non_HT_value >= 6:
-            if "6" in self.BSS_Basic_Rate:
-                allowed_control6 = 6
-            else:
-                if (not ("6" in self.BSS_Basic_Rate or "9" in self.BSS_Basic_Rate or "12" in self.BSS_Basic_Rate
-                         or "18" in self.BSS_Basic_Rate or "24" in self.BSS_Basic_Rate or "36" in self.BSS_Basic_Rate or
-                         "48" in self.BSS_Basic_Rate or "54" in self.BSS_Basic_Rate)):
-                    allowed_control6 = 6
-                else:
-                    allowed_control6 = 0
-        else:
-            allowed_control6 = 0
-
-        if Non_HT_value >= 9:
-            if "9" in self.BSS_Basic_Rate:
-                allowed_control9 = 9
-            else:
-                if (not ("6" in self.BSS_Basic_Rate or "9" in self.BSS_Basic_Rate or "12" in self.BSS_Basic_Rate
-                         or "18" in self.BSS_Basic_Rate or "24" in self.BSS_Basic_Rate or "36" in self.BSS_Basic_Rate or
-                         "48" in self.BSS_Basic_Rate or "54" in self.BSS_Basic_Rate)):
-                    allowed_control9 = 6
-                else:
-                    allowed_control9 = 0
-        else:
-            allowed_control9 = 0
-
-        if Non_HT_value >= 12:
-            if "12" in self.BSS_Basic_Rate:
-                allowed_control12 = 12
-            else:
-                if (not ("6" in self.BSS_Basic_Rate or "9" in self.BSS_Basic_Rate or "12" in self.BSS_Basic_Rate
-                         or "18" in self.BSS_Basic_Rate or "24" in self.BSS_Basic_Rate or "36" in self.BSS_Basic_Rate or
-                         "48" in self.BSS_Basic_Rate or "54" in self.BSS_Basic_Rate)):
-                    allowed_control12 = 12
-                else:
-                    allowed_control12 = 0
-        else:
-            allowed_control12 = 0
-
-        if Non_HT_value >= 18:
-            if "18" in self.BSS_Basic_Rate:
-                allowed_control18 = 18
-            else:
-                if (not ("6" in self.BSS_Basic_Rate or "9" in self.BSS_Basic_Rate or "12" in self.BSS_Basic_Rate
-                         or "18" in self.BSS_Basic_Rate or "24" in self.BSS_Basic_Rate or "36" in self.BSS_Basic_Rate or
-                         "48" in self.BSS_Basic_Rate or "54" in self.BSS_Basic_Rate)):
-                    allowed_control18 = 12
-                else:
-                    allowed_control18 = 0
-        else:
-            allowed_control18 = 0
-
-        if Non_HT_value >= 24:
-            if "24" in self.BSS_Basic_Rate:
-                allowed_control24 = 24
-            else:
-                if (not ("6" in self.BSS_Basic_Rate or "9" in self.BSS_Basic_Rate or "12" in self.BSS_Basic_Rate
-                         or "18" in self.BSS_Basic_Rate or "24" in self.BSS_Basic_Rate or "36" in self.BSS_Basic_Rate or
-                         "48" in self.BSS_Basic_Rate or "54" in self.BSS_Basic_Rate)):
-                    allowed_control24 = 24
-                else:
-                    allowed_control24 = 0
-        else:
-            allowed_control24 = 0
-
-        if Non_HT_value >= 36:
-            if "36" in self.BSS_Basic_Rate:
-                allowed_control36 = 36
-            else:
-                if (not ("6" in self.BSS_Basic_Rate or "9" in self.BSS_Basic_Rate or "12" in self.BSS_Basic_Rate
-                         or "18" in self.BSS_Basic_Rate or "24" in self.BSS_Basic_Rate or "36" in self.BSS_Basic_Rate or
-                         "48" in self.BSS_Basic_Rate or "54" in self.BSS_Basic_Rate)):
-                    allowed_control36 = 24
-                else:
-                    allowed_control36 = 0
-        else:
-            allowed_control36 = 0
-
-        if Non_HT_value >= 48:
-            if "48" in self.BSS_Basic_Rate:
-                allowed_control48 = 48
-            else:
-                if (not ("6" in self.BSS_Basic_Rate or "9" in self.BSS_Basic_Rate or "12" in self.BSS_Basic_Rate
-                         or "18" in self.BSS_Basic_Rate or "24" in self.BSS_Basic_Rate or "36" in self.BSS_Basic_Rate or
-                         "48" in self.BSS_Basic_Rate or "54" in self.BSS_Basic_Rate)):
-                    allowed_control48 = 24
-                else:
-                    allowed_control48 = 0
-        else:
-            allowed_control48 = 0
-
-        if Non_HT_value >= 54:
-            if "54" in self.BSS_Basic_Rate:
-                allowed_control54 = 54
-            else:
-                if (not ("6" in self.BSS_Basic_Rate or "9" in self.BSS_Basic_Rate or "12" in self.BSS_Basic_Rate
-                         or "18" in self.BSS_Basic_Rate or "24" in self.BSS_Basic_Rate or "36" in self.BSS_Basic_Rate or
-                         "48" in self.BSS_Basic_Rate or "54" in self.BSS_Basic_Rate)):
-                    allowed_control54 = 24
-                else:
-                    allowed_control54 = 0
-        else:
-            allowed_control54 = 0
-
-        MeanBackoff = CWmin_leave_alone_for_default * Slot_Time / 2
-
-        IP_Packets_MSDU = int(self.IP_Packets_MSDU_str)
-        if "Mixed" in self.Codec_Type_Voice_Traffic:
-            plcp = 1
-        elif "Greenfield" in self.Codec_Type_Voice_Traffic:
-            plcp = 2
-
-        RTS_CTS_Handshake = 1
-        if "No" in self.RTS_CTS:
-            CTS_to_self_protection = 1
-        elif "Yes" in self.RTS_CTS:
-            CTS_to_self_protection = 2
-
-        # g24 QoS Hdr
-
-        if "Yes" in self.QoS:
-            QoS_1 = 1
-        elif "No" in self.QoS:
-            QoS_1 = 0
-        if (QoS_1 == 1) or (IP_Packets_MSDU > 1):
-            QoS_Hdr = 2
-
-        else:
-            QoS_Hdr = 0
-
-        # g23 Encrypt Hdr
-
-        if "None" in self.Encryption:
-            Encrypt_Hdr = 0
-
-        else:
-            if "WEP" in self.Encryption:
-                Encrypt_Hdr = 8
+    def calculate(self, stations=1):
+        """
+        :return: CapacityResult for this many stations
+        """
+        return _ac11_theoretical(self.Traffic_Type, self.Data_Voice_MCS, self.spatial, self.Channel_Bandwidth,
+                                 self.Guard_Interval_value, self.Highest_Basic_str, self.Encryption, self.QoS,
+                                 self.IP_Packets_MSDU_str, self.MAC_Frames_per_A_MPDU_str,
+                                 _rate_set(self.BSS_Basic_Rate), self.MAC_MPDU_Size_Data_Traffic,
+                                 self.Codec_Type_Voice_Traffic, self.CWmin, self.RTS_CTS, stations)
 
-            elif "TKIP" in self.Encryption:
-                Encrypt_Hdr = 20
-
-            else:
-                Encrypt_Hdr = 16
-
-        # c18 MAC MPDU Size
-
-        IP_Packets_MSDU_loc = IP_Packets_MSDU + 1
-
-        if "Data" in self.Traffic_Type:
-            MAC_MPDU_Size = int(self.MAC_MPDU_Size_Data_Traffic)
-
-        else:
-            if (IP_Packets_MSDU == 0):
-                MAC_MPDU_Size = (Codec_IP_Packet_Size + 28 + QoS_Hdr + Encrypt_Hdr + 8)
-
-            else:
-                MAC_MPDU_Size_1 = (
-                        Codec_IP_Packet_Size + 28 + QoS_Hdr + Encrypt_Hdr + 8 + (IP_Packets_MSDU_loc - 1) * (
-                        14 + 3))
-                MAC_MPDU_Size = int(MAC_MPDU_Size_1 / (IP_Packets_MSDU_loc - 1))
-
-        # MSDU Size
-
-        if IP_Packets_MSDU == 0:
-            MSDU_final = MAC_MPDU_Size - 28 - QoS_Hdr - Encrypt_Hdr
-
-
-        else:
-            MSDU_1 = (MAC_MPDU_Size - 28 - QoS_Hdr - Encrypt_Hdr - (IP_Packets_MSDU) * (14 + 3))
-            MSDU_final = (int(MSDU_1 / (IP_Packets_MSDU)))
-        if MSDU_final < 0:
-            MSDU = MSDU_final - 1
-        else:
-            MSDU = MSDU_final
-
-        if (MSDU - 8) < 20:
-            IP_Packet_value = "N/A"
-            ip_value = 0
-        else:
-            IP_Packet_value = MSDU - 8
-            ip_value = 1
-
-        if ip_value == 0:
-            Ethernet_value = "N/A"
-            eth_value = 0
-        else:
-            ip_1 = int(IP_Packet_value)
-            Ethernet_value = max(ip_1 + 18, 64)
-            eth_value = 1
-
-        i = 1
-        while True:
-            if int(spatial_int) == i:
-                offset_str = HT_LTFs[i - 1]
-                break
-            i = i + 1
-        offset = int(offset_str)
-        Tppdu_fixed = 36 + offset * 4
-
-        # Tppdu_fixed (HT Control Frames)
-
-        offset_str_1 = HT_LTFs[0]
-        offset_1 = int(offset_str_1)
-
-        Tppdu_fixed_control = 36 + offset_1 * 4
-
-        # c23 VHT Data Rate
-        # Ndbps, data bits per symbol (Data)
-        # offset
-        j = 0
-        while True:
-            if Data_Voice_MCS_int == j:
-                if "20" in self.Channel_Bandwidth:
-                    Ndbps_str = Ndbps_20MHz[j]
-                    break
-                elif "40" in self.Channel_Bandwidth:
-                    Ndbps_str = Ndbps_40MHz[j]
-                    break
-                elif "80" in self.Channel_Bandwidth:
-                    Ndbps_str = Ndbps_80MHz[j]
-                    break
-            j = j + 1
-        Ndbps = int(Ndbps_str)
-
-        Ndbps_bits_per_symbol_Data = Ndbps * spatial_int
-
-        # c27 Tsymbol(Data), Data Symbol Period
-        if "400" in self.Guard_Interval_value:
-            Guard_Interval_1 = 1
-        elif "800" in self.Guard_Interval_value:
-            Guard_Interval_1 = 0
-
-        calculation = (((Data_Voice_MCS_int > 7 and plcp == 2) or plcp == 1))
-
-        if (Guard_Interval_1 == 1) and calculation:
-            Tsymbol_Data_Symbol_Period = 3.60
-
-
-        else:
-            Tsymbol_Data_Symbol_Period = 4
-
-        VHT_Data_Rate = Ndbps_bits_per_symbol_Data / Tsymbol_Data_Symbol_Period
-
-        # Non-HT Reference Rate
-        k = 0
-        while True:
-            if Data_Voice_MCS_int == k:
-                Non_HT = Non_HT_Ref[k]
-                break
-            k = k + 1
-
-        Non_HT_value = int(Non_HT)
-
-        # PHY Bit Rate of Control Frames
-
-        PHY_Bit_Rate_of_Control_Frames = max(allowed_control6, allowed_control9,
-                                             allowed_control12, allowed_control18,
-                                             allowed_control24, allowed_control36,
-                                             allowed_control48, allowed_control54, 6)
-
-        # c27 Ndbps, data bits per symbol (Control)
-
-        if PHY_Bit_Rate_of_Control_Frames < 7:
-            if PHY_Bit_Rate_of_Control_Frames < 3:
-                PHY = PHY_Bit_Rate_of_Control_Frames
-            else:
-                if PHY_Bit_Rate_of_Control_Frames == 3:
-                    PHY = 5.5
-                else:
-                    if PHY_Bit_Rate_of_Control_Frames == 4:
-                        PHY = 11
-                    else:
-                        if PHY_Bit_Rate_of_Control_Frames == 5:
-                            PHY = 6
-                        else:
-                            if PHY_Bit_Rate_of_Control_Frames == 6:
-                                PHY = 9
-        else:
-            if PHY_Bit_Rate_of_Control_Frames == 8:
-                PHY = 18
-            else:
-                if PHY_Bit_Rate_of_Control_Frames == 9:
-                    PHY = 24
-                else:
-                    if PHY_Bit_Rate_of_Control_Frames == 10:
-                        PHY = 36
-                    else:
-                        if PHY_Bit_Rate_of_Control_Frames == 11:
-                            PHY = 48
-                        else:
-                            PHY = 54
-        Ndbps_bits_per_symbol_Control = PHY * 4
-
-        # Nbits, Bits per MAC PPDU
-        # A-MPDU Pad
-
-        if ((MAC_Frames_per_A_MPDU == 0)):
-            MPDU_Pad = int(0)
-
-        else:
-            x = int((MAC_MPDU_Size % 4))
-            y = int((4 - x))
-            MPDU_Pad = int((y % 4))
-
-        MAC_Frames_per_A_MPDU_loc = MAC_Frames_per_A_MPDU + 1
-        if (MAC_Frames_per_A_MPDU == 0):
-            Nbits_Bits_per_MAC_PPDU = MAC_MPDU_Size * 8
-
-        else:
-            Nbits_Bits_per_MAC_PPDU = ((MAC_MPDU_Size + 4) * (MAC_Frames_per_A_MPDU_loc - 1) + MPDU_Pad * (
-                    MAC_Frames_per_A_MPDU_loc - 2)) * 8
-
-        # Nes, Number of BCC encoders
-
-        l = 0
-        while True:
-            if Data_Voice_MCS_int == l:
-                if "20" in self.Channel_Bandwidth:
-                    Nes = 0 * 10 + Data_Voice_MCS_int
-                elif "40" in self.Channel_Bandwidth:
-                    Nes = 1 * 10 + Data_Voice_MCS_int
-                elif "80" in self.Channel_Bandwidth:
-                    Nes = 2 * 10 + Data_Voice_MCS_int
-
-                if spatial_int == 1:
-                    Nes_str = Nes1[Nes]
-                    break
-                elif spatial_int == 2:
-                    Nes_str = Nes2[Nes]
-                    break
-                elif spatial_int == 3:
-                    Nes_str = Nes3[Nes]
-                    break
-                elif spatial_int == 4:
-                    Nes_str = Nes4[Nes]
-                    break
-            l = l + 1
-
-        Nes_int = int(Nes_str)
-
-        # Ttxframe (DATA)
-
-        Ttxframe = Tppdu_fixed + int((16 + 6 * Nes_int + Nbits_Bits_per_MAC_PPDU + Ndbps_bits_per_symbol_Data - 1)
-                                     / Ndbps_bits_per_symbol_Data) * Tsymbol_Data_Symbol_Period
-
-        Ttxframe_Ack = int(
-            (22 + 14 * 8 + PHY_Bit_Rate_of_Control_Frames * 4 - 1) / (PHY_Bit_Rate_of_Control_Frames * 4)) * 4 + 20
-
-        # c34 Ttxframe (Compressed BlockAck)
-
-        Ttxframe_Compressed_BlockAck = int((22 + 32 * 8 + PHY_Bit_Rate_of_Control_Frames * 4 - 1)
-                                           / (PHY_Bit_Rate_of_Control_Frames * 4)) * 4 + 20
-
-        # c35 RTS/CTS Handshake Overhead
-
-        if RTS_CTS_Handshake == 2:
-            if "20" in self.Channel_Bandwidth:
-                RTS_CTS_Handshake_Overhead = 2 * 20 + 4 * int(
-                    (22 + (20 + 14) * 8 + 24 * 4 - 1) / (24 * 4)) + 2 * SIFS
-            else:
-                RTS_CTS_Handshake_Overhead = 2 * 20 + int(
-                    (22 + (20 + 14) * 8 + 24 - 1) / 24) * Tsymbol_control_Symbol_Period + 2 * SIFS
-        else:
-            RTS_CTS_Handshake_Overhead = 0
-
-        # c36 CTS-to-self Handshake Overhead
-
-        if RTS_CTS_Handshake == 2:
-            CTS_to_self_Handshake_Overhead = 0
-        else:
-            if CTS_to_self_protection == 2:
-                if "20" in self.Channel_Bandwidth:
-                    CTS_to_self_Handshake_Overhead = 20 + 4 * int((22 + 14 * 8 + 24 * 4 - 1) / (24 * 4)) + SIFS
-                else:
-                    CTS_to_self_Handshake_Overhead = 20 + int(
-                        (22 + 14 * 8 + 24 - 1) / 24) * Tsymbol_control_Symbol_Period + SIFS
-            else:
-                CTS_to_self_Handshake_Overhead = 0
-
-        # c37 Ack Response Overhead
-        # g20 Use BlockAck
-
-        if (MAC_Frames_per_A_MPDU == 0):
-            Use_BlockAck = False
-        else:
-            Use_BlockAck = True
-
-        if Use_BlockAck:
-            Ack_Response_Overhead = 0
-        else:
-            Ack_Response_Overhead = SIFS + Ttxframe_Ack
-
-        # c38BlockAck Response Overhead
-
-        if Use_BlockAck:
-            BlockAck_Response_Overhead = SIFS + Ttxframe_Compressed_BlockAck
-        else:
-            BlockAck_Response_Overhead = 0
-
-        # c42 MAC PPDU Interval
-
-        MAC_PPDU_Interval_1 = RTS_CTS_Handshake_Overhead + CTS_to_self_Handshake_Overhead + Ttxframe + Ack_Response_Overhead + BlockAck_Response_Overhead + DIFS + (
-                MeanBackoff / 1)
-        Client_1_new = format(MAC_PPDU_Interval_1, '.2f')
-        MAC_PPDU_Interval_2 = RTS_CTS_Handshake_Overhead + CTS_to_self_Handshake_Overhead + Ttxframe + Ack_Response_Overhead + BlockAck_Response_Overhead + DIFS + (
-                MeanBackoff / 2)
-        Client_2_new = format(MAC_PPDU_Interval_2, '.2f')
-
-        MAC_PPDU_Interval_3 = RTS_CTS_Handshake_Overhead + CTS_to_self_Handshake_Overhead + Ttxframe + Ack_Response_Overhead + BlockAck_Response_Overhead + DIFS + (
-                MeanBackoff / 5)
-        Client_3_new = format(MAC_PPDU_Interval_3, '.2f')
-
-        MAC_PPDU_Interval_4 = RTS_CTS_Handshake_Overhead + CTS_to_self_Handshake_Overhead + Ttxframe + Ack_Response_Overhead + BlockAck_Response_Overhead + DIFS + (
-                MeanBackoff / 10)
-        Client_4_new = format(MAC_PPDU_Interval_4, '.2f')
-        MAC_PPDU_Interval_5 = RTS_CTS_Handshake_Overhead + CTS_to_self_Handshake_Overhead + Ttxframe + Ack_Response_Overhead + BlockAck_Response_Overhead + DIFS + (
-                MeanBackoff / 20)
-        Client_5_new = format(MAC_PPDU_Interval_5, '.2f')
-        MAC_PPDU_Interval_6 = RTS_CTS_Handshake_Overhead + CTS_to_self_Handshake_Overhead + Ttxframe + Ack_Response_Overhead + BlockAck_Response_Overhead + DIFS + (
-                MeanBackoff / 50)
-        Client_6_new = format(MAC_PPDU_Interval_6, '.2f')
-        MAC_PPDU_Interval_7 = RTS_CTS_Handshake_Overhead + CTS_to_self_Handshake_Overhead + Ttxframe + Ack_Response_Overhead + BlockAck_Response_Overhead + DIFS + (
-                MeanBackoff / 100)
-        Client_7_new = format(MAC_PPDU_Interval_7, '.3f')
-
-        # Max PPDU Rate
-
-        Max_PPDU_Rate_1 = 1000000 / MAC_PPDU_Interval_1
-        Client_8_new = format(Max_PPDU_Rate_1, '.2f')
-        Max_PPDU_Rate_2 = 1000000 / MAC_PPDU_Interval_2
-        Client_9_new = format(Max_PPDU_Rate_2, '.2f')
-        Max_PPDU_Rate_3 = 1000000 / MAC_PPDU_Interval_3
-        Client_10_new = format(Max_PPDU_Rate_3, '.2f')
-        Max_PPDU_Rate_4 = 1000000 / MAC_PPDU_Interval_4
-        Client_11_new = format(Max_PPDU_Rate_4, '.2f')
-        Max_PPDU_Rate_5 = 1000000 / MAC_PPDU_Interval_5
-        Client_12_new = format(Max_PPDU_Rate_5, '.2f')
-        Max_PPDU_Rate_6 = 1000000 / MAC_PPDU_Interval_6
-        Client_13_new = format(Max_PPDU_Rate_6, '.2f')
-        Max_PPDU_Rate_7 = 1000000 / MAC_PPDU_Interval_7
-        Client_14_new = format(Max_PPDU_Rate_7, '.2f')
-
-        # c44 Max_MAC_MPDU_Rate_1
-
-        if (MAC_Frames_per_A_MPDU > 0):
-            Max_MAC_MPDU_Rate_1 = (MAC_Frames_per_A_MPDU) * Max_PPDU_Rate_1
-            Max_MAC_MPDU_Rate_2 = (MAC_Frames_per_A_MPDU) * Max_PPDU_Rate_2
-            Max_MAC_MPDU_Rate_3 = (MAC_Frames_per_A_MPDU) * Max_PPDU_Rate_3
-            Max_MAC_MPDU_Rate_4 = (MAC_Frames_per_A_MPDU) * Max_PPDU_Rate_4
-            Max_MAC_MPDU_Rate_5 = (MAC_Frames_per_A_MPDU) * Max_PPDU_Rate_5
-            Max_MAC_MPDU_Rate_6 = (MAC_Frames_per_A_MPDU) * Max_PPDU_Rate_6
-            Max_MAC_MPDU_Rate_7 = (MAC_Frames_per_A_MPDU) * Max_PPDU_Rate_7
-        else:
-            Max_MAC_MPDU_Rate_1 = Max_PPDU_Rate_1
-            Max_MAC_MPDU_Rate_2 = Max_PPDU_Rate_2
-            Max_MAC_MPDU_Rate_3 = Max_PPDU_Rate_3
-            Max_MAC_MPDU_Rate_4 = Max_PPDU_Rate_4
-            Max_MAC_MPDU_Rate_5 = Max_PPDU_Rate_5
-            Max_MAC_MPDU_Rate_6 = Max_PPDU_Rate_6
-            Max_MAC_MPDU_Rate_7 = Max_PPDU_Rate_7
-
-        Client_15_new = round(Max_MAC_MPDU_Rate_1)
-        Client_16_new = round(Max_MAC_MPDU_Rate_2)
-        Client_17_new = round(Max_MAC_MPDU_Rate_3)
-        Client_18_new = round(Max_MAC_MPDU_Rate_4)
-        Client_19_new = round(Max_MAC_MPDU_Rate_5)
-        Client_20_new = round(Max_MAC_MPDU_Rate_6)
-        Client_21_new = round(Max_MAC_MPDU_Rate_7)
-
-        # Max MAC MSDU Rate
-
-        if (IP_Packets_MSDU > 0):
-            Max_MAC_MSDU_Rate_1 = (IP_Packets_MSDU) * Max_MAC_MPDU_Rate_1
-            Max_MAC_MSDU_Rate_2 = (IP_Packets_MSDU) * Max_MAC_MPDU_Rate_2
-            Max_MAC_MSDU_Rate_3 = (IP_Packets_MSDU) * Max_MAC_MPDU_Rate_3
-            Max_MAC_MSDU_Rate_4 = (IP_Packets_MSDU) * Max_MAC_MPDU_Rate_4
-            Max_MAC_MSDU_Rate_5 = (IP_Packets_MSDU) * Max_MAC_MPDU_Rate_5
-            Max_MAC_MSDU_Rate_6 = (IP_Packets_MSDU) * Max_MAC_MPDU_Rate_6
-            Max_MAC_MSDU_Rate_7 = (IP_Packets_MSDU) * Max_MAC_MPDU_Rate_7
-
-        else:
-            Max_MAC_MSDU_Rate_1 = Max_MAC_MPDU_Rate_1
-            Max_MAC_MSDU_Rate_2 = Max_MAC_MPDU_Rate_2
-            Max_MAC_MSDU_Rate_3 = Max_MAC_MPDU_Rate_3
-            Max_MAC_MSDU_Rate_4 = Max_MAC_MPDU_Rate_4
-            Max_MAC_MSDU_Rate_5 = Max_MAC_MPDU_Rate_5
-            Max_MAC_MSDU_Rate_6 = Max_MAC_MPDU_Rate_6
-            Max_MAC_MSDU_Rate_7 = Max_MAC_MPDU_Rate_7
-
-        Client_22_new = round(Max_MAC_MSDU_Rate_1)
-        Client_23_new = round(Max_MAC_MSDU_Rate_2)
-        Client_24_new = round(Max_MAC_MSDU_Rate_3)
-        Client_25_new = round(Max_MAC_MSDU_Rate_4)
-        Client_26_new = round(Max_MAC_MSDU_Rate_5)
-        Client_27_new = round(Max_MAC_MSDU_Rate_6)
-        Client_28_new = round(Max_MAC_MSDU_Rate_7)
-
-        # Max. 802.11 MAC Frame Data Rate
-
-        Max_802_11_MAC_Frame_Data_Rate_1 = Max_MAC_MPDU_Rate_1 * MAC_MPDU_Size * 8 / 1000000
-        Max_802_11_MAC_Frame_Data_Rate_2 = Max_MAC_MPDU_Rate_2 * MAC_MPDU_Size * 8 / 1000000
-        Max_802_11_MAC_Frame_Data_Rate_3 = Max_MAC_MPDU_Rate_3 * MAC_MPDU_Size * 8 / 1000000
-        Max_802_11_MAC_Frame_Data_Rate_4 = Max_MAC_MPDU_Rate_4 * MAC_MPDU_Size * 8 / 1000000
-        Max_802_11_MAC_Frame_Data_Rate_5 = Max_MAC_MPDU_Rate_5 * MAC_MPDU_Size * 8 / 1000000
-        Max_802_11_MAC_Frame_Data_Rate_6 = Max_MAC_MPDU_Rate_6 * MAC_MPDU_Size * 8 / 1000000
-        Max_802_11_MAC_Frame_Data_Rate_7 = Max_MAC_MPDU_Rate_7 * MAC_MPDU_Size * 8 / 1000000
-
-        Client_29_new = format(Max_802_11_MAC_Frame_Data_Rate_1, '.3f')
-        Client_30_new = format(Max_802_11_MAC_Frame_Data_Rate_2, '.3f')
-        Client_31_new = format(Max_802_11_MAC_Frame_Data_Rate_3, '.3f')
-        Client_32_new = format(Max_802_11_MAC_Frame_Data_Rate_4, '.3f')
-        Client_33_new = format(Max_802_11_MAC_Frame_Data_Rate_5, '.3f')
-        Client_34_new = format(Max_802_11_MAC_Frame_Data_Rate_6, '.3f')
-        Client_35_new = format(Max_802_11_MAC_Frame_Data_Rate_7, '.3f')
-
-        # Max. 802.11 MAC Payload Goodput
-
-        Max_802_11_MAC_Payload_Goodput_1 = MSDU * 8 * Max_MAC_MSDU_Rate_1 / 1000000
-        Max_802_11_MAC_Payload_Goodput_2 = MSDU * 8 * Max_MAC_MSDU_Rate_2 / 1000000
-        Max_802_11_MAC_Payload_Goodput_3 = MSDU * 8 * Max_MAC_MSDU_Rate_3 / 1000000
-        Max_802_11_MAC_Payload_Goodput_4 = MSDU * 8 * Max_MAC_MSDU_Rate_4 / 1000000
-        Max_802_11_MAC_Payload_Goodput_5 = MSDU * 8 * Max_MAC_MSDU_Rate_5 / 1000000
-        Max_802_11_MAC_Payload_Goodput_6 = MSDU * 8 * Max_MAC_MSDU_Rate_6 / 1000000
-        Max_802_11_MAC_Payload_Goodput_7 = MSDU * 8 * Max_MAC_MSDU_Rate_7 / 1000000
-
-        Client_36_new = format(Max_802_11_MAC_Payload_Goodput_1, '.3f')
-        Client_37_new = format(Max_802_11_MAC_Payload_Goodput_2, '.3f')
-        Client_38_new = format(Max_802_11_MAC_Payload_Goodput_3, '.3f')
-        Client_39_new = format(Max_802_11_MAC_Payload_Goodput_4, '.3f')
-        Client_40_new = format(Max_802_11_MAC_Payload_Goodput_5, '.3f')
-        Client_41_new = format(Max_802_11_MAC_Payload_Goodput_6, '.3f')
-        Client_42_new = format(Max_802_11_MAC_Payload_Goodput_7, '.3f')
-
-        # MAC Goodput Per 802.11 Client
-
-        MAC_Goodput_Per_802_11_Client_1 = Max_802_11_MAC_Payload_Goodput_1 / 1
-        MAC_Goodput_Per_802_11_Client_2 = Max_802_11_MAC_Payload_Goodput_2 / 2
-        MAC_Goodput_Per_802_11_Client_3 = Max_802_11_MAC_Payload_Goodput_3 / 5
-        MAC_Goodput_Per_802_11_Client_4 = Max_802_11_MAC_Payload_Goodput_4 / 10
-        MAC_Goodput_Per_802_11_Client_5 = Max_802_11_MAC_Payload_Goodput_5 / 20
-        MAC_Goodput_Per_802_11_Client_6 = Max_802_11_MAC_Payload_Goodput_6 / 50
-        MAC_Goodput_Per_802_11_Client_7 = Max_802_11_MAC_Payload_Goodput_7 / 100
-
-        Client_43_new = format(MAC_Goodput_Per_802_11_Client_1, '.3f')
-        Client_44_new = format(MAC_Goodput_Per_802_11_Client_2, '.3f')
-        Client_45_new = format(MAC_Goodput_Per_802_11_Client_3, '.3f')
-        Client_46_new = format(MAC_Goodput_Per_802_11_Client_4, '.3f')
-        Client_47_new = format(MAC_Goodput_Per_802_11_Client_5, '.3f')
-        Client_48_new = format(MAC_Goodput_Per_802_11_Client_6, '.3f')
-        Client_49_new = format(MAC_Goodput_Per_802_11_Client_7, '.3f')
-
-        # Offered Load (802.3 Side)
-
-        if eth_value != 0:
-
-            Offered_Load_8023_Side_1 = Max_MAC_MSDU_Rate_1 * Ethernet_value * 8 / 1000000
-            Offered_Load_8023_Side_2 = Max_MAC_MSDU_Rate_2 * Ethernet_value * 8 / 1000000
-            Offered_Load_8023_Side_3 = Max_MAC_MSDU_Rate_3 * Ethernet_value * 8 / 1000000
-            Offered_Load_8023_Side_4 = Max_MAC_MSDU_Rate_4 * Ethernet_value * 8 / 1000000
-            Offered_Load_8023_Side_5 = Max_MAC_MSDU_Rate_5 * Ethernet_value * 8 / 1000000
-            Offered_Load_8023_Side_6 = Max_MAC_MSDU_Rate_6 * Ethernet_value * 8 / 1000000
-            Offered_Load_8023_Side_7 = Max_MAC_MSDU_Rate_7 * Ethernet_value * 8 / 1000000
-            Client_50_new = format(Offered_Load_8023_Side_1, '.3f')
-            Client_51_new = format(Offered_Load_8023_Side_2, '.3f')
-            Client_52_new = format(Offered_Load_8023_Side_3, '.3f')
-            Client_53_new = format(Offered_Load_8023_Side_4, '.3f')
-            Client_54_new = format(Offered_Load_8023_Side_5, '.3f')
-            Client_55_new = format(Offered_Load_8023_Side_6, '.3f')
-            Client_56_new = format(Offered_Load_8023_Side_7, '.3f')
-
-        else:
-            Client_50_new = "N/A"
-            Client_51_new = "N/A"
-            Client_52_new = "N/A"
-            Client_53_new = "N/A"
-            Client_54_new = "N/A"
-            Client_55_new = "N/A"
-            Client_56_new = "N/A"
-
-        IP_Packet_value_str = str(IP_Packet_value)
-        if "N/A" not in IP_Packet_value_str:
-            IP_Goodput_802_11_8023_1 = Max_MAC_MSDU_Rate_1 * ip_1 * 8 / 1000000
-            IP_Goodput_802_11_8023_2 = Max_MAC_MSDU_Rate_2 * ip_1 * 8 / 1000000
-            IP_Goodput_802_11_8023_3 = Max_MAC_MSDU_Rate_3 * ip_1 * 8 / 1000000
-            IP_Goodput_802_11_8023_4 = Max_MAC_MSDU_Rate_4 * ip_1 * 8 / 1000000
-            IP_Goodput_802_11_8023_5 = Max_MAC_MSDU_Rate_5 * ip_1 * 8 / 1000000
-            IP_Goodput_802_11_8023_6 = Max_MAC_MSDU_Rate_6 * ip_1 * 8 / 1000000
-            IP_Goodput_802_11_8023_7 = Max_MAC_MSDU_Rate_7 * ip_1 * 8 / 1000000
-            Client_57_new = format(IP_Goodput_802_11_8023_1, '.3f')
-            Client_58_new = format(IP_Goodput_802_11_8023_2, '.3f')
-            Client_59_new = format(IP_Goodput_802_11_8023_3, '.3f')
-            Client_60_new = format(IP_Goodput_802_11_8023_4, '.3f')
-            Client_61_new = format(IP_Goodput_802_11_8023_5, '.3f')
-            Client_62_new = format(IP_Goodput_802_11_8023_6, '.3f')
-            Client_63_new = format(IP_Goodput_802_11_8023_7, '.3f')
-
-        else:
-            Client_57_new = "N/A"
-            Client_58_new = "N/A"
-            Client_59_new = "N/A"
-            Client_60_new = "N/A"
-            Client_61_new = "N/A"
-            Client_62_new = "N/A"
-            Client_63_new = "N/A"
-
-            # Theoretical Voice Call Capacity
-
-        if "Data" in self.Traffic_Type:
-            Maximum_Theoretical_R_value = "N/A"
-            Estimated_MOS_Score = "N/A"
-        else:
-
-            Maximum_Theoretical_R_value = 85.9
-            if Maximum_Theoretical_R_value < 0:
-                Estimated_MOS_Score = 1
-            else:
-                if Maximum_Theoretical_R_value > 100:
-                    Estimated_MOS_Score = 4.5
-                else:
-                    Estimated_MOS_Score_1 = (1 + 0.035 * Maximum_Theoretical_R_value + Maximum_Theoretical_R_value * (
-                            Maximum_Theoretical_R_value - 60) * (100 - Maximum_Theoretical_R_value) * 7 * 0.000001)
-                    Estimated_MOS_Score = format(Estimated_MOS_Score_1, '.2f')
-
-        # Voice_Call_Range
-
-        try:
-            Voice_Call_Range = round(Max_PPDU_Rate_1 / Codec_Frame_Rate)
-
-            # c55 Maximum Bidirectional Voice Calls
-
-            if Voice_Call_Range <= 1:
-                Maximum_Bidirectional = Max_MAC_MSDU_Rate_1 / Codec_Frame_Rate
-
-            else:
-                if Voice_Call_Range <= 2:
-                    Maximum_Bidirectional = Max_MAC_MSDU_Rate_2 / Codec_Frame_Rate
-
-                else:
-                    if Voice_Call_Range <= 5:
-                        Maximum_Bidirectional = Max_MAC_MSDU_Rate_3 / Codec_Frame_Rate
-
-                    else:
-                        if Voice_Call_Range <= 10:
-                            Maximum_Bidirectional = Max_MAC_MSDU_Rate_4 / Codec_Frame_Rate
-
-                        else:
-                            if Voice_Call_Range <= 20:
-                                Maximum_Bidirectional = Max_MAC_MSDU_Rate_5 / Codec_Frame_Rate
-
-                            else:
-                                if Voice_Call_Range <= 50:
-                                    Maximum_Bidirectional = Max_MAC_MSDU_Rate_6 / Codec_Frame_Rate
-
-                                else:
-
-                                    Maximum_Bidirectional = Max_MAC_MSDU_Rate_7 / Codec_Frame_Rate
-        except ZeroDivisionError:
-            pass
-
-        if "Data" in self.Traffic_Type:
-            Maximum_Bidirectional_Voice_Calls = "N/A"
-        else:
-            Maximum_Bidirectional_Voice_Calls = round(Maximum_Bidirectional, 2)
-
-        print("\n" + "******************Station : 11ac Calculator*****************************" + "\n")
-        print("Theoretical Maximum Offered Load" + "\n")
-        print("1 Client:")
-        All_theoretical_output = {'MAC PPDU Interval(usec)': Client_1_new, 'Max PPDU Rate(fps)': Client_8_new,
-                                  'Max MAC MPDU Rate': Client_15_new,
-                                  'Max MAC MSDU Rate': Client_22_new,
-                                  'Max. 802.11 MAC Frame Data Rate(Mb/s)': Client_29_new,
-                                  'Max. 802.11 MAC Payload Goodput(Mb/s)': Client_36_new,
-                                  'MAC Goodput Per 802.11 Client(Mb/s)': Client_43_new,
-                                  'Offered Load (802.3 Side)(Mb/s)': Client_50_new,
-                                  'IP Goodput (802.11 -> 802.3)(Mb/s)': Client_57_new}
-        print(json.dumps(All_theoretical_output, indent=4))
-
-        print("\n" + "Theroretical Voice Call Capacity" + "\n")
-
-        All_theoretical_voice = {'Maximum Theoretical R-value': Maximum_Theoretical_R_value,
-                                 'Estimated MOS Score': Estimated_MOS_Score,
-                                 'Maximum Bidirectional Voice Calls(calls)': Maximum_Bidirectional_Voice_Calls}
-        print(json.dumps(All_theoretical_voice, indent=4))
+    def input_parameter(self):
+        result = self.calculate()
+        _print_theoretical("11ac Calculator", result)
+        return result
+
+
+# ********************************************* Library API ***********************************************
+# capacity() returns the theoretical values as a CapacityResult without printing anything. Results are
+# cached per configuration, so a throughput test can ask for its expected rate at every polling interval:
+#
+#     expected = capacity("11n", stations=len(station_list), Data_Voice_MCS=mcs, Channel_Bandwidth="40")
+#     if measured_mbps < 0.8 * expected.ip_throughput_per_client_mbps:
+#         ...
+
+# rate sets are lists of rates themselves (never swept)
+RATE_SET_OPTIONS = ("Basic_Rate_Set", "BSS_Basic_Rate")
+DEFAULT_RATE_SET = ('1', '2', '5.5', '11', '6', '12', '24')
+# defaults match the command line defaults of main()
+CALCULATOR_DEFAULTS = {
+    "11abg": {"Traffic_Type": "Data", "PHY_Bit_Rate": "54", "Encryption": "None", "QoS": "No",
+              "MAC_Frame_802_11": "1518", "Basic_Rate_Set": DEFAULT_RATE_SET, "Preamble": "Short",
+              "slot_name": "Short", "Codec_Type": "G.723", "RTS_CTS_Handshake": "No", "CTS_to_self": "No"},
+    "11n": {"Traffic_Type": "Data", "Data_Voice_MCS": "7", "Channel_Bandwidth": "40", "Guard_Interval_value": "400",
+            "Highest_Basic_str": "1", "Encryption": "None", "QoS": "Yes", "IP_Packets_MSDU_str": "0",
+            "MAC_Frames_per_A_MPDU_str": "42", "BSS_Basic_Rate": DEFAULT_RATE_SET,
+            "MAC_MPDU_Size_Data_Traffic": "1518", "Codec_Type_Voice_Traffic": "G.711", "PLCP": "Mixed",
+            "CWmin": "15", "RTS_CTS_Handshake": "No", "CTS_to_self_protection": "No"},
+    "11ac": {"Traffic_Type": "Data", "Data_Voice_MCS": "9", "spatial": "4", "Channel_Bandwidth": "80",
+             "Guard_Interval_value": "400", "Highest_Basic_str": "1", "Encryption": "None", "QoS": "Yes",
+             "IP_Packets_MSDU_str": "0", "MAC_Frames_per_A_MPDU_str": "64", "BSS_Basic_Rate": DEFAULT_RATE_SET,
+             "MAC_MPDU_Size_Data_Traffic": "1518", "Codec_Type_Voice_Traffic": "Mixed", "CWmin": "15",
+             "RTS_CTS": "No"},
+}
+CAPACITY_FUNCTIONS = {"11abg": _abg11_theoretical, "11n": _n11_theoretical, "11ac": _ac11_theoretical}
+
+
+def _settings(station, options):
+    """
+    :return: calculator arguments of station in class order, options over the defaults
+    """
+    if station not in CALCULATOR_DEFAULTS:
+        raise ValueError("station must be one of %s, given %s" % (", ".join(CALCULATOR_DEFAULTS), station))
+    unknown = set(options) - set(CALCULATOR_DEFAULTS[station])
+    if unknown:
+        raise ValueError("unknown %s options: %s" % (station, ", ".join(sorted(unknown))))
+    return dict(CALCULATOR_DEFAULTS[station], **options)
+
+
+def capacity(station, stations=1, **options):
+    """
+    Theoretical values of one configuration.
+    :param station: "11abg", "11n" or "11ac"
+    :param stations: number of stations sharing the medium
+    :param options: calculator arguments by name (as in the calculator classes), numbers or strings.
+        Unset arguments take the command line defaults.
+    :return: CapacityResult
+    """
+    stations = int(stations)
+    if stations < 1:
+        raise ValueError("stations must be at least 1, given %s" % stations)
+    arguments = []
+    for name, value in _settings(station, options).items():
+        arguments.append(_rate_set(value) if name in RATE_SET_OPTIONS else str(value))
+    return CAPACITY_FUNCTIONS[station](*arguments, stations)
+
+
+# ********************************************* Sweep mode ***********************************************
+# Evaluates every combination of the given option values at once with numpy, one table row per
+# combination and station count, e.g. to derive pass/fail thresholds for a set of test permutations:
+#
+#     table = sweep("11ac", stations=[1, 10, 50], min_client_mbps=2,
+#                   Data_Voice_MCS=range(10), spatial=[1, 2, 4], Channel_Bandwidth=["20", "40", "80"])
+#     write_sweep([table], "ac_thresholds.csv")
+
+# result columns, named as in the calculators' printed output
+SWEEP_VOICE_CALLS = 'Maximum Bidirectional Voice Calls(calls)'
+SWEEP_MAX_CLIENTS = 'Max Clients'
+
+
+class _SweepGrid:
+    """
+    Cartesian product of the option values plus the station counts. column() maps each
+    distinct value of one option through fn once and spreads the results over the rows.
+    """
+    def __init__(self, options, stations, rate_set=()):
+        self.rate_set = rate_set
+        self.names = list(options) + ["stations"]
+        self.values = [list(values) for values in options.values()] + [list(stations)]
+        shape = [len(values) for values in self.values]
+        self.rows = int(np.prod(shape))
+        self.index = np.indices(shape).reshape(len(shape), -1)
+
+    def column(self, name, fn=None, dtype=None):
+        position = self.names.index(name)
+        values = self.values[position]
+        if fn is not None:
+            values = [fn(value) for value in values]
+        return np.array(values, dtype=dtype)[self.index[position]]
+
+    def config_columns(self):
+        return {name: list(self.column(name, dtype=object)) for name in self.names}
+
+
+def _sweep_voice_calls(voice, frame_rates, call_rates, codec_frame_rate):
+    """
+    Vectorized Maximum Bidirectional Voice Calls
+    :param frame_rates: rate per client count in CLIENT_COUNTS deciding the voice call range, shape (rows, 7)
+    :param call_rates: rate per client count the calls are counted from, shape (rows, 7)
+    """
+    voice_calls = np.round(frame_rates[:, 0] / codec_frame_rate)
+    client = np.searchsorted(np.array(VOICE_CALL_RANGES), voice_calls, side="left")
+    calls = np.round(np.take_along_axis(call_rates, client[:, None], axis=1)[:, 0] / codec_frame_rate, 2)
+    return np.where(voice & (codec_frame_rate > 0), calls, np.nan)
+
+
+def _sweep_max_clients(ip_throughput, min_client_mbps):
+    """
+    Stations that each get at least min_client_mbps of the IP throughput
+    """
+    return np.floor(np.nan_to_num(ip_throughput) / min_client_mbps).astype(int)
+
+
+def _sweep_abg11(grid):
+    c = grid.column
+    rate_set = grid.rate_set
+    phy = c("PHY_Bit_Rate", _abg_phy_rate)
+    PHY_Bit_Rate_int = phy[:, 0].astype(int)
+    yellow_cell = phy[:, 1].astype(float)
+    cck = np.isin(PHY_Bit_Rate_int, ABG_CCK_RATES)
+    PHY_Bit = c("PHY_Bit_Rate", lambda value: _abg_control_rate(*_abg_phy_rate(value), rate_set), dtype=float)
+    cck_control = np.isin(PHY_Bit, ABG_CCK_CONTROL_RATES)
+    CWmin = np.where(cck, _abg_cwmin(True, rate_set), _abg_cwmin(False, rate_set))
+
+    Enc_value = c("Encryption", _encrypt_hdr)
+    Qos_value = np.where(c("QoS", lambda value: "Yes" in value), 2, 0)
+    MAC_Frame = c("MAC_Frame_802_11", int)
+    ip_packet = np.trunc(MAC_Frame - 36 - Enc_value.astype(float) - Qos_value.astype(float))
+    Ethernet_MAC_Frame = np.maximum(MAC_Frame.astype(float) - 24 - 8 + 14 - Enc_value - Qos_value, 64)
+
+    codec = c("Codec_Type", _codec, dtype=float)
+    Codec_IP_Packet_Size, Codec_Frame_rate = codec[:, 0], codec[:, 1]
+    data = c("Traffic_Type", lambda value: "Data" in value)
+    MAC_MPDU_Size = np.where(data, MAC_Frame, Codec_IP_Packet_Size + 28 + Enc_value + Qos_value + 8)
+
+    short_preamble = c("Preamble", lambda value: "Short" in value)
+    Preamble_1 = np.where(short_preamble, 96.0, 192.0)
+    ack_symbols = np.trunc((14 * 8 + 22 + PHY_Bit * 4 - 1) / (PHY_Bit * 4))
+    rts_symbols = np.trunc(((20 + 14) * 8 + 22 + PHY_Bit * 4 - 1) / (PHY_Bit * 4))
+    Ttxframe = np.where(cck_control, (14 * 8) / PHY_Bit + Preamble_1, ack_symbols * 4 + 20)
+
+    SIFS_value = np.where(cck, 10.0, 16.0)
+    rts = c("RTS_CTS_Handshake", lambda value: _no_yes(value, "RTS/CTS Handshake"))
+    RTS_CTS_Handshake_Overhead = np.where(rts, np.where(cck_control, ((20 + 14) * 8) / PHY_Bit + Preamble_1,
+                                                        rts_symbols * 4 + 2 * 20) + (2 * SIFS_value), 0)
+    no_cts = c("CTS_to_self", lambda value: "No" in value) | rts
+    CTS_to_self_Handshake = np.where(no_cts, 0, np.where(cck_control, (14 * 8) / PHY_Bit + Preamble_1 + SIFS_value,
+                                                         ack_symbols * 4 + 20 + SIFS_value))
+
+    short_slot = (~cck) & c("slot_name", lambda value: "Short" in value)
+    DIFS_value = np.where(short_slot, 34, 50)
+    MeanBackoff_value = np.where(short_slot, CWmin * 9 / 2, CWmin * 20 / 2)
+
+    Nbits_value = MAC_MPDU_Size * 8
+    Ndbps_value = yellow_cell * 4
+    Tmac_value = np.where(cck, Nbits_value / yellow_cell, np.trunc((Nbits_value + 22 + Ndbps_value) / Ndbps_value) * 4)
+    Tplcp = np.where(cck, Preamble_1, 20.0)
+    Ttxframe_data = Tmac_value + Tplcp
+
+    def interval(clients):
+        return (Ttxframe_data + SIFS_value + Ttxframe + DIFS_value + RTS_CTS_Handshake_Overhead +
+                CTS_to_self_Handshake + MeanBackoff_value / clients)
+
+    stations = c("stations", int)
+    Client = interval(stations)
+    Max_Frame_Rate = 1000000 / Client
+    Max_Offered_Load = Max_Frame_Rate * Nbits_value / 1000000
+    ip_throughput = np.where(ip_packet < 20, np.nan, Max_Frame_Rate * ip_packet * 8 / 1000000)
+    frame_rates = 1000000 / np.stack([interval(clients) for clients in CLIENT_COUNTS], axis=1)
+    R_value = np.where(data, np.nan, codec[:, 2])
+
+    return {'Packet Interval(usec)': Client,
+            'Max Frame Rate(fps)': Max_Frame_Rate,
+            'Max. Offered Load (802.11)(Mb/s)': Max_Offered_Load,
+            'Offered Load Per 802.11 Client(Mb/s)': Max_Offered_Load / stations,
+            'Offered Load (802.3 Side)(Mb/s)': Max_Frame_Rate * Ethernet_MAC_Frame * 8 / 1000000,
+            'IP Throughput (802.11 -> 802.3)(Mb/s)': ip_throughput,
+            'Maximum Theoretical R-value': R_value,
+            SWEEP_VOICE_CALLS: _sweep_voice_calls(~data, frame_rates, np.round(frame_rates), Codec_Frame_rate)}
+
+
+def _sweep_ht_mpdu(grid, Codec_IP_Packet_Size):
+    """
+    Vectorized MAC MPDU Size and MSDU Size of 802.11n/ac
+    :return: (MAC MPDU Size, MSDU Size before rounding, IP Packets per A-MSDU)
+    """
+    c = grid.column
+    IP_Packets_MSDU = c("IP_Packets_MSDU_str", int)
+    QoS_Hdr = np.where(c("QoS", lambda value: _yes_no(value, "QoS")) | (IP_Packets_MSDU > 1), 2, 0)
+    Encrypt_Hdr = c("Encryption", _encrypt_hdr)
+    per_msdu = np.maximum(IP_Packets_MSDU, 1)
+    voice_size = Codec_IP_Packet_Size + 28 + QoS_Hdr + Encrypt_Hdr + 8
+    voice_mpdu = np.where(IP_Packets_MSDU == 0, voice_size,
+                          np.trunc((voice_size + IP_Packets_MSDU * (14 + 3)) / per_msdu))
+    MAC_MPDU_Size = np.where(c("Traffic_Type", lambda value: "Data" in value),
+                             c("MAC_MPDU_Size_Data_Traffic", int), voice_mpdu).astype(np.int64)
+    payload = MAC_MPDU_Size - 28 - QoS_Hdr - Encrypt_Hdr
+    MSDU_final = np.where(IP_Packets_MSDU == 0, payload, (payload - IP_Packets_MSDU * (14 + 3)) / per_msdu)
+    return MAC_MPDU_Size, MSDU_final, IP_Packets_MSDU
+
+
+def _sweep_ht(grid, Ttxframe, control_rate, rts_cts_usec, cts_self_usec, MAC_MPDU_Size, MSDU, IP_Packets_MSDU,
+              Codec_Frame_Rate, R_value):
+    """
+    Vectorized theoretical values shared by 802.11n and 802.11ac once Ttxframe is known
+    """
+    c = grid.column
+    MAC_Frames_per_A_MPDU = c("MAC_Frames_per_A_MPDU_str", int)
+    ack_usec = np.zeros(max(HT_ACK_USEC) + 1)
+    blockack_usec = np.zeros(max(HT_BLOCKACK_USEC) + 1)
+    for rate in HT_ACK_USEC:
+        ack_usec[rate] = HT_ACK_USEC[rate]
+        blockack_usec[rate] = HT_BLOCKACK_USEC[rate]
+    use_blockack = MAC_Frames_per_A_MPDU != 0
+    Ack_Response_Overhead = np.where(use_blockack, 0, HT_SIFS + ack_usec[control_rate])
+    BlockAck_Response_Overhead = np.where(use_blockack, HT_SIFS + blockack_usec[control_rate], 0)
+    MeanBackoff = c("CWmin", int) * HT_SLOT_TIME / 2
+
+    def rates(clients):
+        interval = (rts_cts_usec + cts_self_usec + Ttxframe + Ack_Response_Overhead + BlockAck_Response_Overhead +
+                    HT_DIFS + (MeanBackoff / clients))
+        ppdu_rate = 1000000 / interval
+        mpdu_rate = np.where(MAC_Frames_per_A_MPDU > 0, MAC_Frames_per_A_MPDU * ppdu_rate, ppdu_rate)
+        msdu_rate = np.where(IP_Packets_MSDU > 0, IP_Packets_MSDU * mpdu_rate, mpdu_rate)
+        return interval, ppdu_rate, mpdu_rate, msdu_rate
+
+    stations = c("stations", int)
+    interval, ppdu_rate, mpdu_rate, msdu_rate = rates(stations)
+    goodput = MSDU * 8 * msdu_rate / 1000000
+    ip_ok = (MSDU - 8) >= 20
+    IP_Packet = MSDU - 8
+    Ethernet = np.maximum(IP_Packet + 18, 64)
+    per_client_count = [rates(clients) for clients in CLIENT_COUNTS]
+    ppdu_rates = np.stack([r[1] for r in per_client_count], axis=1)
+    msdu_rates = np.stack([r[3] for r in per_client_count], axis=1)
+    voice = ~c("Traffic_Type", lambda value: "Data" in value)
+
+    return {'MAC PPDU Interval(usec)': interval,
+            'Max PPDU Rate(fps)': ppdu_rate,
+            'Max MAC MPDU Rate': mpdu_rate,
+            'Max MAC MSDU Rate': msdu_rate,
+            'Max. 802.11 MAC Frame Data Rate(Mb/s)': mpdu_rate * MAC_MPDU_Size * 8 / 1000000,
+            'Max. 802.11 MAC Payload Goodput(Mb/s)': goodput,
+            'MAC Goodput Per 802.11 Client(Mb/s)': goodput / stations,
+            'Offered Load (802.3 Side)(Mb/s)': np.where(ip_ok, msdu_rate * Ethernet * 8 / 1000000, np.nan),
+            'IP Goodput (802.11 -> 802.3)(Mb/s)': np.where(ip_ok, msdu_rate * IP_Packet * 8 / 1000000, np.nan),
+            'Maximum Theoretical R-value': np.where(voice, R_value, np.nan),
+            SWEEP_VOICE_CALLS: _sweep_voice_calls(voice, ppdu_rates, msdu_rates, Codec_Frame_Rate)}
+
+
+def _sweep_nbits(grid, MAC_MPDU_Size):
+    """
+    Vectorized Nbits, Bits per MAC PPDU including the A-MPDU Pad
+    """
+    MAC_Frames_per_A_MPDU = grid.column("MAC_Frames_per_A_MPDU_str", int)
+    MPDU_Pad = (4 - MAC_MPDU_Size % 4) % 4
+    return np.where(MAC_Frames_per_A_MPDU == 0, MAC_MPDU_Size * 8,
+                    ((MAC_MPDU_Size + 4) * MAC_Frames_per_A_MPDU + MPDU_Pad * (MAC_Frames_per_A_MPDU - 1)) * 8)
+
+
+def _sweep_tsymbol(grid, Data_Voice_MCS_int, plcp):
+    short_gi = grid.column("Guard_Interval_value", _guard_interval_400)
+    return np.where(short_gi & (((Data_Voice_MCS_int > 7) & (plcp == 2)) | (plcp == 1)), 3.60, 4.0)
+
+
+def _sweep_n11(grid):
+    c = grid.column
+    Data_Voice_MCS_int = c("Data_Voice_MCS", lambda value: _mcs(value, len(N11_NON_HT_REF)))
+    bandwidth = c("Channel_Bandwidth", lambda value: _bandwidth(value, N11_BANDWIDTHS))
+    codec = c("Codec_Type_Voice_Traffic", _codec, dtype=float)
+    MAC_MPDU_Size, MSDU_final, IP_Packets_MSDU = _sweep_ht_mpdu(grid, codec[:, 0].astype(int))
+    # 11n drops one more byte from negative MSDU sizes of two or more digits
+    MSDU = np.trunc(MSDU_final).astype(np.int64) - (MSDU_final <= -10)
+
+    plcp = c("PLCP", _plcp_config)
+    HT_LTFs = np.array(N11_HT_LTFS)[Data_Voice_MCS_int // 8]
+    Tppdu_fixed_Data_Frame = np.where(plcp == 1, 36 + 4 * HT_LTFs, 24 + 4 * HT_LTFs).astype(float)
+    ndbps = np.where(bandwidth == "20", np.array(N11_NDBPS["20"])[Data_Voice_MCS_int % 8],
+                     np.array(N11_NDBPS["40"])[Data_Voice_MCS_int % 8])
+    data_bits = ndbps * (Data_Voice_MCS_int // 8 + 1)
+    offset = np.where(c("Channel_Bandwidth", lambda value: "40" in value),
+                      6 * np.array(N11_NES)[Data_Voice_MCS_int], 6)
+    Nbits = _sweep_nbits(grid, MAC_MPDU_Size)
+    Ttxframe = np.round(Tppdu_fixed_Data_Frame + ((16 + offset + Nbits + data_bits - 1) // data_bits) *
+                        _sweep_tsymbol(grid, Data_Voice_MCS_int, plcp), 2)
+
+    control_rate = c("Data_Voice_MCS", lambda value: _ht_control_rate(N11_NON_HT_REF[int(value)], grid.rate_set))
+    rts = c("RTS_CTS_Handshake", lambda value: "Yes" in value)
+    cts_self = c("CTS_to_self_protection", lambda value: "Yes" in value) & ~rts
+    bandwidth_20 = c("Channel_Bandwidth", lambda value: "20" in value)
+    rts_cts_usec = np.where(rts, np.where(bandwidth_20, HT_RTS_CTS_USEC_20, HT_RTS_CTS_USEC_WIDE), 0)
+    cts_self_usec = np.where(cts_self, np.where(bandwidth_20, HT_CTS_SELF_USEC_20, HT_CTS_SELF_USEC_WIDE), 0)
+    return _sweep_ht(grid, Ttxframe, control_rate, rts_cts_usec, cts_self_usec, MAC_MPDU_Size, MSDU,
+                     IP_Packets_MSDU, codec[:, 1], codec[:, 2])
+
+
+def _sweep_ac11(grid):
+    c = grid.column
+    Data_Voice_MCS_int = c("Data_Voice_MCS", lambda value: _mcs(value, len(AC11_NON_HT_REF)))
+    spatial_int = c("spatial", _ac11_spatial)
+    bandwidth_index = c("Channel_Bandwidth", lambda value: AC11_BANDWIDTHS.index(_bandwidth(value, AC11_BANDWIDTHS)))
+    # 11ac has no PLCP option of its own, the Codec Type carries it
+    plcp = c("Codec_Type_Voice_Traffic", _plcp_config)
+    cts_self = c("RTS_CTS", lambda value: _no_yes(value, "RTS/CTS Handshake and CTS-to-self"))
+
+    MAC_MPDU_Size, MSDU_final, IP_Packets_MSDU = _sweep_ht_mpdu(grid, AC11_CODEC_IP_PACKET_SIZE)
+    MSDU = np.trunc(MSDU_final).astype(np.int64)
+    MSDU = MSDU - (MSDU < 0)
+
+    Tppdu_fixed = 36 + np.array(AC11_HT_LTFS)[spatial_int - 1] * 4
+    ndbps = np.array([AC11_NDBPS[bandwidth] for bandwidth in AC11_BANDWIDTHS])
+    Ndbps_bits_per_symbol_Data = ndbps[bandwidth_index, Data_Voice_MCS_int] * spatial_int
+    nes = np.array([AC11_NES[streams] for streams in sorted(AC11_NES)])
+    Nes = nes[spatial_int - 1, bandwidth_index * 10 + Data_Voice_MCS_int]
+    Nbits = _sweep_nbits(grid, MAC_MPDU_Size)
+    Ttxframe = Tppdu_fixed + ((16 + 6 * Nes + Nbits + Ndbps_bits_per_symbol_Data - 1)
+                              // Ndbps_bits_per_symbol_Data) * _sweep_tsymbol(grid, Data_Voice_MCS_int, plcp)
+
+    control_rate = c("Data_Voice_MCS", lambda value: _ht_control_rate(AC11_NON_HT_REF[int(value)], grid.rate_set))
+    bandwidth_20 = c("Channel_Bandwidth", lambda value: "20" in value)
+    cts_self_usec = np.where(cts_self, np.where(bandwidth_20, HT_CTS_SELF_USEC_20, HT_CTS_SELF_USEC_WIDE), 0)
+    return _sweep_ht(grid, Ttxframe, control_rate, 0, cts_self_usec, MAC_MPDU_Size, MSDU, IP_Packets_MSDU,
+                     AC11_CODEC_FRAME_RATE, AC11_R_VALUE)
+
+
+SWEEP_KERNELS = {"11abg": _sweep_abg11, "11n": _sweep_n11, "11ac": _sweep_ac11}
+
+
+def sweep(station, stations=(1,), min_client_mbps=None, **options):
+    """
+    Theoretical values for every combination of option values, vectorized with numpy.
+    :param station: "11abg", "11n" or "11ac"
+    :param stations: station counts to evaluate each combination for
+    :param min_client_mbps: when given, adds a Max Clients column: stations that each get this much IP throughput
+    :param options: calculator arguments by name (as in the calculator classes); a list, tuple or range is
+        swept, a single value is held. Unset arguments take the command line defaults.
+    :return: table as a dict of column name to list (option columns) or numpy array (results)
+    """
+    swept = {}
+    rate_set = ()
+    for name, value in _settings(station, options).items():
+        if name in RATE_SET_OPTIONS:
+            rate_set = _rate_set(value)
+        elif isinstance(value, (list, tuple, range)):
+            swept[name] = [str(item) for item in value]
+        else:
+            swept[name] = [str(value)]
+    grid = _SweepGrid(swept, stations, rate_set)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        results = SWEEP_KERNELS[station](grid)
+    table = {"Station": [station] * grid.rows}
+    table.update(grid.config_columns())
+    table.update(results)
+    if min_client_mbps is not None:
+        throughput = results.get('IP Throughput (802.11 -> 802.3)(Mb/s)',
+                                 results.get('IP Goodput (802.11 -> 802.3)(Mb/s)'))
+        table[SWEEP_MAX_CLIENTS] = _sweep_max_clients(throughput, min_client_mbps)
+    return table
+
+
+def _sweep_rows(tables):
+    """
+    :return: (column names, rows as dicts) of tables merged in order; cells are str, int, float or "N/A"
+    """
+    columns = []
+    rows = []
+    for table in tables:
+        for name in table:
+            if name not in columns:
+                columns.append(name)
+        names = list(table)
+        for values in zip(*(table[name] for name in names)):
+            row = {}
+            for name, value in zip(names, values):
+                if isinstance(value, (float, np.floating)):
+                    value = "N/A" if np.isnan(value) else round(float(value), 3)
+                elif isinstance(value, np.integer):
+                    value = int(value)
+                row[name] = value
+            rows.append(row)
+    return columns, rows
+
+
+def write_sweep(tables, filename=None):
+    """
+    Write sweep() tables as csv, or as json when filename ends with .json; csv to stdout without a filename.
+    """
+    columns, rows = _sweep_rows(tables)
+    if filename is not None and filename.endswith(".json"):
+        with open(filename, "w") as json_file:
+            json.dump(rows, json_file, indent=2)
+        return
+    if filename is None:
+        writer = csv.DictWriter(sys.stdout, fieldnames=columns, restval="")
+        writer.writeheader()
+        writer.writerows(rows)
+        return
+    with open(filename, "w", newline="") as csv_file:
+        writer = csv.DictWriter(csv_file, fieldnames=columns, restval="")
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def _sweep_values(value):
+    """
+    "0-9,12" -> ['0', ..., '9', '12']; other comma separated values are split as they are
+    """
+    values = []
+    for item in value.split(","):
+        item = item.strip()
+        low, dash, high = item.partition("-")
+        if dash and low.isdigit() and high.isdigit():
+            values += [str(number) for number in range(int(low), int(high) + 1)]
+        elif item:
+            values.append(item)
+    return values
 
 
 # main method
@@ -2205,6 +1295,16 @@ def main():
     ap.add_argument("-rc", "--rtscts", help="Enter the RTS/CTS Handshake and CTS-to-self "
                                             "  = ['No','Yes'] (by Default No for 11ac)")
 
+    # Sweep mode
+
+    ap.add_argument("--sweep", action="store_true",
+                    help="Evaluate every combination of comma separated option values, e.g. -d 0-9 -spa 1,2,4 "
+                         "-ch 20,40,80, and write one table row per combination and station count")
+    ap.add_argument("--stations", default="1", help="Station counts for --sweep, e.g. 1,10,50 (by Default 1)")
+    ap.add_argument("--min_client_mbps", type=float,
+                    help="With --sweep, add a Max Clients column: stations that each get this much IP throughput")
+    ap.add_argument("--sweep_output", help="File for the --sweep table, .csv or .json (by Default csv on stdout)")
+
     try:
         args = ap.parse_args()
         # Station
@@ -2381,6 +1481,36 @@ def main():
         logging.exception(e)
         exit(2)
 
+    if args.sweep:
+        stations = [int(count) for count in _sweep_values(args.stations)]
+        tables = []
+        if "11abg" in Calculator_name:
+            options = dict(Traffic_Type=traffic_name, PHY_Bit_Rate=phy_name, Encryption=encryption_name,
+                           QoS=qos_name, MAC_Frame_802_11=mac_name, Preamble=preamble_name, slot_name=slot_name,
+                           Codec_Type=codec_name, RTS_CTS_Handshake=rts_name, CTS_to_self=cts_name)
+            tables.append(sweep("11abg", stations, args.min_client_mbps, Basic_Rate_Set=basic_name,
+                                **{name: _sweep_values(value) for name, value in options.items()}))
+        if "11n" in Calculator_name:
+            options = dict(Traffic_Type=traffic_name, Data_Voice_MCS=data_name, Channel_Bandwidth=channel_name,
+                           Guard_Interval_value=guard_name, Highest_Basic_str=highest_name, Encryption=encryption_name,
+                           QoS=qos_name, IP_Packets_MSDU_str=ip_name, MAC_Frames_per_A_MPDU_str=mc_name,
+                           MAC_MPDU_Size_Data_Traffic=mac_name, Codec_Type_Voice_Traffic=codec_name,
+                           PLCP=plcp_name, CWmin=cwin_name, RTS_CTS_Handshake=rts_name,
+                           CTS_to_self_protection=cts_name)
+            tables.append(sweep("11n", stations, args.min_client_mbps, BSS_Basic_Rate=basic_name,
+                                **{name: _sweep_values(value) for name, value in options.items()}))
+        if "11ac" in Calculator_name:
+            options = dict(Traffic_Type=traffic_name, Data_Voice_MCS=data_name, spatial=spatial_name,
+                           Channel_Bandwidth=channel_name, Guard_Interval_value=guard_name,
+                           Highest_Basic_str=highest_name, Encryption=encryption_name, QoS=qos_name,
+                           IP_Packets_MSDU_str=ip_name, MAC_Frames_per_A_MPDU_str=mc_name,
+                           MAC_MPDU_Size_Data_Traffic=mac_name, Codec_Type_Voice_Traffic=codec_name,
+                           CWmin=cwin_name, RTS_CTS=rtscts_name)
+            tables.append(sweep("11ac", stations, args.min_client_mbps, BSS_Basic_Rate=basic_name,
+                                **{name: _sweep_values(value) for name, value in options.items()}))
+        write_sweep(tables, args.sweep_output)
+        return
+
     # Select station(802.11a/b/g/n/ac standards)
 
     if "11abg" in Calculator_name:
@@ -2402,4 +1532,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
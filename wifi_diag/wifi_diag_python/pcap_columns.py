@@ -0,0 +1,358 @@
+"""
+-----------------------------------------------------------------------------
+Name : WIFI Diag pcap columns
+------------------------------------------------------------------------------
+
+Reads the per packet values the WIFI Diag histograms need (frame control, data rate,
+PHY, MCS, bandwidth, spatial streams, signal and A-MPDU reference) into numpy columns,
+one row per packet, without building a pyshark packet per row:
+
+    read_capture(path)          parses pcap/pcapng radiotap and 802.11 headers from a memory map
+    read_capture_tshark(path)   runs one "tshark -T fields" and parses its output
+
+    columns = read_capture("wifi_diag.pcap")
+    data = columns.frame_type == 2
+    values, counts = np.unique(columns.mcs[data & (columns.mcs >= 0)], return_counts=True)
+"""
+
+import mmap
+import struct
+import subprocess
+import tempfile
+
+import numpy as np
+
+# wlan_radio.phy values
+PHY_UNKNOWN = 0
+PHY_11B = 4
+PHY_11A = 5
+PHY_11G = 6
+PHY_11N = 7
+PHY_11AC = 8
+PHY_11AX = 11
+PHY_NAMES = {0: "Unknown", 1: "802.11 FHSS", 2: "802.11 IR", 3: "802.11 DSSS", 4: "802.11b", 5: "802.11a",
+             6: "802.11g", 7: "802.11n", 8: "802.11ac", 9: "802.11ad", 10: "802.11ah", 11: "802.11ax"}
+
+LINKTYPE_IEEE802_11 = 105
+LINKTYPE_IEEE802_11_RADIOTAP = 127
+
+PCAP_MAGIC = {b"\xd4\xc3\xb2\xa1": "<", b"\xa1\xb2\xc3\xd4": ">",
+              b"\x4d\x3c\xb2\xa1": "<", b"\xa1\xb2\x3c\x4d": ">"}
+PCAPNG_SHB = 0x0A0D0D0A
+PCAPNG_BYTE_ORDER = 0x1A2B3C4D
+
+# radiotap present bits up to HE: (alignment, size)
+RADIOTAP_FIELDS = ((8, 8), (1, 1), (1, 1), (2, 4), (1, 2), (1, 1), (1, 1), (2, 2), (2, 2), (2, 2), (1, 1), (1, 1),
+                   (1, 1), (1, 1), (2, 2), (2, 2), (1, 1), (1, 1), (4, 8), (1, 3), (4, 8), (2, 12), (8, 12), (2, 12))
+RT_RATE = 2
+RT_CHANNEL = 3
+RT_DBM_ANTSIGNAL = 5
+RT_MCS = 19
+RT_AMPDU = 20
+RT_VHT = 21
+RT_HE = 23
+RT_EXT = 31
+CHAN_CCK = 0x0020
+CHAN_OFDM = 0x0040
+CHAN_2GHZ = 0x0080
+CHAN_DYN = 0x0400
+
+# radiotap VHT bandwidth code to MHz
+VHT_BW = (20, 40, 40, 40, 80, 80, 80, 80, 80, 80, 80, 160, 160, 160, 160, 160, 160, 160, 160, 160, 160, 160,
+          160, 160, 160, 160)
+HE_BW = (20, 40, 80, 160)
+HT_BW = (20, 40, 20, 20)
+# data subcarriers by bandwidth, and bits per subcarrier by MCS (modulation bits * coding rate)
+HT_SUBCARRIERS = {20: 52, 40: 108, 80: 234, 160: 468}
+HE_SUBCARRIERS = {20: 234, 40: 468, 80: 980, 160: 1960}
+MCS_BITS = (0.5, 1.0, 1.5, 2.0, 3.0, 4.0, 4.5, 5.0, 6.0, 20.0 / 3, 7.5, 25.0 / 3)
+HE_GI_USEC = (0.8, 1.6, 3.2)
+
+
+def ht_rate(mcs, nss, bandwidth, short_gi):
+    """
+    :return: 802.11n/ac data rate in Mb/s, rounded as wireshark shows it
+    """
+    if (mcs < 0) or (mcs >= len(MCS_BITS)) or (nss < 1) or (bandwidth not in HT_SUBCARRIERS):
+        return np.nan
+    symbol_usec = 3.6 if short_gi else 4.0
+    return round(HT_SUBCARRIERS[bandwidth] * MCS_BITS[mcs] * nss / symbol_usec, 1)
+
+
+def he_rate(mcs, nss, bandwidth, gi):
+    """
+    :return: 802.11ax data rate in Mb/s
+    """
+    if (mcs < 0) or (mcs >= len(MCS_BITS)) or (nss < 1) or (bandwidth not in HE_SUBCARRIERS) or (gi > 2):
+        return np.nan
+    return round(HE_SUBCARRIERS[bandwidth] * MCS_BITS[mcs] * nss / (12.8 + HE_GI_USEC[gi]), 1)
+
+
+class PacketColumns:
+    """
+    One numpy array per value, one row per packet. Missing values are -1 (nan for the float
+    columns and 0 for phy and bandwidth); frame_type is -1 when the packet has no 802.11 header.
+    fc is the first frame control byte, e.g. 0x88 for QoS Data.
+    """
+    NAMES = ("fc", "frame_type", "rate", "phy", "mcs", "bandwidth", "nss", "signal", "ampdu")
+
+    def __init__(self, **columns):
+        for name in self.NAMES:
+            setattr(self, name, columns[name])
+
+    def __len__(self):
+        return len(self.fc)
+
+    @classmethod
+    def from_lists(cls, fc, rate, phy, mcs, bandwidth, nss, signal, ampdu):
+        fc = np.asarray(fc, dtype=np.int16)
+        return cls(fc=fc,
+                   frame_type=np.where(fc >= 0, (fc >> 2) & 3, -1).astype(np.int8),
+                   rate=np.asarray(rate, dtype=np.float64),
+                   phy=np.asarray(phy, dtype=np.int8),
+                   mcs=np.asarray(mcs, dtype=np.int16),
+                   bandwidth=np.asarray(bandwidth, dtype=np.int16),
+                   nss=np.asarray(nss, dtype=np.int8),
+                   signal=np.asarray(signal, dtype=np.float64),
+                   ampdu=np.asarray(ampdu, dtype=np.int64))
+
+
+class _ColumnLists:
+    def __init__(self):
+        self.fc = []
+        self.rate = []
+        self.phy = []
+        self.mcs = []
+        self.bandwidth = []
+        self.nss = []
+        self.signal = []
+        self.ampdu = []
+
+    def add(self, fc=-1, rate=np.nan, phy=PHY_UNKNOWN, mcs=-1, bandwidth=0, nss=-1, signal=np.nan, ampdu=-1):
+        self.fc.append(fc)
+        self.rate.append(rate)
+        self.phy.append(phy)
+        self.mcs.append(mcs)
+        self.bandwidth.append(bandwidth)
+        self.nss.append(nss)
+        self.signal.append(signal)
+        self.ampdu.append(ampdu)
+
+    def columns(self):
+        return PacketColumns.from_lists(self.fc, self.rate, self.phy, self.mcs, self.bandwidth, self.nss,
+                                        self.signal, self.ampdu)
+
+
+def _add_radiotap(lists, data, start, end):
+    """
+    Parse one radiotap header and the 802.11 frame control after it. A truncated or
+    malformed header is recorded as a packet with missing values.
+    """
+    if end - start < 8:
+        lists.add()
+        return
+    rt_len, present = struct.unpack_from("<HI", data, start + 2)
+    header_end = start + rt_len
+    if (rt_len < 8) or (header_end > end):
+        lists.add()
+        return
+    offset = start + 8
+    word = present
+    while word & (1 << RT_EXT):
+        if offset + 4 > header_end:
+            lists.add()
+            return
+        word, = struct.unpack_from("<I", data, offset)
+        offset += 4
+    fc = data[header_end] if header_end < end else -1
+    values = {}
+    for bit, (align, size) in enumerate(RADIOTAP_FIELDS):
+        if not present & (1 << bit):
+            continue
+        offset += (start - offset) % align
+        if offset + size > header_end:
+            break
+        if bit in (RT_RATE, RT_CHANNEL, RT_DBM_ANTSIGNAL, RT_MCS, RT_AMPDU, RT_VHT, RT_HE):
+            values[bit] = offset
+        offset += size
+
+    rate = np.nan
+    phy = PHY_UNKNOWN
+    mcs = -1
+    bandwidth = 0
+    nss = -1
+    signal = np.nan
+    ampdu = -1
+    if RT_DBM_ANTSIGNAL in values:
+        signal = struct.unpack_from("<b", data, values[RT_DBM_ANTSIGNAL])[0]
+    if RT_AMPDU in values:
+        ampdu = struct.unpack_from("<I", data, values[RT_AMPDU])[0]
+    if RT_RATE in values:
+        rate = data[values[RT_RATE]] / 2
+    if RT_CHANNEL in values:
+        flags, = struct.unpack_from("<H", data, values[RT_CHANNEL] + 2)
+        if flags & CHAN_CCK:
+            phy = PHY_11B
+        elif flags & CHAN_DYN:
+            phy = PHY_11G
+        elif flags & CHAN_OFDM:
+            phy = PHY_11G if flags & CHAN_2GHZ else PHY_11A
+    if RT_HE in values:
+        _, _, data3, _, data5, data6 = struct.unpack_from("<6H", data, values[RT_HE])
+        phy = PHY_11AX
+        mcs = (data3 >> 8) & 0x0f
+        code = data5 & 0x0f
+        bandwidth = HE_BW[code] if code < len(HE_BW) else 0
+        nss = data6 & 0x0f
+        rate = he_rate(mcs, nss, bandwidth, (data5 >> 4) & 0x03)
+    elif RT_VHT in values:
+        position = values[RT_VHT]
+        flags = data[position + 2]
+        code = data[position + 3]
+        mcs = data[position + 4] >> 4
+        nss = data[position + 4] & 0x0f
+        phy = PHY_11AC
+        bandwidth = VHT_BW[code] if code < len(VHT_BW) else 0
+        rate = ht_rate(mcs, nss, bandwidth, flags & 0x04)
+    elif RT_MCS in values:
+        position = values[RT_MCS]
+        flags = data[position + 1]
+        index = data[position + 2]
+        phy = PHY_11N
+        mcs = index
+        nss = index // 8 + 1
+        bandwidth = HT_BW[flags & 0x03]
+        rate = ht_rate(index % 8, nss, bandwidth, flags & 0x04)
+    lists.add(fc, rate, phy, mcs, bandwidth, nss, signal, ampdu)
+
+
+def _add_packet(lists, linktype, data, start, end):
+    if linktype == LINKTYPE_IEEE802_11_RADIOTAP:
+        _add_radiotap(lists, data, start, end)
+    elif (linktype == LINKTYPE_IEEE802_11) and (end > start):
+        lists.add(fc=data[start])
+    else:
+        lists.add()
+
+
+def _read_pcap(lists, data):
+    order = PCAP_MAGIC[bytes(data[0:4])]
+    linktype, = struct.unpack_from(order + "I", data, 20)
+    record = struct.Struct(order + "IIII")
+    offset = 24
+    size = len(data)
+    while offset + 16 <= size:
+        _, _, caplen, _ = record.unpack_from(data, offset)
+        offset += 16
+        _add_packet(lists, linktype, data, offset, min(offset + caplen, size))
+        offset += caplen
+
+
+def _read_pcapng(lists, data):
+    order = "<"
+    linktypes = []
+    offset = 0
+    size = len(data)
+    while offset + 12 <= size:
+        block_type, = struct.unpack_from("<I", data, offset)
+        if block_type == PCAPNG_SHB:
+            magic, = struct.unpack_from("<I", data, offset + 8)
+            order = "<" if magic == PCAPNG_BYTE_ORDER else ">"
+            linktypes = []
+        block_type, block_len = struct.unpack_from(order + "II", data, offset)
+        if block_len < 12:
+            raise ValueError("pcapng: bad block length %d at offset %d" % (block_len, offset))
+        if block_type == 1:
+            linktypes.append(struct.unpack_from(order + "H", data, offset + 8)[0])
+        elif block_type == 6:
+            interface, _, _, caplen = struct.unpack_from(order + "IIII", data, offset + 8)
+            start = offset + 28
+            _add_packet(lists, linktypes[interface], data, start, min(start + caplen, offset + block_len))
+        elif block_type == 3:
+            start = offset + 12
+            _add_packet(lists, linktypes[0], data, start, offset + block_len - 4)
+        elif block_type == 2:
+            interface, = struct.unpack_from(order + "H", data, offset + 8)
+            caplen, = struct.unpack_from(order + "I", data, offset + 20)
+            start = offset + 28
+            _add_packet(lists, linktypes[interface], data, start, min(start + caplen, offset + block_len))
+        offset += block_len
+
+
+def read_capture(path):
+    """
+    Parse a pcap or pcapng capture of radiotap (or plain 802.11) packets.
+    :return: PacketColumns
+    """
+    lists = _ColumnLists()
+    with open(path, "rb") as fp:
+        with mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            magic = bytes(data[0:4])
+            if magic in PCAP_MAGIC:
+                _read_pcap(lists, data)
+            elif struct.unpack("<I", magic)[0] == PCAPNG_SHB:
+                _read_pcapng(lists, data)
+            else:
+                raise ValueError("%s is not a pcap or pcapng file" % path)
+    return lists.columns()
+
+
+# tshark field, converter to the column value
+TSHARK_FIELDS = (("wlan.fc", lambda v: int(v, 16) >> 8),
+                 ("wlan_radio.data_rate", float),
+                 ("wlan_radio.phy", int),
+                 ("wlan_radio.signal_dbm", float),
+                 ("wlan_radio.a_mpdu_aggregate_id", int),
+                 ("wlan_radio.11n.mcs_index", int),
+                 ("wlan_radio.11n.bandwidth", lambda v: HT_BW[int(v) & 0x03]),
+                 ("wlan_radio.11ac.mcs", int),
+                 ("wlan_radio.11ac.nss", int),
+                 ("wlan_radio.11ac.bandwidth", lambda v: VHT_BW[int(v)] if int(v) < len(VHT_BW) else 0),
+                 ("radiotap.he.data_3.data_mcs", lambda v: int(v, 0)),
+                 ("radiotap.he.data_6.nsts", lambda v: int(v, 0)),
+                 ("radiotap.he.data_5.data_bw_ru_allocation",
+                  lambda v: HE_BW[int(v, 0)] if int(v, 0) < len(HE_BW) else 0))
+
+
+def read_capture_tshark(path, tshark="tshark"):
+    """
+    Same columns as read_capture(), from a single tshark run, for captures read_capture()
+    cannot parse. Needs a tshark that knows the 802.11ax radiotap fields.
+    :return: PacketColumns
+    """
+    command = [tshark, "-n", "-r", path, "-T", "fields", "-E", "separator=\t", "-E", "occurrence=f"]
+    for field, _ in TSHARK_FIELDS:
+        command += ["-e", field]
+    lists = _ColumnLists()
+    # stderr is not read until stdout ends; a pipe would fill up and stall tshark
+    errors = tempfile.TemporaryFile(mode="w+")
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=errors, universal_newlines=True)
+    for line in process.stdout:
+        values = {}
+        for (field, convert), value in zip(TSHARK_FIELDS, line.rstrip("\n").split("\t")):
+            if value != "":
+                values[field] = convert(value)
+        mcs = values.get("wlan_radio.11n.mcs_index", -1)
+        nss = mcs // 8 + 1 if mcs >= 0 else -1
+        bandwidth = values.get("wlan_radio.11n.bandwidth", 0)
+        if "radiotap.he.data_3.data_mcs" in values:
+            mcs = values["radiotap.he.data_3.data_mcs"]
+            nss = values.get("radiotap.he.data_6.nsts", -1)
+            bandwidth = values.get("radiotap.he.data_5.data_bw_ru_allocation", 0)
+        elif "wlan_radio.11ac.mcs" in values:
+            mcs = values["wlan_radio.11ac.mcs"]
+            nss = values.get("wlan_radio.11ac.nss", -1)
+            bandwidth = values.get("wlan_radio.11ac.bandwidth", 0)
+        lists.add(fc=values.get("wlan.fc", -1),
+                  rate=values.get("wlan_radio.data_rate", np.nan),
+                  phy=values.get("wlan_radio.phy", PHY_UNKNOWN),
+                  mcs=mcs,
+                  bandwidth=bandwidth,
+                  nss=nss,
+                  signal=values.get("wlan_radio.signal_dbm", np.nan),
+                  ampdu=values.get("wlan_radio.a_mpdu_aggregate_id", -1))
+    with errors:
+        if process.wait() != 0:
+            errors.seek(0)
+            raise RuntimeError("%s failed: %s" % (" ".join(command), errors.read().strip()))
+    return lists.columns()
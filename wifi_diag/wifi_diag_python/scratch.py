@@ -27,6 +27,7 @@ import base64
 from io import BytesIO
 from htmlText import *
 from Dataplot import Plot
+import pcap_columns
 import shutil
 import argparse
 import logging
@@ -94,20 +95,14 @@ def PacketHistogram(subtype_list, Managementls, Controlls, Data_framels, count):
 
 def RateHistogram(DataRate, PhyType, SignalStrength, count):
 
-    countUniqueData = []
     perUniqueData = []
 
-    countUniquePhy = []
     perUniquePhy = []
 
-    countUniqueSignal = []
     perUniqueSignal = []
 
     # This is for Data Table Histogram
-    uniqueData = np.unique(DataRate)
-
-    for i in uniqueData:
-        countUniqueData.append(DataRate.count(i))
+    uniqueData, countUniqueData = np.unique(DataRate, return_counts=True)
 
     uniqueData = [i for i in uniqueData]
 
@@ -143,9 +138,7 @@ def RateHistogram(DataRate, PhyType, SignalStrength, count):
 
 
     # This is for Phy Histogram
-    uniquePhy = np.unique(PhyType)
-    for j in uniquePhy:
-        countUniquePhy.append(PhyType.count(j))
+    uniquePhy, countUniquePhy = np.unique(PhyType, return_counts=True)
 
     uniquePhy = [i for i in uniquePhy]
     # uniquePhy.append("Sum: ")
@@ -179,10 +172,7 @@ def RateHistogram(DataRate, PhyType, SignalStrength, count):
     htmltable(" Phy Histogram.",df_Phy,str(path),"0","0","Summary ")
 
     # This is for Signal Histogram
-    uniqueSignal = np.unique(SignalStrength)
-
-    for k in uniqueSignal:
-        countUniqueSignal.append(SignalStrength.count(k))
+    uniqueSignal, countUniqueSignal = np.unique(SignalStrength, return_counts=True)
 
     uniqueSignal = [i for i in uniqueSignal]
     # uniqueSignal.append("Sum: ")
@@ -233,23 +223,17 @@ def RateHistogram(DataRate, PhyType, SignalStrength, count):
 
 def PHY_BW_MCS_NCS(MCSIndex, vMCS, Bandwidth, vBW, PHY, vPHY, Spatial_Stream, vNCS,  count):
 
-    countUniqueMCSIndex = []
-    countUniqueBandwidth = []
     countUniquePHY = []
-    countUniqueSpatial_stream = []
 
     perUniqueMCS = []
     perUniqueBW = []
     perUniquePHY = []
     perUniqueNCS = []
 
-    uniqueMCSIndex = np.unique(MCSIndex)
-    uniqueBandwidth = ((np.unique(Bandwidth)))
+    uniqueMCSIndex, countUniqueMCSIndex = np.unique(MCSIndex, return_counts=True)
+    uniqueBandwidth, countUniqueBandwidth = np.unique(Bandwidth, return_counts=True)
     # uniquePHY = ((np.unique(PHY)))
-    uniqueSpatial_stream = ((np.unique(Spatial_Stream)))
-
-    for countMCS in uniqueMCSIndex:
-        countUniqueMCSIndex.append(MCSIndex.count(countMCS))
+    uniqueSpatial_stream, countUniqueSpatial_stream = np.unique(Spatial_Stream, return_counts=True)
 
     for cnt in countUniqueMCSIndex:
         perUniqueMCS.append(round((cnt * 100) / count, 2))
@@ -271,9 +255,6 @@ def PHY_BW_MCS_NCS(MCSIndex, vMCS, Bandwidth, vBW, PHY, vPHY, Spatial_Stream, vN
 
     # print(uniqueMCSIndex, countUniqueMCSIndex)
 
-    for countBandwidth in uniqueBandwidth:
-        countUniqueBandwidth.append(Bandwidth.count(countBandwidth))
-
     for cnt in countUniqueBandwidth:
         perUniqueBW.append(round((cnt * 100) / count, 2))
 
@@ -312,9 +293,6 @@ def PHY_BW_MCS_NCS(MCSIndex, vMCS, Bandwidth, vBW, PHY, vPHY, Spatial_Stream, vN
     """
 
 
-    for countNCS in uniqueSpatial_stream:
-        countUniqueSpatial_stream.append(Spatial_Stream.count(countNCS))
-
     for cnt in countUniqueSpatial_stream:
         perUniqueNCS.append(round((cnt * 100) / count, 2))
 
@@ -335,48 +313,31 @@ def PHY_BW_MCS_NCS(MCSIndex, vMCS, Bandwidth, vBW, PHY, vPHY, Spatial_Stream, vN
     htmltable("Data NSS Histogram.", df_NCS, str(path), "0", "0",PacketInfo)
 
 def RateAMPDU(AMPDU,count):
-    countAMPDU = []
     # print("IN AMPDU")
     # print("AMPDU: ",AMPDU)
 
-    countUniqueAMPDU = []
 
     perUniqueAMPDU = []
-    chainCountAMPDU = []
 
-    uniqueAMPDU = np.unique(AMPDU)
-    uniqueAMPDU = [i for i in uniqueAMPDU]
+    # packets per A-MPDU, then A-MPDUs per chain length
+    uniqueAMPDU, countUniqueAMPDU = np.unique(AMPDU, return_counts=True)
 
     # print("uniqueAMPDU",uniqueAMPDU)
     #
     # print("len(uniqueAMPDU)",len(uniqueAMPDU))
 
-    for countAMPDU in uniqueAMPDU:
-        countUniqueAMPDU.append(AMPDU.count(countAMPDU))
-
     # print("countUniqueAMPDU",countUniqueAMPDU)
     # print("len(countUniqueAMPDU)",len(countUniqueAMPDU))
 
-    chainUniqueAMPDU = np.unique(countUniqueAMPDU)
+    chainUniqueAMPDU, chainCountAMPDU = np.unique(countUniqueAMPDU, return_counts=True)
     chainUniqueAMPDU = [i for i in chainUniqueAMPDU]
 
     # print("chainUniqueAMPDU", chainUniqueAMPDU)
     # print("len(chainUniqueAMPDU)", len(chainUniqueAMPDU))
 
-    for Acount in chainUniqueAMPDU:
-        chainCountAMPDU.append(countUniqueAMPDU.count(Acount))
-
     # print(" len(chainCountAMPDU): ", len(chainCountAMPDU))
     # print("chainCountAMPDU",chainCountAMPDU)
 
-    UniqueChainCountAMPDU = np.unique(chainCountAMPDU)
-    UniqueChainCountAMPDU = [i for i in UniqueChainCountAMPDU]
-
-    listAMPDU = []
-    for un in UniqueChainCountAMPDU:
-        listAMPDU.append(chainCountAMPDU.count(un))
-
-
 
     print(chainUniqueAMPDU,chainCountAMPDU)
     dictAMPDU = dict(zip(chainUniqueAMPDU,chainCountAMPDU))
@@ -408,8 +369,25 @@ def RateAMPDU(AMPDU,count):
 
 
 
+# first frame control byte as hex
+SUBTYPE_LIST = {"80": "Beacon frame", "d0": "Action", "b4": "Request-to-send", "d4": "Acknowledgement", \
+                "88": "QoS Data", "84": "Block Ack Req", "94": "Block Ack Req", \
+                "40": "Probe Request", "50": "Probe Response", "b0": "Authentication",
+                "a2": "Disassociate", "a8": "QoS Data + CF-Poll", "c8":"QoS Null function", \
+                "10": "Association Response", "00": "Association Request", "c4": "Clear-to-send", \
+                "98": "QoS Data + CF-Acknowledgment", "24": "Trigger", "28": "Data + CF-Poll" ,\
+                "d8": "Unknown", "54": "VHT/HE NDP Announcement", "e8": "QoS CF-Poll", \
+                "b8" : "QoS Data + CF-Ack + CF-Poll", "18": "Data + CF-Ack", "48" : "Null function", \
+                "69" : "CF-Poll", "08": "Data"
+                }
+
+
 class shark:
-    def __init__(self):
+    def __init__(self, backend="pyshark"):
+        """
+        :param backend: "pyshark" walks every packet with pyshark, "native" parses the capture
+            with pcap_columns.read_capture() and "tshark" with one tshark -T fields run
+        """
         # FilePath having pcap file
         # self.FilePath = "wifi_diag.pcap"
         # self.FilePath = "C:\Candela\Scripts\Lanforge scripts\lanforge-scripts-master\wifi_diag\wifi_diag.pcapng"
@@ -420,23 +398,20 @@ class shark:
         # self.FilePath = "C:\candela\pcap\\11ax_cap2_Copy.pcapng"
         # self.FilePath = "C:\candela\pcap\sta1.pcap"
         self.FilePath = output
+        self.backend = backend
 
-        self.cap = pyshark.FileCapture(self.FilePath)
+        self.cap = None
+        if backend == "pyshark":
+            self.cap = pyshark.FileCapture(self.FilePath)
         # print("Strt time stamp :",datetime.datetime.now())
 
     def Extract(self):
+        if self.backend != "pyshark":
+            self.ExtractColumns()
+            return
 
         type_list = {"0": "Management frame", "1": "Control Frame", "2": "Data frame"}
-        subtype_list = {"80": "Beacon frame", "d0": "Action", "b4": "Request-to-send", "d4": "Acknowledgement", \
-                        "88": "QoS Data", "84": "Block Ack Req", "94": "Block Ack Req", \
-                        "40": "Probe Request", "50": "Probe Response", "b0": "Authentication",
-                        "a2": "Disassociate", "a8": "QoS Data + CF-Poll", "c8":"QoS Null function", \
-                        "10": "Association Response", "00": "Association Request", "c4": "Clear-to-send", \
-                        "98": "QoS Data + CF-Acknowledgment", "24": "Trigger", "28": "Data + CF-Poll" ,\
-                        "d8": "Unknown", "54": "VHT/HE NDP Announcement", "e8": "QoS CF-Poll", \
-                        "b8" : "QoS Data + CF-Ack + CF-Poll", "18": "Data + CF-Ack", "48" : "Null function", \
-                        "69" : "CF-Poll", "08": "Data"
-                        }
+        subtype_list = SUBTYPE_LIST
 
 
         Managementls = []
@@ -776,9 +751,53 @@ class shark:
         # print("After appending time stamp :", datetime.datetime.now())
         RateHistogram(DataRate, PhyType, SignalStrength, count)
         # print("After RateHist time stamp :", datetime.datetime.now())
-        PacketHistogram(subtype_list, Managementls, Controlls, Data_framels, count)
+        PacketHistogram(SUBTYPE_LIST, Managementls, Controlls, Data_framels, count)
         # print("After PacketHist time stamp :", datetime.datetime.now())
 
+    def ExtractColumns(self):
+        """
+        Same histograms as Extract(), from columns read in one pass over the capture.
+        """
+        if self.backend == "tshark":
+            columns = pcap_columns.read_capture_tshark(self.FilePath)
+        else:
+            columns = pcap_columns.read_capture(self.FilePath)
+        count = len(columns)
+        print("Packets: ", count)
+
+        # Type/Subtype lists by frame type, built from the count of each frame control value
+        Managementls = []
+        Controlls = []
+        Data_framels = []
+        frame_lists = {0: Managementls, 1: Controlls, 2: Data_framels}
+        fc_values, fc_counts = np.unique(columns.fc[columns.fc >= 0], return_counts=True)
+        for fc, fc_count in zip(fc_values, fc_counts):
+            name = SUBTYPE_LIST.get("%02x" % fc)
+            frame_list = frame_lists.get((fc >> 2) & 3)
+            if (name is not None) and (frame_list is not None):
+                frame_list.extend([name] * int(fc_count))
+
+        # MCS/BW/NSS of 802.11ac and 802.11ax data frames, A-MPDU references of all data frames
+        data = (columns.frame_type == 2) & (columns.phy != pcap_columns.PHY_UNKNOWN)
+        ht = data & ((columns.phy == pcap_columns.PHY_11AC) | (columns.phy == pcap_columns.PHY_11AX))
+        MCSIndex = [str(mcs) for mcs in columns.mcs[ht & (columns.mcs >= 0)]]
+        Bandwidth = ["%d MHz" % bandwidth for bandwidth in columns.bandwidth[ht & (columns.bandwidth > 0)]]
+        Spatial_Stream = [str(nss) for nss in columns.nss[ht & (columns.nss >= 0)]]
+        PHY = [pcap_columns.PHY_NAMES.get(phy, str(phy)) for phy in columns.phy[data]]
+        AMPDU = columns.ampdu[(columns.frame_type == 2) & (columns.ampdu >= 0)]
+
+        DataRate = ["%g" % rate for rate in columns.rate[~np.isnan(columns.rate)]]
+        PhyType = [pcap_columns.PHY_NAMES.get(phy, str(phy)) for phy in
+                   columns.phy[columns.phy != pcap_columns.PHY_UNKNOWN]]
+        SignalStrength = ["%d" % signal for signal in columns.signal[~np.isnan(columns.signal)]]
+
+        if len(AMPDU) != 0:
+            RateAMPDU(AMPDU, count)
+        PHY_BW_MCS_NCS(MCSIndex, len(MCSIndex), Bandwidth, len(Bandwidth), PHY, len(PHY), Spatial_Stream,
+                       len(Spatial_Stream), count)
+        RateHistogram(DataRate, PhyType, SignalStrength, count)
+        PacketHistogram(SUBTYPE_LIST, Managementls, Controlls, Data_framels, count)
+
 
 
 if __name__ == "__main__":
@@ -788,6 +807,9 @@ if __name__ == "__main__":
     # parser.add_argument("-o", "--output", type=str, help="Enter the output pcap file name")
     parser.add_argument("-i", "--input", type=str,
                         help="Enter the Name of the pcap files which needs to be combined")
+    parser.add_argument("-b", "--backend", type=str, default="pyshark", choices=["pyshark", "native", "tshark"],
+                        help="How packets are read: pyshark per packet (slow), native pcap/radiotap parsing, "
+                             "or one tshark -T fields run")
 
     args = None
 
@@ -822,7 +844,7 @@ if __name__ == "__main__":
     myUL()
 
 
-    Extract = shark()
+    Extract = shark(backend=args.backend)
     Extract.Extract()
     # htmltable()
 